@@ -8,6 +8,7 @@ from puma.buffer.subscription import OnComplete as OnComplete  # noqa: F401, I10
 from puma.buffer.subscription import OnValue as OnValue  # noqa: F401, I100
 from puma.buffer.subscription import Subscription as Subscription  # noqa: F401, I100
 from puma.buffer.observable import Observable as Observable  # noqa: F401, I100
+from puma.buffer.serialized_value import SerializedValue as SerializedValue  # noqa: F401, I100
 from puma.buffer.publisher import DEFAULT_PUBLISH_COMPLETE_TIMEOUT as DEFAULT_PUBLISH_COMPLETE_TIMEOUT  # noqa: F401, I100
 from puma.buffer.publisher import DEFAULT_PUBLISH_VALUE_TIMEOUT as DEFAULT_PUBLISH_VALUE_TIMEOUT  # noqa: F401, I100
 from puma.buffer.publisher import Publisher as Publisher  # noqa: F401, I100
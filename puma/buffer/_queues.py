@@ -4,6 +4,7 @@ from multiprocessing import queues as multiprocessing_queues
 from typing import Generic, TYPE_CHECKING, TypeVar, Union
 
 from puma.attribute.mixin import ScopedAttributesCompatibilityMixin
+from puma.process_context import get_process_context
 
 # Queue Typing hack - see https://github.com/python/mypy/issues/5264 - because the runtime does not recognise the generic
 # nature of Queue and raises an exception "'Queue' object is not subscriptable"
@@ -33,7 +34,7 @@ else:
         """Type definition of a Queue variable for use between processes."""
 
         def __init__(self, maxsize: int = 0) -> None:
-            super().__init__(maxsize, ctx=multiprocessing.get_context())
+            super().__init__(maxsize, ctx=get_process_context())
 
         def __getitem__(self, item: T) -> '_ProcessQueue[T]':
             return multiprocessing.Queue
@@ -2,10 +2,11 @@ import logging
 from multiprocessing import synchronize
 from typing import TypeVar
 
-from puma.buffer import Publishable
+from puma.buffer import Publishable, SerializedValue
 from puma.buffer._queues import _ThreadQueue
 from puma.buffer.implementation.managed_queues import ManagedProcessQueue
 from puma.buffer.internal.items.queue_item import QueueItem
+from puma.buffer.internal.items.serialized_value_item import SerializedValueItem
 from puma.buffer.internal.publisher_impl import PublisherImpl
 from puma.timeouts import Timeouts
 from puma.unexpected_situation_action import UnexpectedSituationAction
@@ -26,6 +27,9 @@ class _MultiProcessPublisherImpl(PublisherImpl[Type]):
         self._comms_queue = comms_queue
         self._emptiness = emptiness
 
+    def _serialized_value_item(self, value: SerializedValue[Type]) -> QueueItem:
+        return SerializedValueItem[Type](value)
+
     def _publish_item(self, item: QueueItem, timeout: float, on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
         logger.debug("%s: publishing %s", self._name, str(item))
         if not self._emptiness.acquire(block=Timeouts.is_blocking(timeout), timeout=Timeouts.timeout_for_queue(timeout)):
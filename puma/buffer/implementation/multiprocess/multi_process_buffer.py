@@ -1,5 +1,4 @@
 import logging
-import multiprocessing
 import queue
 from multiprocessing import synchronize
 from typing import Optional, TypeVar
@@ -15,6 +14,7 @@ from puma.buffer.internal.items.queue_item import QueueItem
 from puma.context import Exit_1, Exit_2, Exit_3
 from puma.helpers.os import is_windows
 from puma.primitives import AutoResetEvent, ConditionType, EventType, ProcessCondition, ProcessEvent, ProcessSafeBool, ProcessSafeInt, SafeBoolType, SafeIntType
+from puma.process_context import get_process_context
 
 Type = TypeVar("Type")
 
@@ -52,7 +52,7 @@ class MultiProcessBuffer(BufferBase[Type]):
         if max_size < 1:
             raise RuntimeError(f"{self._name}: Buffer must be created with a size of a least 1")
         self._comms_queue = ManagedProcessQueue(name=self._name)  # no maximum size - fullness is implemented using the emptiness semaphore
-        self._emptiness = multiprocessing.BoundedSemaphore(max_size)
+        self._emptiness = get_process_context().BoundedSemaphore(max_size)
         self._subscriber_queue = factory(_ThreadQueue[QueueItem])  # no maximum size - fullness is implemented using the emptiness semaphore
 
     def __enter__(self) -> 'MultiProcessBuffer[Type]':
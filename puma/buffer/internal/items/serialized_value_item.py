@@ -0,0 +1,31 @@
+from multiprocessing import reduction  # type: ignore  # reduction is missing from typeshed
+from typing import Any, Callable, Generic, Tuple, TypeVar
+
+from puma.buffer.internal.items.queue_item import QueueItem
+from puma.buffer.internal.items.value_item import ValueItem
+from puma.buffer.serialized_value import SerializedValue
+
+Type = TypeVar("Type")
+
+
+class SerializedValueItem(Generic[Type], QueueItem):
+    """An item queued by Publisher.publish_serialized_value() on a buffer that carries items across a process boundary.
+
+    It is pickled as the value's pickled form, which is shared with every other buffer that the value is published to, and is received as a ValueItem.
+    The value is pickled (if it has not been already) when the item is created, by the publishing thread, rather than later by the queue's feeder thread; this means that
+    an error pickling the value is raised to the publisher, and that the feeder threads of several buffers do not race to pickle the same value.
+    """
+
+    def __init__(self, value: SerializedValue[Type]) -> None:
+        self._payload = value.payload()
+        self._value = value.value  # For logging
+
+    def __reduce__(self) -> Tuple[Callable[[bytes], ValueItem[Any]], Tuple[bytes]]:
+        return _unpickle_value_item, (self._payload,)
+
+    def __str__(self) -> str:
+        return f"SerializedValueItem: {self._value}"
+
+
+def _unpickle_value_item(payload: bytes) -> ValueItem[Any]:
+    return ValueItem[Any](reduction.ForkingPickler.loads(payload))
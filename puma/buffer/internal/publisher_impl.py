@@ -3,7 +3,7 @@ import queue
 from abc import abstractmethod
 from typing import Any, Optional, TypeVar
 
-from puma.buffer import DEFAULT_PUBLISH_COMPLETE_TIMEOUT, DEFAULT_PUBLISH_VALUE_TIMEOUT, Publishable, Publisher
+from puma.buffer import DEFAULT_PUBLISH_COMPLETE_TIMEOUT, DEFAULT_PUBLISH_VALUE_TIMEOUT, Publishable, Publisher, SerializedValue
 from puma.buffer._queues import _ThreadQueue
 from puma.buffer.internal.items.complete_item import CompleteItem
 from puma.buffer.internal.items.queue_item import QueueItem
@@ -58,6 +58,15 @@ class PublisherImpl(Publisher[Type]):
             raise RuntimeError(f"{self._name}: Trying to publish a value after publishing Complete")
         self._publish_item(ValueItem[Type](value), timeout, on_full_action)
 
+    def publish_serialized_value(self, value: SerializedValue[Type],
+                                 timeout: float = DEFAULT_PUBLISH_VALUE_TIMEOUT,
+                                 on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
+        """Implementation of Publisher.publish_serialized_value"""
+        logger.debug("%s Publishing serialized value %s, with timeout %s", self._name, safe_str(value.value), Timeouts.describe(timeout))
+        if self._published_complete:
+            raise RuntimeError(f"{self._name}: Trying to publish a value after publishing Complete")
+        self._publish_item(self._serialized_value_item(value), timeout, on_full_action)
+
     def publish_complete(self, error: Optional[BaseException],
                          timeout: float = DEFAULT_PUBLISH_COMPLETE_TIMEOUT, on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
         """Implementation of Publisher.publish_complete"""
@@ -82,6 +91,10 @@ class PublisherImpl(Publisher[Type]):
             raise RuntimeError(f"{self._name}: Publication has already been invalidated")
         self._given_publishable = None
 
+    def _serialized_value_item(self, value: SerializedValue[Type]) -> QueueItem:
+        # Called by publish_serialized_value. Overridden by buffers that carry items across a process boundary, to use the value's pickled form.
+        return ValueItem[Type](value.value)
+
     @abstractmethod
     def _publish_item(self, item: QueueItem, timeout: float, on_full_action: UnexpectedSituationAction) -> None:
         # Called by publish_value and publish_complete, puts an item on the queue
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Generic, Optional, TypeVar
 
+from puma.buffer.serialized_value import SerializedValue
 from puma.context import Exit_1, Exit_2, Exit_3
 from puma.primitives import AutoResetEvent
 from puma.timeouts import TIMEOUT_NO_WAIT
@@ -40,6 +41,18 @@ class Publisher(Generic[Type], ABC):
         """
         raise NotImplementedError()
 
+    def publish_serialized_value(self, value: SerializedValue[Type],
+                                 timeout: float = DEFAULT_PUBLISH_VALUE_TIMEOUT,
+                                 on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
+        """As publish_value, for a value that may be published to several buffers. Buffers that carry values across a process boundary use the value's pickled form,
+        so that it is only pickled once; others are given the value itself, which is what this default implementation does.
+
+        Raises:
+            queue.Full  as publish_value.
+            Any error raised when pickling the value, if this buffer carries values across a process boundary.
+        """
+        self.publish_value(value.value, timeout, on_full_action)
+
     @abstractmethod
     def publish_complete(self, error: Optional[BaseException],
                          timeout: float = DEFAULT_PUBLISH_COMPLETE_TIMEOUT, on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
@@ -0,0 +1,26 @@
+from multiprocessing import reduction  # type: ignore  # reduction is missing from typeshed
+from typing import Generic, Optional, TypeVar
+
+Type = TypeVar("Type")
+
+
+class SerializedValue(Generic[Type]):
+    """A value, together with its pickled form, which is created when first asked for and then reused.
+
+    Used when the same value is published to several buffers (see Publisher.publish_serialized_value), so that the value is pickled once, however many of those buffers
+    carry it across a process boundary. Buffers within a process are given the value itself.
+    """
+
+    def __init__(self, value: Type) -> None:
+        self.value = value
+        self._payload: Optional[bytes] = None
+
+    def payload(self) -> bytes:
+        """Returns the pickled value, pickling it on the first call. Raises an error if the value cannot be pickled."""
+        if self._payload is None:
+            self._payload = bytes(reduction.ForkingPickler.dumps(self.value))
+        return self._payload
+
+    def is_serialized(self) -> bool:
+        """Returns whether the value has been pickled."""
+        return self._payload is not None
@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from puma.concurrent.futures.typed_future import TypedFuture
+from puma.primitives import ThreadLock
+
+logger = logging.getLogger(__name__)
+
+# A fixed protocol, so that keys and the files in the disk tier do not change with the version of Python
+_PICKLE_PROTOCOL = 4
+_DISK_FILE_SUFFIX = ".result"
+
+
+@dataclass(frozen=True)
+class ResultCacheStatistics:
+    """A snapshot of the activity and contents of a ResultCache."""
+    hits: int  # Including those found in the disk tier
+    disk_hits: int
+    misses: int
+    evictions: int  # Entries evicted from memory to keep within the size limit
+    entry_count: int  # In memory
+    size_bytes: int  # In memory
+
+
+class ResultCache:
+    """A cache of the values returned by jobs, which Pool and TypedExecutor consult before dispatching a job, so that a job that has already been run with the same
+    arguments is not run again. Cached results are returned in futures that are already resolved.
+
+    Each job is identified by a key: a hash of the module and qualified name of the function and of its pickled arguments. Only jobs that can be identified in this
+    way are cached. Functions without a stable qualified name (lambdas and functions defined inside other functions) are not cached, and nor are jobs whose arguments
+    cannot be pickled. Arguments that are equal but pickle differently, such as dictionaries built in different orders, give different keys.
+
+    Only the results of jobs that succeed are cached. Results are held pickled, so that each hit returns a copy that the caller can change without affecting the
+    cache, and so that the memory used by the cache is known. The least recently used results are evicted to keep the cache within its size limit.
+
+    If a disk directory is given, every result is also written there, and a result not found in memory is looked for on disk, so results survive eviction and can be
+    shared between sessions. The disk tier is not bounded; it can be emptied by deleting the directory's contents.
+
+    Functions are cached by name, so the cache must be cleared (and the disk directory emptied) if the functions change. The cache is thread safe.
+    """
+
+    def __init__(self, max_size_bytes: int, *, disk_directory: Optional[str] = None) -> None:
+        """Constructor.
+
+        Arguments:
+            max_size_bytes: The greatest total size of the pickled results held in memory. A result larger than this is not held in memory.
+            disk_directory: If given, results are also stored in files in this directory, which is created if it does not exist.
+        """
+        if max_size_bytes < 1:
+            raise ValueError("The maximum size must be at least 1 byte")
+        if disk_directory is not None:
+            os.makedirs(disk_directory, exist_ok=True)
+        self._max_size_bytes = max_size_bytes
+        self._disk_directory = disk_directory
+        self._lock = ThreadLock()
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()  # Least recently used first
+        self._size_bytes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(fn: Callable[..., Any], args: Sequence[Any], kwargs: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Returns the key identifying a call of the function with the given arguments, or None if the call cannot be cached."""
+        module = getattr(fn, "__module__", None)
+        qualified_name = getattr(fn, "__qualname__", None)
+        if not module or not qualified_name or "<" in qualified_name:  # For example "<lambda>", or "outer.<locals>.inner"
+            return None
+        try:
+            pickled_args = pickle.dumps((tuple(args), sorted((kwargs or {}).items())), protocol=_PICKLE_PROTOCOL)
+        except Exception as ex:
+            logger.debug("Not caching a call of %s.%s, whose arguments cannot be pickled: %s", module, qualified_name, ex)
+            return None
+        digest = hashlib.sha256(f"{module}.{qualified_name}".encode())
+        digest.update(pickled_args)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Looks up the result stored with the given key. Returns (True, result) if found, otherwise (False, None)."""
+        with self._lock:
+            pickled = self._entries.get(key)
+            if pickled is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+        if pickled is not None:
+            return True, pickle.loads(pickled)
+        pickled = self._read_from_disk(key)
+        with self._lock:
+            if pickled is None:
+                self._misses += 1
+                return False, None
+            self._hits += 1
+            self._disk_hits += 1
+            self._store_in_memory(key, pickled)
+        return True, pickle.loads(pickled)
+
+    def put(self, key: str, result: Any) -> None:
+        """Stores the result of the call identified by the key. Results that cannot be pickled are not stored."""
+        try:
+            pickled = pickle.dumps(result, protocol=_PICKLE_PROTOCOL)
+        except Exception as ex:
+            logger.debug("Not caching a result that cannot be pickled: %s", ex)
+            return
+        with self._lock:
+            self._store_in_memory(key, pickled)
+        self._write_to_disk(key, pickled)
+
+    def submit(self, key: Optional[str], submit: Callable[[], "Future[Any]"]) -> "Future[Any]":
+        """Returns a resolved future holding the result stored with the key, if there is one. Otherwise calls submit, which dispatches the job and returns its
+        future, and arranges for the job's result to be stored when it succeeds. A key of None (a call that cannot be cached) is always submitted.
+        """
+        if key is not None:
+            found, result = self.get(key)
+            if found:
+                return resolved_future(result)
+        future = submit()
+        if key is not None:
+            self.put_when_done(key, future)
+        return future
+
+    def put_when_done(self, key: str, future: "Future[Any]") -> None:
+        """Arranges for the result of the future to be stored with the key, if it succeeds."""
+
+        def on_done(done: "Future[Any]") -> None:
+            if not done.cancelled() and done.exception() is None:
+                self.put(key, done.result())
+
+        future.add_done_callback(on_done)
+
+    def get_statistics(self) -> ResultCacheStatistics:
+        with self._lock:
+            return ResultCacheStatistics(self._hits, self._disk_hits, self._misses, self._evictions, len(self._entries), self._size_bytes)
+
+    def clear(self) -> None:
+        """Removes all the results held in memory, and resets the statistics. The disk tier, if any, is left as it is."""
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self._hits = self._disk_hits = self._misses = self._evictions = 0
+
+    def _store_in_memory(self, key: str, pickled: bytes) -> None:
+        # Called with the lock held
+        existing = self._entries.pop(key, None)
+        if existing is not None:
+            self._size_bytes -= len(existing)
+        if len(pickled) > self._max_size_bytes:
+            return
+        self._entries[key] = pickled
+        self._size_bytes += len(pickled)
+        while self._size_bytes > self._max_size_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= len(evicted)
+            self._evictions += 1
+
+    def _disk_path(self, key: str) -> Optional[str]:
+        return os.path.join(self._disk_directory, key + _DISK_FILE_SUFFIX) if self._disk_directory else None
+
+    def _read_from_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as ex:
+            logger.warning("Failed to read a cached result from '%s': %s", path, ex)
+            return None
+
+    def _write_to_disk(self, key: str, pickled: bytes) -> None:
+        # Written to a temporary file which is then renamed, so that a reader never sees a partly written file
+        path = self._disk_path(key)
+        if not path:
+            return
+        try:
+            fd, temporary_path = tempfile.mkstemp(dir=self._disk_directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(pickled)
+                os.replace(temporary_path, path)
+            except BaseException:
+                os.remove(temporary_path)
+                raise
+        except OSError as ex:
+            logger.warning("Failed to write a cached result to '%s': %s", path, ex)
+
+
+def resolved_future(result: Any) -> TypedFuture[Any]:
+    """Returns a future that already holds the given result."""
+    future: TypedFuture[Any] = TypedFuture()
+    future.set_result(result)
+    return future
@@ -0,0 +1,49 @@
+from time import perf_counter
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+R = TypeVar("R")
+
+# With chunksize="auto", chunks are sized so that each takes about this long to run
+AUTO_CHUNK_TARGET_DURATION = 0.05
+
+# The largest chunk that is submitted with chunksize="auto", however short the calls are
+AUTO_CHUNKSIZE_MAX = 1000
+
+# The weight given to each new measurement in the running estimate of the duration of a call, so that the chunk size follows changes in the calls' durations
+_SMOOTHING = 0.3
+
+
+class _AdaptiveChunkSize:
+    """Chooses the size of chunks of calls, from measurements of how long chunks took to run, so that each chunk takes about the target duration.
+
+    Until the first chunk has been measured, the calls are probed one at a time.
+    """
+
+    def __init__(self, target_duration: float = AUTO_CHUNK_TARGET_DURATION, max_chunksize: int = AUTO_CHUNKSIZE_MAX) -> None:
+        self._target_duration = target_duration
+        self._max_chunksize = max_chunksize
+        self._call_duration: Optional[float] = None
+
+    def next_chunksize(self) -> int:
+        if self._call_duration is None:
+            return 1
+        if self._call_duration <= 0.0:
+            return self._max_chunksize
+        return max(1, min(self._max_chunksize, round(self._target_duration / self._call_duration)))
+
+    def record(self, call_count: int, duration: float) -> None:
+        """Records that a chunk of the given number of calls took the given time to run."""
+        if call_count < 1:
+            return
+        call_duration = duration / call_count
+        if self._call_duration is None:
+            self._call_duration = call_duration
+        else:
+            self._call_duration += _SMOOTHING * (call_duration - self._call_duration)
+
+
+def _run_timed_chunk(fn: Callable[..., R], param_sets: Sequence[Tuple[Any, ...]]) -> Tuple[List[R], float]:
+    # Runs on a worker; module level so that it can be pickled. Returns the values returned by the calls, and how long they took in total.
+    start = perf_counter()
+    results = [fn(*param_set) for param_set in param_sets]
+    return results, perf_counter() - start
@@ -0,0 +1,218 @@
+import logging
+import mmap
+import os
+import tempfile
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from puma.concurrent.futures.typed_future import TypedFuture
+from puma.primitives import ThreadLock
+
+logger = logging.getLogger(__name__)
+
+# A tmpfs on Linux, so files created there are held in shared memory rather than written to disk
+_SHARED_MEMORY_DIRECTORY = "/dev/shm"
+_SEGMENT_PREFIX = "puma-shm-"
+
+_BYTES = "bytes"
+_BYTEARRAY = "bytearray"
+_MEMORYVIEW = "memoryview"
+_NDARRAY = "ndarray"
+
+
+@dataclass(frozen=True)
+class _SharedSegment:
+    # The handle that is sent between processes in place of a large value, whose contents are in the file at the given path
+    path: str
+    kind: str
+    format: str  # The format of a memoryview, or the dtype of a NumPy array
+    shape: Tuple[int, ...]
+
+
+@dataclass
+class _SharedArgument:
+    value: Any  # Keeps the value alive, so that its id is not reused while the segment is shared
+    segment: _SharedSegment
+    use_count: int
+
+
+def get_default_shared_memory_directory() -> str:
+    return _SHARED_MEMORY_DIRECTORY if os.path.isdir(_SHARED_MEMORY_DIRECTORY) else tempfile.gettempdir()
+
+
+class _SharedMemoryTransport:
+    """Submits calls to a process pool executor, passing large arguments and results through files in shared memory, so that only small handles are pickled
+    through the executor's queues.
+
+    Values that support the buffer protocol are passed this way if they are at least the threshold size, provided that they are bytes, bytearray, C-contiguous
+    memoryview or C-contiguous NumPy array objects; only the positional and keyword arguments themselves are considered, not values nested inside them.
+    A worker receives bytes and bytearray arguments as copies, and memoryview and NumPy array arguments as views of a private copy-on-write mapping of the file.
+
+    An argument passed to several calls at once (the same object) is written to shared memory once, and the file is removed when the futures of all those
+    calls have resolved, whether with a value, an error, or by being cancelled. A result passed back through shared memory is removed as soon as it has been read.
+    """
+
+    def __init__(self, threshold: int, directory: str) -> None:
+        if threshold < 1:
+            raise ValueError("The shared memory threshold must be at least 1 byte")
+        self._threshold = threshold
+        self._directory = directory
+        self._lock = ThreadLock()
+        self._shared_arguments: Dict[int, _SharedArgument] = {}  # Keyed by the id of the value
+
+    def submit(self, executor: Executor, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> TypedFuture[Any]:
+        held: List[int] = []
+        try:
+            shared_args = tuple(self._share(arg, held) for arg in args)
+            shared_kwargs = {name: self._share(value, held) for name, value in kwargs.items()}
+            inner = executor.submit(_call_with_shared_memory, fn, shared_args, shared_kwargs, self._threshold, self._directory)
+        except BaseException:
+            self._release(held)
+            raise
+
+        outer: TypedFuture[Any] = TypedFuture()
+
+        def on_outer_done(done: "Future[Any]") -> None:
+            if done.cancelled():
+                inner.cancel()
+
+        def on_inner_done(done: "Future[Any]") -> None:
+            self._release(held)
+            result = None if done.cancelled() or done.exception() else done.result()
+            if not outer.set_running_or_notify_cancel():  # The caller has cancelled the future
+                if isinstance(result, _SharedSegment):
+                    _remove_segment(result)
+                return
+            if done.cancelled():
+                outer.set_exception(RuntimeError("The call was cancelled by the executor"))
+            elif done.exception():
+                outer.set_exception(done.exception())
+            else:
+                try:
+                    outer.set_result(_receive_segment(result) if isinstance(result, _SharedSegment) else result)
+                except Exception as ex:
+                    outer.set_exception(ex)
+
+        outer.add_done_callback(on_outer_done)
+        inner.add_done_callback(on_inner_done)
+        return outer
+
+    def get_shared_count(self) -> int:
+        """Returns the number of arguments currently held in shared memory."""
+        with self._lock:
+            return len(self._shared_arguments)
+
+    def _share(self, value: Any, held: List[int]) -> Any:
+        if not _is_large_enough(value, self._threshold):
+            return value
+        key = id(value)
+        with self._lock:
+            shared_argument = self._shared_arguments.get(key)
+            if shared_argument is None or shared_argument.value is not value:
+                segment = _write_segment(value, self._directory)
+                if segment is None:
+                    return value
+                shared_argument = _SharedArgument(value, segment, 0)
+                self._shared_arguments[key] = shared_argument
+            shared_argument.use_count += 1
+            held.append(key)
+            return shared_argument.segment
+
+    def _release(self, held: List[int]) -> None:
+        with self._lock:
+            for key in held:
+                shared_argument = self._shared_arguments[key]
+                shared_argument.use_count -= 1
+                if shared_argument.use_count == 0:
+                    del self._shared_arguments[key]
+                    _remove_segment(shared_argument.segment)
+        held.clear()
+
+
+def _call_with_shared_memory(fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any], threshold: int, directory: str) -> Any:
+    # Runs on a worker; module level so that it can be pickled
+    args = tuple(_read_segment(arg) if isinstance(arg, _SharedSegment) else arg for arg in args)
+    kwargs = {name: _read_segment(value) if isinstance(value, _SharedSegment) else value for name, value in kwargs.items()}
+    result = fn(*args, **kwargs)
+    if _is_large_enough(result, threshold):
+        segment = _write_segment(result, directory)
+        if segment:
+            return segment
+    return result
+
+
+def _describe(value: Any) -> Optional[Tuple[str, str, Tuple[int, ...]]]:
+    # Returns the kind, format and shape of a value that can be passed through shared memory, or None if it cannot
+    if isinstance(value, bytes):
+        return _BYTES, "B", (len(value),)
+    if isinstance(value, bytearray):
+        return _BYTEARRAY, "B", (len(value),)
+    if isinstance(value, memoryview):
+        view = _view(value)
+        if not view.c_contiguous or not view.shape:
+            return None
+        try:
+            view.cast("B").cast(view.format, view.shape)  # Checks that the view can be rebuilt from raw bytes
+        except (TypeError, ValueError):
+            return None
+        return _MEMORYVIEW, view.format, tuple(view.shape)
+    if type(value).__name__ == "ndarray" and type(value).__module__ == "numpy":  # Checked by name, so that NumPy is only imported by workers that receive arrays
+        if not value.flags["C_CONTIGUOUS"] or value.dtype.hasobject:
+            return None
+        return _NDARRAY, value.dtype.str, tuple(value.shape)
+    return None
+
+
+def _is_large_enough(value: Any, threshold: int) -> bool:
+    return _describe(value) is not None and bool(_view(value).nbytes >= threshold)
+
+
+def _write_segment(value: Any, directory: str) -> Optional[_SharedSegment]:
+    description = _describe(value)
+    if description is None:
+        return None
+    fd, path = tempfile.mkstemp(prefix=_SEGMENT_PREFIX, dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_view(value).cast("B"))
+    except OSError as ex:
+        logger.debug("Unable to write a value to shared memory, it will be pickled instead: %s", ex)
+        os.remove(path)
+        return None
+    return _SharedSegment(path, *description)
+
+
+def _read_segment(segment: _SharedSegment) -> Any:
+    with open(segment.path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    if segment.kind == _BYTES:
+        with mapping:
+            return mapping[:]
+    if segment.kind == _BYTEARRAY:
+        with mapping:
+            return bytearray(_view(mapping))
+    if segment.kind == _MEMORYVIEW:
+        return _view(mapping).cast(segment.format, segment.shape)
+    import numpy  # A NumPy array has been sent, so NumPy is installed
+    return numpy.frombuffer(mapping, dtype=numpy.dtype(segment.format)).reshape(segment.shape)
+
+
+def _view(value: Any) -> Any:
+    # A memoryview, typed as Any because the stubs for memoryview lack most of its attributes
+    return memoryview(value)
+
+
+def _receive_segment(segment: _SharedSegment) -> Any:
+    # The file can be removed as soon as it has been mapped; the mapping remains valid
+    try:
+        return _read_segment(segment)
+    finally:
+        _remove_segment(segment)
+
+
+def _remove_segment(segment: _SharedSegment) -> None:
+    try:
+        os.remove(segment.path)
+    except OSError as ex:
+        logger.warning("Failed to remove shared memory file '%s': %s", segment.path, ex)
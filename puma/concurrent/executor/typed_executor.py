@@ -1,16 +1,24 @@
 from __future__ import annotations
 
 from abc import ABC
-from concurrent.futures import Executor
+from collections import deque
+from concurrent.futures import Executor, FIRST_COMPLETED, Future, wait
 from concurrent.futures.process import ProcessPoolExecutor
 from concurrent.futures.thread import ThreadPoolExecutor
-from itertools import zip_longest
+from functools import partial
+from itertools import islice
 from multiprocessing.context import BaseContext
-from typing import Any, Callable, Iterable, List, Optional, Tuple, TypeVar, overload
+from os import cpu_count
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union, overload
 
 from puma.concurrent import Timeout
+from puma.concurrent.cache.result_cache import ResultCache
+from puma.concurrent.executor._adaptive_chunksize import _AdaptiveChunkSize, _run_timed_chunk
+from puma.concurrent.executor._shared_memory import _SharedMemoryTransport, get_default_shared_memory_directory
 from puma.concurrent.futures.typed_future import TypedFuture
 from puma.context import ContextManager, Exit_1, Exit_2, Exit_3
+from puma.helpers.os import is_windows
 
 # "submit" method type parameters
 # SP# = Submit Parameter Type, SR = Submit Return Type
@@ -40,15 +48,38 @@ MP9 = TypeVar("MP9")
 MP10 = TypeVar("MP10")
 MR = TypeVar("MR")
 
+# The number of calls that imap() and imap_unordered() keep in flight, unless told otherwise
+DEFAULT_MAX_IN_FLIGHT = 100
+
+# By default, TypedProcessPoolExecutor passes arguments and results of at least this many bytes through shared memory
+DEFAULT_SHARED_MEMORY_THRESHOLD = 1024 * 1024
+
+# The chunk size of map() and map_tuple(): a number of calls, or AUTO_CHUNKSIZE
+Chunksize = Union[int, str]
+AUTO_CHUNKSIZE = "auto"
+
 
 # TODO: Flake8 errors in this file are apparently fixed on master, but no new version has been released. https://github.com/PyCQA/pyflakes/issues/320
 #  Wait for a while for this release before using comments to prevent errors
 
 class TypedExecutor(ContextManager["TypedExecutor"], ABC):
-    """A typed version of Python's build in concurrent.futures.Executor"""
+    """A typed version of Python's build in concurrent.futures.Executor
+
+    An executor given a ResultCache looks up each call made by submit(), map(), map_tuple(), imap() and imap_unordered() in the cache, and only runs those whose
+    results are not cached.
 
-    def __init__(self, executor: Executor) -> None:
+    Like Executor.map(), map() and map_tuple() submit all their calls straight away. To work through a very large or unbounded iterable, use imap() or
+    imap_unordered(), which take items from the iterable only as calls complete.
+
+    With a process pool, each chunk of calls given to a worker costs a round trip between processes, so short calls are best mapped in chunks of many calls.
+    Given chunksize="auto", map() and map_tuple() choose the chunk size themselves: the first calls are run one at a time and timed, and later chunks are sized
+    to take about 50 milliseconds each, following changes in the calls' durations. Chunks are then submitted as earlier ones complete, keeping twice as many
+    chunks in flight as there are CPUs, rather than all being submitted straight away.
+    """
+
+    def __init__(self, executor: Executor, *, result_cache: Optional[ResultCache] = None) -> None:
         self._executor = executor
+        self._result_cache = result_cache
 
     def __enter__(self) -> "TypedExecutor":
         self._executor.__enter__()
@@ -60,134 +91,138 @@ class TypedExecutor(ContextManager["TypedExecutor"], ABC):
     # region map_tuple overloads
     @overload
     def map_tuple(self, fn: Callable[[], MR],
-                  param_sets: List, timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: List, timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1], MR],
-                  param_sets: Iterable[MP1], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[MP1], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map_tuple(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9, MP10], MR],
-                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9, MP10]], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+                  param_sets: Iterable[Tuple[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9, MP10]], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     # endregion
-    def map_tuple(self, fn: Callable[..., MR], param_sets: Iterable[Any], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:  # noqa: F811
-        try:
-            restructured_params: Any = zip_longest(*param_sets)
-        except TypeError as e:
-            # Handle the case where a list of single values is given (when the method accepts only one argument)
-            # vs. where a list of Tuples is given (for methods that accept several arguments)
-            if "zip_longest argument #1 must support iteration" == str(e):
-                restructured_params = (param_sets,)
-            else:
-                raise e
-        return self._executor.map(fn, *restructured_params, timeout=timeout, chunksize=chunksize)
+    def map_tuple(self, fn: Callable[..., MR], param_sets: Iterable[Any], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:  # noqa: F811
+        # Each tuple is the arguments of one call; any other value is the single argument of a call (for methods that accept only one argument).
+        # The parameter sets are taken one at a time, rather than being transposed, which would need them all in memory at once.
+        restructured_params = (_as_param_set(param_set) for param_set in param_sets)
+        if self._result_cache:
+            return self._map_through_cache(fn, restructured_params, timeout)
+        if isinstance(chunksize, str):
+            _validate_auto_chunksize(chunksize)
+            return self._map_adaptively(fn, restructured_params, timeout)
+        return self._executor.map(partial(_call_with_param_set, fn), restructured_params, timeout=timeout, chunksize=chunksize)
 
     # region map overloads
     @overload
     def map(self, fn: Callable[[MP1], MR],
-            __param_1s: Iterable[MP1], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_1s: Iterable[MP1], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2], MR],
-            __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3], MR],
-            __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4],
-            timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4], __param_5s: Iterable[MP5],
-            timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4], __param_5s: Iterable[MP5],
-            __param_6s: Iterable[MP6], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_6s: Iterable[MP6], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4], __param_5s: Iterable[MP5],
             __param_6s: Iterable[MP6],
-            __param_7s: Iterable[MP7], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_7s: Iterable[MP7], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4], __param_5s: Iterable[MP5],
-            __param_6s: Iterable[MP6], __param_7s: Iterable[MP7], __param_8s: Iterable[MP8], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_6s: Iterable[MP6], __param_7s: Iterable[MP7], __param_8s: Iterable[MP8], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4], __param_5s: Iterable[MP5], __param_6s: Iterable[MP6],
-            __param_7s: Iterable[MP7], __param_8s: Iterable[MP8], __param_9s: Iterable[MP9], timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            __param_7s: Iterable[MP7], __param_8s: Iterable[MP8], __param_9s: Iterable[MP9], timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     @overload  # noqa: F811
     def map(self, fn: Callable[[MP1, MP2, MP3, MP4, MP5, MP6, MP7, MP8, MP9, MP10], MR],
             __param_1s: Iterable[MP1], __param_2s: Iterable[MP2], __param_3s: Iterable[MP3], __param_4s: Iterable[MP4], __param_5s: Iterable[MP5],
             __param_6s: Iterable[MP6], __param_7s: Iterable[MP7], __param_8s: Iterable[MP8], __param_9s: Iterable[MP9], __param_10s: Iterable[MP10],
-            timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:
+            timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:
         ...
 
     # endregion
-    def map(self, fn: Callable[..., MR], *params: Any, timeout: Timeout = None, chunksize: int = 1) -> Iterable[MR]:  # noqa: F811
+    def map(self, fn: Callable[..., MR], *params: Any, timeout: Timeout = None, chunksize: Chunksize = 1) -> Iterable[MR]:  # noqa: F811
+        if self._result_cache:
+            return self._map_through_cache(fn, zip(*params), timeout)  # Each call is looked up in the cache, so calls are not chunked
+        if isinstance(chunksize, str):
+            _validate_auto_chunksize(chunksize)
+            return self._map_adaptively(fn, zip(*params), timeout)
         return self._executor.map(fn, *params, timeout=timeout, chunksize=chunksize)
 
     # region submit overloads
@@ -242,21 +277,166 @@ class TypedExecutor(ContextManager["TypedExecutor"], ABC):
 
     # endregion
     def submit(self, fn: Callable[..., Any], *args: Iterable[Any], **kwargs: Any) -> Any:  # noqa: F811
-        return self._executor.submit(fn, *args, **kwargs)
+        if self._result_cache:
+            return self._result_cache.submit(ResultCache.make_key(fn, args, kwargs), lambda: self._submit_to_executor(fn, args, kwargs))
+        return self._submit_to_executor(fn, args, kwargs)
+
+    def imap(self, fn: Callable[[MP1], MR], iterable: Iterable[MP1], *, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> Iterator[MR]:
+        """Calls fn with each item of the iterable, returning an iterator which yields the values returned, in the same order as the items.
+
+        Items are taken from the iterable lazily: at most max_in_flight calls are submitted but not yet yielded, and another item is only taken when the oldest
+        call's value has been yielded. Memory use therefore does not grow with the length of the iterable, which need not be finite.
+        If a call raises an error, it is raised when that call's value would have been yielded. Calls still in flight when the iterator is closed are cancelled.
+        """
+        _validate_max_in_flight(max_in_flight)
+        return self._imap(fn, iter(iterable), max_in_flight)
+
+    def imap_unordered(self, fn: Callable[[MP1], MR], iterable: Iterable[MP1], *, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> Iterator[MR]:
+        """Like imap(), but yields the values in the order in which the calls complete, rather than the order of the items, so a slow call does not hold up the
+        values of later ones.
+        """
+        _validate_max_in_flight(max_in_flight)
+        return self._imap_unordered(fn, iter(iterable), max_in_flight)
 
     def shutdown(self, wait: bool = True) -> None:
         return self._executor.shutdown(wait)
 
+    def _submit_to_executor(self, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Future[Any]:
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def _map_adaptively(self, fn: Callable[..., MR], param_sets: Iterator[Tuple[Any, ...]], timeout: Timeout) -> Iterator[MR]:
+        # The first chunks are submitted straight away, as Executor.map() would, so that errors such as the executor having been shut down are raised now
+        end_time = None if timeout is None else monotonic() + timeout
+        chunk_fn = partial(_run_timed_chunk, fn)
+        chunk_size = _AdaptiveChunkSize()
+        max_chunks_in_flight = 2 * (cpu_count() or 1)
+        in_flight: Deque[Future[Tuple[List[MR], float]]] = deque()
+
+        def submit_chunks() -> None:
+            while len(in_flight) < max_chunks_in_flight:
+                chunk = list(islice(param_sets, chunk_size.next_chunksize()))
+                if not chunk:
+                    return
+                in_flight.append(self._executor.submit(chunk_fn, chunk))
+
+        def result_iterator() -> Iterator[MR]:
+            try:
+                while in_flight:
+                    results, duration = in_flight.popleft().result(None if end_time is None else end_time - monotonic())
+                    chunk_size.record(len(results), duration)
+                    submit_chunks()
+                    yield from results
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+        submit_chunks()
+        return result_iterator()
+
+    def _imap(self, fn: Callable[[MP1], MR], iterator: Iterator[MP1], max_in_flight: int) -> Iterator[MR]:
+        in_flight: Deque[TypedFuture[MR]] = deque()
+        try:
+            for item in iterator:
+                if len(in_flight) >= max_in_flight:
+                    yield in_flight.popleft().result()
+                in_flight.append(self.submit(fn, item))
+            while in_flight:
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def _imap_unordered(self, fn: Callable[[MP1], MR], iterator: Iterator[MP1], max_in_flight: int) -> Iterator[MR]:
+        in_flight: Set[Future[MR]] = set()
+        try:
+            for item in iterator:
+                while len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                in_flight.add(self.submit(fn, item))
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def _map_through_cache(self, fn: Callable[..., MR], param_sets: Iterable[Tuple[Any, ...]], timeout: Timeout) -> Iterator[MR]:
+        # Behaves like Executor.map(): all the calls are submitted straight away, and the timeout applies from now
+        end_time = None if timeout is None else monotonic() + timeout
+        futures = [self.submit(fn, *param_set) for param_set in param_sets]
+
+        def result_iterator() -> Iterator[MR]:
+            try:
+                futures.reverse()
+                while futures:
+                    yield futures.pop().result(None if end_time is None else end_time - monotonic())
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return result_iterator()
+
+
+def _call_with_param_set(fn: Callable[..., MR], param_set: Tuple[Any, ...]) -> MR:
+    # Module level, so that it can be pickled along with fn
+    return fn(*param_set)
+
+
+def _as_param_set(value: Any) -> Tuple[Any, ...]:
+    if isinstance(value, tuple):
+        return value
+    return (value,)
+
+
+def _validate_auto_chunksize(chunksize: str) -> None:
+    if chunksize != AUTO_CHUNKSIZE:
+        raise ValueError(f"The chunk size must be a number or '{AUTO_CHUNKSIZE}'")
+
+
+def _validate_max_in_flight(max_in_flight: int) -> None:
+    if max_in_flight < 1:
+        raise ValueError("The maximum number of calls in flight must be at least 1")
+
 
 class TypedThreadPoolExecutor(TypedExecutor):
 
-    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = "", initializer: Optional[Callable[..., None]] = None, initargs: Tuple = ()) -> None:
-        super().__init__(ThreadPoolExecutor(max_workers, thread_name_prefix, initializer, initargs))
+    def __init__(self, max_workers: Optional[int] = None, thread_name_prefix: str = "", initializer: Optional[Callable[..., None]] = None, initargs: Tuple = (), *,
+                 result_cache: Optional[ResultCache] = None) -> None:
+        super().__init__(ThreadPoolExecutor(max_workers, thread_name_prefix, initializer, initargs), result_cache=result_cache)
 
 
 class TypedProcessPoolExecutor(TypedExecutor):
+    """A TypedExecutor whose calls are run in worker processes.
+
+    Calls made by submit(), imap() and imap_unordered() pass large arguments and results through shared memory rather than pickling them: bytes, bytearray,
+    memoryview and NumPy array objects of at least shared_memory_threshold bytes are written to a file in shared memory (/dev/shm, where it exists), and only a
+    handle to the file is pickled. The same object passed to many calls is written once. Each file is removed once the futures of the calls that use it have
+    resolved, or (for a result) once it has been read. A worker receives bytes and bytearray arguments as copies, but memoryview and NumPy array arguments as views
+    of a private copy-on-write mapping, so it sees the caller's data without copying it. Arguments must not be changed while calls using them are in flight.
+    Calls made by map() and map_tuple() pickle their arguments as usual. Not supported on Windows.
+    """
 
     def __init__(self, max_workers: Optional[int] = None, mp_context: Optional[BaseContext] = None, initializer: Optional[Callable[..., None]] = None,
-                 initargs: Tuple = ()) -> None:
+                 initargs: Tuple = (), *, result_cache: Optional[ResultCache] = None, shared_memory_threshold: Optional[int] = DEFAULT_SHARED_MEMORY_THRESHOLD,
+                 shared_memory_directory: Optional[str] = None) -> None:
+        """Constructor. The first four arguments are those of ProcessPoolExecutor.
+
+        Arguments:
+            result_cache:            If given, calls whose results are cached are not run (see TypedExecutor).
+            shared_memory_threshold: The size in bytes from which arguments and results are passed through shared memory, or None to pickle everything.
+                                     Ignored on Windows.
+            shared_memory_directory: The directory in which the shared memory files are created. Defaults to /dev/shm if it exists, otherwise the temporary directory.
+        """
         # TODO: Ignore this type until we update to mypy 0.720. This currently causes lots of errors to be raised
-        super().__init__(ProcessPoolExecutor(max_workers, mp_context, initializer, initargs))  # type: ignore
+        super().__init__(ProcessPoolExecutor(max_workers, mp_context, initializer, initargs), result_cache=result_cache)  # type: ignore
+        self._shared_memory: Optional[_SharedMemoryTransport] = None
+        if shared_memory_threshold is not None and not is_windows():
+            self._shared_memory = _SharedMemoryTransport(shared_memory_threshold, shared_memory_directory or get_default_shared_memory_directory())
+
+    def _submit_to_executor(self, fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Future[Any]:
+        if self._shared_memory:
+            return self._shared_memory.submit(self._executor, fn, args, kwargs)
+        return super()._submit_to_executor(fn, args, kwargs)
@@ -1,5 +1,8 @@
+import concurrent.futures
 from concurrent.futures import Future
-from typing import Generic, TYPE_CHECKING, TypeVar
+from typing import Generic, Iterable, Iterator, TYPE_CHECKING, TypeVar, cast
+
+from puma.concurrent import Timeout
 
 # This file has slightly odd formatting to prevent PyCharm complaining
 
@@ -17,3 +20,12 @@ else:
 # noinspection PyUnresolvedReferences
 class TypedFuture(Generic[T], _InternalFuture[T]):
     pass
+
+
+def as_completed(futures: Iterable[TypedFuture[T]], timeout: Timeout = None) -> Iterator[TypedFuture[T]]:
+    """A typed version of concurrent.futures.as_completed(): yields the given futures as they complete (or are cancelled).
+
+    Raises concurrent.futures.TimeoutError if they have not all completed when the timeout expires.
+    """
+    for future in concurrent.futures.as_completed(futures, timeout):
+        yield cast(TypedFuture[T], future)
@@ -6,6 +6,7 @@ from puma.buffer import Buffer, MultiProcessBuffer
 from puma.buffer.implementation.managed_queues import ManagedProcessQueue, ManagedQueueTypes
 from puma.environment import Environment
 from puma.primitives import ConditionType, EventType, ProcessCondition, ProcessEvent, ProcessSafeBool, ProcessSafeInt, SafeBoolType, SafeIntType
+from puma.process_context import get_process_context
 from puma.runnable import Runnable
 from puma.runnable.runner import ProcessRunner, Runner
 
@@ -22,7 +23,7 @@ class ProcessEnvironment(Environment):
 
     def create_thread_or_process(self, name: str, target: Optional[Callable[..., Any]] = None, args: Optional[Iterable[Any]] = None, kwargs: Optional[Mapping[str, Any]] = None) \
             -> Union[threading.Thread, multiprocessing.Process]:
-        return multiprocessing.Process(name=name, target=target, args=args or (), kwargs=kwargs or {})
+        return get_process_context().Process(name=name, target=target, args=args or (), kwargs=kwargs or {})
 
     def create_event(self) -> EventType:
         return ProcessEvent()
@@ -0,0 +1,197 @@
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from logging import Handler, LogRecord
+from threading import Condition, Thread
+from typing import Any, Deque, List
+
+from puma.helpers.string import safe_str
+
+# The most records that may wait for each handler's writer thread. Beyond this, records are dropped.
+DEFAULT_WRITER_BUFFER_SIZE = 10000
+
+# The longest time (in seconds) that written records may wait in a stream's buffer before the stream is flushed
+DEFAULT_WRITER_FLUSH_INTERVAL = 0.1
+
+# Records at this level or higher are flushed as soon as they are written
+_FLUSH_LEVEL = logging.ERROR
+
+# The emit methods of the standard handlers that write formatted records to a stream. Compared by name, because the logging module may have been reloaded.
+_STREAM_EMIT = "StreamHandler.emit"
+_FILE_EMIT = "FileHandler.emit"
+_ROTATING_FILE_EMIT = "BaseRotatingHandler.emit"
+
+
+@dataclass(frozen=True)
+class LogWriterOptions:
+    """Options for the writer threads of the log listener process (see AsynchronousHandler). These may be given in the "log_writers" section of a logging
+    configuration file, for example::
+        log_writers:
+          buffer_size: 10000
+          flush_interval: 0.1
+    """
+    buffer_size: int = DEFAULT_WRITER_BUFFER_SIZE
+    flush_interval: float = DEFAULT_WRITER_FLUSH_INTERVAL
+
+    def __post_init__(self) -> None:
+        if self.buffer_size < 1:
+            raise ValueError("The writer buffer size must be at least 1")
+        if self.flush_interval < 0.0:
+            raise ValueError("The writer flush interval must not be negative")
+
+
+class AsynchronousHandler(Handler):
+    """Stands in for a handler in the log listener process, so that a slow destination (such as a file on a slow disk, or a terminal) does not hold up the listener,
+    and through it the logging queue. Records given to this handler are passed to the target handler by a writer thread; the target's level and filters still apply.
+
+    At most the buffer size of records wait for the writer thread; beyond this, records are dropped, and the writer then passes on a warning record saying how many.
+
+    The writer thread passes on all the records waiting for it at once. If the target is one of the standard handlers that write to a stream (StreamHandler,
+    FileHandler or a rotating file handler) the records are formatted and written to the stream together, and the stream is flushed once the flush interval has
+    passed, or at once if an error is written, rather than after every record. Other targets are given one record at a time.
+
+    stop() must be called to write and flush the remaining records.
+    """
+
+    def __init__(self, target: Handler, options: LogWriterOptions) -> None:
+        super().__init__(target.level)
+        self._target = target
+        self._options = options
+        self._condition = Condition()
+        self._buffer: Deque[LogRecord] = deque()
+        self._dropped_count = 0
+        self._flush_requested = False
+        self._stopping = False
+        self._writer = Thread(target=self._writer_run, name=f"Log writer for {safe_str(target)}", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def wrap(handler: Handler, options: LogWriterOptions) -> Handler:
+        """Returns an AsynchronousHandler for the given handler, or the handler itself if it is a QueueHandler, which does not write and so does not need one."""
+        if any(base.__name__ == "QueueHandler" for base in type(handler).__mro__):
+            return handler
+        return AsynchronousHandler(handler, options)
+
+    @property
+    def target(self) -> Handler:
+        return self._target
+
+    def handle(self, record: LogRecord) -> None:
+        # Called by the listener thread. The target's filters are applied by the writer thread.
+        with self._condition:
+            if len(self._buffer) >= self._options.buffer_size:
+                self._dropped_count += 1
+                return
+            self._buffer.append(record)
+            if len(self._buffer) == 1:
+                self._condition.notify()
+
+    def emit(self, record: LogRecord) -> None:
+        self.handle(record)
+
+    def flush(self) -> None:
+        """Asks the writer thread to flush the target, without waiting for it to do so."""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Writes and flushes the remaining records, and ends the writer thread."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._writer.join()
+
+    def close(self) -> None:
+        self.stop()
+        self._target.close()
+        super().close()
+
+    def _writer_run(self) -> None:
+        last_flush = time.monotonic()
+        unflushed = False
+        while True:
+            with self._condition:
+                while not self._buffer and not self._stopping and not self._flush_requested:
+                    if not unflushed:
+                        self._condition.wait()
+                        continue
+                    remaining = last_flush + self._options.flush_interval - time.monotonic()
+                    if remaining <= 0.0:
+                        break
+                    self._condition.wait(remaining)
+                records = list(self._buffer)
+                self._buffer.clear()
+                dropped_count, self._dropped_count = self._dropped_count, 0
+                flush_requested, self._flush_requested = self._flush_requested, False
+                stopping = self._stopping
+
+            if dropped_count:
+                records.append(self._make_dropped_summary(dropped_count))
+            if records:
+                self._write(records)
+                unflushed = True
+            now = time.monotonic()
+            if unflushed and (stopping or flush_requested or now >= last_flush + self._options.flush_interval or any(r.levelno >= _FLUSH_LEVEL for r in records)):
+                self._flush_target()
+                last_flush = now
+                unflushed = False
+            if stopping:
+                return
+
+    def _write(self, records: List[LogRecord]) -> None:
+        emit_name = getattr(type(self._target).emit, "__qualname__", "")
+        if emit_name in (_STREAM_EMIT, _FILE_EMIT, _ROTATING_FILE_EMIT):
+            self._write_to_stream(records, rotating=emit_name == _ROTATING_FILE_EMIT)
+        else:
+            for record in records:
+                self._target.handle(record)
+
+    def _write_to_stream(self, records: List[LogRecord], *, rotating: bool) -> None:
+        # Does what the target's emit() would do for each record, except that the stream is not flushed, and that, unless the target might roll over to a new file
+        # (which it decides from the stream's current position), the records are written with a single call
+        target: Any = self._target
+        chunks: List[str] = []
+        target.acquire()
+        try:
+            for record in records:
+                try:
+                    if not target.filter(record):
+                        continue
+                    if rotating and target.shouldRollover(record):
+                        target.doRollover()
+                    chunks.append(target.format(record) + target.terminator)
+                    if rotating:
+                        self._write_chunks(chunks)
+                except Exception:
+                    target.handleError(record)
+            self._write_chunks(chunks)
+        except Exception:
+            target.handleError(records[-1])
+        finally:
+            target.release()
+
+    def _write_chunks(self, chunks: List[str]) -> None:
+        # Called with the target's lock held
+        if not chunks:
+            return
+        target: Any = self._target
+        if target.stream is None:  # A FileHandler which delays opening its file until the first record
+            target.stream = target._open()
+        target.stream.write("".join(chunks))
+        chunks.clear()
+
+    def _flush_target(self) -> None:
+        try:
+            self._target.flush()
+        except Exception as ex:
+            print(f"Error flushing log handler {safe_str(self._target)}: {safe_str(ex)}")  # Can't log here!
+
+    def _make_dropped_summary(self, dropped_count: int) -> LogRecord:
+        return logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': logging.getLevelName(logging.WARNING),
+            'msg': f"{dropped_count} log records dropped because the writer for {safe_str(self._target)} could not keep up",
+        })
@@ -0,0 +1,204 @@
+import logging
+import os
+import queue
+import time
+from logging import LogRecord
+from logging.handlers import QueueHandler
+from multiprocessing import util  # type: ignore  # util is missing from typeshed
+from queue import Queue
+from threading import Condition, Thread
+from typing import Any, List, Optional, Union
+
+# A batch is sent when it holds this many records
+DEFAULT_MAX_BATCH_SIZE = 100
+
+# A batch is sent when its first record has waited this long (in seconds). This must be well under the time that CaptureLogs waits for records to arrive.
+DEFAULT_MAX_BATCH_DELAY = 0.01
+
+# Records at this level or higher are sent at once, with any records batched before them, so that they are not lost if the process then dies
+DEFAULT_FLUSH_LEVEL = logging.ERROR
+
+# The most records that are held while the queue is full. Beyond this, records are dropped: debug records first, then the oldest.
+DEFAULT_MAX_BACKLOG = 10000
+
+# Records saying how many records were dropped are sent no more often than this (in seconds)
+DEFAULT_DROPPED_SUMMARY_INTERVAL = 5.0
+
+# Batches are sent when the process exits, before the logging queue's own finalizers (priority 10) close it
+_EXIT_PRIORITY = 20
+
+# An item on the logging queue: a single record, or a batch of records sent by BatchingQueueHandler
+LogQueueItem = Union[LogRecord, List[LogRecord]]
+
+
+class BatchingQueueHandler(QueueHandler):
+    """A QueueHandler which puts records on the queue in batches (lists of records), so that a process that logs heavily pickles and sends one message per batch
+    rather than one per record. Used by child processes to send their records to the log listener process.
+
+    A batch is sent when it is full, when its first record has waited for the maximum delay, when a record at the flush level or higher is handled, and when the
+    handler is flushed or closed or the process exits. Records are sent in the order they were handled. A background thread sends batches that are not filled in time.
+
+    Logging never blocks. If the queue is full (see ManagedProcessLogQueue), records are held and sending is retried after the maximum delay. If more than the
+    maximum backlog of records are held, the backlog is cut to nine tenths of its maximum size by dropping debug records, oldest first, and then the oldest records.
+    The number of records dropped by the process is counted, and a warning record saying how many were dropped is sent with the next batch, at most once per
+    summary interval.
+    """
+
+    def __init__(self, queue: 'Queue[Any]', max_batch_size: int = DEFAULT_MAX_BATCH_SIZE, max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY,
+                 flush_level: int = DEFAULT_FLUSH_LEVEL, max_backlog: int = DEFAULT_MAX_BACKLOG,
+                 dropped_summary_interval: float = DEFAULT_DROPPED_SUMMARY_INTERVAL) -> None:
+        if max_batch_size < 1:
+            raise ValueError("The maximum batch size must be at least 1")
+        if max_batch_delay <= 0.0:
+            raise ValueError("The maximum batch delay must be greater than zero")
+        if max_backlog < max_batch_size:
+            raise ValueError("The maximum backlog must be at least the maximum batch size")
+        if dropped_summary_interval < 0.0:
+            raise ValueError("The dropped records summary interval must not be negative")
+        super().__init__(queue)
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        self._flush_level = flush_level
+        self._max_backlog = max_backlog
+        self._dropped_summary_interval = dropped_summary_interval
+        self._reset()
+
+    def _reset(self) -> None:
+        # (Re)initialises the state belonging to the current process. Called when constructed, and in a forked child, where the lock may have been held by a thread
+        # that does not exist in the child.
+        self._pid = os.getpid()
+        self._condition = Condition()
+        self._batch: List[LogRecord] = []
+        self._batch_start = 0.0  # When the first record in the batch arrived, or, if the queue was full, when sending was last tried
+        self._queue_full = False
+        self._dropped_count = 0
+        self._dropped_since_summary = 0
+        self._last_summary_time = 0.0
+        self._closed = False
+        self._flusher: Optional[Thread] = None
+        self._finalizer: Optional[Any] = None
+
+    def emit(self, record: LogRecord) -> None:
+        try:
+            prepared = self.prepare(record)
+            self._ensure_owned_by_this_process()
+            with self._condition:
+                if not self._batch:
+                    self._batch_start = time.monotonic()
+                    self._condition.notify()
+                self._batch.append(prepared)
+                if record.levelno >= self._flush_level or (len(self._batch) >= self._max_batch_size and not self._queue_full):
+                    self._send_batch()
+                if len(self._batch) > self._max_backlog:
+                    self._drop_records()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        if self._pid != os.getpid():
+            return  # Inherited when forked; the records belong to the parent, which will send them
+        with self._condition:
+            self._send_batch(force_summary=True)
+
+    def close(self) -> None:
+        self.flush()
+        if self._pid == os.getpid():
+            with self._condition:
+                self._closed = True
+                self._condition.notify()
+            if self._finalizer:
+                self._finalizer.cancel()
+                self._finalizer = None
+        super().close()
+
+    def get_dropped_count(self) -> int:
+        """Returns the number of records dropped by this process because the queue was full."""
+        if self._pid != os.getpid():
+            return 0
+        with self._condition:
+            return self._dropped_count
+
+    def _ensure_owned_by_this_process(self) -> None:
+        # Starts the background thread, and registers to send the last batch when the process exits, on first use in each process
+        if self._pid != os.getpid():
+            self._reset()
+        if self._flusher is None:
+            self._flusher = Thread(target=self._flusher_run, name="Log batch flusher", daemon=True)
+            self._flusher.start()
+            # Child processes do not call logging.shutdown() on exit, but do run multiprocessing's finalizers
+            self._finalizer = util.Finalize(self, BatchingQueueHandler.flush, args=(self,), exitpriority=_EXIT_PRIORITY)
+
+    def _flusher_run(self) -> None:
+        condition = self._condition  # Not self._condition, which is replaced if the process forks
+        with condition:
+            while not self._closed:
+                due = self._get_due_time()
+                if due is None:
+                    condition.wait()
+                    continue
+                remaining = due - time.monotonic()
+                if remaining > 0.0:
+                    condition.wait(remaining)
+                    continue
+                self._send_batch()
+
+    def _get_due_time(self) -> Optional[float]:
+        # Called with the condition's lock held. Returns when the background thread should next send, or None if there is nothing to send.
+        due = self._batch_start + self._max_batch_delay if self._batch else None
+        if self._dropped_since_summary and not self._queue_full:
+            summary_due = self._last_summary_time + self._dropped_summary_interval
+            due = summary_due if due is None else min(due, summary_due)
+        return due
+
+    def _send_batch(self, *, force_summary: bool = False) -> None:
+        # Called with the condition's lock held. Sends the held records, in batches of at most the maximum size. If the queue is full, the records that have not
+        # been sent are kept, to be retried after the maximum delay. If a batch cannot be sent for any other reason it is discarded, and the error reported.
+        while self._batch or self._is_summary_due(force_summary):
+            batch = self._batch[:self._max_batch_size]
+            summary = self._make_dropped_summary() if self._is_summary_due(force_summary) else None
+            items = [summary] + batch if summary else batch
+            try:
+                self.enqueue(items)  # type: ignore  # The queue carries batches as well as single records
+            except queue.Full:
+                self._queue_full = True
+                self._batch_start = time.monotonic()
+                return
+            except Exception:
+                self.handleError(items[0])
+            self._queue_full = False
+            del self._batch[:len(batch)]
+            if summary:
+                self._dropped_since_summary = 0
+                self._last_summary_time = time.monotonic()
+
+    def _is_summary_due(self, force: bool) -> bool:
+        return self._dropped_since_summary > 0 and (force or time.monotonic() >= self._last_summary_time + self._dropped_summary_interval)
+
+    def _drop_records(self) -> None:
+        # Called with the condition's lock held, when the backlog is too long. Drops debug records, oldest first, and then the oldest records. The backlog is cut to
+        # nine tenths of its maximum size, so that this is not done for every record logged while the queue remains full.
+        excess = len(self._batch) - max(1, self._max_backlog * 9 // 10)
+        kept: List[LogRecord] = []
+        dropped = 0
+        for record in self._batch:
+            if dropped < excess and record.levelno <= logging.DEBUG:
+                dropped += 1
+            else:
+                kept.append(record)
+        if dropped < excess:
+            del kept[:excess - dropped]
+            dropped = excess
+        self._batch = kept
+        self._dropped_count += dropped
+        self._dropped_since_summary += dropped
+
+    def _make_dropped_summary(self) -> LogRecord:
+        # The record is created in the process that dropped the records, so its process name and ID say which process dropped them
+        record = logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': logging.getLevelName(logging.WARNING),
+            'msg': f"{self._dropped_since_summary} log records dropped because the logging queue was full ({self._dropped_count} dropped by this process in total)",
+        })
+        prepared: LogRecord = self.prepare(record)
+        return prepared
@@ -2,16 +2,25 @@ import logging
 from logging import LogRecord
 from logging.handlers import QueueHandler, QueueListener
 from multiprocessing import Process
+from typing import Any, Dict
 
 from puma.buffer.implementation.managed_queues import ManagedProcessQueue
 from puma.logging import Logging
+from puma.logging.child_process_logging.asynchronous_handler import AsynchronousHandler
+from puma.logging.child_process_logging.batching_queue_handler import LogQueueItem
 from puma.logging.child_process_logging.current_logging_configuration import LogListenerProcessConfiguration
 from puma.primitives import ProcessEvent
+from puma.process_context import start_process_using
 
 
 class LogListenerProcess(Process):
     """This process is started by ProcessLoggingMechanism. It receives log records on a queue and logs them as described by the current logging configuration.
 
+    Child processes send their records in batches (see BatchingQueueHandler); each batch is handled in one go.
+
+    Each of the configured handlers is given a writer thread (see AsynchronousHandler), so that the thread receiving records from the queue is not held up by a slow
+    destination. The writer threads' options are given in the "log_writers" section of the logging configuration.
+
     This process will be started by the logging mechanism if any ProcessRunner is executed. It takes over logging, both from child processes and from the main process,
     so that logging is managed and so that logging to files can succeed without multiple processes trying to open the same files.
     """
@@ -21,10 +30,18 @@ class LogListenerProcess(Process):
             self._unpause_event = unpause_event
             super().__init__(queue)
 
-        def handle(self, record: LogRecord) -> None:
+        def handle(self, record: LogQueueItem) -> None:  # Receives batches of records as well as single records
+            # The pause event is checked once per item, which may be a whole batch of records
             self._unpause_event.wait()
-            logger = logging.getLogger(record.name)
-            logger.handle(record)
+            if isinstance(record, list):
+                loggers: Dict[str, logging.Logger] = {}
+                for batched_record in record:
+                    logger = loggers.get(batched_record.name)
+                    if logger is None:
+                        logger = loggers[batched_record.name] = logging.getLogger(batched_record.name)
+                    logger.handle(batched_record)
+            else:
+                logging.getLogger(record.name).handle(record)
 
     def __init__(self, logging_queue: ManagedProcessQueue[LogRecord], logging_config: LogListenerProcessConfiguration) -> None:
         super().__init__(name="Log Listener")
@@ -37,6 +54,8 @@ class LogListenerProcess(Process):
 
     def run(self) -> None:
         Logging.init_log_listener_process_logging(self._logging_config)
+        writer_options = Logging.get_log_writer_options()
+        handlers = Logging.replace_handlers(lambda handler: AsynchronousHandler.wrap(handler, writer_options))
 
         q_listener = QueueListener(self._q, LogListenerProcess.MyHandler(self._q, self._unpause_event))
         q_listener.start()
@@ -48,6 +67,13 @@ class LogListenerProcess(Process):
         # End
         self.resume()
         q_listener.stop()
+        for handler in handlers:
+            if isinstance(handler, AsynchronousHandler):
+                handler.stop()  # Writes and flushes the remaining records
+
+    def _Popen(self, process_obj: Any) -> Any:
+        # Start the process using the same context that its events and queue were created from, rather than the multiprocessing module's default
+        return start_process_using(process_obj)
 
     def start_blocking(self) -> None:
         self.start()
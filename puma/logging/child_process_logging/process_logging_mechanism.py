@@ -40,6 +40,7 @@ class ProcessLoggingMechanism:
             raise RuntimeError("Internal error: Process Logging Mechanism being stopped in a child process")
 
         logger.debug('Stopping log listener and restoring main process logging ...')
+        Logging.flush_handlers()  # Sends any batched records while the listener is still there to receive them
         self._log_listener_process.stop()
         self._log_listener_process.join(10.0)
         if self._log_listener_process.is_alive():
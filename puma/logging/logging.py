@@ -7,7 +7,7 @@ import os
 import sys
 from logging import LogRecord
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Set, Union, cast, no_type_check
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Union, cast, no_type_check
 
 import yaml
 
@@ -15,6 +15,8 @@ from puma.buffer.implementation.managed_queues import ManagedProcessQueue
 from puma.helpers.class_name import get_class_fully_qualified_name, get_fully_qualified_name
 from puma.helpers.string import safe_str
 from puma.logging import LogLevel
+from puma.logging.child_process_logging.asynchronous_handler import LogWriterOptions
+from puma.logging.child_process_logging.batching_queue_handler import BatchingQueueHandler
 from puma.logging.child_process_logging.child_process_configuration import ChildProcessConfiguration
 from puma.logging.child_process_logging.current_logging_configuration import CurrentLoggingConfiguration, LogListenerProcessConfiguration
 from puma.primitives import ThreadRLock
@@ -86,6 +88,7 @@ class Logging:
     __history: CurrentLoggingConfiguration = CurrentLoggingConfiguration()
     __logger_dict: Optional[Dict[str, Any]] = None  # cached reference to logging dictionary
     __pre_reset_loggers: Set[logging.Logger] = set()  # loggers that existed before we reset the logging system, so we can modify them when settings change
+    __log_writer_options = LogWriterOptions()  # options for the log listener process's writer threads, from the "log_writers" section of the configuration
 
     @classmethod
     def init_logging(cls, config_filename: str = DEFAULT_LOG_FILE) -> None:
@@ -174,6 +177,34 @@ class Logging:
             cls._make_existing_loggers_act_as_currently_configured(cls.__pre_reset_loggers)
             cls.__history.clear()
 
+    @classmethod
+    def flush_handlers(cls) -> None:
+        """Flushes all the current handlers, so that, for example, records batched to be sent to the log listener process are sent now."""
+        with cls.__lock:
+            for handler in cls._get_all_current_handlers():
+                handler.flush()
+
+    @classmethod
+    def get_log_writer_options(cls) -> LogWriterOptions:
+        """Returns the options for the writer threads of the log listener process, given in the "log_writers" section of the logging configuration."""
+        with cls.__lock:
+            return cls.__log_writer_options
+
+    @classmethod
+    def replace_handlers(cls, replacement: Callable[[logging.Handler], logging.Handler]) -> List[logging.Handler]:
+        """Replaces each handler of the current loggers with the handler returned by the given function, which is called once for each handler, however many
+        loggers use it. Returns the new handlers. Used by the log listener process to give its handlers writer threads."""
+        with cls.__lock:
+            replacements: Dict[logging.Handler, logging.Handler] = {}
+            for logger in cls._get_current_loggers():
+                handlers = cls._get_logger_handlers(logger)
+                for i, handler in enumerate(handlers):
+                    if handler not in replacements:
+                        replacements[handler] = replacement(handler)
+                    handlers[i] = replacements[handler]
+            cls._make_existing_loggers_act_as_currently_configured(cls.__pre_reset_loggers)
+            return list(replacements.values())
+
     @classmethod
     def init_child_process_logging(cls, logging_process_config: ChildProcessConfiguration) -> None:
         """Used by child processes, which log to a queue. Applies the configuration returned by get_child_process_logging_config()."""
@@ -390,6 +421,7 @@ class Logging:
         logging.shutdown()
         importlib.reload(logging)
         cls.__logger_dict = None  # force the cache to reload
+        cls.__log_writer_options = LogWriterOptions()
 
     @classmethod
     def add_memory_log_handler_impl(cls, capture_queue: ManagedProcessQueue, level: LogLevel) -> str:
@@ -443,7 +475,7 @@ class Logging:
     @classmethod
     def get_child_process_logging_config_impl(cls, logging_queue: ManagedProcessQueue[LogRecord]) -> Dict[str, Any]:
         # Returns the configuration to be used by child processes. This is the same as the current configuration, except that
-        # the log handlers are removed and replaced with a single QueueHandler. This ensures that logging is filtered at source,
+        # the log handlers are removed and replaced with a single BatchingQueueHandler. This ensures that logging is filtered at source,
         # so that log records are only put on the queue if they are going to get logged.
         loggers = cls._get_current_loggers(including_root=False)
         root_logger = logging.getLogger('')
@@ -453,7 +485,7 @@ class Logging:
             'disable_existing_loggers': False,
             'handlers': {
                 'queue': {
-                    'class': 'logging.handlers.QueueHandler',
+                    'class': get_class_fully_qualified_name(BatchingQueueHandler),
                     'queue': logging_queue
                 },
             },
@@ -478,7 +510,10 @@ class Logging:
     def _apply_dictionary_config(cls, config: Dict[str, Any]) -> None:
         cls._ensure_basic_logging_sections_present(config)
         cls._create_directories_for_configured_log_files(config)
-        logging.config.dictConfig(config)
+        log_writer_options = LogWriterOptions(**config['log_writers']) if 'log_writers' in config else None  # Checked before the configuration is applied
+        logging.config.dictConfig(config)  # Ignores the "log_writers" section
+        if log_writer_options:
+            cls.__log_writer_options = log_writer_options
 
     @classmethod
     def _get_current_loggers(cls, *, including_root: bool = True) -> List[logging.Logger]:
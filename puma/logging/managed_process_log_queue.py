@@ -1,8 +1,11 @@
 from logging import LogRecord
-from typing import Union
+from typing import List, Union
 
 from puma.buffer.implementation.managed_queues import ManagedProcessQueue
 
+# The size of the logging queue used by ProcessRunner, in items. Most items are batches of records (see BatchingQueueHandler), so this is many more records.
+DEFAULT_LOG_QUEUE_SIZE = 1000
+
 
 class ManagedProcessLogQueue(ManagedProcessQueue[LogRecord]):
     """Derived ManagedProcessQueue specifically for logging.
@@ -10,9 +13,13 @@ class ManagedProcessLogQueue(ManagedProcessQueue[LogRecord]):
     The difference from the base class is:
       - If put() is called outside of context management, this is silently ignored, rather than causing an error as it would normally.
         This preventing a live-lock situation where an error is constantly logged, which prevents the queue being cleaned up.
+      - As well as single records, it carries batches (lists) of records, sent by BatchingQueueHandler.
+
+    The queue may be bounded by giving a maxsize. Records are put on it without blocking, so when a bounded queue is full, processes logging to it are not stalled:
+    BatchingQueueHandler holds their records until there is space, and drops records if too many are held.
     """
 
-    def put(self, obj: LogRecord, block: bool = True, timeout: Union[int, float, None] = None) -> None:
+    def put(self, obj: Union[LogRecord, List[LogRecord]], block: bool = True, timeout: Union[int, float, None] = None) -> None:
         if not self._in_context_management:
             # Silently discard  - don't log here!
             return
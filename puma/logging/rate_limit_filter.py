@@ -0,0 +1,162 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import LogRecord
+from typing import List, Optional, Tuple
+
+from puma.primitives import ThreadLock
+
+# The number of times a message may be logged at once, before it is limited to the rate
+DEFAULT_BURST = 10
+
+# The number of times per second a message may be logged, once its burst has been used up
+DEFAULT_RATE = 1.0
+
+# Records saying how many messages were suppressed are logged no more often than this (in seconds), for each message
+DEFAULT_SUMMARY_INTERVAL = 10.0
+
+# The most messages that are tracked at once. When there are more, the one logged least recently is forgotten.
+DEFAULT_MAX_KEYS = 1000
+
+# Set on the records that report suppressed messages, which are never themselves suppressed
+_SUMMARY_ATTRIBUTE = "rate_limit_summary"
+
+_Key = Tuple[str, str]
+
+
+@dataclass
+class _Bucket:
+    # The token bucket, and the suppressed records, for one message
+    tokens: float
+    updated: float
+    last_summary: float
+    over_limit: int = 0  # The number of records logged while the bucket was empty, whether suppressed or let through as samples
+    suppressed: int = 0  # The number of records suppressed since the last summary
+    suppressed_since: float = 0.0
+    suppressed_level: int = logging.NOTSET
+    last_suppressed: Optional[LogRecord] = None
+
+
+class RateLimitFilter(logging.Filter):
+    """A logging filter which stops a message that is logged repeatedly from flooding the log. Each message, identified by its logger and message template
+    (the message before its arguments are substituted), may be logged "burst" times at once, and then "rate" times per second; this is a token bucket. Records beyond
+    this are suppressed, except that, if "sample_every" is given, one in that many of them is let through.
+
+    When a message has been suppressed, a record is logged saying "Suppressed N similar messages", at the level of the suppressed records, no more often than once
+    per summary interval. It is logged while the filter is in use: when the message is next logged, or when any other record is filtered.
+
+    The filter is intended to be attached to handlers, for example in a YAML configuration file used with Logging.init_logging()::
+        filters:
+          rate_limit:
+            (): puma.logging.rate_limit_filter.RateLimitFilter
+            burst: 10
+            rate: 1.0
+        handlers:
+          console:
+            filters: ['rate_limit']
+
+    The same filter may be attached to several handlers; a record is counted once, however many of them filter it. The summary records are logged to the suppressed
+    records' logger, so they reach all of its handlers. When child processes are run by ProcessRunner, handlers' filters are applied by the log listener process.
+    """
+
+    def __init__(self, burst: int = DEFAULT_BURST, rate: float = DEFAULT_RATE, sample_every: int = 0, summary_interval: float = DEFAULT_SUMMARY_INTERVAL,
+                 max_keys: int = DEFAULT_MAX_KEYS) -> None:
+        """Constructor.
+
+        burst: The number of times a message may be logged at once.
+        rate: The number of times per second a message may be logged, once its burst has been used up.
+        sample_every: If not zero, one in this many records that exceed the rate is let through.
+        summary_interval: The shortest time, in seconds, between records reporting how many times a message was suppressed.
+        max_keys: The most messages that are tracked at once.
+        """
+        if burst < 1:
+            raise ValueError("The burst must be at least 1")
+        if rate <= 0.0:
+            raise ValueError("The rate must be greater than zero")
+        if sample_every < 0:
+            raise ValueError("The sampling interval must not be negative")
+        if summary_interval < 0.0:
+            raise ValueError("The summary interval must not be negative")
+        if max_keys < 1:
+            raise ValueError("The maximum number of keys must be at least 1")
+        super().__init__()
+        self._burst = burst
+        self._rate = rate
+        self._sample_every = sample_every
+        self._summary_interval = summary_interval
+        self._max_keys = max_keys
+        self._decision_attribute = f"_rate_limit_filter_{id(self)}"  # Records the decision on a record, in case it reaches another handler with the same filter
+        self._lock = ThreadLock()
+        self._buckets: 'OrderedDict[_Key, _Bucket]' = OrderedDict()  # Ordered from least to most recently logged
+        self._next_scan = time.monotonic() + summary_interval
+
+    def filter(self, record: LogRecord) -> bool:
+        if getattr(record, _SUMMARY_ATTRIBUTE, False):
+            return True
+        decision = record.__dict__.get(self._decision_attribute)
+        if decision is not None:
+            return bool(decision)
+        summaries: List[LogRecord] = []
+        now = time.monotonic()
+        with self._lock:
+            allowed = self._allow(record, now, summaries)
+            if now >= self._next_scan:
+                self._next_scan = now + self._summary_interval
+                for bucket in self._buckets.values():
+                    self._add_summary_if_due(bucket, now, summaries)
+        record.__dict__[self._decision_attribute] = allowed
+        for summary in summaries:
+            # Logged without the lock, because the summary is filtered by this filter (and let through)
+            logging.getLogger(summary.name).handle(summary)
+        return allowed
+
+    def _allow(self, record: LogRecord, now: float, summaries: List[LogRecord]) -> bool:
+        # Called with the lock held. Returns whether the record is let through.
+        key = (record.name, str(record.msg))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(tokens=float(self._burst), updated=now, last_summary=now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self._max_keys:
+                _, forgotten = self._buckets.popitem(last=False)
+                self._add_summary_if_due(forgotten, now, summaries, force=True)
+        else:
+            self._buckets.move_to_end(key)
+            bucket.tokens = min(float(self._burst), bucket.tokens + (now - bucket.updated) * self._rate)
+            bucket.updated = now
+
+        if bucket.tokens >= 1.0:
+            bucket.tokens -= 1.0
+            allowed = True
+        else:
+            bucket.over_limit += 1
+            allowed = bool(self._sample_every) and bucket.over_limit % self._sample_every == 0
+            if not allowed:
+                if not bucket.suppressed:
+                    bucket.suppressed_since = now
+                bucket.suppressed += 1
+                bucket.suppressed_level = max(bucket.suppressed_level, record.levelno)
+                bucket.last_suppressed = record
+        self._add_summary_if_due(bucket, now, summaries)
+        return allowed
+
+    def _add_summary_if_due(self, bucket: _Bucket, now: float, summaries: List[LogRecord], *, force: bool = False) -> None:
+        # Called with the lock held
+        if not bucket.suppressed or not bucket.last_suppressed or (not force and now < bucket.last_summary + self._summary_interval):
+            return
+        attributes = dict(bucket.last_suppressed.__dict__)
+        for name in ('created', 'msecs', 'relativeCreated', 'exc_info', 'exc_text', 'stack_info', self._decision_attribute):
+            attributes.pop(name, None)  # So that the summary is timestamped when it is made, and does not repeat an exception
+        attributes.update({
+            'msg': "Suppressed %d similar messages in the last %.1f seconds: %s",
+            'args': (bucket.suppressed, now - bucket.suppressed_since, bucket.last_suppressed.getMessage()),
+            'levelno': bucket.suppressed_level,
+            'levelname': logging.getLevelName(bucket.suppressed_level),
+            _SUMMARY_ATTRIBUTE: True,
+        })
+        summaries.append(logging.makeLogRecord(attributes))
+        bucket.suppressed = 0
+        bucket.suppressed_level = logging.NOTSET
+        bucket.last_suppressed = None
+        bucket.last_summary = now
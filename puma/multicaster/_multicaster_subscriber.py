@@ -1,8 +1,9 @@
 import logging
 import queue
-from typing import Dict, Optional, TypeVar
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Generic, Hashable, Optional, Tuple, TypeVar
 
-from puma.buffer import Publisher, Subscriber
+from puma.buffer import DEFAULT_PUBLISH_COMPLETE_TIMEOUT, Publisher, SerializedValue, Subscriber
 from puma.helpers.string import safe_str
 from puma.primitives import ThreadLock
 from puma.timeouts import TIMEOUT_NO_WAIT
@@ -13,76 +14,121 @@ Type = TypeVar("Type")
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class _Subscription(Generic[Type]):
+    publisher: Publisher[Type]
+    on_full_action: UnexpectedSituationAction
+    routing_keys: Optional[FrozenSet[Hashable]]  # If given, only values with one of these keys are sent
+    predicate: Optional[Callable[[Type], bool]]  # If given, only values for which this returns True are sent
+
+
+@dataclass(frozen=True)
+class _SubscriptionTable(Generic[Type]):
+    # An immutable snapshot of the subscriptions, replaced whenever a subscription is added or removed, so that items can be sent without taking a lock.
+    # Each tuple is in the order in which the subscriptions were made. The dictionary is never modified once the table has been built.
+    all: Tuple[_Subscription[Type], ...]
+    by_key: Dict[Hashable, Tuple[_Subscription[Type], ...]]  # The candidate subscriptions for a value with each routing key that a subscription has asked for
+    others: Tuple[_Subscription[Type], ...]  # The candidate subscriptions for any other value: those without routing keys
+
+    @staticmethod
+    def build(subscriptions: Tuple[_Subscription[Type], ...]) -> '_SubscriptionTable[Type]':
+        keys = {key for subscription in subscriptions if subscription.routing_keys for key in subscription.routing_keys}
+        by_key = {key: tuple(s for s in subscriptions if s.routing_keys is None or key in s.routing_keys) for key in keys}
+        return _SubscriptionTable(subscriptions, by_key, tuple(s for s in subscriptions if s.routing_keys is None))
+
+
 class _MulticasterSubscriber(Subscriber[Type]):
-    """A subscriber used by the multicaster. Copies items to its subscribing buffers.
+    """A subscriber used by the multicaster, and by MulticastPublisher. Copies items to its subscribing buffers.
 
     If there are no subscribers then received items are discarded.
     The behaviour if a subscribing buffer is full depends on the option given when subscribing that buffer.
+    Each item is pickled at most once, however many of the subscribing buffers carry it across a process boundary; buffers within the process are given the item itself.
     """
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, key_function: Optional[Callable[[Type], Hashable]] = None) -> None:
         super().__init__()
         self._name = name
-        self._publishers: Dict[Publisher[Type], UnexpectedSituationAction] = dict()
-        self._publishers_lock: ThreadLock = ThreadLock()
+        self._key_function = key_function
+        self._table: _SubscriptionTable[Type] = _SubscriptionTable.build(())
+        self._table_lock: ThreadLock = ThreadLock()  # Serialises changes to the table; not needed to read it
 
-    def subscribe(self, publisher: Publisher[Type], on_full_action: UnexpectedSituationAction) -> None:
+    def subscribe(self, publisher: Publisher[Type], on_full_action: UnexpectedSituationAction, *,
+                  routing_keys: Optional[FrozenSet[Hashable]] = None, predicate: Optional[Callable[[Type], bool]] = None) -> None:
         # For comments see Multicaster.subscribe()
         if not publisher:
             raise ValueError("Publisher must be supplied")
         if not on_full_action:
             raise ValueError("on_full_action must be supplied")
-        with self._publishers_lock:
-            if publisher in self._publishers:
+        if routing_keys is not None and not self._key_function:
+            raise ValueError("Routing keys can only be used if the multicaster was given a key function")
+        with self._table_lock:
+            if any(subscription.publisher == publisher for subscription in self._table.all):
                 raise RuntimeError("Publisher is already subscribed")
             logger.debug("%s: Subscribing buffer '%s'", self._name, publisher.buffer_name())
-            self._publishers[publisher] = on_full_action
+            self._table = _SubscriptionTable.build(self._table.all + (_Subscription(publisher, on_full_action, routing_keys, predicate),))
 
     def unsubscribe(self, publisher: Publisher[Type]) -> None:
         if not publisher:
             raise ValueError("Publisher must be supplied")
-        with self._publishers_lock:
+        with self._table_lock:
             logger.debug("%s: Unsubscribing buffer '%s'", self._name, publisher.buffer_name())
-            if publisher not in self._publishers:
+            remaining = tuple(subscription for subscription in self._table.all if subscription.publisher != publisher)
+            if len(remaining) == len(self._table.all):
                 raise RuntimeError("Publisher is not subscribed")
-            del self._publishers[publisher]
+            self._table = _SubscriptionTable.build(remaining)
 
     def on_value(self, value: Type) -> None:
-        subscriptions_copy = self._get_copy_of_subscriptions()
-        if subscriptions_copy:
-            for subscription, on_full_action in subscriptions_copy.items():
-                logger.debug("%s: Pushing item '%s' to buffer '%s'", self._name, str(value), subscription.buffer_name())
-                try:
-                    subscription.publish_value(value, TIMEOUT_NO_WAIT, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
-                except queue.Full:
-                    self._handle_buffer_full_exception(on_full_action, subscription)
-        else:
-            logger.debug("%s: Discarding item '%s' - no subscribers", self._name, str(value))
+        self.publish_value_to_subscribers(value, TIMEOUT_NO_WAIT)
 
     def on_complete(self, error: Optional[BaseException]) -> None:
-        subscriptions_copy = self._get_copy_of_subscriptions()
-        if subscriptions_copy:
-            for subscription, on_full_action in subscriptions_copy.items():
-                logger.debug("%s: Pushing Completion (with error '%s') to buffer '%s'", self._name, safe_str(error), subscription.buffer_name())
+        self.publish_complete_to_subscribers(error, DEFAULT_PUBLISH_COMPLETE_TIMEOUT)
+
+    def publish_value_to_subscribers(self, value: Type, timeout: float) -> None:
+        # Publishes the value to the subscribers that want it, each with the given timeout
+        table = self._table
+        if not table.all:
+            logger.debug("%s: Discarding item '%s' - no subscribers", self._name, str(value))
+            return
+        candidates = table.by_key.get(self._key_function(value), table.others) if (self._key_function and table.by_key) else table.others
+        serialized_value = SerializedValue(value)
+        for subscription in candidates:
+            if subscription.predicate and not subscription.predicate(value):
+                continue
+            logger.debug("%s: Pushing item '%s' to buffer '%s'", self._name, str(value), subscription.publisher.buffer_name())
+            try:
+                subscription.publisher.publish_serialized_value(serialized_value, timeout, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+            except queue.Full:
+                self._handle_buffer_full_exception(subscription.on_full_action, subscription.publisher)
+
+    def publish_complete_to_subscribers(self, error: Optional[BaseException], timeout: float, *, distribute_full_error: bool = False) -> None:
+        # Publishes completion to all the subscribers, each with the given timeout.
+        # If completion (without an error) cannot be published to a full buffer whose on_full_action is "raise exception", queue.Full is raised. If distribute_full_error
+        # is True, that error is first published to the remaining subscribers; otherwise it is raised at once, and the caller is responsible for doing so.
+        subscriptions = self._table.all
+        full_error: Optional[queue.Full] = None
+        if subscriptions:
+            for subscription in subscriptions:
+                logger.debug("%s: Pushing Completion (with error '%s') to buffer '%s'", self._name, safe_str(error), subscription.publisher.buffer_name())
                 try:
                     try:
-                        subscription.publish_complete(error, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+                        subscription.publisher.publish_complete(error, timeout, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
                     except queue.Full:
-                        self._handle_buffer_full_exception(on_full_action, subscription)
-                except queue.Full:  # on_full_action must be "raise exception"
+                        self._handle_buffer_full_exception(subscription.on_full_action, subscription.publisher)
+                except queue.Full as ex:  # on_full_action must be "raise exception"
                     if error:
                         logger.warning(f"Buffer full in on_complete (with an error '{error}'). "
                                        f"The multicaster will continue distributing the original error to any remaining subscriptions.")
                     else:
                         # from now on, we are dealing with this error situation
                         logger.error(f"Buffer full in on_complete. The multicaster will distribute this error to any remaining subscriptions.")
-                        raise
+                        if not distribute_full_error:
+                            raise
+                        full_error = ex
+                        error = ex
         else:
             logger.debug("%s: Discarding Completion (with error '%s') - no subscribers", self._name, safe_str(error))
-
-    def _get_copy_of_subscriptions(self) -> Dict[Publisher[Type], UnexpectedSituationAction]:
-        with self._publishers_lock:
-            return self._publishers.copy()
+        if full_error:
+            raise full_error
 
     def _handle_buffer_full_exception(self, on_full_action: UnexpectedSituationAction, subscription: Publisher[Type]) -> None:
         handle_unexpected_situation(on_full_action, f"{self._name}: Unable to push to buffer '{subscription.buffer_name()}', it is full", logger,
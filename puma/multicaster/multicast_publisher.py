@@ -0,0 +1,123 @@
+import logging
+from typing import Callable, Dict, Hashable, Iterable, NoReturn, Optional, TypeVar
+
+from puma.buffer import DEFAULT_PUBLISH_COMPLETE_TIMEOUT, DEFAULT_PUBLISH_VALUE_TIMEOUT, Publishable, Publisher
+from puma.context import Exit_1, Exit_2, Exit_3
+from puma.helpers.string import safe_str
+from puma.multicaster._multicaster_subscriber import _MulticasterSubscriber
+from puma.primitives import AutoResetEvent
+from puma.unexpected_situation_action import UnexpectedSituationAction
+
+Type = TypeVar("Type")
+
+logger = logging.getLogger(__name__)
+
+
+class MulticastPublisher(Publisher[Type]):
+    """A Publisher which copies each value published to it to one or more subscribers (which are typically output buffers), on the publishing thread.
+
+    This is an alternative to publishing to a buffer serviced by a Multicaster, without the Multicaster's thread and input buffer: a value reaches the output buffers
+    as soon as it is published, without waiting for another thread to wake up. The cost is that the publisher does the copying, and that, because there is no input
+    buffer, a full output buffer is dealt with at once.
+
+    Use the subscribe() and unsubscribe() methods to add and remove output buffers; these may be called at any time before completion. Subscribing an output buffer
+    publishes to it, so the MulticastPublisher should be context managed, so that the output buffers are unpublished when it exits.
+
+    The options given when subscribing an output buffer are the same as those of the Multicaster: the action taken if it is full, and optionally routing keys and
+    a predicate choosing the values it receives. Each value is pickled at most once, however many of the output buffers carry it across a process boundary.
+
+    The timeout given to publish_value or publish_complete applies to each output buffer in turn. The on_full_action given to them is not used: the action taken
+    if an output buffer is full is the one given when it was subscribed. If completion cannot be published to a full output buffer whose action is RAISE_EXCEPTION,
+    completion is published with that error to the remaining output buffers, and then queue.Full is raised.
+
+    Like other publishers, a MulticastPublisher should be used by one thread at a time, and cannot be sent to another process.
+    """
+
+    def __init__(self, name: str, *, key_function: Optional[Callable[[Type], Hashable]] = None) -> None:
+        """Constructor.
+
+        name: Name for logging, returned by buffer_name().
+        key_function: Optional function returning the routing key of a value, which must be hashable. Required if subscribers are to be given routing keys.
+        """
+        if not name:
+            raise ValueError("Name must be supplied")
+        self._name = name
+        self._subscriber: _MulticasterSubscriber[Type] = _MulticasterSubscriber(name, key_function)
+        self._has_key_function = key_function is not None
+        self._publishers: Dict[Publishable[Type], Publisher[Type]] = {}
+        self._published_complete = False
+
+    def __enter__(self) -> 'MulticastPublisher[Type]':
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        for publishable in list(self._publishers):
+            self._unpublish(publishable, exc_type, exc_value, traceback)
+
+    def __getstate__(self) -> NoReturn:
+        raise RuntimeError(f"{self._name}: MulticastPublisher must not be sent across a process boundary")
+
+    def subscribe(self, publishable: Publishable[Type], on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION, *,
+                  routing_keys: Optional[Iterable[Hashable]] = None, predicate: Optional[Callable[[Type], bool]] = None) -> None:
+        """Subscribe a publishable to receive a copy of values published to this publisher. The parameters are as for Multicaster.subscribe()."""
+        if not publishable:
+            raise ValueError("Publishable must be supplied")
+        keys = None if routing_keys is None else frozenset(routing_keys)
+        if keys is not None and not keys:
+            raise ValueError("If routing keys are given, there must be at least one")
+        if keys is not None and not self._has_key_function:
+            raise ValueError("Routing keys can only be used if the publisher was given a key function")
+        if publishable in self._publishers:
+            raise RuntimeError("Publishable is already subscribed")
+        if self._published_complete:
+            raise RuntimeError(f"{self._name}: Trying to subscribe after publishing Complete")
+        publisher = publishable.publish()
+        publisher.__enter__()
+        try:
+            self._subscriber.subscribe(publisher, on_full_action, routing_keys=keys, predicate=predicate)
+        except BaseException as ex:
+            publisher.__exit__(type(ex), ex, ex.__traceback__)
+            raise
+        self._publishers[publishable] = publisher
+
+    def unsubscribe(self, publishable: Publishable[Type]) -> None:
+        """Unsubscribe a publishable, unpublishing from it. It is not necessary to call this before the publisher exits context management."""
+        if not publishable:
+            raise ValueError("Publishable must be supplied")
+        if publishable not in self._publishers:
+            raise RuntimeError("Publishable is not subscribed")
+        self._unpublish(publishable, None, None, None)
+
+    def publish_value(self, value: Type,
+                      timeout: float = DEFAULT_PUBLISH_VALUE_TIMEOUT, on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
+        """Implementation of Publisher.publish_value. See the class comment for the treatment of the timeout and on_full_action."""
+        if self._published_complete:
+            raise RuntimeError(f"{self._name}: Trying to publish a value after publishing Complete")
+        self._subscriber.publish_value_to_subscribers(value, timeout)
+
+    def publish_complete(self, error: Optional[BaseException],
+                         timeout: float = DEFAULT_PUBLISH_COMPLETE_TIMEOUT, on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
+        """Implementation of Publisher.publish_complete. See the class comment for the treatment of the timeout and on_full_action."""
+        if (error is not None) and (not isinstance(error, Exception)):
+            raise TypeError(f"{self._name}: If an error is supplied, it must be an instance of Exception")
+        if self._published_complete:
+            raise RuntimeError(f"{self._name}: Trying to publish Complete more than once")
+        self._published_complete = True
+        self._subscriber.publish_complete_to_subscribers(error, timeout, distribute_full_error=True)
+
+    def buffer_name(self) -> str:
+        return self._name
+
+    def invalidate(self) -> None:
+        # Not obtained from a buffer, so never invalidated by one
+        raise RuntimeError(f"{self._name}: MulticastPublisher is not owned by a buffer, and cannot be invalidated")
+
+    def set_subscriber_event(self, subscriber_event: Optional[AutoResetEvent]) -> None:
+        # Not obtained from a buffer, so has no subscriber event
+        raise RuntimeError(f"{self._name}: MulticastPublisher is not owned by a buffer, and has no subscriber event")
+
+    def _unpublish(self, publishable: Publishable[Type], exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        publisher = self._publishers.pop(publishable)
+        self._subscriber.unsubscribe(publisher)
+        logger.debug("%s: Unpublishing from buffer '%s' (with error: %s)", self._name, publisher.buffer_name(), safe_str(exc_type))
+        publisher.__exit__(exc_type, exc_value, traceback)
@@ -1,5 +1,5 @@
 import logging
-from typing import Generic, Set, TypeVar
+from typing import Callable, Generic, Hashable, Iterable, Optional, Set, TypeVar
 
 from puma.buffer import Observable, Publishable
 from puma.context import ensure_used_within_context_manager
@@ -24,6 +24,10 @@ class Multicaster(ThreadRunner, Generic[Type]):
 
     The behaviour of the multicaster if it cannot push an item to an output buffer (because it is full) depends on the option given when that buffer was subscribed.
 
+    By default every item is copied to every subscriber. A subscriber may instead ask for only some of the items: those with particular routing keys (if the multicaster was
+    given a key function, which returns the routing key of an item), or those for which a predicate returns True, or both. Items are routed to the subscribers that asked for
+    their keys by looking the key up in a dictionary, so the cost of sending an item does not grow with the number of subscribers asking for other keys.
+
     The thread ends when either the runnable receives the stop command on its command buffer, or has received on_complete from its input buffer, or an exception occurs
     in the thread itself.
     When ended, the runnable sends on_complete (including the thread's error, if any) to all output buffers that it has not already tried to send it to. If ending because
@@ -33,15 +37,17 @@ class Multicaster(ThreadRunner, Generic[Type]):
     The owner should regularly poll check_for_exceptions to receive errors raised by the thread, which will be passed back to the owner on its status buffer.
     """
 
-    def __init__(self, observable: Observable[Type]) -> None:
+    def __init__(self, observable: Observable[Type], *, key_function: Optional[Callable[[Type], Hashable]] = None) -> None:
         """Constructor. Use context management to control the thread's lifetime. Poll check_for_exceptions to receive errors raised by the thread.
 
         observable: The buffer whose items are to be copied to subscribers.
+        key_function: Optional function returning the routing key of an item, which must be hashable. Required if subscribers are to be given routing keys.
         """
         if not observable:
             raise ValueError("Observable must be supplied")
         name = f"Multicaster from '{observable.buffer_name()}'"
-        self._subscriber: _MulticasterSubscriber[Type] = _MulticasterSubscriber(name)
+        self._subscriber: _MulticasterSubscriber[Type] = _MulticasterSubscriber(name, key_function)
+        self._has_key_function = key_function is not None
         self._runnable: SingleBufferServicingRunnable[Type] = SingleBufferServicingRunnable(observable, self._subscriber, [], name)
         self._publishables: Set[Publishable[Type]] = set()
         super().__init__(runnable=self._runnable, name=name)
@@ -51,21 +57,31 @@ class Multicaster(ThreadRunner, Generic[Type]):
         return self
 
     @ensure_used_within_context_manager
-    def subscribe(self, publishable: Publishable[Type], on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
+    def subscribe(self, publishable: Publishable[Type], on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION, *,
+                  routing_keys: Optional[Iterable[Hashable]] = None, predicate: Optional[Callable[[Type], bool]] = None) -> None:
         """Subscribe a publishable to receive a copy of items received from the buffer passed to the constructor.
 
         publishable: The subscribing buffer.
         on_full_action: Specifies the action that the multicaster will take if the supplied buffer is full when the multicaster tries to push an item on to it.
                         In the case of the RAISE_EXCEPTION option, queue.Full will be raised, which will be communicated to the owning thread on its status channel
                         (poll check_for_exceptions to receive errors).
+        routing_keys: Optional routing keys. If given, the buffer only receives items whose key (as returned by the multicaster's key function) is one of these.
+        predicate: Optional function, called on the multicaster's thread. If given, the buffer only receives items for which it returns True.
+                   An error raised by the predicate ends the multicaster.
+        On completion, all subscribed buffers receive on_complete, whatever their routing keys and predicate.
         """
         if not publishable:
             raise ValueError("Publishable must be supplied")
+        keys = None if routing_keys is None else frozenset(routing_keys)
+        if keys is not None and not keys:
+            raise ValueError("If routing keys are given, there must be at least one")
+        if keys is not None and not self._has_key_function:
+            raise ValueError("Routing keys can only be used if the multicaster was given a key function")
         if publishable in self._publishables:
             raise RuntimeError("Publishable is already subscribed")
         self._publishables.add(publishable)
         publisher = self._runnable.multicaster_accessor.add_output_buffer(publishable)
-        self._subscriber.subscribe(publisher, on_full_action)
+        self._subscriber.subscribe(publisher, on_full_action, routing_keys=keys, predicate=predicate)
 
     def unsubscribe(self, publishable: Publishable[Type]) -> None:
         """Unsubscribe a publisher. It is not necessary to call this before destroying the multicaster."""
@@ -0,0 +1,2 @@
+from puma.pipeline.stage_placement import StagePlacement  # noqa: F401
+from puma.pipeline.pipeline import Pipeline, StageFactory  # noqa: F401, I100
@@ -0,0 +1,42 @@
+import logging
+from typing import Any, Callable, List, Optional, Sequence
+
+from puma.buffer import Observable, Publishable, Publisher, Subscriber
+from puma.runnable import MultiBufferServicingRunnable
+from puma.unexpected_situation_action import UnexpectedSituationAction
+
+logger = logging.getLogger(__name__)
+
+StageFunction = Callable[[Any], Any]
+
+
+class _FunctionStageSubscriber(Subscriber[Any]):
+    """Passes each value through a chain of functions, publishing the result to every output. A function returning None drops the value."""
+
+    def __init__(self, name: str, functions: Sequence[StageFunction], publishers: Sequence[Publisher[Any]], publish_timeout: float) -> None:
+        self._name = name
+        self._functions: List[StageFunction] = list(functions)
+        self._publishers: List[Publisher[Any]] = list(publishers)
+        self._publish_timeout = publish_timeout
+
+    def on_value(self, value: Any) -> None:
+        for function in self._functions:
+            value = function(value)
+            if value is None:
+                return
+        for publisher in self._publishers:
+            publisher.publish_value(value, self._publish_timeout, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+
+    def on_complete(self, error: Optional[BaseException]) -> None:
+        logger.debug("%s: Passing on Complete to %d outputs", self._name, len(self._publishers))
+        for publisher in self._publishers:
+            publisher.publish_complete(error)
+
+
+class _FunctionStageRunnable(MultiBufferServicingRunnable):
+    """Runs one or more function stages of a Pipeline, which have been fused together so that values pass between them without going through a buffer."""
+
+    def __init__(self, name: str, observable: Observable[Any], functions: Sequence[StageFunction], output_buffers: Sequence[Publishable[Any]], publish_timeout: float) -> None:
+        super().__init__(name, output_buffers)
+        publishers = [self._get_publisher_unwrapped(output_buffer) for output_buffer in output_buffers]
+        self._add_subscription(observable, _FunctionStageSubscriber(name, functions, publishers, publish_timeout))
@@ -0,0 +1,416 @@
+import logging
+from contextlib import ExitStack
+from dataclasses import dataclass
+from enum import Enum, unique
+from time import monotonic
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from puma.buffer import Buffer, Observable, Publishable
+from puma.context import ContextManager, Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager, must_be_context_managed
+from puma.environment import Environment, ProcessEnvironment, ThreadEnvironment
+from puma.pipeline._function_stage_runnable import StageFunction, _FunctionStageRunnable
+from puma.pipeline.stage_placement import StagePlacement
+from puma.runnable import Runnable
+from puma.runnable.runner import Runner, RunnerMonitor
+from puma.runnable.runner.runner import RunnerStillAliveError
+from puma.timeouts import TIMEOUT_INFINITE, TIMEOUT_NO_WAIT, Timeouts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PIPELINE_BUFFER_SIZE = 100
+DEFAULT_STAGE_PUBLISH_TIMEOUT = 10.0
+
+StageFactory = Callable[[List[Observable[Any]], List[Publishable[Any]]], Runnable]
+"""Creates the runnable of a stage, given its input buffers (in the order the inputs were named) and its output buffers (one per downstream consumer)."""
+
+
+@unique
+class _NodeKind(Enum):
+    INPUT = "input"
+    OUTPUT = "output"
+    FUNCTION = "function"
+    RUNNABLE = "runnable"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}.{self.name}>"
+
+
+@dataclass(frozen=True)
+class _Node:
+    # An input, output or stage of the pipeline, as described by the user
+    name: str
+    kind: _NodeKind
+    inputs: Tuple[str, ...] = ()
+    placement: StagePlacement = StagePlacement.THREAD
+    lightweight: bool = False
+    function: Optional[StageFunction] = None
+    factory: Optional[StageFactory] = None
+
+
+@dataclass(frozen=True)
+class _StageGroup:
+    # One or more stages that are executed by a single runnable. Only function stages are ever fused into a group of more than one stage.
+    stages: Tuple[_Node, ...]
+    placement: StagePlacement
+
+    def name(self) -> str:
+        return "+".join(stage.name for stage in self.stages)
+
+
+@must_be_context_managed
+class Pipeline(ContextManager["Pipeline"]):
+    """Builds and runs a graph of stages, connected by buffers, from a declarative description.
+
+    Stages are added in order: each stage names the stages (or pipeline inputs) that feed it, which must already have been added, so the stages form a directed acyclic graph.
+    There are two kinds of stage:
+        Function stages apply a function to each value they receive, publishing the result to each of their consumers (nothing is published if the function returns None).
+        Runnable stages are created by a factory, which is given the stage's input and output buffers.
+
+    Each stage has a placement hint, saying whether it should run in a thread or a process of its own. The buffer used for each connection is chosen accordingly: a
+    MultiProcessBuffer if the connection crosses a process boundary, otherwise a MultiThreadBuffer. Placements can be changed using set_placement(), for example from
+    configuration, without changing the code that describes the pipeline.
+
+    Function stages marked as lightweight are fused with the function stage that feeds them (or, if that is lightweight, with the one that it feeds), provided that the
+    connection between them is one-to-one. Fused stages are run by a single runnable, so values pass between them without a buffer, and without waking another thread.
+
+    When context management begins, the buffers, runnables and runners are created. start() starts the stages, downstream stages first. stop() stops the source stages
+    (those that are not fed by other stages); the other stages end when they have received on_complete from all their inputs, having processed everything they
+    were sent. Runnable stages must therefore end when all their inputs are complete, as MultiBufferServicingRunnable does.
+
+    Example:
+        pipeline = Pipeline("Example")
+        pipeline.add_input("numbers")
+        pipeline.add_function_stage("parse", parse, "numbers", lightweight=True)
+        pipeline.add_function_stage("analyse", analyse, "parse", placement=StagePlacement.PROCESS)
+        pipeline.add_output("results", "analyse")
+        with pipeline:
+            pipeline.start_blocking()
+            with pipeline.get_input("numbers").publish() as publisher:
+                ...
+    """
+
+    def __init__(self, name: str = "Pipeline", *, buffer_size: int = DEFAULT_PIPELINE_BUFFER_SIZE, publish_timeout: float = DEFAULT_STAGE_PUBLISH_TIMEOUT,
+                 fuse_stages: bool = True) -> None:
+        """Constructor.
+
+        Arguments:
+            name:            Name of the pipeline, used to name its buffers and runners.
+            buffer_size:     The size of each buffer between stages.
+            publish_timeout: How long a function stage waits for space in a full output buffer, before raising queue.Full.
+            fuse_stages:     Whether lightweight function stages are fused with their neighbours. If False, every stage has its own runnable.
+        """
+        if buffer_size < 1:
+            raise ValueError("Buffer size must be at least 1")
+        Timeouts.validate(publish_timeout)
+        self._name = name
+        self._buffer_size = buffer_size
+        self._publish_timeout = publish_timeout
+        self._fuse_stages = fuse_stages
+        self._nodes: Dict[str, _Node] = {}  # In the order added, which is a topological order
+        self._consumers: Dict[str, List[str]] = {}
+        self._context_management = ExitStack()
+        self._in_context_management = False
+        self._groups: List[_StageGroup] = []
+        self._buffers: Dict[Tuple[str, str], Buffer[Any]] = {}
+        self._runners: List[Runner] = []  # In the same order as self._groups
+        self._monitor: Optional[RunnerMonitor] = None
+
+    def __enter__(self) -> 'Pipeline':
+        logger.debug("%s: Entering context management, building the pipeline", self._name)
+        if self._in_context_management:
+            raise RuntimeError(f"{self._name}: Already context managed")
+        with ExitStack() as stack:
+            self._groups = self._plan_groups()
+            self._create_buffers(stack)
+            self._runners = [self._create_runner(group) for group in self._groups]
+            for runner in reversed(self._runners):  # The stack exits them in reverse, so upstream stages are stopped first
+                stack.enter_context(runner)
+            self._monitor = stack.enter_context(RunnerMonitor(self._runners, f"Monitor of {self._name}"))
+            self._context_management = stack.pop_all()
+        self._in_context_management = True
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        """End of context management. If not unrolling after an exception, the source stages are stopped and the pipeline drains; then all runners are stopped and joined,
+        upstream stages first.
+
+        If any errors have occurred then the first of them is re-raised; although it is good practice for the caller not to rely on this, but to poll
+        check_for_exceptions().
+        """
+        unrolling_after_exception: bool = exc_type is not None
+        logger.debug("%s: Exiting context management", self._name)
+        self._in_context_management = False
+        try:
+            if not unrolling_after_exception and self.is_alive():
+                self._stop_source_stages()
+                self._join(max(runner._get_final_join_timeout() for runner in self._runners))
+        finally:
+            try:
+                self._context_management.__exit__(exc_type, exc_value, traceback)
+            finally:
+                self._monitor = None
+                self._runners = []
+                self._buffers = {}
+                logger.debug("%s: Finished", self._name)
+
+    def get_name(self) -> str:
+        return self._name
+
+    def add_input(self, name: str) -> None:
+        """Adds an input to the pipeline: a buffer that the owner of the pipeline publishes to (see get_input()). It must feed exactly one stage."""
+        self._add_node(_Node(name, _NodeKind.INPUT))
+
+    def add_output(self, name: str, source: str) -> None:
+        """Adds an output to the pipeline: a buffer, fed by the given stage, that the owner of the pipeline subscribes to (see get_output())."""
+        self._add_node(_Node(name, _NodeKind.OUTPUT, (source,)))
+
+    def add_function_stage(self, name: str, function: StageFunction, input_name: str, *, placement: StagePlacement = StagePlacement.THREAD,
+                           lightweight: bool = False) -> None:
+        """Adds a stage which calls the given function for each value arriving from the named stage or input, publishing the result to all its consumers.
+
+        Arguments:
+            name:        Name of the stage, which must be unique within the pipeline.
+            function:    Called with each value; the result is published, unless it is None. It must be picklable if the stage runs in a process.
+            input_name:  The stage or pipeline input whose values this stage processes.
+            placement:   Where the stage should run, unless it is fused with another stage.
+            lightweight: If True, the stage does so little work that it is worth fusing it with a neighbouring function stage, whose placement it then shares.
+        """
+        if not callable(function):
+            raise ValueError("A function must be supplied")
+        self._add_node(_Node(name, _NodeKind.FUNCTION, (input_name,), placement, lightweight, function=function))
+
+    def add_stage(self, name: str, factory: StageFactory, input_names: Sequence[str] = (), *, placement: StagePlacement = StagePlacement.THREAD) -> None:
+        """Adds a stage whose runnable is created by the given factory when the pipeline enters context management.
+
+        Arguments:
+            name:        Name of the stage, which must be unique within the pipeline.
+            factory:     Given the stage's input buffers (in the order of input_names) and output buffers (one per consumer, in the order the consumers were added),
+                         returns the runnable. The runnable should end when all its inputs have completed, and send on_complete to all its outputs.
+            input_names: The stages or pipeline inputs that feed this stage. A stage with no inputs is a source.
+            placement:   Where the stage should run.
+        """
+        if not callable(factory):
+            raise ValueError("A factory must be supplied")
+        self._add_node(_Node(name, _NodeKind.RUNNABLE, tuple(input_names), placement, factory=factory))
+
+    def set_placement(self, name: str, placement: StagePlacement) -> None:
+        """Changes the placement of the named stage."""
+        node = self._get_node(name)
+        if node.kind in (_NodeKind.INPUT, _NodeKind.OUTPUT):
+            raise ValueError(f"{self._name}: '{name}' is not a stage")
+        self._check_not_built()
+        self._nodes[name] = _Node(node.name, node.kind, node.inputs, placement, node.lightweight, node.function, node.factory)
+
+    def get_stage_groups(self) -> List[List[str]]:
+        """Returns the names of the stages executed by each runnable, upstream stages first. Stages that have been fused are listed together."""
+        groups = self._groups if self._in_context_management else self._plan_groups()
+        return [[stage.name for stage in group.stages] for group in groups]
+
+    @ensure_used_within_context_manager
+    def get_input(self, name: str) -> Publishable[Any]:
+        """Returns the buffer of the named pipeline input, for the owner of the pipeline to publish to."""
+        node = self._get_node(name)
+        if node.kind != _NodeKind.INPUT:
+            raise ValueError(f"{self._name}: '{name}' is not a pipeline input")
+        return self._buffers[(name, self._consumers[name][0])]
+
+    @ensure_used_within_context_manager
+    def get_output(self, name: str) -> Observable[Any]:
+        """Returns the buffer of the named pipeline output, for the owner of the pipeline to subscribe to."""
+        node = self._get_node(name)
+        if node.kind != _NodeKind.OUTPUT:
+            raise ValueError(f"{self._name}: '{name}' is not a pipeline output")
+        return self._buffers[(node.inputs[0], name)]
+
+    @ensure_used_within_context_manager
+    def get_buffer(self, from_name: str, to_name: str) -> Optional[Buffer[Any]]:
+        """Returns the buffer that connects the two named stages, or None if they have been fused together."""
+        if to_name not in self._consumers.get(from_name, []):
+            raise ValueError(f"{self._name}: '{from_name}' does not feed '{to_name}'")
+        return self._buffers.get((from_name, to_name))
+
+    @ensure_used_within_context_manager
+    def get_runner(self, stage_name: str) -> Runner:
+        """Returns the runner that executes the named stage."""
+        self._get_node(stage_name)
+        for group, runner in zip(self._groups, self._runners):
+            if any(stage.name == stage_name for stage in group.stages):
+                return runner
+        raise ValueError(f"{self._name}: '{stage_name}' is not a stage")
+
+    @ensure_used_within_context_manager
+    def get_runners(self) -> List[Runner]:
+        """Returns the runners executing the stages, upstream stages first."""
+        return list(self._runners)
+
+    @ensure_used_within_context_manager
+    def start(self) -> None:
+        """Starts all the stages, downstream stages first, without waiting for them to report that they are running."""
+        logger.debug("%s: Starting", self._name)
+        for runner in reversed(self._runners):
+            runner.start()
+
+    @ensure_used_within_context_manager
+    def start_blocking(self, timeout: float = TIMEOUT_INFINITE) -> None:
+        """Starts all the stages, then blocks until all of them have reported that they are running.
+
+        Raises RuntimeError if any stage has not reported that it is running within the given timeout, which applies to the pipeline as a whole.
+        """
+        Timeouts.validate(timeout)
+        self.start()
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        for runner in reversed(self._runners):
+            remaining = end_time - monotonic()
+            runner.wait_until_running(TIMEOUT_NO_WAIT if remaining <= 0.0 else remaining)
+
+    @ensure_used_within_context_manager
+    def stop(self) -> None:
+        """Stops the source stages: those fed only by pipeline inputs, or by nothing. The other stages end when they have processed everything sent to them."""
+        self._stop_source_stages()
+
+    @ensure_used_within_context_manager
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Blocks until all the stages have ended. The timeout applies to the pipeline as a whole.
+
+        Raises RunnerStillAliveError, naming the stages concerned, if any of them are still alive when the timeout expires.
+        """
+        self._join(timeout)
+
+    @ensure_used_within_context_manager
+    def check_for_exceptions(self) -> None:
+        """Raises the first error found in any of the stages."""
+        if self._monitor:
+            self._monitor.check_for_exceptions()
+
+    def is_alive(self) -> bool:
+        """Returns True if any of the stages is alive."""
+        return any(runner.is_alive() for runner in self._runners)
+
+    def _add_node(self, node: _Node) -> None:
+        self._check_not_built()
+        if not node.name:
+            raise ValueError("A name must be supplied")
+        if node.name in self._nodes:
+            raise ValueError(f"{self._name}: The name '{node.name}' is already used")
+        for input_name in node.inputs:
+            input_node = self._get_node(input_name)
+            if input_node.kind == _NodeKind.OUTPUT:
+                raise ValueError(f"{self._name}: '{input_name}' is a pipeline output, it cannot feed '{node.name}'")
+            if input_node.kind == _NodeKind.INPUT and self._consumers[input_name]:
+                raise ValueError(f"{self._name}: Pipeline input '{input_name}' already feeds '{self._consumers[input_name][0]}'")
+        if len(set(node.inputs)) != len(node.inputs):
+            raise ValueError(f"{self._name}: '{node.name}' has the same input more than once")
+        self._nodes[node.name] = node
+        self._consumers[node.name] = []
+        for input_name in node.inputs:
+            self._consumers[input_name].append(node.name)
+
+    def _get_node(self, name: str) -> _Node:
+        node = self._nodes.get(name)
+        if node is None:
+            raise ValueError(f"{self._name}: There is no stage, input or output called '{name}'")
+        return node
+
+    def _check_not_built(self) -> None:
+        if self._in_context_management:
+            raise RuntimeError(f"{self._name}: The pipeline cannot be changed while it is context managed")
+
+    def _plan_groups(self) -> List[_StageGroup]:
+        # Group the stages, fusing lightweight function stages with their neighbours, and work out where each group will run
+        for name, node in self._nodes.items():
+            if node.kind == _NodeKind.INPUT and not self._consumers[name]:
+                raise ValueError(f"{self._name}: Pipeline input '{name}' does not feed any stage")
+        members: List[List[_Node]] = []
+        group_index: Dict[str, int] = {}
+        for node in self._nodes.values():
+            if node.kind in (_NodeKind.INPUT, _NodeKind.OUTPUT):
+                continue
+            upstream = self._fusable_upstream(node, members, group_index)
+            if upstream is None:
+                group_index[node.name] = len(members)
+                members.append([node])
+            else:
+                group_index[node.name] = group_index[upstream]
+                members[group_index[upstream]].append(node)
+        return [_StageGroup(tuple(stages), self._group_placement(stages)) for stages in members]
+
+    def _fusable_upstream(self, node: _Node, members: List[List[_Node]], group_index: Dict[str, int]) -> Optional[str]:
+        # Returns the name of the stage that the given stage can be fused onto, if any
+        if not self._fuse_stages or node.kind != _NodeKind.FUNCTION:
+            return None
+        upstream = self._nodes[node.inputs[0]]
+        if upstream.kind != _NodeKind.FUNCTION or self._consumers[upstream.name] != [node.name]:
+            return None
+        upstream_group = members[group_index[upstream.name]]
+        if node.lightweight or all(stage.lightweight for stage in upstream_group):
+            return upstream.name
+        return None
+
+    @staticmethod
+    def _group_placement(stages: List[_Node]) -> StagePlacement:
+        # A fused group runs where its one stage that isn't lightweight wants to run; if they are all lightweight, where the first one wants to run
+        for stage in stages:
+            if not stage.lightweight:
+                return stage.placement
+        return stages[0].placement
+
+    def _location(self, name: str) -> Optional[int]:
+        # Returns the index of the group whose process the named node runs in, or None if it runs in the owner's process
+        for index, group in enumerate(self._groups):
+            if any(stage.name == name for stage in group.stages):
+                return index if group.placement == StagePlacement.PROCESS else None
+        return None  # A pipeline input or output
+
+    def _group_of(self, name: str) -> Optional[_StageGroup]:
+        for group in self._groups:
+            if any(stage.name == name for stage in group.stages):
+                return group
+        return None
+
+    def _create_buffers(self, stack: ExitStack) -> None:
+        self._buffers = {}
+        for node in self._nodes.values():
+            for input_name in node.inputs:
+                group = self._group_of(node.name)
+                if group is not None and group is self._group_of(input_name):
+                    continue  # Fused: no buffer needed
+                environment: Environment = ThreadEnvironment() if self._location(input_name) == self._location(node.name) else ProcessEnvironment()
+                buffer = environment.create_buffer(object, self._buffer_size, f"{self._name}: {input_name} -> {node.name}")
+                logger.debug("%s: Connecting '%s' to '%s' using %s", self._name, input_name, node.name, type(buffer).__name__)
+                self._buffers[(input_name, node.name)] = stack.enter_context(buffer)
+
+    def _create_runner(self, group: _StageGroup) -> Runner:
+        first = group.stages[0]
+        last = group.stages[-1]
+        outputs: List[Publishable[Any]] = [self._buffers[(last.name, consumer)] for consumer in self._consumers[last.name]]
+        runnable: Runnable
+        if first.kind == _NodeKind.FUNCTION:
+            functions = [stage.function for stage in group.stages if stage.function is not None]
+            runnable = _FunctionStageRunnable(group.name(), self._buffers[(first.inputs[0], first.name)], functions, outputs, self._publish_timeout)
+        else:
+            assert first.factory is not None
+            inputs: List[Observable[Any]] = [self._buffers[(input_name, first.name)] for input_name in first.inputs]
+            runnable = first.factory(inputs, outputs)
+        environment: Environment = ProcessEnvironment() if group.placement == StagePlacement.PROCESS else ThreadEnvironment()
+        return environment.create_runner(runnable, f"{self._name}: {group.name()}")
+
+    def _is_source(self, group: _StageGroup) -> bool:
+        return all(self._nodes[input_name].kind == _NodeKind.INPUT for input_name in group.stages[0].inputs)
+
+    def _stop_source_stages(self) -> None:
+        for group, runner in zip(self._groups, self._runners):
+            if self._is_source(group) and runner.is_alive():
+                logger.debug("%s: Stopping source stage %s", self._name, group.name())
+                runner.stop()
+
+    def _join(self, timeout: Optional[float]) -> None:
+        Timeouts.validate_optional(timeout)
+        end_time = None if timeout is None else monotonic() + timeout
+        still_alive: List[str] = []
+        for group, runner in zip(self._groups, self._runners):
+            try:
+                runner.join(None if end_time is None else max(end_time - monotonic(), 0.0))
+            except RunnerStillAliveError:
+                still_alive.append(group.name())
+        if still_alive:
+            raise RunnerStillAliveError(f"{self._name}: Failed to stop the stages: {', '.join(still_alive)}")
@@ -0,0 +1,11 @@
+from enum import Enum, unique
+
+
+@unique
+class StagePlacement(Enum):
+    """Where a stage of a Pipeline is executed."""
+    THREAD = "thread"  # In a thread of the process that owns the pipeline
+    PROCESS = "process"  # In a process of its own
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}.{self.name}>"
@@ -1,8 +1,9 @@
-import multiprocessing
 import threading
 from multiprocessing import synchronize
 from typing import Union
 
+from puma.process_context import get_process_context
+
 ThreadCondition = threading.Condition
 """Type definition of a Condition variable for use between threads."""
 
@@ -15,7 +16,7 @@ class ProcessCondition(synchronize.Condition):
     """
 
     def __init__(self, lock: Union[synchronize.Lock, synchronize.RLock, None] = None) -> None:
-        super().__init__(lock=lock, ctx=multiprocessing.get_context())
+        super().__init__(lock=lock, ctx=get_process_context())
 
 
 ConditionType = Union[ThreadCondition, ProcessCondition]
@@ -1,8 +1,9 @@
-import multiprocessing
 import threading
 from multiprocessing import synchronize
 from typing import Union
 
+from puma.process_context import get_process_context
+
 ThreadEvent = threading.Event
 """Type definition of an Event variable for use between threads."""
 
@@ -15,7 +16,7 @@ class ProcessEvent(synchronize.Event):
     """
 
     def __init__(self) -> None:
-        super().__init__(ctx=multiprocessing.get_context())
+        super().__init__(ctx=get_process_context())
 
 
 EventType = Union[ThreadEvent, ProcessEvent]
@@ -1,8 +1,9 @@
-import multiprocessing
 import threading
 from multiprocessing import synchronize
 from typing import Union
 
+from puma.process_context import get_process_context
+
 ThreadLock = threading.Lock
 """Type definition of a Lock variable for use between threads."""
 
@@ -18,7 +19,7 @@ class ProcessLock(synchronize.Lock):
     """
 
     def __init__(self) -> None:
-        super().__init__(ctx=multiprocessing.get_context())
+        super().__init__(ctx=get_process_context())
 
 
 class ProcessRLock(synchronize.RLock):
@@ -29,7 +30,7 @@ class ProcessRLock(synchronize.RLock):
     """
 
     def __init__(self) -> None:
-        super().__init__(ctx=multiprocessing.get_context())
+        super().__init__(ctx=get_process_context())
 
 
 LockType = Union[ThreadLock, ProcessLock]
@@ -1,7 +1,7 @@
-import multiprocessing
 from typing import Union, cast, no_type_check
 
 from puma.primitives import ProcessRLock, ThreadRLock
+from puma.process_context import get_process_context
 
 
 class ProcessSafeInt:
@@ -11,7 +11,7 @@ class ProcessSafeInt:
     """
 
     def __init__(self, initial_value: int):
-        self._val = multiprocessing.Value('i', initial_value)
+        self._val = get_process_context().Value('i', initial_value)
 
     @property
     def value(self) -> int:
@@ -59,7 +59,7 @@ class ProcessSafeBool:
     """
 
     def __init__(self, initial_value: bool):
-        self._val = multiprocessing.Value('i', int(initial_value))
+        self._val = get_process_context().Value('i', int(initial_value))
 
     @property
     def value(self) -> bool:
@@ -0,0 +1,75 @@
+import logging
+import multiprocessing
+from enum import Enum, unique
+from multiprocessing.context import BaseContext
+from typing import Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FORKSERVER_PRELOAD = ("__main__", "puma.runnable.runner", "puma.logging", "puma.buffer", "puma.primitives", "yaml", "tblib")
+"""Modules imported once by the fork server, so that processes forked from it start without re-importing them. Modules that fail to import are ignored."""
+
+
+@unique
+class StartMethod(Enum):
+    """The way in which child processes are started. See the documentation of the multiprocessing module."""
+    FORK = "fork"  # Fast; the child is a copy of the parent, including any threads' locks. Not available on Windows.
+    FORKSERVER = "forkserver"  # The child is forked from a single-threaded server process, which has preloaded commonly used modules. Not available on Windows.
+    SPAWN = "spawn"  # The child is a fresh interpreter which imports everything it needs. Slow to start, but available everywhere.
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}.{self.name}>"
+
+    def is_available(self) -> bool:
+        """Returns True if this start method can be used on the current platform."""
+        return self.value in multiprocessing.get_all_start_methods()
+
+
+_start_method: Optional[StartMethod] = None
+
+
+def set_start_method(start_method: Optional[StartMethod], forkserver_preload: Optional[Iterable[str]] = None) -> None:
+    """Sets the start method used for child processes, and the context from which all process primitives (locks, events, queues, shared values) are created.
+
+    This should be called once, at program start-up, before any buffers, primitives or runners are created: primitives created from the "fork" context cannot be
+    shared with processes started using "spawn" or "forkserver". Unlike multiprocessing.set_start_method, this does not change the global default of the
+    multiprocessing module.
+
+    Arguments:
+        start_method:       The start method to use. If None, reverts to the default of the multiprocessing module.
+        forkserver_preload: When using StartMethod.FORKSERVER, the modules that the fork server imports once on start-up. Defaults to DEFAULT_FORKSERVER_PRELOAD.
+    """
+    global _start_method
+    if start_method is not None:
+        if not start_method.is_available():
+            raise ValueError(f"Start method {start_method.value} is not available on this platform")
+        if start_method == StartMethod.FORKSERVER:
+            preload: List[str] = list(forkserver_preload) if forkserver_preload is not None else list(DEFAULT_FORKSERVER_PRELOAD)
+            get_process_context(start_method).set_forkserver_preload(preload)
+        elif forkserver_preload is not None:
+            raise ValueError("forkserver_preload may only be given when using the forkserver start method")
+    logger.debug("Setting process start method to %s", start_method.value if start_method else "the default")
+    _start_method = start_method
+
+
+def get_start_method() -> StartMethod:
+    """Returns the start method that is used for child processes, unless overridden for an individual ProcessRunner."""
+    if _start_method is not None:
+        return _start_method
+    return StartMethod(get_process_context().get_start_method())
+
+
+def get_process_context(start_method: Optional[StartMethod] = None) -> BaseContext:
+    """Returns the multiprocessing context for the given start method, or for the start method set by set_start_method if None.
+
+    If set_start_method has not been called, this is the default context of the multiprocessing module.
+    """
+    method = start_method or _start_method
+    if method is None:
+        return multiprocessing.get_context()
+    return multiprocessing.get_context(method.value)
+
+
+def start_process_using(process: Any, start_method: Optional[StartMethod] = None) -> Any:
+    """Starts a multiprocessing.Process using the context of the given start method, returning its Popen object. Used to implement the _Popen method of processes."""
+    return get_process_context(start_method).Process._Popen(process)  # type: ignore
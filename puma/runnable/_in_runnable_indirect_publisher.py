@@ -2,7 +2,7 @@ from typing import Callable, Optional, TypeVar
 
 from puma.attribute import child_only, child_scope_value, copied, unmanaged
 from puma.attribute.mixin import ScopedAttributesMixin
-from puma.buffer import DEFAULT_PUBLISH_COMPLETE_TIMEOUT, DEFAULT_PUBLISH_VALUE_TIMEOUT, Publishable, Publisher
+from puma.buffer import DEFAULT_PUBLISH_COMPLETE_TIMEOUT, DEFAULT_PUBLISH_VALUE_TIMEOUT, Publishable, Publisher, SerializedValue
 from puma.context import Exit_1, Exit_2, Exit_3
 from puma.primitives import AutoResetEvent
 from puma.unexpected_situation_action import UnexpectedSituationAction
@@ -46,6 +46,10 @@ class _InRunnableIndirectPublisher(Publisher[PType], ScopedAttributesMixin):
                       on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
         self._get_publisher().publish_value(value, timeout, on_full_action)
 
+    def publish_serialized_value(self, value: SerializedValue[PType], timeout: float = DEFAULT_PUBLISH_VALUE_TIMEOUT,
+                                 on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
+        self._get_publisher().publish_serialized_value(value, timeout, on_full_action)
+
     def publish_complete(self, error: Optional[BaseException], timeout: float = DEFAULT_PUBLISH_COMPLETE_TIMEOUT,
                          on_full_action: UnexpectedSituationAction = UnexpectedSituationAction.RAISE_EXCEPTION) -> None:
         self._get_publisher().publish_complete(error, timeout, on_full_action)
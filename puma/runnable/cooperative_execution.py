@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+Wake = Callable[[], None]
+
+
+class CooperativeExecution(ABC):
+    """The execution of a runnable by a CooperativeExecutor: rather than blocking in _execute(), the runnable is serviced one step at a time, whenever it is woken.
+
+    Returned by Runnable._begin_cooperative_execution(), which replaces the call to _execute(). Only runnables derived from MultiBufferServicingRunnable support this.
+    """
+
+    @abstractmethod
+    def is_running(self) -> bool:
+        """Returns False once the runnable has ended."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def step(self) -> bool:
+        """Services the runnable once, having been woken (or its tick being due). Returns False if the runnable has ended.
+
+        If the runnable ends with an error that it cannot pass on to its subscribers, the error is raised, as it would have been by _execute().
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def interval_to_next_tick(self) -> Optional[float]:
+        """Returns the time (in seconds) until the runnable next needs to be stepped if it is not woken, or None if it only needs stepping when woken."""
+        raise NotImplementedError()
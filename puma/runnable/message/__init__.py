@@ -3,4 +3,4 @@ from puma.runnable.message.status_message_buffer import StatusMessageBuffer  # n
 from puma.runnable.message.command_message import (CommandMessage, RemoteObjectGetAttributeCommandMessage, RemoteObjectMethodCommandMessage,  # noqa: F401, I100
                                                    RunInChildScopeCommandMessage, StopCommandMessage)  # noqa: F401
 from puma.runnable.message.command_message_buffer import CommandMessageBuffer  # noqa: F401
-from puma.runnable.message.status_buffer import StatusBuffer, StatusBufferPublisher, StatusBufferSubscription  # noqa: F401, I100
+from puma.runnable.message.status_buffer import StatusBuffer, StatusBufferPublisher, StatusBufferSubscription, StatusListener  # noqa: F401, I100
@@ -2,7 +2,7 @@ import logging
 import queue
 import threading
 import time
-from typing import Dict, Optional, Type, TypeVar, Union, cast
+from typing import Callable, Dict, List, Optional, Type, TypeVar, Union, cast
 
 from puma.attribute import ProcessAction, ThreadAction, copied, factory, manually_managed, per_scope_value, python_default
 from puma.attribute.mixin import ScopedAttributesMixin
@@ -18,6 +18,8 @@ logger = logging.getLogger(__name__)
 
 StatusMessageType = TypeVar("StatusMessageType", bound=StatusMessage)
 
+StatusListener = Callable[[], None]
+
 
 class StatusBuffer(ScopedAttributesMixin):
     """Contains a buffer that a runnable class (thread or process) uses to communicate back to its creator, and methods to use that buffer.
@@ -92,6 +94,31 @@ class StatusBufferPublisher:
         self._wrapped_publisher.publish_complete(error, TIMEOUT_NO_WAIT, on_full_action=UnexpectedSituationAction.LOG_WARNING)  # Don't raise if full, errors will build up
 
 
+class _ListenableAutoResetEvent(AutoResetEvent):
+    """An AutoResetEvent that also calls any registered listeners whenever it is set. Listeners are called in the thread that sets the event, so must be quick."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._listeners: List[StatusListener] = []
+        self._listeners_lock = threading.Lock()
+
+    def set(self) -> None:
+        super().set()
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def add_listener(self, listener: StatusListener) -> None:
+        with self._listeners_lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: StatusListener) -> None:
+        with self._listeners_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+
 class StatusBufferSubscription(ContextManager["StatusBufferSubscription"], ScopedAttributesMixin):
     _wrapped_buffer: StatusMessageBuffer = copied("_wrapped_buffer")
     _parent: StatusBuffer = copied("_parent")
@@ -100,7 +127,7 @@ class StatusBufferSubscription(ContextManager["StatusBufferSubscription"], Scope
     _running: bool = copied("_running")
     _finished: bool = copied("_finished")
     _exception: Optional[TraceableException] = copied("_exception")
-    _event: AutoResetEvent = manually_managed("_event", ThreadAction.SHARED, ProcessAction.SET_TO_NONE)
+    _event: _ListenableAutoResetEvent = manually_managed("_event", ThreadAction.SHARED, ProcessAction.SET_TO_NONE)
     _exceptions_lock: threading.Lock = manually_managed("_exceptions_lock", ThreadAction.SHARED, ProcessAction.SET_TO_NONE)
     _subscription: Optional[Subscription] = copied("_subscription")
     _status_cache: Dict[str, StatusMessage] = copied("_status_cache")
@@ -114,7 +141,7 @@ class StatusBufferSubscription(ContextManager["StatusBufferSubscription"], Scope
         self._running = False  # Set when we are told that run() has started and false when self._finished is set
         self._finished = False  # Set when we are told of a fatal exception or that run() has finished
         self._exception = None  # Set when we are told of a fatal exception
-        self._event = AutoResetEvent()
+        self._event = _ListenableAutoResetEvent()
         self._exceptions_lock = threading.Lock()
         self._subscription = per_scope_value(None)
         self._status_cache = factory(dict)  # Cache of the latest of each type of status message
@@ -211,6 +238,27 @@ class StatusBufferSubscription(ContextManager["StatusBufferSubscription"], Scope
         logger.debug("%s: block_until_running returning %s", self._name, str(self._running))
         return self._running
 
+    def has_finished(self) -> bool:
+        """Called by the owner of a Runner, returns True once the Runner has reported that it has finished, with or without an error.
+
+        Any error is not raised: call check_for_exceptions() to raise it.
+        """
+        self._pop_queue_until_empty()
+        return self._finished
+
+    def add_listener(self, listener: StatusListener) -> None:
+        """Registers a callable that is called whenever a status message (including "complete") arrives from the Runner, so that the owner can be woken.
+
+        The listener is called in whichever thread delivers the message, and must do no more than record that something has arrived; it must not call the
+        methods of this subscription. The listener is also called once immediately, in case messages have already arrived.
+        """
+        self._event.add_listener(listener)
+        listener()
+
+    def remove_listener(self, listener: StatusListener) -> None:
+        """Unregisters a callable registered using add_listener(). Does nothing if it is not registered."""
+        self._event.remove_listener(listener)
+
     def _pop_queue_until_empty(self) -> None:
         if not self._wrapped_subscription:
             raise RuntimeError("StatusBufferSubscription not context managed")
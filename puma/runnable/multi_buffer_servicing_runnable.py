@@ -12,6 +12,7 @@ from puma.helpers.string import safe_str
 from puma.precision_timestamp.precision_timestamp import precision_timestamp
 from puma.primitives import HighPrecisionAutoResetEvent
 from puma.runnable import Runnable
+from puma.runnable.cooperative_execution import CooperativeExecution, Wake
 from puma.runnable.decorator.run_in_child_scope import run_in_child_scope
 from puma.runnable.message import CommandMessage
 from puma.timeouts import Timeouts
@@ -165,22 +166,44 @@ class MultiBufferServicingRunnable(Runnable, ABC):
         try:
             self._check_ready_to_execute()
             with ExitStack() as stack:
-                work_subscriptions = [stack.enter_context(obs.subscribe(self._event)) for obs in self._observables]
-                command_subscription = stack.enter_context(self._get_command_message_buffer().subscribe(self._event))
+                work_subscriptions, command_subscription = self.__subscribe(stack)
                 try:
                     while self._should_continue():
                         self._pre_wait_hook()
                         self.__wait_on_event(self._interval_to_next_tick())
-                        self.__tick_if_due()
-                        self.__service_command_buffer(command_subscription)
-                        self.__service_input_buffers(work_subscriptions)
+                        self._service_buffers(work_subscriptions, command_subscription)
                 except Exception as ex:
                     self._execution_ending(ex)
                 else:
                     self._execution_ending(None)
         finally:
-            self._executing = False
-            logger.debug("%s: Finished", self._name)
+            self.__execution_finished()
+
+    def _begin_cooperative_execution(self, stack: ExitStack, wake: Wake) -> CooperativeExecution:
+        # The equivalent of _execute() when hosted by a CooperativeExecutor. Rather than waiting on the event, the runnable is stepped by the executor whenever the
+        # event is set (which calls wake) or a tick is due. Everything that must be cleaned up when the runnable ends is added to the given stack.
+        logger.debug("%s: Running cooperatively", self._name)
+        self._executing = True
+        stack.callback(self.__execution_finished)
+        self._check_ready_to_execute()
+        self._event = _WakingAutoResetEvent(wake)
+        work_subscriptions, command_subscription = self.__subscribe(stack)
+        return _MultiBufferServicingCooperativeExecution(self, work_subscriptions, command_subscription)
+
+    def _service_buffers(self, work_subscriptions: List[Subscription[Any]], command_subscription: Subscription[Any]) -> None:
+        # Called each time the runnable is woken
+        self.__tick_if_due()
+        self.__service_command_buffer(command_subscription)
+        self.__service_input_buffers(work_subscriptions)
+
+    def __subscribe(self, stack: ExitStack) -> Tuple[List[Subscription[Any]], Subscription[Any]]:
+        work_subscriptions = [stack.enter_context(obs.subscribe(self._event)) for obs in self._observables]
+        command_subscription = stack.enter_context(self._get_command_message_buffer().subscribe(self._event))
+        return work_subscriptions, command_subscription
+
+    def __execution_finished(self) -> None:
+        self._executing = False
+        logger.debug("%s: Finished", self._name)
 
     def _on_tick(self, timestamp: float) -> None:
         """Derived classes should implement this method to make use of the regular ticking facility of the runnable.
@@ -383,3 +406,58 @@ class MultiBufferServicingRunnable(Runnable, ABC):
 
         # call on_tick, outside the lock
         self._on_tick(precision_timestamp())
+
+
+class _WakingAutoResetEvent(HighPrecisionAutoResetEvent):
+    """The event of a runnable hosted by a CooperativeExecutor. When set, it tells the executor that the runnable needs servicing."""
+
+    def __init__(self, wake: Wake) -> None:
+        super().__init__()
+        self._wake = wake
+
+    def set(self) -> None:
+        super().set()
+        self._wake()
+
+
+# noinspection PyProtectedMember
+class _MultiBufferServicingCooperativeExecution(CooperativeExecution):
+    """Steps a MultiBufferServicingRunnable in the same sequence as the loop in its _execute() method, minus the waiting."""
+
+    def __init__(self, runnable: MultiBufferServicingRunnable, work_subscriptions: List[Subscription[Any]], command_subscription: Subscription[Any]) -> None:
+        self._runnable = runnable
+        self._work_subscriptions = work_subscriptions
+        self._command_subscription = command_subscription
+        self._running = True
+        self._prepare_to_wait()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def step(self) -> bool:
+        if not self._running:
+            return False
+        try:
+            self._runnable._service_buffers(self._work_subscriptions, self._command_subscription)
+        except Exception as ex:
+            self._end(ex)
+        else:
+            self._prepare_to_wait()
+        return self._running
+
+    def interval_to_next_tick(self) -> Optional[float]:
+        return self._runnable._interval_to_next_tick()
+
+    def _prepare_to_wait(self) -> None:
+        try:
+            if self._runnable._should_continue():
+                self._runnable._pre_wait_hook()
+                return
+        except Exception as ex:
+            self._end(ex)
+        else:
+            self._end(None)
+
+    def _end(self, error: Optional[Exception]) -> None:
+        self._running = False
+        self._runnable._execution_ending(error)
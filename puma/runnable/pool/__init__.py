@@ -1,3 +1,11 @@
-from puma.runnable.pool.types import PoolJob, PoolJobCall, PoolType  # noqa: F401
-from puma.runnable.pool.pool_runnable import PoolRunnable  # noqa: F401, I100
+from puma.runnable.pool.types import PoolJob, PoolJobCall, PoolJobChunk, PoolJobChunkResult, PoolJobResult, PoolType, PoolWorkerRecycleRequest  # noqa: F401
+from puma.runnable.pool.pool_dispatch import PoolDispatch  # noqa: F401, I100
+from puma.runnable.pool.pool_scaling import PoolScaling, PoolScalingCallback, PoolScalingEvent, PoolScalingEventType  # noqa: F401
+from puma.runnable.pool.pool_worker_context import get_worker_context  # noqa: F401
+from puma.runnable.pool.pool_job_dispatcher import PoolJobDispatcher  # noqa: F401, I100
+from puma.runnable.pool.shared_queue_pool_job_dispatcher import SharedQueuePoolJobDispatcher  # noqa: F401
+from puma.runnable.pool.work_stealing_pool_job_dispatcher import WorkStealingPoolJobDispatcher  # noqa: F401
+from puma.runnable.pool.pool_result_collector import PoolJobFutures, PoolResultCollector  # noqa: F401, I100
+from puma.runnable.pool.pool_runnable import PoolRunnable  # noqa: F401
+from puma.runnable.pool.parallel_map_runnable import ParallelMapRunnable  # noqa: F401, I100
 from puma.runnable.pool.pool import Pool, ProcessPool, ThreadPool  # noqa: F401, I100
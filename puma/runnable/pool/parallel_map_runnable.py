@@ -0,0 +1,146 @@
+import concurrent.futures
+import logging
+from collections import deque
+from contextlib import ExitStack
+from typing import Any, Callable, Deque, Optional
+
+from puma.attribute import child_only, child_scope_value, copied, python_default
+from puma.buffer import Observable, Publishable, Publisher, Subscriber
+from puma.concurrent.futures.typed_future import TypedFuture
+from puma.environment import Environment, ProcessEnvironment, ThreadEnvironment
+from puma.runnable import MultiBufferServicingRunnable
+from puma.runnable.cooperative_execution import CooperativeExecution, Wake
+from puma.runnable.pool.pool import Pool, ProcessPool, RUNNER_CHECK_INTERVAL, ThreadPool
+from puma.timeouts import Timeouts
+from puma.unexpected_situation_action import UnexpectedSituationAction
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARALLEL_MAP_PUBLISH_TIMEOUT = 10.0
+
+
+class ParallelMapRunnable(MultiBufferServicingRunnable, Subscriber[Any]):
+    """A runnable which applies a function to each value arriving on its input buffer, on a pool of workers, and publishes the results to its output buffer in the
+    order in which the values arrived.
+
+    Each value is submitted to the pool as soon as it arrives. The futures of the values that are in flight are kept in the order of the values, which acts as a
+    reorder buffer: each time the runnable is woken (which it is whenever a job completes), the results at the head of the queue that are ready are published.
+    A result that completes out of order is held until the results of all preceding values have been published.
+
+    At most max_in_flight values are in flight at once. When that many are in flight, the runnable waits for the oldest to complete before submitting another, so
+    values back up in the input buffer rather than accumulating in the runnable.
+
+    The pool is created when the runnable starts executing, in the thread or process that executes it, and is ended when the runnable ends. Its workers are threads
+    or processes according to the given worker environment; for CPU-bound functions they should be processes, in which case the function, the values and the
+    results must all be pickleable.
+
+    When on_complete is received from the input buffer without an error, the runnable waits for the values in flight, publishes their results, then passes
+    on_complete to the output buffer. If the function raises an error, or on_complete is received with an error, the runnable ends and the error is passed on with
+    on_complete; the results of any values still in flight are discarded.
+    """
+    _map_function: Callable[..., Any] = python_default("_map_function")
+    _worker_count: int = copied("_worker_count")
+    _worker_environment: Environment = python_default("_worker_environment")
+    _max_in_flight: int = copied("_max_in_flight")
+    _publish_timeout: float = copied("_publish_timeout")
+    _publisher: Publisher[Any] = child_only("_publisher")
+    _pool: Optional[Pool] = child_only("_pool")
+    _in_flight: Deque[TypedFuture[Any]] = child_only("_in_flight")
+
+    def __init__(self, name: str, observable: Observable[Any], function: Callable[[Any], Any], output_buffer: Publishable[Any], worker_count: int, *,
+                 worker_environment: Optional[Environment] = None, max_in_flight: Optional[int] = None,
+                 publish_timeout: float = DEFAULT_PARALLEL_MAP_PUBLISH_TIMEOUT) -> None:
+        """Constructor.
+
+        Arguments:
+            name:               A name for the runnable, used for logging and to name its pool.
+            observable:         The buffer whose values are processed.
+            function:           Called on one of the workers with each value; the value it returns is published. Must be pickleable if the workers are processes.
+            output_buffer:      The buffer to which the results are published, in the order of the values.
+            worker_count:       The number of workers in the pool.
+            worker_environment: Whether the workers are threads (ThreadEnvironment) or processes (ProcessEnvironment, the default).
+            max_in_flight:      The greatest number of values that can be in flight at once. Defaults to twice the number of workers, so that each worker has a
+                                value queued for it while it works on another.
+            publish_timeout:    How long to wait for space in the output buffer, before raising queue.Full.
+        """
+        if not callable(function):
+            raise ValueError("A function must be supplied")
+        if worker_count < 1:
+            raise ValueError("There must be at least one worker")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("The maximum number of values in flight must be at least 1")
+        Timeouts.validate(publish_timeout)
+        super().__init__(name, [output_buffer])
+        self._map_function = function  # type: ignore
+        self._worker_count = worker_count
+        self._worker_environment = worker_environment or ProcessEnvironment()
+        self._max_in_flight = max_in_flight or 2 * worker_count
+        self._publish_timeout = publish_timeout
+        self._publisher = self._get_publisher(output_buffer)
+        self._pool = child_scope_value(None)
+        self._in_flight = child_scope_value(deque())
+        self._add_subscription(observable, self)
+
+    def on_value(self, value: Any) -> None:
+        pool = self._get_pool()
+        while len(self._in_flight) >= self._max_in_flight:
+            self._publish_result(self._wait_for_result(self._in_flight.popleft()))
+        future: TypedFuture[Any] = pool.submit(self._map_function, (value,))
+        event = self._event  # The future is resolved by the pool's result collector thread, which must not access the runnable's attributes
+        future.add_done_callback(lambda _: event.set())
+        self._in_flight.append(future)
+
+    def on_complete(self, error: Optional[BaseException]) -> None:
+        if error:
+            logger.debug("%s: Ending with an error, discarding %d values in flight", self._name, len(self._in_flight))
+            self._in_flight.clear()
+        else:
+            logger.debug("%s: Input complete, waiting for %d values in flight", self._name, len(self._in_flight))
+            while self._in_flight:
+                self._publish_result(self._wait_for_result(self._in_flight.popleft()))
+        self._publisher.publish_complete(error)
+
+    def _execute(self) -> None:
+        with self._create_pool() as pool:
+            self._pool = pool
+            try:
+                super()._execute()
+            finally:
+                self._pool = None
+
+    def _begin_cooperative_execution(self, stack: ExitStack, wake: Wake) -> CooperativeExecution:
+        self._pool = stack.enter_context(self._create_pool())
+        stack.callback(self._clear_pool)
+        return super()._begin_cooperative_execution(stack, wake)
+
+    def _pre_wait_hook(self) -> None:
+        # Called each time around the loop, including when woken by a job completing. Publishes the results that are ready, in order.
+        while self._in_flight and self._in_flight[0].done():
+            self._publish_result(self._in_flight.popleft().result())
+        if self._pool:
+            self._pool.check_for_exceptions()
+
+    def _create_pool(self) -> Pool:
+        name = f"{self._name} workers"
+        if isinstance(self._worker_environment, ThreadEnvironment):
+            return ThreadPool(self._worker_count, name, queue_size=self._max_in_flight)
+        return ProcessPool(self._worker_count, name, queue_size=self._max_in_flight)
+
+    def _clear_pool(self) -> None:
+        self._pool = None
+
+    def _get_pool(self) -> Pool:
+        if not self._pool:
+            raise RuntimeError(f"{self._name}: The pool has not been created")
+        return self._pool
+
+    def _wait_for_result(self, future: TypedFuture[Any]) -> Any:
+        # While waiting, the pool is checked for errors, so that a worker dying cannot leave the runnable waiting forever
+        while True:
+            try:
+                return future.result(RUNNER_CHECK_INTERVAL)
+            except concurrent.futures.TimeoutError:
+                self._get_pool().check_for_exceptions()
+
+    def _publish_result(self, result: Any) -> None:
+        self._publisher.publish_value(result, self._publish_timeout, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
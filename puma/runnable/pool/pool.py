@@ -1,103 +1,530 @@
+import concurrent.futures
+import itertools
+import logging
 import pickle
+import queue
+import sys
 from abc import ABC
-from typing import Any, Generic, List
+from collections import deque
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Generic, Hashable, Iterable, Iterator, List, NoReturn, Optional, Sequence, Tuple
 
-from puma.buffer import Publishable
-from puma.buffer.implementation.managed_queues import ManagedQueueTypes
+from puma.buffer import Buffer, Publishable, Publisher
+from puma.concurrent.cache.result_cache import ResultCache, resolved_future
+from puma.concurrent.futures.typed_future import TypedFuture
 from puma.context import ContextManager, Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager, must_be_context_managed
 from puma.environment import Environment, ProcessEnvironment, ThreadEnvironment
-from puma.runnable.pool import PoolJob, PoolJobCall, PoolRunnable, PoolType
-from puma.runnable.runner import Runner
+from puma.helpers.os import is_windows
+from puma.primitives import ThreadLock
+from puma.runnable.pool import PoolDispatch, PoolJob, PoolJobCall, PoolJobChunk, PoolJobChunkResult, PoolJobDispatcher, PoolJobFutures, PoolResultCollector, PoolRunnable, \
+    PoolScaling, PoolScalingCallback, PoolScalingEvent, PoolScalingEventType, PoolType, PoolWorkerRecycleRequest, SharedQueuePoolJobDispatcher, WorkStealingPoolJobDispatcher
+from puma.runnable.runner import Runner, RunnerGroup, RunnerMonitor, ThreadRunner
+from puma.runnable.runner.runner import RunnerStillAliveError
 from puma.timeouts import TIMEOUT_INFINITE, Timeouts
 
+logger = logging.getLogger(__name__)
+
+RESULTS_BUFFER_SIZE = 1000  # Size of the buffer on which the workers return the results of chunks of jobs to the result collector
+
+# When the pool ends, the result collector is given this long to receive the results of the jobs that had completed
+RESULT_COLLECTION_TIMEOUT = 10.0
+
+# While waiting for the result of a job, the runners are checked for errors at this interval, so that a worker dying cannot leave the caller waiting forever
+RUNNER_CHECK_INTERVAL = 1.0
+
+_SCALING_EVENT_DESCRIPTIONS = {
+    PoolScalingEventType.WORKER_ADDED: "added",
+    PoolScalingEventType.WORKER_RETIRED: "retired",
+    PoolScalingEventType.WORKER_RECYCLED: "recycled",
+}
+
 
 @must_be_context_managed
 class Pool(Generic[PoolType], ContextManager["Pool[PoolType]"], ABC):
+    """Runs jobs on a number of workers, each of which is a runnable executed by a runner in the given environment.
+
+    Each submitted job is given an id, which is carried to the worker with the job and returned with its result. A result collector, running in a thread in the
+    owner's process, uses the id to resolve the future that was returned when the job was submitted. Optionally, the values returned by successful jobs are also
+    published, in the order in which they complete, to a result buffer.
+
+    An elastic pool (one given a PoolScaling) starts with the given number of workers and adds more, up to its maximum size, while jobs are being queued. Its workers
+    retire when they have been idle for a while, down to its minimum size. Workers that have retired are removed from the pool when it next checks its runners
+    for errors, which it does whenever a job is submitted and while waiting for results. Registered callbacks are given a PoolScalingEvent for each change.
+
+    Expensive set-up that jobs need, such as loading a model or opening a connection, can be done once in each worker by an initializer, given when the pool is
+    constructed. The value returned by the initializer is the worker's context, which its jobs obtain by calling get_worker_context().
 
-    def __init__(self, size: int, name: str, result_buffer: Publishable[PoolType], environment: Environment) -> None:
+    To bound the growth of a worker's memory use, workers can be recycled once they have run a given number of jobs (or, in a ProcessPool, once their resident
+    set size reaches a given number of bytes). A worker that reaches its limit asks to be replaced, along with the results of the chunk it has just run, and
+    carries on running jobs until it is. The pool replaces it when it next checks its runners, stopping it and starting a new worker with the same index, which
+    runs the initializer again and takes over any jobs queued for the old one.
+
+    A pool given a ResultCache looks up each job in the cache before dispatching it; a job that has already been run with the same arguments is not dispatched, its
+    future being resolved with the cached result straight away.
+    """
+
+    def __init__(self, size: int, name: str, result_buffer: Optional[Publishable[PoolType]], environment: Environment, *,
+                 queue_size: int = 1, dispatch: PoolDispatch = PoolDispatch.SHARED_QUEUE, scaling: Optional[PoolScaling] = None,
+                 initializer: Optional[Callable[..., Any]] = None, initargs: Tuple[Any, ...] = (), max_jobs_per_worker: Optional[int] = None,
+                 max_worker_rss: Optional[int] = None, result_cache: Optional[ResultCache] = None) -> None:
+        """Constructor.
+
+        Arguments:
+            size: The number of workers; for an elastic pool, the number started initially.
+            name: Name of the pool, used for logging.
+            result_buffer: Optional buffer to which the values returned by successful jobs are published, as well as being set on the jobs' futures.
+                           The pool publishes on_complete to this buffer when it ends.
+            environment: The environment in which the workers are run.
+            queue_size: The number of submissions (each a single job, or a chunk of jobs) that can be queued while all the workers are busy; with
+                        PoolDispatch.PER_WORKER_QUEUES, the number that can be queued for each worker.
+            dispatch: How jobs are given to the workers. Affinity keys can only be given when submitting jobs if this is PoolDispatch.PER_WORKER_QUEUES.
+            scaling: If given, the pool is elastic, and varies its number of workers as described by the PoolScaling. Only supported with PoolDispatch.SHARED_QUEUE,
+                     because the per-worker queues rely on the set of workers not changing.
+            initializer: If given, each worker calls this with initargs when it starts, in the thread in which it runs its jobs. The value it returns is the
+                         worker's context (see get_worker_context()). If it raises an error, the worker ends, and the error is raised by check_for_exceptions().
+            initargs: The arguments to the initializer.
+            max_jobs_per_worker: If given, each worker is replaced once it has run this many jobs. The limit is checked after each chunk, so a worker given chunks
+                                 of several jobs may run a few more.
+            max_worker_rss: If given, each worker is replaced once its resident set size has reached this many bytes. Only meaningful if each worker is in a
+                            process of its own. The current resident set size is only available on Linux; elsewhere, the peak resident set size is used. Not supported on Windows.
+            result_cache: If given, jobs whose results are in the cache are not dispatched, and the results of successful jobs are added to it. Cannot be used with
+                          a result buffer, since cached results are not published.
+        """
+        if size < 1:
+            raise ValueError("A pool must start with at least one worker")
+        if scaling:
+            if dispatch != PoolDispatch.SHARED_QUEUE:
+                raise ValueError("An elastic pool must use PoolDispatch.SHARED_QUEUE")
+            if not scaling.min_size <= size <= scaling.max_size:
+                raise ValueError("The initial size of an elastic pool must be between its minimum and maximum sizes")
+        if max_jobs_per_worker is not None and max_jobs_per_worker < 1:
+            raise ValueError("The maximum number of jobs per worker must be at least 1")
+        if max_worker_rss is not None:
+            if max_worker_rss < 1:
+                raise ValueError("The maximum resident set size of a worker must be at least 1")
+            if is_windows():
+                raise ValueError("Limiting the resident set size of workers is not supported on Windows")
+        if result_cache and result_buffer:
+            raise ValueError("A result cache cannot be used with a result buffer")
         self._size = size
+        self._max_size = scaling.max_size if scaling else size
+        self._scaling = scaling
         self._name = name
-        self._result_buffer: Publishable[PoolType] = result_buffer
+        self._result_buffer: Optional[Publishable[PoolType]] = result_buffer
         self._environment = environment
-        self._pool_job_queue: ManagedQueueTypes[PoolJobCall] = self._environment.create_managed_queue(PoolJobCall, 1)
-        self._pool_runnables: List[PoolRunnable] = []
-        self._pool_runners: List[Runner] = []
+        self._dispatcher = self._create_dispatcher(dispatch, queue_size)
+        self._futures = PoolJobFutures()
+        self._job_ids = itertools.count()
+        self._results_buffer: Optional[Buffer[PoolJobChunkResult]] = None
+        self._results_publisher: Optional[Publisher[PoolJobChunkResult]] = None
+        self._collector_runner: Optional[Runner] = None
+        self._pool_runnables: Dict[int, PoolRunnable] = {}  # Keyed by worker index
+        self._pool_runners: Dict[int, Runner] = {}
+        self._runner_group: Optional[RunnerGroup] = None
+        self._runner_monitor: Optional[RunnerMonitor] = None
+        self._scaling_callbacks: List[PoolScalingCallback] = []
+        self._initializer = initializer
+        self._initargs = initargs
+        self._max_jobs_per_worker = max_jobs_per_worker
+        self._max_worker_rss = max_worker_rss
+        self._result_cache = result_cache
+        # Requests from workers to be replaced are received by the result collector, in its thread, and acted on in the owner's thread
+        self._recycle_requests_lock = ThreadLock()
+        self._recycle_requests: List[PoolWorkerRecycleRequest] = []
 
     def __enter__(self) -> "Pool[PoolType]":
+        self._dispatcher.__enter__()
+
+        # If anything fails, for example a worker's initializer, whatever has been started is ended again
+        try:
+            self._enter_runners()
+        except BaseException:
+            self.__exit__(*sys.exc_info())
+            raise
+        return self
 
-        self._pool_job_queue.__enter__()
-        self._result_publisher = self._result_buffer.publish().__enter__()
+    def _enter_runners(self) -> None:
+        # The pool keeps a publisher on the workers' results buffer, so that it can publish on_complete, ending the result collector, once all the workers have ended
+        self._results_buffer = self._environment.create_buffer(PoolJobChunkResult, RESULTS_BUFFER_SIZE, f"Results of {self._name}").__enter__()
+        self._results_publisher = self._results_buffer.publish().__enter__()
+
+        collector = PoolResultCollector(f"Result collector of {self._name}", self._results_buffer, self._futures, self._result_buffer,
+                                        on_recycle_request=self._on_recycle_request)
+        self._collector_runner = ThreadRunner(collector, f"Result collector runner of {self._name}").__enter__()
+        self._collector_runner.start_blocking()
 
         for i in range(self._size):
-            name_suffix = f"#{i} in {self._name}"
-            runnable = self._create_pool_runnable(f"Runnable {name_suffix}", self._pool_job_queue)
-            runner = self._environment.create_runner(runnable, f"Runner {name_suffix}")
+            self._create_worker(i)
 
-            runner.__enter__()
-            runner.start()
+        self._runner_group = RunnerGroup(self._pool_runners.values(), f"Runners in {self._name}")
+        self._runner_group.__enter__()
+        self._runner_monitor = RunnerMonitor(list(self._pool_runners.values()) + [self._collector_runner], f"Monitor of {self._name}").__enter__()
+        if self._scaling:
+            self._runner_monitor.add_callback(self._on_runner_ended)
+        self._runner_group.start_blocking()
 
-            self._pool_runnables.append(runnable)
-            self._pool_runners.append(runner)
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        if self._runner_monitor:
+            self._runner_monitor.__exit__(exc_type, exc_value, traceback)
+            self._runner_monitor = None
 
-        for runner in self._pool_runners:
-            runner.wait_until_running()
+        # Stop all runners together, then join them with a shared deadline. This raises the error of any worker that failed, for example in the initializer, so
+        # the result collector is ended whether or not it succeeds.
+        try:
+            if self._runner_group:
+                runner_group, self._runner_group = self._runner_group, None
+                runner_group.__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._end_result_collection(exc_type, exc_value, traceback)
 
-        return self
+    def _end_result_collection(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        # All the workers have ended, so all their results are in the buffer; completing it lets the collector receive them and then end
+        if self._results_publisher:
+            self._results_publisher.publish_complete(None)
+            self._results_publisher.__exit__(exc_type, exc_value, traceback)
+            self._results_publisher = None
 
-    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
-        # Kill all runners
-        for runner in self._pool_runners:
-            runner.stop()
+        if self._collector_runner:
+            try:
+                self._collector_runner.join(RESULT_COLLECTION_TIMEOUT)
+            except RunnerStillAliveError:
+                logger.warning("%s: Result collector did not end, some results may have been lost", self._name)
+            finally:
+                self._collector_runner.__exit__(exc_type, exc_value, traceback)
+                self._collector_runner = None
+
+        if self._results_buffer:
+            self._results_buffer.__exit__(exc_type, exc_value, traceback)
+            self._results_buffer = None
 
-        for runner in self._pool_runners:
-            runner.join()
+        # Jobs that were still queued, or running, when the pool was stopped will never produce a result
+        self._futures.fail_all(RuntimeError(f"{self._name} ended before the job completed"))
+
+        self._dispatcher.__exit__(exc_type, exc_value, traceback)
+
+        self._pool_runnables = {}
+        self._pool_runners = {}
+
+    @ensure_used_within_context_manager
+    def check_for_exceptions(self) -> None:
+        """Raises the first error found in any of the pool's runners. Only the runners that have reported a change of status since they were last checked are checked.
 
-        for runner in self._pool_runners:
-            runner.__exit__(exc_type, exc_value, traceback)
+        This is done whenever a job is submitted, and while waiting for results. It is also when workers that have retired from an elastic pool are removed, and
+        workers that have reached their limits are replaced.
+        """
+        if self._runner_monitor:
+            self._runner_monitor.check_for_exceptions()
+        with self._recycle_requests_lock:
+            recycle_requests, self._recycle_requests = self._recycle_requests, []
+        for request in recycle_requests:
+            self._recycle_worker(request)
 
-        self._result_publisher.publish_complete(None)
+    def get_worker_count(self) -> int:
+        """Returns the number of workers in the pool. In an elastic pool, this includes workers that have retired but not yet been removed."""
+        return len(self._pool_runners)
 
-        self._result_publisher.__exit__(exc_type, exc_value, traceback)
+    def add_scaling_callback(self, callback: PoolScalingCallback) -> None:
+        """Registers a callable that is given a PoolScalingEvent whenever an elastic pool adds or removes a worker, or a worker is recycled. Callbacks are called in
+        the owner's thread.
+        """
+        self._scaling_callbacks.append(callback)
 
-        self._pool_runnables = []
-        self._pool_runners = []
+    def remove_scaling_callback(self, callback: PoolScalingCallback) -> None:
+        """Unregisters a callable registered using add_scaling_callback(). Does nothing if it is not registered."""
+        if callback in self._scaling_callbacks:
+            self._scaling_callbacks.remove(callback)
 
     @ensure_used_within_context_manager
-    def submit(self, job: PoolJob, args: Any, timeout: float = TIMEOUT_INFINITE) -> None:
+    def submit(self, job: PoolJob, args: Any, timeout: float = TIMEOUT_INFINITE, *, affinity_key: Optional[Hashable] = None) -> TypedFuture[PoolType]:
+        """Submits a job, to be called with the given arguments on one of the workers. Returns a future which receives the value returned, or error raised, by the job.
 
-        # Ensure job can be pickled
-        try:
-            pickle.dumps(job)
-        except AttributeError as e:
-            raise RuntimeError("Please provide a pickleable job (ie, not a lambda)") from e
+        Blocks while all the workers are busy and the job queue is full, raising queue.Full if this is still the case when the timeout expires.
+        Jobs submitted with the same affinity key are all run by the same worker, which may have cached the data they use (see PoolDispatch.PER_WORKER_QUEUES).
+        """
+        return self._submit_chunk(job, [args], timeout, affinity_key)[0]
 
-        # Ensure args can be pickled
-        try:
-            pickle.dumps(args)
-        except AttributeError:
-            for arg in args:
+    @ensure_used_within_context_manager
+    def submit_many(self, job: PoolJob, args_iterable: Iterable[Any], chunksize: int = 1, timeout: float = TIMEOUT_INFINITE, *,
+                    affinity_key: Optional[Hashable] = None) -> List[TypedFuture[PoolType]]:
+        """Submits a job to be called once with each of the given sets of arguments. Returns the futures of the calls, in the same order as the arguments.
+
+        The calls are divided into chunks of the given size. Each chunk is dispatched to a worker as a single item, and the worker returns the results of all its calls
+        together, so fine-grained jobs are best submitted with a chunk size large enough for the cost of dispatching a chunk to be small compared with running it.
+
+        The timeout and affinity key apply to the submission of each chunk; see submit().
+        """
+        futures: List[TypedFuture[PoolType]] = []
+        for chunk_args in _split_into_chunks(args_iterable, chunksize):
+            futures.extend(self._submit_chunk(job, chunk_args, timeout, affinity_key))
+        return futures
+
+    @ensure_used_within_context_manager
+    def map(self, job: PoolJob, iterable: Iterable[Any], chunksize: int = 1) -> List[PoolType]:
+        """Calls the job with each item of the iterable, on the workers, and returns the values returned, in the same order as the items.
+
+        The items are submitted in chunks of the given size; see submit_many().
+        If any call raises an error, then the first such error (in the order of the items) is raised, once the preceding calls have completed.
+        """
+        return list(self.imap(job, iterable, chunksize))
+
+    @ensure_used_within_context_manager
+    def imap(self, job: PoolJob, iterable: Iterable[Any], chunksize: int = 1) -> Iterator[PoolType]:
+        """Like map(), but returns an iterator which yields each value as soon as it and the values for all preceding items are available.
+
+        Items are taken from the iterable as the workers are able to accept them, so the iterable need not be finite; results are yielded while further items are submitted.
+        """
+        in_flight: Deque[TypedFuture[PoolType]] = deque()
+        for chunk in _split_into_chunks(iterable, chunksize):
+            in_flight.extend(self._submit_chunk(job, [(item,) for item in chunk], TIMEOUT_INFINITE, None))
+            while in_flight and in_flight[0].done():
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield self._wait_for_result(in_flight.popleft())
+
+    @ensure_used_within_context_manager
+    def imap_unordered(self, job: PoolJob, iterable: Iterable[Any], chunksize: int = 1) -> Iterator[PoolType]:
+        """Like imap(), but yields the values in the order in which the calls complete, rather than the order of the items.
+
+        If a call raises an error, it is raised when that call completes.
+        """
+        completed: "queue.Queue[concurrent.futures.Future[PoolType]]" = queue.Queue()
+        outstanding = 0
+        for chunk in _split_into_chunks(iterable, chunksize):
+            for submitted in self._submit_chunk(job, [(item,) for item in chunk], TIMEOUT_INFINITE, None):
+                submitted.add_done_callback(completed.put)
+                outstanding += 1
+            while True:
                 try:
-                    pickle.dumps(arg)
-                except AttributeError as e:
-                    raise RuntimeError(f"Please provide pickleable arguments, unable to pickle {arg}") from e
+                    future = completed.get_nowait()
+                except queue.Empty:
+                    break
+                outstanding -= 1
+                yield future.result()
+        while outstanding:
+            future = self._wait_for_completed(completed)
+            outstanding -= 1
+            yield future.result()
+
+    def _submit_chunk(self, job: PoolJob, args_list: Sequence[Any], timeout: float, affinity_key: Optional[Hashable]) -> List[TypedFuture[PoolType]]:
+        # Check for any exceptions that have occurred in the runners. Only those that have reported a change of status since the last check are examined.
+        self.check_for_exceptions()
+        if not self._result_cache:
+            return self._dispatch_chunk(job, args_list, timeout, affinity_key)
+
+        # Only the calls whose results are not cached are dispatched, as a chunk of their own
+        futures: List[Optional[TypedFuture[PoolType]]] = []
+        uncached_keys: List[Optional[str]] = []
+        uncached_args_list: List[Any] = []
+        for args in args_list:
+            key = ResultCache.make_key(job, args)
+            found, result = self._result_cache.get(key) if key else (False, None)
+            if found:
+                futures.append(resolved_future(result))
+            else:
+                futures.append(None)
+                uncached_keys.append(key)
+                uncached_args_list.append(args)
+        if uncached_args_list:
+            dispatched = iter(self._dispatch_chunk(job, uncached_args_list, timeout, affinity_key))
+            for index, key in zip((i for i, future in enumerate(futures) if future is None), uncached_keys):
+                future = next(dispatched)
+                if key:
+                    self._result_cache.put_when_done(key, future)
+                futures[index] = future
+        return [future for future in futures if future is not None]
+
+    def _dispatch_chunk(self, job: PoolJob, args_list: Sequence[Any], timeout: float, affinity_key: Optional[Hashable]) -> List[TypedFuture[PoolType]]:
+        job_calls = tuple(PoolJobCall(job, args, job_id) for args, job_id in zip(args_list, self._job_ids))
+        job_ids = [job_call.job_id for job_call in job_calls]
+        chunk = self._make_chunk(job_calls)
+        futures = self._futures.add(job_ids)
+
+        # Send the chunk straight to an idle worker if there is one, waking it; otherwise it is queued for the next worker to become free
+        try:
+            index = self._dispatch(chunk, timeout, affinity_key)
+        except BaseException:
+            self._futures.discard(job_ids)
+            raise
+        if index is not None:
+            self._pool_runnables[index].send_chunk(chunk)
+        return futures
+
+    def _dispatch(self, chunk: PoolJobChunk, timeout: float, affinity_key: Optional[Hashable]) -> Optional[int]:
+        if not self._scaling:
+            return self._dispatcher.submit(chunk, timeout, affinity_key)
+
+        # An elastic pool waits for space in the queue for no longer than the scale-up wait at a time, adding a worker each time that wait expires.
+        # The workers are counted by the dispatcher, which stops counting a worker as soon as it retires, rather than when the pool sees it end.
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        while True:
+            remaining = max(end_time - monotonic(), 0.0)
+            can_grow = self._dispatcher.get_worker_count() < self._max_size
+            try:
+                index = self._dispatcher.submit(chunk, min(remaining, self._scaling.scale_up_wait) if can_grow else remaining, affinity_key)
+            except queue.Full:
+                if not can_grow or monotonic() >= end_time:
+                    raise
+                self._add_worker(f"a submission waited {self._scaling.scale_up_wait} seconds for space in the queue")
+            else:
+                if index is None and can_grow:
+                    queued_count = self._dispatcher.get_queued_count()
+                    if queued_count >= self._scaling.scale_up_backlog or self._dispatcher.get_worker_count() == 0:
+                        self._add_worker(f"{queued_count} submissions are queued")
+                return index
+
+    def _add_worker(self, reason: str) -> None:
+        index = self._get_free_index()
+        self._start_worker(index)
+        self._report_scaling_event(PoolScalingEventType.WORKER_ADDED, index, reason)
 
-        # Check for any exceptions that have occurred in the runners
-        for runner in self._pool_runners:
-            runner.check_for_exceptions()
+    def _get_free_index(self) -> int:
+        # Only called when the dispatcher counts fewer workers than the maximum. If every index is in use, then some are held by workers that have retired but
+        # have not yet been seen to end; they end promptly, and are removed by _on_runner_ended() when the monitor sees them end.
+        assert self._runner_monitor
+        while True:
+            index = next((i for i in range(self._max_size) if i not in self._pool_runners), None)
+            if index is not None:
+                return index
+            self._runner_monitor.wait_any(RUNNER_CHECK_INTERVAL)
+            self._runner_monitor.check_for_exceptions()
 
-        self._pool_job_queue.put(PoolJobCall(job, args), True, Timeouts.timeout_for_queue(timeout))
+    def _on_recycle_request(self, request: PoolWorkerRecycleRequest) -> None:
+        # Called by the result collector, in its thread, before it resolves the futures of the jobs in the chunk that came with the request. So, once a caller
+        # has the result of the job that took a worker to its limit, the pool's next check of its runners replaces that worker.
+        with self._recycle_requests_lock:
+            self._recycle_requests.append(request)
 
-    def _create_pool_runnable(self, name: str, queue: ManagedQueueTypes[PoolJobCall]) -> PoolRunnable:
-        return PoolRunnable(name, self._result_buffer, queue)
+    def _recycle_worker(self, request: PoolWorkerRecycleRequest) -> None:
+        # Stops a worker that has reached one of its limits, and starts a new one with the same index, which takes over any chunks queued for the old one.
+        # A worker stops after finishing its current chunk, and the dispatcher no longer sends it chunks once it has been removed, so no jobs are lost.
+        runner = self._pool_runners.get(request.worker_index)
+        if runner is None:
+            return
+        assert self._runner_group and self._runner_monitor
+        self._runner_monitor.remove(runner)
+        self._dispatcher.remove_worker(request.worker_index)
+        self._runner_group.remove(runner)  # Raises the runner's error, if it failed
+        self._start_worker(request.worker_index)
+        self._report_scaling_event(PoolScalingEventType.WORKER_RECYCLED, request.worker_index, request.reason)
+
+    def _start_worker(self, index: int) -> None:
+        assert self._runner_group and self._runner_monitor
+        runner = self._create_worker(index)
+        self._runner_group.add(runner)
+        self._runner_monitor.add(runner)
+        runner.start_blocking()
+
+    def _create_worker(self, index: int) -> Runner:
+        name_suffix = f"#{index} in {self._name}"
+        runnable = self._create_pool_runnable(f"Runnable {name_suffix}", self._dispatcher, index)
+        runner = self._environment.create_runner(runnable, f"Runner {name_suffix}")
+        self._dispatcher.add_worker(index)
+        self._pool_runnables[index] = runnable
+        self._pool_runners[index] = runner
+        return runner
+
+    def _on_runner_ended(self, runner: Runner) -> None:
+        # Called by the runner monitor, in the owner's thread, when a runner is found to have ended. In an elastic pool, a worker that ends has retired, or failed.
+        index = next((i for i, pool_runner in self._pool_runners.items() if pool_runner is runner), None)
+        if index is None:
+            return
+        assert self._runner_group and self._runner_monitor
+        del self._pool_runnables[index]
+        del self._pool_runners[index]
+        self._runner_monitor.remove(runner)
+        self._runner_group.remove(runner)  # Raises the runner's error, if it failed
+        self._report_scaling_event(PoolScalingEventType.WORKER_RETIRED, index, "it was idle")
+
+    def _report_scaling_event(self, event_type: PoolScalingEventType, index: int, reason: str) -> None:
+        event = PoolScalingEvent(event_type, index, len(self._pool_runners), reason)
+        logger.info("%s: Worker #%d %s because %s; now %d workers", self._name, index, _SCALING_EVENT_DESCRIPTIONS[event_type], reason, event.worker_count)
+        for callback in list(self._scaling_callbacks):
+            callback(event)
+
+    def _make_chunk(self, job_calls: Tuple[PoolJobCall, ...]) -> PoolJobChunk:
+        # Workers in threads are given the calls as they are, without pickling them
+        return PoolJobChunk(job_calls)
+
+    def _wait_for_result(self, future: TypedFuture[PoolType]) -> PoolType:
+        while True:
+            try:
+                return future.result(RUNNER_CHECK_INTERVAL)
+            except concurrent.futures.TimeoutError:
+                self.check_for_exceptions()
+
+    def _wait_for_completed(self, completed: "queue.Queue[concurrent.futures.Future[PoolType]]") -> "concurrent.futures.Future[PoolType]":
+        while True:
+            try:
+                return completed.get(timeout=RUNNER_CHECK_INTERVAL)
+            except queue.Empty:
+                self.check_for_exceptions()
+
+    def _create_dispatcher(self, dispatch: PoolDispatch, queue_size: int) -> PoolJobDispatcher:
+        if dispatch == PoolDispatch.SHARED_QUEUE:
+            return SharedQueuePoolJobDispatcher(self._environment, self._max_size, self._name, queue_size=queue_size)
+        elif dispatch == PoolDispatch.PER_WORKER_QUEUES:
+            return WorkStealingPoolJobDispatcher(self._environment, self._max_size, self._name, queue_size=queue_size)
+        else:
+            raise ValueError(f"Unsupported dispatch: {dispatch}")
+
+    def _create_pool_runnable(self, name: str, dispatcher: PoolJobDispatcher, index: int) -> PoolRunnable:
+        assert self._results_buffer is not None
+        return PoolRunnable(name, self._results_buffer, dispatcher, index,
+                            idle_timeout=self._scaling.idle_timeout if self._scaling else None, min_worker_count=self._scaling.min_size if self._scaling else 0,
+                            initializer=self._initializer, initargs=self._initargs, max_jobs=self._max_jobs_per_worker, max_rss=self._max_worker_rss)
 
 
 class ThreadPool(Pool):
+    """A Pool whose workers are threads in the owner's process. Since they share the process's memory, workers can only be recycled after a number of jobs."""
 
-    def __init__(self, size: int, name: str, result_buffer: Publishable[PoolType]) -> None:
-        super().__init__(size, name, result_buffer, ThreadEnvironment())
+    def __init__(self, size: int, name: str, result_buffer: Optional[Publishable[PoolType]] = None, *,
+                 queue_size: int = 1, dispatch: PoolDispatch = PoolDispatch.SHARED_QUEUE, scaling: Optional[PoolScaling] = None,
+                 initializer: Optional[Callable[..., Any]] = None, initargs: Tuple[Any, ...] = (), max_jobs_per_worker: Optional[int] = None,
+                 result_cache: Optional[ResultCache] = None) -> None:
+        super().__init__(size, name, result_buffer, ThreadEnvironment(), queue_size=queue_size, dispatch=dispatch, scaling=scaling,
+                         initializer=initializer, initargs=initargs, max_jobs_per_worker=max_jobs_per_worker, result_cache=result_cache)
 
 
 class ProcessPool(Pool):
+    """A Pool whose workers are child processes. The jobs, their arguments and the initializer and its arguments must be pickleable."""
+
+    def __init__(self, size: int, name: str, result_buffer: Optional[Publishable[PoolType]] = None, *,
+                 queue_size: int = 1, dispatch: PoolDispatch = PoolDispatch.SHARED_QUEUE, scaling: Optional[PoolScaling] = None,
+                 initializer: Optional[Callable[..., Any]] = None, initargs: Tuple[Any, ...] = (), max_jobs_per_worker: Optional[int] = None,
+                 max_worker_rss: Optional[int] = None, result_cache: Optional[ResultCache] = None) -> None:
+        super().__init__(size, name, result_buffer, ProcessEnvironment(), queue_size=queue_size, dispatch=dispatch, scaling=scaling,
+                         initializer=initializer, initargs=initargs, max_jobs_per_worker=max_jobs_per_worker, max_worker_rss=max_worker_rss,
+                         result_cache=result_cache)
+
+    def _make_chunk(self, job_calls: Tuple[PoolJobCall, ...]) -> PoolJobChunk:
+        # The calls are pickled here, once, which also checks that they can be sent to a worker process; the queues then pass the bytes through as they are
+        try:
+            return PoolJobChunk(pickled_calls=pickle.dumps(job_calls))
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            _raise_unpickleable_error(job_calls, e)
+
+
+def _raise_unpickleable_error(job_calls: Tuple[PoolJobCall, ...], error: BaseException) -> NoReturn:
+    # Finds out which part of the calls could not be pickled. Only done when pickling has failed, so it does not add to the cost of submitting jobs.
+    try:
+        pickle.dumps(job_calls[0].job)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise RuntimeError("Please provide a pickleable job (ie, not a lambda)") from e
+    for job_call in job_calls:
+        for arg in job_call.args:
+            try:
+                pickle.dumps(arg)
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                raise RuntimeError(f"Please provide pickleable arguments, unable to pickle {arg}") from e
+    raise RuntimeError("Unable to pickle the job's arguments") from error
+
 
-    def __init__(self, size: int, name: str, result_buffer: Publishable[PoolType]) -> None:
-        super().__init__(size, name, result_buffer, ProcessEnvironment())
+def _split_into_chunks(iterable: Iterable[Any], chunksize: int) -> Iterator[List[Any]]:
+    if chunksize < 1:
+        raise ValueError("The chunk size must be at least 1")
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
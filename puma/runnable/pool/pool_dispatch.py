@@ -0,0 +1,11 @@
+from enum import Enum, unique
+
+
+@unique
+class PoolDispatch(Enum):
+    """How a Pool gives the jobs submitted to it to its workers."""
+    SHARED_QUEUE = "shared_queue"  # Jobs that cannot be sent to an idle worker are put on one queue, and taken by whichever worker is next free
+    PER_WORKER_QUEUES = "per_worker_queues"  # Each worker has a queue; jobs go to the least loaded worker, or the one chosen by their affinity key
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}.{self.name}>"
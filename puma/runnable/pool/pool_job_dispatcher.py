@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+from typing import Hashable, Optional
+
+from puma.context import ContextManager, Exit_1, Exit_2, Exit_3
+from puma.runnable.pool import PoolJobChunk
+from puma.timeouts import TIMEOUT_INFINITE
+
+# A worker that has claimed a queued job waits this long for it to arrive. The job has already been put on the queue, so it should arrive almost immediately.
+QUEUED_JOB_ARRIVAL_TIMEOUT = 10.0
+
+
+class PoolJobDispatcher(ContextManager["PoolJobDispatcher"], ABC):
+    """Decides, for each chunk of jobs submitted to a Pool, whether it is sent straight to an idle worker or queued for a worker to take when it becomes free.
+
+    The dispatcher is shared by the pool and its workers, so it is created from the pool's environment and must be usable from the workers' threads or processes.
+    """
+
+    @abstractmethod
+    def __enter__(self) -> 'PoolJobDispatcher':
+        raise NotImplementedError()
+
+    @abstractmethod
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        raise NotImplementedError()
+
+    @abstractmethod
+    def submit(self, chunk: PoolJobChunk, timeout: float = TIMEOUT_INFINITE, affinity_key: Optional[Hashable] = None) -> Optional[int]:
+        """Called by the pool. Returns the index of an idle worker, which is marked as busy and to which the caller must send the chunk; or None if the chunk was queued.
+
+        Blocks while the chunk can neither be sent nor queued. Raises queue.Full if this is still the case when the timeout expires.
+        If an affinity key is given, then the chunk is given to the worker chosen for that key, if the dispatcher supports this; otherwise ValueError is raised.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def next_job(self, index: int) -> Optional[PoolJobChunk]:
+        """Called by a worker when it is ready for more work. Returns the next chunk for the worker, or None if there is none, in which case the worker is marked as idle."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def set_busy(self, index: int) -> None:
+        """Called by a worker when it is ending, so that no more jobs are sent to it."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_idle_count(self) -> int:
+        """Returns the number of workers that are currently idle."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_queued_count(self) -> int:
+        """Returns the number of chunks that are queued, waiting for a worker to take them."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_worker_count(self) -> int:
+        """Returns the number of workers that have been added and have not retired or been removed. A worker that has retired is no longer counted, even if the
+        pool has not yet seen it end.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def add_worker(self, index: int) -> None:
+        """Called by the pool before it starts a worker, including any started after the pool has started."""
+        raise NotImplementedError()
+
+    @abstractmethod
+    def try_retire(self, index: int, min_worker_count: int) -> bool:
+        """Called by an idle worker that wants to end. Returns True, having marked the worker as busy so that no more jobs are sent to it, if the worker is still idle
+        and more than the given number of workers would remain; otherwise returns False and the worker must carry on.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def remove_worker(self, index: int) -> None:
+        """Called by the pool when it stops a worker that has not retired, for example to replace it with a new worker having the same index."""
+        raise NotImplementedError()
@@ -0,0 +1,110 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from puma.attribute import python_default
+from puma.buffer import Observable, Publishable, Publisher, Subscriber
+from puma.concurrent.futures.typed_future import TypedFuture
+from puma.primitives import ThreadLock
+from puma.runnable import MultiBufferServicingRunnable
+from puma.runnable.pool import PoolJobChunkResult, PoolJobResult, PoolWorkerRecycleRequest
+
+RecycleCallback = Callable[[PoolWorkerRecycleRequest], None]
+
+logger = logging.getLogger(__name__)
+
+
+class PoolJobFutures:
+    """The futures of the jobs submitted to a Pool that have not yet produced a result, keyed by job id. Shared by the pool and its result collector."""
+
+    def __init__(self) -> None:
+        self._lock = ThreadLock()
+        self._futures: Dict[int, TypedFuture[Any]] = {}
+
+    def add(self, job_ids: Sequence[int]) -> List[TypedFuture[Any]]:
+        """Creates and returns the futures of jobs that are being submitted. A job cannot be withdrawn once submitted, so its future cannot be cancelled."""
+        futures: List[TypedFuture[Any]] = [TypedFuture() for _ in job_ids]
+        for future in futures:
+            future.set_running_or_notify_cancel()
+        with self._lock:
+            self._futures.update(zip(job_ids, futures))
+        return futures
+
+    def discard(self, job_ids: Sequence[int]) -> None:
+        """Forgets the futures of jobs that could not be submitted."""
+        with self._lock:
+            for job_id in job_ids:
+                self._futures.pop(job_id, None)
+
+    def resolve(self, result: PoolJobResult) -> None:
+        """Sets the result or error of the job that produced the given result."""
+        with self._lock:
+            future = self._futures.pop(result.job_id, None)
+        if future is None:
+            logger.warning("Received a result for unknown job %d", result.job_id)
+        elif result.error is not None:
+            future.set_exception(result.error.get_error())
+        else:
+            future.set_result(result.value)
+
+    def fail_all(self, error: BaseException) -> None:
+        """Sets the given error on the futures of all jobs that have not produced a result, for example because the pool has ended."""
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.set_exception(error)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._futures)
+
+
+class _PoolResultSubscriber(Subscriber[PoolJobChunkResult]):
+    """Resolves the futures of jobs as their results arrive; the values of successful jobs are also published to the output, if there is one.
+
+    A request from a worker to be replaced is passed on to the pool before the futures of the results that came with it are resolved, so that a caller that has
+    the result of a worker's last job can rely on the pool knowing about the request.
+    """
+
+    def __init__(self, futures: PoolJobFutures, publishers: List[Publisher[Any]], on_recycle_request: Optional[RecycleCallback]) -> None:
+        self._futures = futures
+        self._publishers = publishers
+        self._on_recycle_request = on_recycle_request
+
+    def on_value(self, value: PoolJobChunkResult) -> None:
+        if value.recycle_request and self._on_recycle_request:
+            self._on_recycle_request(value.recycle_request)
+        for result in value.results:
+            self._futures.resolve(result)
+            if result.error is None:
+                for publisher in self._publishers:
+                    publisher.publish_value(result.value)
+
+    def on_complete(self, error: Optional[BaseException]) -> None:
+        if error is not None and not self._publishers:
+            raise error  # Nowhere to pass the error on to, so the collector ends with it, and the pool's check_for_exceptions() raises it
+        for publisher in self._publishers:
+            publisher.publish_complete(error)
+
+
+class PoolResultCollector(MultiBufferServicingRunnable):
+    """Runs in the process that owns a Pool, receiving the results that the pool's workers publish and resolving the futures of the jobs that produced them."""
+    _futures: PoolJobFutures = python_default("_futures")  # Shared with the pool, which is always in the same process
+
+    def __init__(self, name: str, results: Observable[PoolJobChunkResult], futures: PoolJobFutures, output_buffer: Optional[Publishable[Any]], *,
+                 on_recycle_request: Optional[RecycleCallback] = None) -> None:
+        """Constructor.
+
+        Arguments:
+            name: A name for the runnable, used for logging.
+            results: The buffer to which the pool's workers publish the results of their jobs.
+            futures: The futures of the jobs that have been submitted to the pool.
+            output_buffer: Optional buffer to which the values returned by successful jobs are also published, in the order in which they arrive.
+            on_recycle_request: Called, in the collector's thread, when a worker asks to be replaced. It should only record the request, for the pool to act on
+                                in the owner's thread.
+        """
+        output_buffers = [output_buffer] if output_buffer is not None else []
+        super().__init__(name, output_buffers)
+        self._futures = futures
+        publishers = [self._get_publisher_unwrapped(buffer) for buffer in output_buffers]
+        self._add_subscription(results, _PoolResultSubscriber(futures, publishers, on_recycle_request))
@@ -1,31 +1,174 @@
-import queue
-from typing import Any, Callable, Generic
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Generic, Optional, Tuple
 
-from puma.attribute import child_only, copied
+from puma.attribute import child_only, child_scope_value, copied, python_default
 from puma.buffer import Publishable, Publisher
-from puma.buffer.implementation.managed_queues import ManagedQueueTypes
+from puma.buffer.traceable_exception import TraceableException
 from puma.runnable import CommandDrivenRunnable
-from puma.runnable.pool import PoolJobCall, PoolType
+from puma.runnable.message import CommandMessage
+from puma.runnable.pool import PoolJobCall, PoolJobChunk, PoolJobChunkResult, PoolJobResult, PoolType, PoolWorkerRecycleRequest
+from puma.runnable.pool.pool_job_dispatcher import PoolJobDispatcher
+from puma.runnable.pool.pool_worker_context import clear_worker_context, set_worker_context
+
+if sys.platform != "win32":
+    import resource
+
+logger = logging.getLogger(__name__)
+
+# A worker waits this long for space in the results buffer, which the pool's result collector empties continuously
+RESULT_PUBLISH_TIMEOUT = 10.0
+
+_PROCESS_MEMORY_STATISTICS = "/proc/self/statm"
+
+
+@dataclass(frozen=True)
+class _PoolJobChunkCommandMessage(CommandMessage):
+    chunk: PoolJobChunk
 
 
 class PoolRunnable(Generic[PoolType], CommandDrivenRunnable):
-    _result_publisher: Publisher[PoolType] = child_only("_result_publisher")
-    _job_queue: ManagedQueueTypes[PoolJobCall] = copied("_job_queue")
+    """A worker in a Pool. Runs jobs one at a time, publishing the value returned, or the error raised, by each, along with the job's id.
+
+    Jobs arrive in chunks (see PoolJobChunk), in one of two ways: a chunk submitted while the worker is idle is sent to it as a command, which wakes it; a chunk
+    submitted while all the workers are busy is queued, and taken by the first worker to finish its current chunk. A worker with nothing to do waits on its event,
+    and so uses no CPU. The results of the jobs in a chunk are published together, once all of them have run.
+
+    If the pool has an initializer, the worker calls it before running its first job, and keeps the value it returns as its context, which jobs obtain by calling
+    get_worker_context().
+
+    In an elastic pool, a worker that has been idle for the given idle timeout retires, ending itself, unless the pool is at its minimum size.
+
+    A worker that has been given limits on the number of jobs it runs, or on its resident set size, checks them after each chunk. Once it has reached one, it asks
+    to be replaced (along with the results of that chunk), and carries on as usual until the pool stops it and starts a new worker with the same index. It does
+    not retire meanwhile, so that the pool cannot start a different worker with its index before acting on the request.
+    """
+    _result_publisher: Publisher[PoolJobChunkResult] = child_only("_result_publisher")
+    _dispatcher: PoolJobDispatcher = python_default("_dispatcher")  # Shared between threads, copied to a process
+    _index: int = copied("_index")
+    _idle_timeout: Optional[float] = copied("_idle_timeout")
+    _min_worker_count: int = copied("_min_worker_count")
+    _idle_since: Optional[float] = child_only("_idle_since")
+    _initializer: Optional[Callable[..., Any]] = python_default("_initializer")
+    _initargs: Tuple[Any, ...] = python_default("_initargs")
+    _max_jobs: Optional[int] = copied("_max_jobs")
+    _max_rss: Optional[int] = copied("_max_rss")
+    _initialized: bool = child_only("_initialized")
+    _job_count: int = child_only("_job_count")
+    _recycle_requested: bool = child_only("_recycle_requested")
+
+    def __init__(self, name: str, result_publishable: Publishable[PoolJobChunkResult], dispatcher: PoolJobDispatcher, index: int, *,
+                 idle_timeout: Optional[float] = None, min_worker_count: int = 0, initializer: Optional[Callable[..., Any]] = None, initargs: Tuple[Any, ...] = (),
+                 max_jobs: Optional[int] = None, max_rss: Optional[int] = None):
+        """Constructor.
 
-    def __init__(self, name: str, result_publishable: Publishable[PoolType], job_queue: ManagedQueueTypes[PoolJobCall]):
-        super().__init__(name, [result_publishable])
-        self._result_publisher: Publisher[PoolType] = self._get_publisher(result_publishable)
-        self._job_queue = job_queue
+        Arguments:
+            name: A name for the runnable, used for logging.
+            result_publishable: The buffer to which the results of chunks of jobs are published.
+            dispatcher: The pool's dispatcher, from which the worker obtains queued chunks.
+            index: The worker's index in the pool.
+            idle_timeout: If given, the worker retires when it has been idle for this long, provided that more than min_worker_count workers would remain.
+            min_worker_count: The number of workers that must remain in the pool.
+            initializer: If given, called with initargs when the worker starts. The value it returns is the worker's context.
+            initargs: The arguments to the initializer.
+            max_jobs: If given, the worker asks to be replaced once it has run this many jobs.
+            max_rss: If given, the worker asks to be replaced once its resident set size has reached this many bytes.
+        """
+        super().__init__(name, [result_publishable], tick_interval=idle_timeout)
+        self._result_publisher: Publisher[PoolJobChunkResult] = self._get_publisher(result_publishable)
+        self._dispatcher = dispatcher
+        self._index = index
+        self._idle_timeout = idle_timeout
+        self._min_worker_count = min_worker_count
+        self._idle_since = child_scope_value(None)
+        self._initializer = initializer
+        self._initargs = initargs
+        self._max_jobs = max_jobs
+        self._max_rss = max_rss
+        self._initialized = child_scope_value(False)
+        self._job_count = child_scope_value(0)
+        self._recycle_requested = child_scope_value(False)
+
+    def send_chunk(self, chunk: PoolJobChunk) -> None:
+        """Called by the pool to give the worker a chunk of jobs, when the dispatcher has chosen this worker because it is idle."""
+        self._send_command(_PoolJobChunkCommandMessage(chunk))
+
+    def _handle_command(self, command: CommandMessage) -> None:
+        if isinstance(command, _PoolJobChunkCommandMessage):
+            self._idle_since = None
+            self._run_chunk(command.chunk)
+        else:
+            super()._handle_command(command)
 
     def _pre_wait_hook(self) -> None:
-        # Retrieve any jobs from the queue
-        try:
-            job_call = self._job_queue.get(True, 0.1)
-            self._result_publisher.publish_value(self._handle_job(job_call.job, *job_call.args))
-        except queue.Empty:
-            pass
+        # Called each time around the loop. Takes the next queued chunk, if any; if there is none, the dispatcher marks the worker as idle.
+        if not self._initialized:
+            self._initialize()
+        chunk = self._dispatcher.next_job(self._index)
+        if chunk:
+            self._idle_since = None
+            self._run_chunk(chunk)
+            self._event.set()  # Go around the loop again, servicing any commands before looking for another chunk
+        elif self._idle_since is None:
+            self._idle_since = monotonic()
+            if self._idle_timeout is not None:
+                self.resume_ticks()  # Does nothing if already ticking
+
+    def _on_tick(self, timestamp: float) -> None:
+        # Only ticks if the worker has an idle timeout
+        assert self._idle_timeout is not None
+        if self._idle_since is not None and monotonic() - self._idle_since >= self._idle_timeout and not self._recycle_requested:
+            if self._dispatcher.try_retire(self._index, self._min_worker_count):
+                logger.debug("%s: Retiring, having been idle for %.1f seconds", self._name, monotonic() - self._idle_since)
+                self._stop_task = True
+
+    def _execution_ending_hook(self, error: Optional[Exception]) -> bool:
+        self._dispatcher.set_busy(self._index)  # No more jobs should be sent to this worker
+        clear_worker_context()
+        return super()._execution_ending_hook(error)
+
+    def _initialize(self) -> None:
+        # Runs in the thread in which the worker runs its jobs. An error raised by the initializer ends the worker.
+        self._initialized = True
+        set_worker_context(self._initializer(*self._initargs) if self._initializer else None)
 
-        self._event.set()  # TODO: QueueHandlingRunnable??
+    def _run_chunk(self, chunk: PoolJobChunk) -> None:
+        calls = chunk.get_calls()
+        results = tuple(self._run_job(job_call) for job_call in calls)
+        self._job_count += len(calls)
+        recycle_request = None if self._recycle_requested else self._get_recycle_request()
+        self._result_publisher.publish_value(PoolJobChunkResult(results, recycle_request), RESULT_PUBLISH_TIMEOUT)
+        if recycle_request:
+            logger.debug("%s: Asked to be replaced, because %s", self._name, recycle_request.reason)
+            self._recycle_requested = True
+
+    def _get_recycle_request(self) -> Optional[PoolWorkerRecycleRequest]:
+        if self._max_jobs is not None and self._job_count >= self._max_jobs:
+            return PoolWorkerRecycleRequest(self._index, f"it has run {self._job_count} jobs")
+        if self._max_rss is not None:
+            rss = _get_resident_set_size()
+            if rss >= self._max_rss:
+                return PoolWorkerRecycleRequest(self._index, f"its resident set size has reached {rss} bytes")
+        return None
+
+    def _run_job(self, job_call: PoolJobCall) -> PoolJobResult:
+        # An error raised by the job is the job's outcome, and goes to its future; it does not end the worker
+        try:
+            return PoolJobResult(job_call.job_id, self._handle_job(job_call.job, *job_call.args))
+        except Exception as ex:
+            return PoolJobResult(job_call.job_id, None, TraceableException(ex))
 
     def _handle_job(self, job: Callable, *args: Any) -> Any:
         return job(*args)
+
+
+def _get_resident_set_size() -> int:
+    # The current resident set size is read from /proc on Linux. Elsewhere, the peak resident set size is used, which getrusage gives in bytes on macOS.
+    try:
+        with open(_PROCESS_MEMORY_STATISTICS) as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
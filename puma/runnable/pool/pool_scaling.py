@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+from enum import Enum, unique
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class PoolScaling:
+    """How an elastic Pool varies its number of workers between a minimum and a maximum.
+
+    Workers are added when jobs are submitted while the pool is busy: when the number of queued submissions reaches scale_up_backlog, or when a submission has
+    waited scale_up_wait seconds for space in the queue. A worker that has been idle for idle_timeout seconds retires, unless the pool is at its minimum size.
+    """
+    min_size: int
+    max_size: int
+    scale_up_backlog: int = 1
+    scale_up_wait: float = 0.05
+    idle_timeout: float = 10.0
+
+    def __post_init__(self) -> None:
+        if self.min_size < 0:
+            raise ValueError("The minimum size must not be negative")
+        if self.max_size < 1 or self.max_size < self.min_size:
+            raise ValueError("The maximum size must be at least 1, and not less than the minimum size")
+        if self.scale_up_backlog < 1:
+            raise ValueError("The backlog at which workers are added must be at least 1")
+        if self.scale_up_wait <= 0.0 or self.idle_timeout <= 0.0:
+            raise ValueError("The scale-up wait and idle timeout must be greater than zero")
+
+
+@unique
+class PoolScalingEventType(Enum):
+    WORKER_ADDED = "worker_added"
+    WORKER_RETIRED = "worker_retired"
+    WORKER_RECYCLED = "worker_recycled"
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}.{self.name}>"
+
+
+@dataclass(frozen=True)
+class PoolScalingEvent:
+    """Reports a change in the number of workers in an elastic Pool, or the replacement of a worker that has reached its limits (see Pool)."""
+    event_type: PoolScalingEventType
+    worker_index: int
+    worker_count: int  # The number of workers after the change
+    reason: str
+
+
+PoolScalingCallback = Callable[[PoolScalingEvent], None]
@@ -0,0 +1,28 @@
+import threading
+from typing import Any
+
+# Each worker runs its jobs in a thread of its own (in a ThreadPool, all the workers are in the owner's process), so the context is kept per thread
+_worker_local = threading.local()
+
+
+def get_worker_context() -> Any:
+    """Returns the context of the Pool worker that is running the calling job: the value returned by the pool's initializer when the worker started, or None if
+    the pool has no initializer.
+
+    Raises RuntimeError if not called by a job running in a Pool worker.
+    """
+    try:
+        return _worker_local.context
+    except AttributeError:
+        raise RuntimeError("get_worker_context() can only be called by a job that is running in a Pool worker") from None
+
+
+def set_worker_context(context: Any) -> None:
+    """Called by a Pool worker, in the thread in which it runs its jobs, when it starts."""
+    _worker_local.context = context
+
+
+def clear_worker_context() -> None:
+    """Called by a Pool worker, in the thread in which it runs its jobs, when it ends."""
+    if hasattr(_worker_local, "context"):
+        del _worker_local.context
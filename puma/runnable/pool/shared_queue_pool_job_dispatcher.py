@@ -0,0 +1,115 @@
+import queue
+from time import monotonic
+from typing import Hashable, List, Optional
+
+from puma.buffer.implementation.managed_queues import ManagedQueueTypes
+from puma.context import Exit_1, Exit_2, Exit_3
+from puma.environment import Environment
+from puma.primitives import ConditionType, SafeBoolType, SafeIntType
+from puma.runnable.pool import PoolJobChunk
+from puma.runnable.pool.pool_job_dispatcher import PoolJobDispatcher, QUEUED_JOB_ARRIVAL_TIMEOUT
+from puma.timeouts import TIMEOUT_INFINITE, Timeouts
+
+
+class SharedQueuePoolJobDispatcher(PoolJobDispatcher):
+    """Dispatches the jobs submitted to a Pool using a single job queue, shared by all the workers.
+
+    A worker with nothing to do marks itself as idle and waits on its event, using no CPU. A job submitted while any worker is idle is sent to that worker as a
+    command, which wakes it immediately. Otherwise the job is queued, and taken by the first worker to finish its current job.
+
+    Both decisions are made while holding one condition, so a job cannot be queued while a worker is marking itself as idle without that worker seeing it.
+    A count of the queued jobs is kept under the same condition, because a process queue cannot reliably say whether it is empty.
+
+    Jobs are dispatched in chunks (see PoolJobChunk); a chunk of several jobs is sent to one worker, and takes a single place in the queue.
+    """
+
+    def __init__(self, environment: Environment, size: int, name: str, *, queue_size: int = 1) -> None:
+        """Constructor.
+
+        Arguments:
+            environment: The environment in which the pool's workers are run.
+            size: The number of workers in the pool, or the maximum number if it is elastic.
+            name: Name of the pool, used to name the job queue.
+            queue_size: The number of chunks of jobs that can be queued while all the workers are busy. Submitting a job blocks while the queue is full.
+        """
+        if queue_size < 1:
+            raise ValueError("The queue size must be at least 1")
+        self._queue_size = queue_size
+        self._condition: ConditionType = environment.create_condition()
+        self._queued_count: SafeIntType = environment.create_safe_int(0)
+        self._idle: List[SafeBoolType] = [environment.create_safe_bool(False) for _ in range(size)]
+        self._worker_count: SafeIntType = environment.create_safe_int(0)
+        self._job_queue: ManagedQueueTypes[PoolJobChunk] = environment.create_managed_queue(PoolJobChunk, 0, f"Job queue of {name}")
+
+    def __enter__(self) -> 'SharedQueuePoolJobDispatcher':
+        self._job_queue.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        self._job_queue.__exit__(exc_type, exc_value, traceback)
+
+    def submit(self, chunk: PoolJobChunk, timeout: float = TIMEOUT_INFINITE, affinity_key: Optional[Hashable] = None) -> Optional[int]:
+        if affinity_key is not None:
+            raise ValueError("Affinity keys are only supported by pools that have a queue for each worker")
+        Timeouts.validate(timeout)
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        with self._condition:
+            while True:
+                for index, idle in enumerate(self._idle):
+                    if idle.value:
+                        idle.value = False
+                        return index
+                if self._queued_count.value < self._queue_size:
+                    self._queued_count.value += 1
+                    self._job_queue.put(chunk)  # The queue is unbounded, so this does not block while holding the condition
+                    return None
+                remaining = end_time - monotonic()
+                if remaining <= 0.0:
+                    raise queue.Full("All the workers in the pool are busy and its job queue is full")
+                self._condition.wait(remaining)
+
+    def next_job(self, index: int) -> Optional[PoolJobChunk]:
+        with self._condition:
+            if self._queued_count.value == 0:
+                self._idle[index].value = True
+                self._condition.notify_all()
+                return None
+            self._queued_count.value -= 1
+            self._condition.notify_all()
+        try:
+            return self._job_queue.get(True, QUEUED_JOB_ARRIVAL_TIMEOUT)
+        except queue.Empty as ex:
+            raise RuntimeError("A queued job failed to arrive") from ex
+
+    def set_busy(self, index: int) -> None:
+        with self._condition:
+            self._idle[index].value = False
+
+    def get_idle_count(self) -> int:
+        with self._condition:
+            return sum(1 for idle in self._idle if idle.value)
+
+    def get_queued_count(self) -> int:
+        with self._condition:
+            return self._queued_count.value
+
+    def get_worker_count(self) -> int:
+        with self._condition:
+            return self._worker_count.value
+
+    def add_worker(self, index: int) -> None:
+        with self._condition:
+            self._worker_count.value += 1
+
+    def try_retire(self, index: int, min_worker_count: int) -> bool:
+        with self._condition:
+            if not self._idle[index].value or self._worker_count.value <= min_worker_count:
+                return False
+            self._idle[index].value = False
+            self._worker_count.value -= 1
+            return True
+
+    def remove_worker(self, index: int) -> None:
+        with self._condition:
+            self._idle[index].value = False
+            self._worker_count.value -= 1
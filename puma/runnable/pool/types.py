@@ -1,5 +1,8 @@
+import pickle
 from dataclasses import dataclass
-from typing import Any, Callable, TypeVar
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from puma.buffer.traceable_exception import TraceableException
 
 PoolType = TypeVar("PoolType")
 PoolJob = Callable[[Any], PoolType]
@@ -9,3 +12,42 @@ PoolJob = Callable[[Any], PoolType]
 class PoolJobCall:
     job: PoolJob
     args: Any
+    job_id: int
+
+
+@dataclass(frozen=True)
+class PoolJobChunk:
+    """One or more jobs that are dispatched to a worker as a single item. The worker runs them in turn, and returns their results together.
+
+    The calls may be pickled by the submitter, in which case the chunk is pickled only once on its way to a worker process: the bytes pass through the queues as they are.
+    """
+    calls: Tuple[PoolJobCall, ...] = ()
+    pickled_calls: Optional[bytes] = None
+
+    def get_calls(self) -> Tuple[PoolJobCall, ...]:
+        if self.pickled_calls is not None:
+            calls: Tuple[PoolJobCall, ...] = pickle.loads(self.pickled_calls)
+            return calls
+        return self.calls
+
+
+@dataclass(frozen=True)
+class PoolJobResult:
+    """The outcome of a job run by a Pool: the value it returned, or the error it raised."""
+    job_id: int
+    value: Any
+    error: Optional[TraceableException] = None
+
+
+@dataclass(frozen=True)
+class PoolWorkerRecycleRequest:
+    """Sent by a Pool worker that has reached the limit on the number of jobs it runs, or on its memory use, and is waiting to be replaced."""
+    worker_index: int
+    reason: str
+
+
+@dataclass(frozen=True)
+class PoolJobChunkResult:
+    """The results of the jobs in a PoolJobChunk, returned together. Carries a recycle request if the worker reached one of its limits while running the chunk."""
+    results: Tuple[PoolJobResult, ...]
+    recycle_request: Optional[PoolWorkerRecycleRequest] = None
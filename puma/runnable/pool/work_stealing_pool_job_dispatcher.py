@@ -0,0 +1,181 @@
+import queue
+from time import monotonic
+from typing import Hashable, List, Optional, Sequence, Tuple
+
+from puma.buffer.implementation.managed_queues import ManagedQueueTypes
+from puma.context import Exit_1, Exit_2, Exit_3
+from puma.environment import Environment
+from puma.primitives import ConditionType, SafeBoolType, SafeIntType
+from puma.runnable.pool import PoolJobChunk
+from puma.runnable.pool.pool_job_dispatcher import PoolJobDispatcher, QUEUED_JOB_ARRIVAL_TIMEOUT
+from puma.timeouts import TIMEOUT_INFINITE, Timeouts
+
+_Taken = Tuple[ManagedQueueTypes[PoolJobChunk], bool]  # The queue from which a chunk has been claimed, and whether the worker's queues were full before it was claimed
+
+
+class WorkStealingPoolJobDispatcher(PoolJobDispatcher):
+    """Dispatches the jobs submitted to a Pool using a bounded queue for each worker.
+
+    A chunk submitted while any worker is idle is sent to that worker as a command, which wakes it immediately. Otherwise it is queued for the least loaded worker;
+    a worker that runs out of work of its own takes chunks from the queue of the most loaded other worker, rather than becoming idle.
+
+    A chunk submitted with an affinity key always goes to the same worker (the one chosen by the key's hash), so that jobs using the same data can make use of
+    whatever that worker has cached. Such chunks are kept on a second queue of the worker's own, from which they are never stolen.
+
+    Each worker's queues, counts and idle flag are protected by a lock of its own, so workers only contend with each other when stealing. Submission only takes a
+    shared condition when all the queues it may use are full, and has to wait for space.
+    """
+
+    def __init__(self, environment: Environment, size: int, name: str, *, queue_size: int = 1) -> None:
+        """Constructor.
+
+        Arguments:
+            environment: The environment in which the pool's workers are run.
+            size: The number of workers in the pool.
+            name: Name of the pool, used to name the job queues.
+            queue_size: The number of chunks of jobs that can be queued for each worker. Submitting a job blocks while the queues it may use are full.
+        """
+        if queue_size < 1:
+            raise ValueError("The queue size must be at least 1")
+        self._size = size
+        self._queue_size = queue_size
+        self._space_condition: ConditionType = environment.create_condition()  # Notified when a full queue has space, or a worker becomes idle
+        self._worker_count: SafeIntType = environment.create_safe_int(0)  # Only changed by the pool, in the owner's thread
+        self._locks: List[ConditionType] = [environment.create_condition() for _ in range(size)]
+        self._idle: List[SafeBoolType] = [environment.create_safe_bool(False) for _ in range(size)]
+        self._stealable_counts: List[SafeIntType] = [environment.create_safe_int(0) for _ in range(size)]
+        self._pinned_counts: List[SafeIntType] = [environment.create_safe_int(0) for _ in range(size)]
+        self._stealable_queues: List[ManagedQueueTypes[PoolJobChunk]] = \
+            [environment.create_managed_queue(PoolJobChunk, 0, f"Job queue #{i} of {name}") for i in range(size)]
+        self._pinned_queues: List[ManagedQueueTypes[PoolJobChunk]] = \
+            [environment.create_managed_queue(PoolJobChunk, 0, f"Affinity job queue #{i} of {name}") for i in range(size)]
+
+    def __enter__(self) -> 'WorkStealingPoolJobDispatcher':
+        for job_queue in self._stealable_queues + self._pinned_queues:
+            job_queue.__enter__()
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        for job_queue in self._stealable_queues + self._pinned_queues:
+            job_queue.__exit__(exc_type, exc_value, traceback)
+
+    def submit(self, chunk: PoolJobChunk, timeout: float = TIMEOUT_INFINITE, affinity_key: Optional[Hashable] = None) -> Optional[int]:
+        Timeouts.validate(timeout)
+        pinned = affinity_key is not None
+        candidates = [hash(affinity_key) % self._size] if pinned else list(range(self._size))
+
+        placed, index = self._try_to_place(chunk, candidates, pinned)
+        if placed:
+            return index
+
+        # Every queue that could be used was full. Try again while holding the space condition, which workers notify when they make space, so it cannot be missed.
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        with self._space_condition:
+            while True:
+                placed, index = self._try_to_place(chunk, candidates, pinned)
+                if placed:
+                    return index
+                remaining = end_time - monotonic()
+                if remaining <= 0.0:
+                    raise queue.Full("The workers in the pool are busy and their job queues are full")
+                self._space_condition.wait(remaining)
+
+    def next_job(self, index: int) -> Optional[PoolJobChunk]:
+        with self._locks[index]:
+            taken = self._take(index, True)
+        if taken is None:
+            taken = self._steal(index)
+        if taken is None:
+            with self._locks[index]:
+                taken = self._take(index, True)  # Something may have been queued for this worker while it was trying to steal
+                if taken is None:
+                    self._idle[index].value = True
+            if taken is None:
+                self._notify_space()  # A submitter waiting for space can now send its chunk to this worker
+                return None
+
+        job_queue, was_full = taken
+        if was_full:
+            self._notify_space()
+        try:
+            return job_queue.get(True, QUEUED_JOB_ARRIVAL_TIMEOUT)
+        except queue.Empty as ex:
+            raise RuntimeError("A queued job failed to arrive") from ex
+
+    def set_busy(self, index: int) -> None:
+        with self._locks[index]:
+            self._idle[index].value = False
+
+    def get_idle_count(self) -> int:
+        return sum(1 for idle in self._idle if idle.value)
+
+    def get_queued_count(self) -> int:
+        return sum(self.get_queued_counts())
+
+    def get_worker_count(self) -> int:
+        return self._worker_count.value
+
+    def add_worker(self, index: int) -> None:
+        self._worker_count.value += 1
+
+    def try_retire(self, index: int, min_worker_count: int) -> bool:
+        return False  # Chunks with affinity are queued for a particular worker, so the set of workers must not change
+
+    def remove_worker(self, index: int) -> None:
+        self.set_busy(index)  # The worker's queues are kept for the worker that replaces it
+        self._worker_count.value -= 1
+
+    def get_queued_counts(self) -> List[int]:
+        """Returns the number of chunks queued for each worker. The counts may be out of date as soon as they are returned."""
+        return [self._load(index) for index in range(self._size)]
+
+    def _try_to_place(self, chunk: PoolJobChunk, candidates: Sequence[int], pinned: bool) -> Tuple[bool, Optional[int]]:
+        # Returns (True, index) if the chunk is to be sent to the idle worker with the given index, (True, None) if it has been queued, or (False, None) if it was not placed.
+        # The flags and counts are first read without taking the workers' locks, as hints, and then checked again while holding the chosen worker's lock.
+        for index in candidates:
+            if self._idle[index].value:
+                with self._locks[index]:
+                    if self._idle[index].value:
+                        self._idle[index].value = False
+                        return True, index
+        for index in sorted(candidates, key=self._load):
+            with self._locks[index]:
+                if self._idle[index].value:
+                    self._idle[index].value = False
+                    return True, index
+                if self._load(index) < self._queue_size:
+                    if pinned:
+                        self._pinned_counts[index].value += 1
+                        self._pinned_queues[index].put(chunk)  # The queues are unbounded, so this does not block while holding the lock
+                    else:
+                        self._stealable_counts[index].value += 1
+                        self._stealable_queues[index].put(chunk)
+                    return True, None
+        return False, None
+
+    def _steal(self, thief: int) -> Optional[_Taken]:
+        victims = [index for index in range(self._size) if index != thief and self._stealable_counts[index].value > 0]
+        for index in sorted(victims, key=self._load, reverse=True):
+            with self._locks[index]:
+                taken = self._take(index, False)
+            if taken is not None:
+                return taken
+        return None
+
+    def _take(self, index: int, include_pinned: bool) -> Optional[_Taken]:
+        # Claims a chunk from the given worker's queues. Must be called while holding the worker's lock. Chunks with affinity are taken before those without.
+        was_full = self._load(index) >= self._queue_size
+        if include_pinned and self._pinned_counts[index].value > 0:
+            self._pinned_counts[index].value -= 1
+            return self._pinned_queues[index], was_full
+        if self._stealable_counts[index].value > 0:
+            self._stealable_counts[index].value -= 1
+            return self._stealable_queues[index], was_full
+        return None
+
+    def _load(self, index: int) -> int:
+        return self._stealable_counts[index].value + self._pinned_counts[index].value
+
+    def _notify_space(self) -> None:
+        with self._space_condition:
+            self._space_condition.notify_all()
@@ -8,6 +8,7 @@ from puma.attribute.mixin import ScopedAttributesMixin
 from puma.buffer import Publishable, Publisher
 from puma.helpers.assert_set import assert_set
 from puma.runnable._in_runnable_indirect_publisher import _InRunnableIndirectPublisher
+from puma.runnable.cooperative_execution import CooperativeExecution, Wake
 from puma.runnable.message import CommandMessage, CommandMessageBuffer, RemoteObjectGetAttributeCommandMessage, RemoteObjectMethodCommandMessage, RunInChildScopeCommandMessage, \
     RunInChildScopeStatusMessage, StartedStatusMessage, StatusBuffer, StatusBufferPublisher, StatusBufferSubscription, StatusMessage, StopCommandMessage
 from puma.runnable.publishable_to_publisher_mapping import PublishableToPublisherMapping
@@ -171,6 +172,21 @@ class Runnable(ScopedAttributesMixin, ABC):
         finally:
             self.__executing = False
 
+    def _runner_accessor__begin_cooperative_execute(self, stack: ExitStack, wake: Wake) -> CooperativeExecution:
+        # Called by a CooperativeRunner, in place of run_execute. The output buffers are published in the same way, but they, and everything else the runnable
+        # needs while executing, are added to the given stack, which the runner closes when the execution ends.
+        self._check_ready_to_execute()
+        self.__executing = True
+        stack.callback(self.__execution_ended)
+        for publishable_id, indirect_publisher in self.__indirect_publishers.items():
+            publisher = indirect_publisher._publishable.publish()
+            indirect_publisher.set_publisher(publisher)
+            stack.enter_context(indirect_publisher)
+        return self._begin_cooperative_execution(stack, wake)
+
+    def __execution_ended(self) -> None:
+        self.__executing = False
+
     ###############################
     #  RunInChildScopeAccessor  #
     ###############################
@@ -205,6 +221,14 @@ class Runnable(ScopedAttributesMixin, ABC):
         """
         raise NotImplementedError()
 
+    def _begin_cooperative_execution(self, stack: ExitStack, wake: Wake) -> CooperativeExecution:
+        """Overridden by runnables that can be executed by a CooperativeExecutor, which steps the runnable whenever it is woken rather than blocking a thread in _execute().
+
+        Anything that must be cleaned up when the execution ends should be added to the given stack. The wake callable must be called whenever the runnable needs
+        to be stepped. Only MultiBufferServicingRunnable implements this; other runnables raise TypeError.
+        """
+        raise TypeError(f"{self._name}: Only runnables derived from MultiBufferServicingRunnable can be executed cooperatively")
+
     def _get_publisher(self, buffer: Publishable[AType]) -> Publisher[AType]:
         return child_scope_value(self._get_publisher_unwrapped(buffer))
 
@@ -354,6 +378,9 @@ class RunnerAccessor(BaseAccessor):
     def run_execute(self) -> None:
         self._runnable._runner_accessor__run_execute()
 
+    def begin_cooperative_execute(self, stack: ExitStack, wake: Wake) -> CooperativeExecution:
+        return self._runnable._runner_accessor__begin_cooperative_execute(stack, wake)
+
     def publish_started_status_message(self) -> None:
         self._runnable._runner_accessor__publish_started_status_message()
 
@@ -1,3 +1,9 @@
 from puma.runnable.runner.runner import Runner  # noqa: F401
-from puma.runnable.runner.process_runner import ProcessRunner  # noqa: F401, I100
+from puma.runnable.runner.process_placement import ProcessPlacement, SchedulingPolicy  # noqa: F401, I100
+from puma.runnable.runner.process_runner import ProcessRunner, spread_across_cpus  # noqa: F401, I100
 from puma.runnable.runner.thread_runner import ThreadRunner  # noqa: F401
+from puma.runnable.runner.standby_process_pool import StandbyProcessPool  # noqa: F401, I100
+from puma.runnable.runner.runner_group import RunnerGroup  # noqa: F401, I100
+from puma.runnable.runner.runner_monitor import RunnerMonitor  # noqa: F401, I100
+from puma.runnable.runner.cooperative_executor import CooperativeExecutor  # noqa: F401, I100
+from puma.runnable.runner.cooperative_runner import CooperativeRunner  # noqa: F401
@@ -0,0 +1,191 @@
+import heapq
+import logging
+from threading import Thread
+from time import monotonic
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING, Tuple
+
+from puma.context import ContextManager, Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager, must_be_context_managed
+from puma.primitives import ThreadCondition, ThreadLock
+from puma.runnable.cooperative_execution import Wake
+
+if TYPE_CHECKING:
+    from puma.runnable.runner.cooperative_runner import CooperativeRunner  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+_RunnerAction = Callable[[], bool]
+
+
+@must_be_context_managed
+class CooperativeExecutor(ContextManager["CooperativeExecutor"]):
+    """Executes many runnables on a small, fixed number of threads.
+
+    Each runnable is run by a CooperativeRunner, which is used in the same way as any other runner. Rather than blocking a thread of its own while it waits for
+    values, commands or its next tick, a runnable hosted by the executor is stepped by one of the executor's threads whenever its event is set or its tick is due.
+    Only runnables derived from MultiBufferServicingRunnable can be hosted.
+
+    Each runnable stays on the thread that began it, since its scoped attributes belong to that thread. Runnables are allocated to the least loaded thread when they
+    are started. A runnable that blocks while handling a value delays the other runnables on its thread, so blocking work should be run by a ThreadRunner or
+    ProcessRunner instead.
+
+    Example:
+        with CooperativeExecutor(2) as executor, RunnerGroup([CooperativeRunner(runnable, executor) for runnable in runnables]) as group:
+            group.start_blocking()
+            ...
+
+    The executor must remain in context management until all the runners hosted by it have ended.
+    """
+
+    def __init__(self, thread_count: int, name: str = "Cooperative executor") -> None:
+        """Constructor.
+
+        Arguments:
+            thread_count: The number of threads on which the runnables are executed.
+            name: Name of the executor, used for logging and to name its threads.
+        """
+        if thread_count < 1:
+            raise ValueError("A cooperative executor must have at least one thread")
+        self._name = name
+        self._workers = [_CooperativeWorker(f"{name} thread {i}") for i in range(thread_count)]
+        self._host_lock = ThreadLock()
+
+    def __enter__(self) -> 'CooperativeExecutor':
+        logger.debug("%s: Entering context management, starting %d threads", self._name, len(self._workers))
+        for worker in self._workers:
+            worker.start()
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        logger.debug("%s: Exiting context management, stopping threads", self._name)
+        for worker in self._workers:
+            worker.stop()
+        for worker in self._workers:
+            worker.join()
+        logger.debug("%s: Finished", self._name)
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_thread_count(self) -> int:
+        """Returns the number of threads on which runnables are executed."""
+        return len(self._workers)
+
+    def get_load(self) -> List[int]:
+        """Returns the number of runnables currently hosted on each of the executor's threads."""
+        return [worker.get_load() for worker in self._workers]
+
+    @ensure_used_within_context_manager
+    def _host(self, runner: "CooperativeRunner") -> None:
+        # Called by CooperativeRunner.start(), allocating the runner to the least loaded thread
+        with self._host_lock:
+            worker = min(self._workers, key=lambda w: w.get_load())
+            worker.add(runner)
+
+
+class _CooperativeWorker:
+    """One of the threads of a CooperativeExecutor, stepping the runners allocated to it whenever they are woken or their tick is due."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._condition = ThreadCondition()
+        self._new: List["CooperativeRunner"] = []  # Runners that have been allocated to this thread but have not yet begun
+        self._woken: Dict["CooperativeRunner", None] = {}  # Runners that need stepping (a dict, to keep them in order and avoid duplicates)
+        self._load = 0
+        self._stopping = False
+        self._thread = Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def get_load(self) -> int:
+        with self._condition:
+            return self._load
+
+    def add(self, runner: "CooperativeRunner") -> None:
+        with self._condition:
+            if self._stopping:
+                raise RuntimeError(f"{self._name}: The executor is stopping")
+            self._new.append(runner)
+            self._load += 1
+            self._condition.notify()
+
+    def _wake(self, runner: "CooperativeRunner") -> None:
+        # Called in whichever thread sets the runnable's event
+        with self._condition:
+            self._woken[runner] = None
+            self._condition.notify()
+
+    def _run(self) -> None:
+        hosted: Dict["CooperativeRunner", Optional[float]] = {}  # The runners that have begun, and when each next needs stepping if not woken
+        deadlines: List[Tuple[float, int, "CooperativeRunner"]] = []  # Heap of tick deadlines; entries no longer matching 'hosted' are discarded when popped
+        sequence = 0
+        while True:
+            with self._condition:
+                while not (self._new or self._woken or self._stopping or (deadlines and deadlines[0][0] <= monotonic())):
+                    self._condition.wait(None if not deadlines else max(0.0, deadlines[0][0] - monotonic()))
+                if self._stopping:
+                    break
+                new, self._new = self._new, []
+                to_step = dict(self._woken)  # A dict, for the same reasons as _woken
+                self._woken.clear()
+
+            now = monotonic()
+            while deadlines and deadlines[0][0] <= now:
+                deadline, _, runner = heapq.heappop(deadlines)
+                if hosted.get(runner) == deadline:
+                    to_step[runner] = None
+
+            for runner in new:
+                if self._call(runner, lambda: runner._cooperative_begin(self._waker(runner))):
+                    sequence = self._schedule(runner, hosted, deadlines, sequence)
+                else:
+                    self._runner_ended(runner)
+
+            for runner in to_step:
+                if runner not in hosted:
+                    continue  # Woken after ending, or before beginning
+                if self._call(runner, runner._cooperative_step):
+                    sequence = self._schedule(runner, hosted, deadlines, sequence)
+                else:
+                    del hosted[runner]
+                    self._runner_ended(runner)
+
+        if hosted:
+            logger.warning("%s: Stopping while still hosting %d runnables", self._name, len(hosted))
+        logger.debug("%s: Finished", self._name)
+
+    def _waker(self, runner: "CooperativeRunner") -> Wake:
+        return lambda: self._wake(runner)
+
+    @staticmethod
+    def _schedule(runner: "CooperativeRunner", hosted: Dict["CooperativeRunner", Optional[float]], deadlines: List[Tuple[float, int, "CooperativeRunner"]],
+                  sequence: int) -> int:
+        # Records when the runner next needs stepping if it is not woken. Returns the updated sequence number, which keeps the heap from comparing runners.
+        interval = runner._cooperative_interval_to_next_tick()
+        if interval is None:
+            hosted[runner] = None
+            return sequence
+        deadline = monotonic() + interval
+        hosted[runner] = deadline
+        heapq.heappush(deadlines, (deadline, sequence, runner))
+        return sequence + 1
+
+    def _call(self, runner: "CooperativeRunner", action: _RunnerAction) -> bool:
+        try:
+            return action()
+        except Exception as ex:
+            logger.error("%s: Unexpected error from %s, abandoning it: %s", self._name, runner.get_name(), repr(ex), exc_info=True)
+            return False
+
+    def _runner_ended(self, runner: "CooperativeRunner") -> None:
+        with self._condition:
+            self._load -= 1
+            self._woken.pop(runner, None)
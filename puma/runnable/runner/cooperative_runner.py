@@ -0,0 +1,138 @@
+import logging
+from contextlib import ExitStack
+from threading import Event
+from typing import Any, Optional, Type, TypeVar
+
+from puma.attribute import ThreadAction
+from puma.attribute.attribute.scoped_attribute import ScopedAttribute
+from puma.attribute.attribute.sharing_attribute_between_scopes_not_allowed_error import SharingAttributeBetweenThreadsNotAllowedError
+from puma.buffer import Buffer, MultiThreadBuffer
+from puma.context import ensure_used_within_context_manager
+from puma.runnable import MultiBufferServicingRunnable, Runnable
+from puma.runnable.cooperative_execution import CooperativeExecution, Wake
+from puma.runnable.message import StatusBufferPublisher
+from puma.runnable.runner import Runner
+from puma.runnable.runner.cooperative_executor import CooperativeExecutor
+
+BufferType = TypeVar("BufferType")
+
+logger = logging.getLogger(__name__)
+
+
+class CooperativeRunner(Runner):
+    """Executes a Runnable on one of the threads of a CooperativeExecutor, which it shares with other runnables. The runnable must be a MultiBufferServicingRunnable.
+
+    Otherwise the runner behaves like a ThreadRunner: the runnable is started, stopped, joined and checked for errors in the same way, and reports the same statuses.
+    """
+
+    def __init__(self, runnable: Runnable, executor: CooperativeExecutor, name: Optional[str] = None) -> None:
+        """Constructor.
+
+        Arguments:
+            runnable: The Runnable to execute. Must be derived from MultiBufferServicingRunnable.
+            executor: The executor on whose threads the runnable is executed. It must be in context management when the runner is started.
+            name: Optional name for the Runner, used for logging. If None, a name is created from the runnable's name.
+        """
+        super().__init__(runnable, name)
+        if not isinstance(runnable, MultiBufferServicingRunnable):
+            raise TypeError(f"{self.get_name()}: A CooperativeRunner can only execute a MultiBufferServicingRunnable")
+        self._executor = executor
+        self._started = False
+        self._ended = Event()
+        self._execution: Optional[CooperativeExecution] = None
+        self._execution_stack = ExitStack()  # Cleans up the runnable's execution
+        self._status_stack = ExitStack()  # Cleans up the status buffer publisher, after the execution has been cleaned up
+        self._status_publisher: Optional[StatusBufferPublisher] = None
+
+    def get_name(self) -> str:
+        return self._name
+
+    def set_name(self, name: str) -> None:
+        if not name:
+            raise ValueError("A name must be supplied")
+        self._name = name
+
+    @ensure_used_within_context_manager
+    def start(self) -> None:
+        """Hands the runnable to the executor, which begins executing it on one of its threads."""
+        if self._started:
+            raise RuntimeError(f"{self.get_name()}: Can only be started once")
+        self._runnable.runner_accessor.assert_comms_not_already_set()
+        self._runnable.runner_accessor.set_command_buffer(self._command_buffer)
+        self._runnable.runner_accessor.set_status_buffer_subscription(self._status_buffer_subscription)
+        self._executor._host(self)
+        self._started = True
+
+    def is_alive(self) -> bool:
+        return self._started and not self._ended.is_set()
+
+    def _perform_join(self, timeout: Optional[float] = None) -> None:
+        if self._started:
+            self._ended.wait(timeout)
+
+    def _handle_individual_scoped_attribute_in_child_scope(self, obj: Any, name: str, attribute: ScopedAttribute) -> None:
+        if attribute.thread_action == ThreadAction.NOT_ALLOWED:
+            raise SharingAttributeBetweenThreadsNotAllowedError(name)
+
+    def _buffer_factory(self, element_type: Type[BufferType], size: int, name: str, warn_on_discard: Optional[bool] = True) -> Buffer[BufferType]:
+        return MultiThreadBuffer(size, name, warn_on_discard)
+
+    # The following methods are called by the executor, on the thread to which the runner has been allocated. Between them they do the same as run().
+
+    def _cooperative_begin(self, wake: Wake) -> bool:
+        # Returns False if the runnable has already ended
+        try:
+            self._status_publisher = self._status_stack.enter_context(self._status_buffer.publish())
+            self._status_stack.callback(self._runnable.runner_accessor.set_status_buffer_publisher, None)
+            self._runnable.runner_accessor.set_status_buffer_publisher(self._status_publisher)
+
+            logger.debug("%s: Started", self.get_name())
+            self._runnable.runner_accessor.record_child_scope_id()
+
+            self._pre_run_execute()
+            self._runnable.runner_accessor.publish_started_status_message()
+            self._execution = self._runnable.runner_accessor.begin_cooperative_execute(self._execution_stack, wake)
+        except Exception as ex:
+            self._cooperative_end(ex)
+            return False
+        if not self._execution.is_running():
+            self._cooperative_end(None)
+            return False
+        return True
+
+    def _cooperative_step(self) -> bool:
+        # Returns False if the runnable has ended
+        assert self._execution
+        try:
+            running = self._execution.step()
+        except Exception as ex:
+            self._cooperative_end(ex)
+            return False
+        if not running:
+            self._cooperative_end(None)
+        return running
+
+    def _cooperative_interval_to_next_tick(self) -> Optional[float]:
+        assert self._execution
+        return self._execution.interval_to_next_tick()
+
+    def _cooperative_end(self, error: Optional[Exception]) -> None:
+        try:
+            try:
+                self._execution_stack.close()
+            except Exception as ex:
+                error = ex
+            if error:
+                logger.error(f"{self.get_name()}: Stopped because of error: {repr(error)}", exc_info=error)
+                if self._in_context_management and self._status_publisher:
+                    self._status_publisher.publish_complete(error=error)  # Transport error back to caller, who will re-raise it when they call check_for_exceptions
+            else:
+                logger.debug("%s: Stopped OK", self.get_name())
+                if self._in_context_management and self._status_publisher:
+                    self._status_publisher.publish_complete(error=None)
+        finally:
+            try:
+                self._status_stack.close()
+            finally:
+                self._status_publisher = None
+                self._ended.set()
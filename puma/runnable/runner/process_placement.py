@@ -0,0 +1,158 @@
+import logging
+import os
+from dataclasses import dataclass
+from enum import Enum, unique
+from pathlib import Path
+from typing import FrozenSet, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+NICE_MIN = -20
+NICE_MAX = 19
+
+_NUMA_NODE_CPULIST = "/sys/devices/system/node/node{}/cpulist"
+_PROCESS_THREADS_DIRECTORY = "/proc/self/task"
+
+
+@unique
+class SchedulingPolicy(Enum):
+    """The scheduling class that a child process is run under. FIFO and ROUND_ROBIN are real-time classes, and usually require elevated privileges."""
+    OTHER = "SCHED_OTHER"  # The standard time-sharing policy
+    BATCH = "SCHED_BATCH"  # For CPU-intensive, non-interactive processes
+    IDLE = "SCHED_IDLE"  # For very low priority background processes
+    FIFO = "SCHED_FIFO"  # Real-time, first in first out
+    ROUND_ROBIN = "SCHED_RR"  # Real-time, round robin
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}.{self.name}>"
+
+    def is_real_time(self) -> bool:
+        return self in (SchedulingPolicy.FIFO, SchedulingPolicy.ROUND_ROBIN)
+
+    def os_value(self) -> int:
+        """Returns the value of the equivalent os.SCHED_* constant. Raises RuntimeError if the policy is not supported on this platform."""
+        value = getattr(os, self.value, None)
+        if value is None:
+            raise RuntimeError(f"Scheduling policy {self.value} is not supported on this platform")
+        return int(value)
+
+
+@dataclass(frozen=True)
+class ProcessPlacement:
+    """Describes where and how a child process should be scheduled by the operating system. Used by ProcessRunner.
+
+    Arguments:
+        cpu_affinity:        The CPUs that the process (and all of its threads) may run on. If None, the affinity is inherited from the parent.
+        numa_node:           If given, the process is restricted to the CPUs of this NUMA node (intersected with cpu_affinity, if that is also given).
+                             Memory is then allocated locally to that node by the operating system's default first-touch policy.
+        nice:                The nice value (-20 to 19) of the process. If None, the nice value is inherited from the parent.
+                             Lowering the nice value below that of the parent usually requires elevated privileges.
+        scheduling_policy:   The scheduling class of the process. If None, the policy is inherited from the parent.
+        scheduling_priority: The static priority, used with the real-time scheduling policies. Must be zero for the other policies.
+
+    The placement is applied inside the child process, before the runnable executes. Placement is currently only supported on Linux.
+    """
+    cpu_affinity: Optional[FrozenSet[int]] = None
+    numa_node: Optional[int] = None
+    nice: Optional[int] = None
+    scheduling_policy: Optional[SchedulingPolicy] = None
+    scheduling_priority: int = 0
+
+    def __post_init__(self) -> None:
+        if self.cpu_affinity is not None:
+            if not self.cpu_affinity:
+                raise ValueError("CPU affinity must contain at least one CPU")
+            if any((not isinstance(cpu, int)) or cpu < 0 for cpu in self.cpu_affinity):
+                raise ValueError(f"CPU affinity must contain non-negative CPU numbers, got {sorted(self.cpu_affinity)}")
+        if self.numa_node is not None and self.numa_node < 0:
+            raise ValueError("NUMA node must not be negative")
+        if self.nice is not None and not NICE_MIN <= self.nice <= NICE_MAX:
+            raise ValueError(f"Nice value must be in the range {NICE_MIN} to {NICE_MAX}")
+        if self.scheduling_policy is None:
+            if self.scheduling_priority != 0:
+                raise ValueError("A scheduling priority may only be given together with a scheduling policy")
+        elif self.scheduling_policy.is_real_time():
+            if self.scheduling_priority < 1:
+                raise ValueError("Real-time scheduling policies require a scheduling priority of at least 1")
+        elif self.scheduling_priority != 0:
+            raise ValueError(f"Scheduling priority must be zero for scheduling policy {self.scheduling_policy.name}")
+        if not self.is_default() and not is_placement_supported():
+            raise RuntimeError("Process placement (CPU affinity, nice value and scheduling policy) is not supported on this platform")
+
+    def is_default(self) -> bool:
+        """Returns True if no placement options have been given, in which case the child process inherits everything from its parent."""
+        return self.cpu_affinity is None and self.numa_node is None and self.nice is None and self.scheduling_policy is None
+
+    def with_cpu_affinity(self, cpu_affinity: Iterable[int]) -> 'ProcessPlacement':
+        """Returns a copy of this placement with a different CPU affinity."""
+        return ProcessPlacement(frozenset(cpu_affinity), self.numa_node, self.nice, self.scheduling_policy, self.scheduling_priority)
+
+    def effective_cpu_affinity(self) -> Optional[FrozenSet[int]]:
+        """Returns the CPUs that the process will be restricted to, taking the NUMA node into account, or None if the affinity is inherited."""
+        if self.numa_node is None:
+            return self.cpu_affinity
+        node_cpus = numa_node_cpus(self.numa_node)
+        if self.cpu_affinity is None:
+            return node_cpus
+        ret = self.cpu_affinity & node_cpus
+        if not ret:
+            raise ValueError(f"None of the CPUs {sorted(self.cpu_affinity)} belong to NUMA node {self.numa_node}")
+        return ret
+
+    def apply_to_current_process(self) -> None:
+        """Applies the placement to every thread of the calling process. Threads started afterwards inherit the settings from the thread that starts them."""
+        if self.is_default():
+            return
+        cpu_affinity = self.effective_cpu_affinity()
+        for thread_id in _get_current_process_thread_ids():
+            if cpu_affinity is not None:
+                os.sched_setaffinity(thread_id, cpu_affinity)
+            if self.scheduling_policy is not None:
+                os.sched_setscheduler(thread_id, self.scheduling_policy.os_value(), os.sched_param(self.scheduling_priority))  # type: ignore  # missing from typeshed
+            if self.nice is not None:
+                os.setpriority(os.PRIO_PROCESS, thread_id, self.nice)
+        logger.debug("Applied process placement: CPUs %s, nice %s, scheduling policy %s (priority %d)",
+                     sorted(cpu_affinity) if cpu_affinity is not None else "inherited", self.nice, self.scheduling_policy, self.scheduling_priority)
+
+
+def is_placement_supported() -> bool:
+    """Returns True if the platform supports setting CPU affinity, nice values and scheduling policies of processes."""
+    return hasattr(os, "sched_setaffinity") and hasattr(os, "sched_setscheduler") and hasattr(os, "setpriority")
+
+
+def available_cpus() -> FrozenSet[int]:
+    """Returns the CPUs that the current process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return frozenset(os.sched_getaffinity(0))
+    return frozenset(range(os.cpu_count() or 1))
+
+
+def numa_node_cpus(node: int) -> FrozenSet[int]:
+    """Returns the CPUs belonging to the given NUMA node. Raises ValueError if the node does not exist."""
+    path = Path(_NUMA_NODE_CPULIST.format(node))
+    if not path.is_file():
+        raise ValueError(f"NUMA node {node} does not exist, or NUMA information is not available on this platform")
+    return parse_cpu_list(path.read_text())
+
+
+def parse_cpu_list(cpu_list: str) -> FrozenSet[int]:
+    """Parses a CPU list in the format used by the Linux kernel, such as "0-3,8,10-11"."""
+    ret: List[int] = []
+    for part in cpu_list.strip().split(","):
+        if not part:
+            continue
+        if "-" in part:
+            first, last = part.split("-", 1)
+            ret.extend(range(int(first), int(last) + 1))
+        else:
+            ret.append(int(part))
+    return frozenset(ret)
+
+
+def _get_current_process_thread_ids() -> List[int]:
+    # On Linux, affinity, scheduling policy and nice value are per-thread attributes. The process may already have helper threads (e.g. queue feeder threads),
+    # so apply the settings to all of them. Zero means "the calling thread" and is used where the threads cannot be enumerated.
+    try:
+        return [int(thread_id) for thread_id in os.listdir(_PROCESS_THREADS_DIRECTORY)]
+    except OSError:
+        return [0]
@@ -1,20 +1,26 @@
 import logging
 import pickle
 from multiprocessing import Process
-from typing import Any, Optional, Set, Type, TypeVar
+from typing import Any, Callable, Iterable, Optional, Sequence, Set, TYPE_CHECKING, Type, TypeVar
 
-from puma.attribute import AccessibleScope, ProcessAction
+from puma.attribute import AccessibleScope, ProcessAction, parent_only
 from puma.attribute.attribute.scoped_attribute import ScopedAttribute
 from puma.attribute.attribute.sharing_attribute_between_scopes_not_allowed_error import SharingAttributeBetweenProcessesNotAllowedError
 from puma.attribute.mixin import ScopedAttributeState, ScopedAttributesBaseMixin
 from puma.buffer import Buffer, MultiProcessBuffer
 from puma.buffer.implementation.managed_queues import ManagedProcessQueue
 from puma.context import Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager
-from puma.helpers.os import is_windows
 from puma.logging import Logging, ManagedProcessLogQueue, ProcessLoggingMechanism
-from puma.primitives import ProcessLock
+from puma.logging.child_process_logging.child_process_configuration import ChildProcessConfiguration
+from puma.logging.managed_process_log_queue import DEFAULT_LOG_QUEUE_SIZE
+from puma.primitives import ProcessLock, ThreadLock
+from puma.process_context import StartMethod, get_start_method, set_start_method, start_process_using
 from puma.runnable import Runnable
 from puma.runnable.runner import Runner
+from puma.runnable.runner.process_placement import ProcessPlacement, SchedulingPolicy, available_cpus
+
+if TYPE_CHECKING:
+    from puma.runnable.runner.standby_process_pool import StandbyProcessPool  # noqa: F401
 
 BufferType = TypeVar("BufferType")
 
@@ -24,59 +30,132 @@ logger = logging.getLogger(__name__)
 class ProcessRunner(Runner, Process):
     """Executes a Runnable within a separate process."""
 
-    _instances_lock = ProcessLock()
+    _instances_lock: Optional[ProcessLock] = None  # Created on first use, so that importing this module does not fix the multiprocessing context
+    _instances_lock_creation_lock = ThreadLock()
+    _instances_lock_start_method: Optional[StartMethod] = None
     _instances = 0
     _process_log_queue: Optional[ManagedProcessQueue] = None
     _process_logging_mechanism: Optional[ProcessLoggingMechanism] = None
+    _standby_pool: Optional['StandbyProcessPool'] = parent_only("_standby_pool")
+
+    def __init__(self, runnable: Runnable, name: Optional[str] = None, *,
+                 cpu_affinity: Optional[Iterable[int]] = None,
+                 numa_node: Optional[int] = None,
+                 nice: Optional[int] = None,
+                 scheduling_policy: Optional[SchedulingPolicy] = None,
+                 scheduling_priority: int = 0,
+                 start_method: Optional[StartMethod] = None,
+                 standby_pool: Optional['StandbyProcessPool'] = None) -> None:
+        """Constructor.
+
+        Arguments:
+            runnable: The Runnable to execute.
+            name: Optional name for the Runner, used for logging.
+            cpu_affinity: Optional collection of CPUs that the child process is restricted to.
+            numa_node: Optional NUMA node whose CPUs the child process is restricted to.
+            nice: Optional nice value for the child process.
+            scheduling_policy: Optional scheduling class for the child process, e.g. SchedulingPolicy.FIFO for real-time scheduling.
+            scheduling_priority: The static priority used with real-time scheduling policies.
+            start_method: Optional start method for the child process, overriding the one set by puma.process_context.set_start_method.
+            standby_pool: Optional pool of pre-started processes. If given, the runnable is run in one of the pool's idle processes, which is much quicker than
+                          starting a new process. If the pool has no idle process, a new process is started as usual.
+
+        See ProcessPlacement for details. The placement is applied in the child process before the runnable executes; if it cannot be applied (for example, because
+        real-time scheduling requires privileges that the process does not have) then the runner ends with the error.
 
-    def __init__(self, runnable: Runnable, name: Optional[str] = None) -> None:
+        The runner's buffers are created from the globally configured context, so a runner can only be given a start method other than "fork" if the global start
+        method is not "fork" either: primitives created by the fork context cannot be shared with processes started in any other way.
+        """
+        if start_method is not None and start_method != StartMethod.FORK and get_start_method() == StartMethod.FORK:
+            raise ValueError(f"A runner cannot use the {start_method.value} start method when the global start method is fork; call set_start_method first")
+        if standby_pool is not None and start_method is not None:
+            raise ValueError("A start method cannot be given when using a standby pool, because the pool's processes have already been started")
         super().__init__(runnable, name)
+        self._child_start_method = start_method  # Not "_start_method", which is used by multiprocessing.Process
+        self._placement = ProcessPlacement(frozenset(cpu_affinity) if cpu_affinity is not None else None, numa_node, nice, scheduling_policy, scheduling_priority)
+        self._has_been_started = False
+        self._standby_pool = standby_pool
+        self._child_logging_initialised = False  # Set if the child is a standby process whose logging has been initialised with the required configuration
 
     def __enter__(self) -> 'ProcessRunner':
-        with ProcessRunner._instances_lock:
+        self._child_process_logging_config = ProcessRunner._add_instance(self._log_queue_factory)
+        super().__enter__()
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        try:
+            super().__exit__(exc_type, exc_value, traceback)
+        finally:
+            ProcessRunner._remove_instance(exc_type, exc_value, traceback)
+
+    @staticmethod
+    def _add_instance(log_queue_factory: Callable[[], ManagedProcessLogQueue]) -> ChildProcessConfiguration:
+        # Counts instances, creating the multiprocess logging mechanism for the first. Also used by StandbyProcessPool, to keep the mechanism alive for its workers.
+        # Returns the logging configuration for child processes.
+        with ProcessRunner._get_instances_lock():
             ProcessRunner._instances += 1
             if ProcessRunner._instances == 1:
                 logger.debug("Creating first instance of ProcessRunner, creating multiprocess logging mechanism")
-                ProcessRunner._process_log_queue = self._log_queue_factory()
+                ProcessRunner._process_log_queue = log_queue_factory()
                 ProcessRunner._process_log_queue.__enter__()
                 ProcessRunner._process_logging_mechanism = ProcessLoggingMechanism(ProcessRunner._process_log_queue)
                 ProcessRunner._process_logging_mechanism.__enter__()
         assert ProcessRunner._process_log_queue
-        self._child_process_logging_config = Logging.get_child_process_logging_config(ProcessRunner._process_log_queue)
-        super().__enter__()
-        return self
+        return Logging.get_child_process_logging_config(ProcessRunner._process_log_queue)
 
-    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
-        try:
-            super().__exit__(exc_type, exc_value, traceback)
-        finally:
-            with ProcessRunner._instances_lock:
-                ProcessRunner._instances -= 1
-                if ProcessRunner._instances == 0:
-                    logger.debug("Destroying last instance of ProcessRunner, removing multiprocess logging mechanism")
-                    if ProcessRunner._process_logging_mechanism:
-                        ProcessRunner._process_logging_mechanism.__exit__(exc_type, exc_value, traceback)
-                        ProcessRunner._process_logging_mechanism = None
-                    if ProcessRunner._process_log_queue:
-                        ProcessRunner._process_log_queue.__exit__(exc_type, exc_value, traceback)
+    @staticmethod
+    def _remove_instance(exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        # Counterpart of _add_instance, removing the multiprocess logging mechanism when the last instance is removed
+        with ProcessRunner._get_instances_lock():
+            ProcessRunner._instances -= 1
+            if ProcessRunner._instances == 0:
+                logger.debug("Destroying last instance of ProcessRunner, removing multiprocess logging mechanism")
+                if ProcessRunner._process_logging_mechanism:
+                    ProcessRunner._process_logging_mechanism.__exit__(exc_type, exc_value, traceback)
+                    ProcessRunner._process_logging_mechanism = None
+                if ProcessRunner._process_log_queue:
+                    ProcessRunner._process_log_queue.__exit__(exc_type, exc_value, traceback)
+
+    @staticmethod
+    def _get_child_process_logging_config() -> ChildProcessConfiguration:
+        # Returns the current logging configuration for child processes. Only valid while there are instances.
+        assert ProcessRunner._process_log_queue
+        return Logging.get_child_process_logging_config(ProcessRunner._process_log_queue)
 
     def __getstate__(self) -> ScopedAttributeState:
         ret = super().__getstate__()
         # Serialise the instance-counting mechanism and the logging queue to the new process, because these should be system-global
-        ret.attributes['$cls$_instances_lock'] = ProcessRunner._instances_lock
-        with ProcessRunner._instances_lock:
+        instances_lock = ProcessRunner._get_instances_lock()
+        ret.attributes['$cls$_instances_lock'] = instances_lock
+        ret.attributes['$glob$_start_method'] = get_start_method()  # Unless forked, the child would otherwise revert to the default start method
+        with instances_lock:
             ret.attributes['$cls$_instances'] = ProcessRunner._instances
             ret.attributes['$cls$_process_log_queue'] = ProcessRunner._process_log_queue
         return ret
 
     def __setstate__(self, state: ScopedAttributeState) -> None:
-        ProcessRunner._instances_lock = state.attributes.pop('$cls$_instances_lock')
-        with ProcessRunner._instances_lock:
+        start_method = state.attributes.pop('$glob$_start_method')
+        if start_method != get_start_method():
+            set_start_method(start_method)
+        instances_lock = state.attributes.pop('$cls$_instances_lock')
+        ProcessRunner._instances_lock = instances_lock
+        ProcessRunner._instances_lock_start_method = start_method
+        with instances_lock:
             ProcessRunner._instances = state.attributes.pop('$cls$_instances')
             ProcessRunner._process_log_queue = state.attributes.pop('$cls$_process_log_queue')
             ProcessRunner._process_logging_mechanism = None  # Only used by the main process, not children
         super().__setstate__(state)
 
+    @classmethod
+    def _get_instances_lock(cls) -> ProcessLock:
+        with cls._instances_lock_creation_lock:
+            start_method = get_start_method()
+            if ProcessRunner._instances_lock is None or (ProcessRunner._instances == 0 and ProcessRunner._instances_lock_start_method != start_method):
+                # (Re)create the lock if the start method has been changed while there are no instances, since locks cannot be shared between contexts
+                ProcessRunner._instances_lock = ProcessLock()
+                ProcessRunner._instances_lock_start_method = start_method
+            return ProcessRunner._instances_lock
+
     def get_name(self) -> str:
         """Overload, delegating to the process"""
         return self.name
@@ -95,15 +174,46 @@ class ProcessRunner(Runner, Process):
         self._runnable.runner_accessor.set_command_buffer(self._command_buffer)
         self._runnable.runner_accessor.set_status_buffer_subscription(self._status_buffer_subscription)
 
+        self._has_been_started = True
         try:
             Process.start(self)  # calls run() in a new process
         except TypeError as e:
             self._handle_type_error(e)
 
+    def get_placement(self) -> ProcessPlacement:
+        """Returns the scheduling options that will be applied to the child process."""
+        return self._placement
+
+    def set_placement(self, placement: ProcessPlacement) -> None:
+        """Sets the scheduling options that will be applied to the child process. Must be called before the runner is started."""
+        if self._has_been_started:
+            raise RuntimeError(f"{self.get_name()}: Placement cannot be changed once the runner has been started")
+        self._placement = placement
+
+    def get_start_method(self) -> StartMethod:
+        """Returns the start method that is used for the child process."""
+        return self._child_start_method or get_start_method()
+
+    def _Popen(self, process_obj: Any) -> Any:
+        """Overload, starting the process using the context of the runner's start method, rather than the multiprocessing module's default"""
+        if self._standby_pool is not None:
+            worker = self._standby_pool.claim_worker()
+            if worker:
+                self._child_logging_initialised = worker.logging_config == self._child_process_logging_config
+                return worker.start_process(process_obj)
+            logger.debug("%s: No standby process available, starting a new process", self.get_name())
+        return start_process_using(process_obj, self._child_start_method)
+
     def run(self) -> None:
-        Logging.init_child_process_logging(self._child_process_logging_config)
+        if not self._child_logging_initialised:
+            Logging.init_child_process_logging(self._child_process_logging_config)
         super().run()
 
+    def _pre_run_execute(self) -> None:
+        """Overload, applying the process placement before the runnable executes. Errors are reported back to the parent in the usual way."""
+        self._placement.apply_to_current_process()
+        super()._pre_run_execute()
+
     def _perform_join(self, timeout: Optional[float] = None) -> None:
         """Overload, delegating to the process"""
         Process.join(self, timeout)
@@ -128,7 +238,7 @@ class ProcessRunner(Runner, Process):
         return MultiProcessBuffer(size, name, warn_on_discard)
 
     def _log_queue_factory(self) -> ManagedProcessLogQueue:
-        return ManagedProcessLogQueue(name='logging queue')
+        return ManagedProcessLogQueue(maxsize=DEFAULT_LOG_QUEUE_SIZE, name='logging queue')
 
     def _handle_scoped_attributes_in_parent_scope(self, obj: Any, object_recursion_tracker: Set[Any]) -> None:
 
@@ -146,11 +256,35 @@ class ProcessRunner(Runner, Process):
         self._iterate_over_all_scoped_attributes(obj, attribute_callback)
 
     def _handle_scoped_attributes_in_child_scope(self, obj: Any, object_recursion_tracker: Set[Any]) -> None:
-        if is_windows():
-            # No need to handle child attributes on Windows, as they will have already been managed in __getstate__ and __setstate__
+        if self.get_start_method() != StartMethod.FORK:
+            # No need to handle child attributes unless forked (e.g. on Windows), as they will have already been managed in __getstate__ and __setstate__
             return
         super()._handle_scoped_attributes_in_child_scope(obj, object_recursion_tracker)
 
     def _handle_individual_scoped_attribute_in_child_scope(self, obj: Any, name: str, attribute: ScopedAttribute) -> None:
         if attribute.process_action == ProcessAction.SET_TO_NONE:
             setattr(obj, name, None)
+
+
+def spread_across_cpus(runners: Sequence[ProcessRunner], cpus: Optional[Iterable[int]] = None, cpus_per_runner: int = 1) -> None:
+    """Pins each of the given runners to its own CPU (or group of CPUs), so that busy processes are not migrated between CPUs by the operating system.
+
+    Must be called before the runners are started. Other placement options (nice value, scheduling policy) already given to the runners are preserved.
+
+    Arguments:
+        runners: The runners to distribute.
+        cpus: The CPUs to distribute the runners over. By default, all CPUs that the current process is allowed to run on.
+        cpus_per_runner: How many CPUs each runner is given.
+
+    If there are more runners than groups of CPUs, the CPUs are re-used in round-robin order.
+    """
+    if cpus_per_runner < 1:
+        raise ValueError("cpus_per_runner must be at least 1")
+    cpu_list = sorted(set(cpus)) if cpus is not None else sorted(available_cpus())
+    if len(cpu_list) < cpus_per_runner:
+        raise ValueError(f"Cannot give each runner {cpus_per_runner} CPUs when only {len(cpu_list)} are available")
+    groups = [cpu_list[i:i + cpus_per_runner] for i in range(0, len(cpu_list) - cpus_per_runner + 1, cpus_per_runner)]
+    for index, runner in enumerate(runners):
+        group = groups[index % len(groups)]
+        logger.debug("Pinning %s to CPUs %s", runner.get_name(), group)
+        runner.set_placement(runner.get_placement().with_cpu_affinity(group))
@@ -9,7 +9,7 @@ from puma.attribute.mixin import ScopedAttributesBaseMixin, ScopedAttributesComp
 from puma.buffer import Buffer
 from puma.context import ContextManager, Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager, must_be_context_managed
 from puma.runnable import Runnable
-from puma.runnable.message import CommandMessage, CommandMessageBuffer, StatusBuffer, StatusBufferSubscription, StatusMessage, StatusMessageBuffer
+from puma.runnable.message import CommandMessage, CommandMessageBuffer, StatusBuffer, StatusBufferSubscription, StatusListener, StatusMessage, StatusMessageBuffer
 from puma.timeouts import TIMEOUT_INFINITE, Timeouts
 
 DEFAULT_COMMAND_AND_STATUS_BUFFER_SIZE = 10
@@ -176,6 +176,28 @@ class Runner(ScopedAttributesCompatibilityMixin, ContextManager["Runner"], ABC):
             raise RuntimeError(f"{self.get_name()}: Not context managed")
         self._status_buffer_subscription.check_for_exceptions()
 
+    @ensure_used_within_context_manager
+    def has_completed(self) -> bool:
+        """Returns True once the runnable has reported that it has ended, with or without an error. Any error is not raised: call check_for_exceptions() to raise it."""
+        if not self._status_buffer_subscription:
+            raise RuntimeError(f"{self.get_name()}: Not context managed")
+        return self._status_buffer_subscription.has_finished()
+
+    @ensure_used_within_context_manager
+    def add_status_listener(self, listener: StatusListener) -> None:
+        """Registers a callable that is called whenever the runner sends a status message to its owner, including when it ends. Used by RunnerMonitor.
+
+        The listener may be called in any thread, and should do no more than wake the owner, which can then call has_completed() or check_for_exceptions().
+        """
+        if not self._status_buffer_subscription:
+            raise RuntimeError(f"{self.get_name()}: Not context managed")
+        self._status_buffer_subscription.add_listener(listener)
+
+    def remove_status_listener(self, listener: StatusListener) -> None:
+        """Unregisters a callable registered using add_status_listener()."""
+        if self._status_buffer_subscription:
+            self._status_buffer_subscription.remove_listener(listener)
+
     @abstractmethod
     @ensure_used_within_context_manager
     def start(self) -> None:
@@ -0,0 +1,182 @@
+import logging
+from contextlib import ExitStack
+from time import monotonic
+from typing import Dict, Iterable, List, Optional
+
+from puma.context import ContextManager, Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager, must_be_context_managed
+from puma.runnable.runner.runner import Runner, RunnerStillAliveError
+from puma.timeouts import TIMEOUT_INFINITE, TIMEOUT_NO_WAIT, Timeouts
+
+logger = logging.getLogger(__name__)
+
+
+@must_be_context_managed
+class RunnerGroup(ContextManager["RunnerGroup"]):
+    """Manages a number of runners as a group, so that they are started, stopped and joined together rather than one after another.
+
+    Starting the group starts every runner before waiting for any of them to report that it is running; joining the group (and ending its context management)
+    tells every runner to stop before waiting for any of them to end, using one deadline shared between all the runners. The time taken to start or stop the group
+    is therefore roughly that of the slowest runner, rather than the sum of them all.
+
+    Example:
+        with RunnerGroup([ProcessRunner(runnable) for runnable in runnables]) as group:
+            group.start_blocking()
+            ...
+            group.check_for_exceptions()
+
+    Errors are handled in the same way as for an individual runner: when context management ends, any error raised by any of the runners is re-raised.
+
+    Runners can be added to the group, and removed from it, while it is in context management; see add() and remove().
+    """
+
+    def __init__(self, runners: Iterable[Runner], name: str = "Runner group") -> None:
+        """Constructor.
+
+        Arguments:
+            runners: The runners in the group. These must not be context managed by the caller; the group manages them.
+            name: Name of the group, used for logging.
+        """
+        self._runners: List[Runner] = list(runners)
+        if not self._runners:
+            raise ValueError("A runner group must contain at least one runner")
+        self._name = name
+        self._context_management = ExitStack()
+        self._runner_context_managements: Dict[Runner, ExitStack] = {}
+        self._in_context_management = False
+
+    def __enter__(self) -> 'RunnerGroup':
+        logger.debug("%s: Entering context management of %d runners", self._name, len(self._runners))
+        with ExitStack() as stack:
+            for runner in self._runners:
+                self._enter_runner(runner, stack)
+            self._context_management = stack.pop_all()  # If any runner fails to enter, those already entered are exited by the stack
+        self._in_context_management = True
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        """End of context management. All the runners are stopped, then joined together, then their context management ends.
+
+        If any errors have occurred then the first of them is re-raised; although it is good practice for the caller not to rely on this, but to poll
+        check_for_exceptions().
+        """
+        unrolling_after_exception: bool = exc_type is not None
+        logger.debug("%s: Exiting context management, stopping", self._name)
+        try:
+            self._stop_alive_runners()
+            try:
+                self._join(self._get_final_join_timeout())
+            except RunnerStillAliveError as e:
+                if not unrolling_after_exception:
+                    raise e
+        finally:
+            self._in_context_management = False
+            self._runner_context_managements.clear()
+            self._context_management.__exit__(exc_type, exc_value, traceback)
+            logger.debug("%s: Finished", self._name)
+
+    def get_name(self) -> str:
+        return self._name
+
+    def get_runners(self) -> List[Runner]:
+        """Returns the runners in the group."""
+        return list(self._runners)
+
+    def add(self, runner: Runner) -> None:
+        """Adds a runner to the group. If the group is in context management, then so is the runner, from now on; the caller must start it."""
+        if runner in self._runners:
+            raise ValueError(f"{self._name}: Runner {runner.get_name()} is already in the group")
+        if self._in_context_management:
+            self._enter_runner(runner, self._context_management)
+        self._runners.append(runner)
+
+    def remove(self, runner: Runner) -> None:
+        """Removes a runner from the group. If the group is in context management, then the runner's context management ends, which stops and joins it, and
+        re-raises any error that it raised. Does nothing if the runner is not in the group.
+        """
+        if runner not in self._runners:
+            return
+        self._runners.remove(runner)
+        runner_context_management = self._runner_context_managements.pop(runner, None)
+        if runner_context_management:
+            runner_context_management.close()
+
+    @ensure_used_within_context_manager
+    def start(self) -> None:
+        """Starts all the runners, without waiting for them to report that they are running."""
+        logger.debug("%s: Starting", self._name)
+        for runner in self._runners:
+            runner.start()
+
+    @ensure_used_within_context_manager
+    def start_blocking(self, timeout: float = TIMEOUT_INFINITE) -> None:
+        """Starts all the runners, then blocks until all of them have reported that they are running.
+
+        Raises RuntimeError if any runner has not reported that it is running within the given timeout, which applies to the group as a whole.
+        """
+        Timeouts.validate(timeout)
+        self.start()
+        self.wait_until_running(timeout)
+
+    @ensure_used_within_context_manager
+    def wait_until_running(self, timeout: float = TIMEOUT_INFINITE) -> None:
+        """Blocks until all the runners have reported that they are running.
+
+        Raises RuntimeError if any runner has not reported that it is running within the given timeout, which applies to the group as a whole.
+        Raises an exception if any runner pushed an error onto its status buffer.
+        """
+        logger.debug("%s: Waiting until running", self._name)
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        for runner in self._runners:
+            remaining = end_time - monotonic()
+            runner.wait_until_running(TIMEOUT_NO_WAIT if remaining <= 0.0 else remaining)
+
+    @ensure_used_within_context_manager
+    def stop(self) -> None:
+        """Sends the stop command to all the runners."""
+        for runner in self._runners:
+            runner.stop()
+
+    @ensure_used_within_context_manager
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Blocks until all the runners have ended. The timeout applies to the group as a whole.
+
+        Raises RunnerStillAliveError, naming the runners concerned, if any of them are still alive when the timeout expires.
+        """
+        self._join(timeout)
+
+    @ensure_used_within_context_manager
+    def check_for_exceptions(self) -> None:
+        """Checks all the runners for errors, raising the first error found."""
+        for runner in self._runners:
+            runner.check_for_exceptions()
+
+    def is_alive(self) -> bool:
+        """Returns True if any of the runners is alive."""
+        return any(runner.is_alive() for runner in self._runners)
+
+    def _stop_alive_runners(self) -> None:
+        for runner in self._runners:
+            if runner.is_alive():
+                runner.stop()
+
+    def _join(self, timeout: Optional[float]) -> None:
+        Timeouts.validate_optional(timeout)
+        end_time = None if timeout is None else monotonic() + timeout
+        still_alive: List[str] = []
+        for runner in self._runners:
+            try:
+                runner.join(None if end_time is None else max(end_time - monotonic(), 0.0))
+            except RunnerStillAliveError:
+                still_alive.append(runner.get_name())
+        if still_alive:
+            raise RunnerStillAliveError(f"{self._name}: Failed to stop the runners: {', '.join(still_alive)}")
+
+    def _get_final_join_timeout(self) -> float:
+        """Returns the timeout for the join() called when the group exits context management."""
+        return max((runner._get_final_join_timeout() for runner in self._runners), default=0.0)
+
+    def _enter_runner(self, runner: Runner, stack: ExitStack) -> None:
+        # Each runner's context management is held in a stack of its own, within the group's, so that it can be ended early if the runner is removed
+        runner_context_management = stack.enter_context(ExitStack())
+        runner_context_management.enter_context(runner)
+        self._runner_context_managements[runner] = runner_context_management
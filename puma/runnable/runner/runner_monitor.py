@@ -0,0 +1,168 @@
+import logging
+from collections import deque
+from time import monotonic
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+from puma.context import ContextManager, Exit_1, Exit_2, Exit_3, ensure_used_within_context_manager, must_be_context_managed
+from puma.primitives import AutoResetEvent, ThreadLock
+from puma.runnable.message import StatusListener
+from puma.runnable.runner.runner import Runner
+from puma.timeouts import TIMEOUT_INFINITE, Timeouts
+
+logger = logging.getLogger(__name__)
+
+RunnerCallback = Callable[[Runner], None]
+
+
+@must_be_context_managed
+class RunnerMonitor(ContextManager["RunnerMonitor"]):
+    """Watches a number of runners using a single event, so that the owner can wait for any of them to end, or check them for errors, without polling each in turn.
+
+    Each runner's status buffer wakes the monitor when a status message arrives. Only the runners that have sent a message since they were last examined are then
+    examined, so the cost of wait_any() and check_for_exceptions() does not grow with the number of runners being watched.
+
+    The runners must be in context management before the monitor is, and must remain so until the monitor's context management has ended.
+
+    Example:
+        with RunnerGroup(runners) as group, RunnerMonitor(runners) as monitor:
+            group.start_blocking()
+            runner = monitor.wait_any()
+            runner.check_for_exceptions()
+
+    A runner whose process is killed, and which therefore cannot report that it has ended, is not detected.
+    """
+
+    def __init__(self, runners: Iterable[Runner] = (), name: str = "Runner monitor") -> None:
+        """Constructor.
+
+        Arguments:
+            runners: The runners to watch. More can be added using add().
+            name: Name of the monitor, used for logging.
+        """
+        self._name = name
+        self._event = AutoResetEvent()
+        self._notified_lock = ThreadLock()
+        self._notified: Dict[Runner, None] = {}  # Runners that have sent a status message since they were last examined (a dict, to keep them in order)
+        self._listeners: Dict[Runner, StatusListener] = {}
+        self._unchecked: Dict[Runner, None] = {}  # Runners that have sent a status message since check_for_exceptions() last examined them
+        self._completed: Deque[Runner] = deque()  # Runners that have ended but have not yet been returned by wait_any()
+        self._ended: Dict[Runner, None] = {}  # All runners that have been found to have ended
+        self._callbacks: List[RunnerCallback] = []
+        self._in_context_management = False
+        for runner in runners:
+            self.add(runner)
+
+    def __enter__(self) -> 'RunnerMonitor':
+        logger.debug("%s: Entering context management, watching %d runners", self._name, len(self._listeners))
+        self._in_context_management = True
+        try:
+            for runner, listener in self._listeners.items():
+                runner.add_status_listener(listener)
+        except BaseException:
+            self._remove_listeners()
+            self._in_context_management = False
+            raise
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        logger.debug("%s: Exiting context management", self._name)
+        self._remove_listeners()
+        self._in_context_management = False
+
+    def get_name(self) -> str:
+        return self._name
+
+    def add(self, runner: Runner) -> None:
+        """Starts watching the given runner. If the monitor is already in context management, then so must the runner be."""
+        if runner in self._listeners:
+            raise ValueError(f"{self._name}: Runner {runner.get_name()} is already being watched")
+
+        def listener() -> None:
+            self._on_status(runner)
+
+        self._listeners[runner] = listener
+        if self._in_context_management:
+            runner.add_status_listener(listener)
+
+    def remove(self, runner: Runner) -> None:
+        """Stops watching the given runner. Does nothing if the runner is not being watched."""
+        listener = self._listeners.pop(runner, None)
+        if listener is None:
+            return
+        if self._in_context_management:
+            runner.remove_status_listener(listener)
+        with self._notified_lock:
+            self._notified.pop(runner, None)
+        self._unchecked.pop(runner, None)
+        self._ended.pop(runner, None)
+        if runner in self._completed:
+            self._completed.remove(runner)
+
+    def get_runners(self) -> List[Runner]:
+        """Returns the runners being watched."""
+        return list(self._listeners)
+
+    def add_callback(self, callback: RunnerCallback) -> None:
+        """Registers a callable that is given each runner when it is found to have ended, with or without an error.
+
+        Callbacks are called in the thread that calls wait_any() or check_for_exceptions(), at the point when the runner's ending is detected.
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: RunnerCallback) -> None:
+        """Unregisters a callable registered using add_callback(). Does nothing if it is not registered."""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    @ensure_used_within_context_manager
+    def wait_any(self, timeout: float = TIMEOUT_INFINITE) -> Optional[Runner]:
+        """Blocks until any of the runners has ended, with or without an error, or until the timeout expires.
+
+        Returns the runner that ended, or None if the timeout expired. Each runner is returned only once; the caller should call check_for_exceptions() on it.
+        """
+        Timeouts.validate(timeout)
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        while True:
+            self._examine_notified_runners()
+            if self._completed:
+                return self._completed.popleft()
+            remaining = end_time - monotonic()
+            if remaining <= 0.0:
+                return None
+            self._event.wait(remaining)
+
+    @ensure_used_within_context_manager
+    def check_for_exceptions(self) -> None:
+        """Raises the first error found in any of the runners. Only the runners that have sent a status message since they were last checked are checked."""
+        self._examine_notified_runners()
+        while self._unchecked:
+            runner = next(iter(self._unchecked))
+            del self._unchecked[runner]
+            runner.check_for_exceptions()
+
+    def get_ended(self) -> List[Runner]:
+        """Returns the runners that have been found to have ended, in the order in which they were found."""
+        return list(self._ended)
+
+    def _on_status(self, runner: Runner) -> None:
+        # Called in whichever thread delivers a status message from the runner
+        with self._notified_lock:
+            self._notified[runner] = None
+        self._event.set()
+
+    def _examine_notified_runners(self) -> None:
+        with self._notified_lock:
+            notified = list(self._notified)
+            self._notified.clear()
+        for runner in notified:
+            self._unchecked[runner] = None
+            if runner not in self._ended and runner.has_completed():
+                logger.debug("%s: Runner %s has ended", self._name, runner.get_name())
+                self._ended[runner] = None
+                self._completed.append(runner)
+                for callback in list(self._callbacks):
+                    callback(runner)
+
+    def _remove_listeners(self) -> None:
+        for runner, listener in self._listeners.items():
+            runner.remove_status_listener(listener)
@@ -0,0 +1,278 @@
+import io
+import logging
+import os
+from multiprocessing import Pipe, Process, context, reduction  # type: ignore  # reduction is missing from typeshed
+from multiprocessing.connection import Connection
+from threading import Thread
+from time import monotonic
+from typing import Any, List, Optional, cast
+
+from puma.context import ContextManager, Exit_1, Exit_2, Exit_3
+from puma.logging import Logging, ManagedProcessLogQueue
+from puma.logging.child_process_logging.child_process_configuration import ChildProcessConfiguration
+from puma.logging.managed_process_log_queue import DEFAULT_LOG_QUEUE_SIZE
+from puma.primitives import ThreadCondition
+from puma.process_context import StartMethod, get_process_context, get_start_method
+from puma.runnable.runner.process_runner import ProcessRunner
+from puma.timeouts import TIMEOUT_INFINITE, Timeouts
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STANDBY_WORKER_JOIN_TIMEOUT = 10.0
+
+# After failing to start a standby process, the pool waits before trying again, doubling the delay after each consecutive failure up to the maximum
+REPLENISH_RETRY_INITIAL_DELAY = 0.1
+REPLENISH_RETRY_MAX_DELAY = 10.0
+
+_inherited_fds: List[int] = []  # In a standby process, the file descriptors that were sent along with the process object
+
+
+class StandbyProcessPool(ContextManager["StandbyProcessPool"]):
+    """A pool of idle, pre-started processes, which ProcessRunners can use to start (almost) instantly.
+
+    Each process in the pool has already been started and has initialised logging. A ProcessRunner that is given the pool claims one of these processes, sends the
+    runner to it over a pipe and runs it there, rather than starting a new process; the process ends when the runner ends. The pool replenishes itself in the
+    background, so that it has a process ready for the next runner. If a process cannot be started, the pool keeps trying, backing off between attempts; until
+    it succeeds, wait_until_ready() raises the error, and runners that find no idle process start a new process as usual.
+
+    The runner has to be pickled to be sent to a pre-started process, which means that primitives created by the "fork" context cannot be used. The pool can
+    therefore only be used if set_start_method has been called to select the "forkserver" or "spawn" start method; forkserver is the recommended choice.
+
+    Example:
+        set_start_method(StartMethod.FORKSERVER)
+        with StandbyProcessPool(2) as standby_pool:
+            with ProcessRunner(runnable, standby_pool=standby_pool) as runner:
+                runner.start_blocking()
+    """
+
+    def __init__(self, size: int = 1, name: str = "Standby process pool") -> None:
+        """Constructor.
+
+        Arguments:
+            size: The number of idle processes to keep ready.
+            name: The name of the pool, used for logging and for naming its processes.
+        """
+        if size < 1:
+            raise ValueError("Standby pool size must be at least 1")
+        if get_start_method() == StartMethod.FORK:
+            raise ValueError("A standby process pool cannot be used with the fork start method; call set_start_method, preferably with StartMethod.FORKSERVER")
+        self._size = size
+        self._name = name
+        self._condition = ThreadCondition()
+        self._idle_workers: List[_StandbyWorker] = []
+        self._stopping = False
+        self._worker_count = 0
+        self._start_error: Optional[Exception] = None  # The error from the most recent attempt to start a process, if it failed
+        self._replenish_thread: Optional[Thread] = None
+
+    def __enter__(self) -> 'StandbyProcessPool':
+        # Keep the multiprocess logging mechanism alive while the pool's processes exist
+        ProcessRunner._add_instance(lambda: ManagedProcessLogQueue(maxsize=DEFAULT_LOG_QUEUE_SIZE, name='logging queue'))
+        self._replenish_thread = Thread(name=f"Replenisher for {self._name}", target=self._replenish_thread_run)
+        self._replenish_thread.start()
+        return self
+
+    def __exit__(self, exc_type: Exit_1, exc_value: Exit_2, traceback: Exit_3) -> None:
+        try:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify_all()
+            if self._replenish_thread:
+                self._replenish_thread.join()
+            with self._condition:
+                workers = self._idle_workers
+                self._idle_workers = []
+            for worker in workers:
+                worker.close()
+        finally:
+            ProcessRunner._remove_instance(exc_type, exc_value, traceback)
+
+    def get_size(self) -> int:
+        """Returns the number of idle processes that the pool tries to keep ready."""
+        return self._size
+
+    def idle_count(self) -> int:
+        """Returns the number of idle processes, some of which may still be initialising."""
+        with self._condition:
+            return len(self._idle_workers)
+
+    def wait_until_ready(self, timeout: float = TIMEOUT_INFINITE) -> bool:
+        """Waits until the pool is full and all its processes have finished initialising. Returns False on timeout.
+
+        Raises RuntimeError if the pool's most recent attempt to start a process failed. The pool carries on trying, so a later call may succeed.
+        """
+        end_time = Timeouts.end_time(monotonic(), timeout)
+        while True:
+            with self._condition:
+                if self._start_error:
+                    raise RuntimeError(f"{self._name}: Failed to start a standby process") from self._start_error
+                if len(self._idle_workers) >= self._size and all(worker.is_ready() for worker in self._idle_workers):
+                    return True
+                remaining = end_time - monotonic()
+                if remaining <= 0.0:
+                    return False
+                self._condition.wait(min(0.01, remaining))  # is_ready() has to poll, so wake regularly
+
+    def claim_worker(self) -> Optional['_StandbyWorker']:
+        """Used by ProcessRunner: Removes an idle process from the pool, returning None if there is none. The pool is replenished in the background."""
+        with self._condition:
+            while self._idle_workers:
+                worker = self._idle_workers.pop(0)
+                self._condition.notify_all()
+                if worker.is_alive():
+                    return worker
+                logger.warning("%s: Standby process %s has ended unexpectedly", self._name, worker.name)
+                worker.close()
+        return None
+
+    def _replenish_thread_run(self) -> None:
+        retry_delay = REPLENISH_RETRY_INITIAL_DELAY
+        while True:
+            with self._condition:
+                while not self._stopping and len(self._idle_workers) >= self._size:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                self._worker_count += 1
+                name = f"{self._name} process {self._worker_count}"
+            try:
+                worker = _StandbyWorker(name, ProcessRunner._get_child_process_logging_config())
+            except Exception as ex:
+                logger.error("%s: Failed to start standby process, trying again in %.1f seconds", self._name, retry_delay, exc_info=True)
+                with self._condition:
+                    self._start_error = ex
+                    self._condition.notify_all()
+                    self._condition.wait_for(lambda: self._stopping, retry_delay)
+                retry_delay = min(retry_delay * 2.0, REPLENISH_RETRY_MAX_DELAY)
+                continue
+            retry_delay = REPLENISH_RETRY_INITIAL_DELAY
+            with self._condition:
+                self._start_error = None
+                if self._stopping:
+                    worker.close()
+                    return
+                self._idle_workers.append(worker)
+                self._condition.notify_all()
+
+
+class _StandbyWorker:
+    """An idle process in a StandbyProcessPool, waiting to be sent a process object to run."""
+
+    def __init__(self, name: str, logging_config: ChildProcessConfiguration) -> None:
+        self.name = name
+        self.logging_config = logging_config
+        self._connection, child_connection = Pipe()
+        self._process: Process = get_process_context().Process(name=name, target=_standby_process_main, args=(child_connection, logging_config), daemon=True)
+        self._process.start()
+        child_connection.close()
+        self._ready = False
+        logger.debug("Started standby process %s", name)
+
+    def is_alive(self) -> bool:
+        return self._process.is_alive()
+
+    def is_ready(self) -> bool:
+        # Returns True once the process has finished initialising and is waiting for a process object
+        if not self._ready and self._connection.poll():
+            try:
+                self._connection.recv_bytes()
+                self._ready = True
+            except EOFError:
+                pass
+        return self._ready
+
+    def start_process(self, process_obj: Process) -> '_StandbyPopen':
+        """Sends the given process object to the standby process, which runs it. Returns the Popen object for the process object."""
+        try:
+            return _StandbyPopen(self._process, self._connection, process_obj)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        self._connection.close()  # The idle process ends when its connection is closed
+        self._process.join(DEFAULT_STANDBY_WORKER_JOIN_TIMEOUT)
+        if self._process.is_alive():
+            logger.warning("Standby process %s did not end, terminating it", self.name)
+            self._process.terminate()
+
+
+class _StandbyPopen:
+    """Takes the place of the Popen object (as used by multiprocessing.Process) for a process object that is run in a standby process.
+
+    The process object is pickled in the same way as when spawning a process. File descriptors (of pipes, for example) are sent alongside it.
+    """
+    method = 'standby'
+
+    def __init__(self, standby_process: Process, connection: Connection, process_obj: Process) -> None:
+        self._standby_process = standby_process
+        self._fds: List[int] = []
+        buffer = io.BytesIO()
+        context.set_spawning_popen(self)
+        try:
+            reduction.dump(process_obj, buffer)
+        finally:
+            context.set_spawning_popen(None)
+        connection.send_bytes(buffer.getvalue())
+        connection.send(len(self._fds))
+        for fd in self._fds:
+            reduction.send_handle(connection, fd, standby_process.pid)
+        connection.close()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._standby_process.pid
+
+    @property
+    def sentinel(self) -> int:
+        return self._standby_process.sentinel
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._standby_process.exitcode
+
+    def duplicate_for_child(self, fd: int) -> int:
+        self._fds.append(fd)
+        return len(self._fds) - 1
+
+    def poll(self, flag: int = os.WNOHANG) -> Optional[int]:
+        return cast(Optional[int], self._popen().poll(flag))
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        return cast(Optional[int], self._popen().wait(timeout))
+
+    def terminate(self) -> None:
+        self._popen().terminate()
+
+    def kill(self) -> None:
+        self._popen().kill()
+
+    def close(self) -> None:
+        self._popen().close()
+
+    def _popen(self) -> Any:
+        return self._standby_process._popen  # type: ignore
+
+    class DupFd:
+        """Used when unpickling in the standby process, to retrieve a file descriptor that was sent alongside the process object."""
+
+        def __init__(self, index: int) -> None:
+            self._index = index
+
+        def detach(self) -> int:
+            return _inherited_fds[self._index]
+
+
+def _standby_process_main(connection: Connection, logging_config: ChildProcessConfiguration) -> None:
+    # The entry point of a standby process: initialises logging, then waits to be sent a process object, and runs it. Ends quietly if the connection is closed.
+    Logging.init_child_process_logging(logging_config)
+    connection.send_bytes(b'')  # Tell the pool that we are ready
+    try:
+        data = connection.recv_bytes()
+        fd_count = connection.recv()
+        _inherited_fds[:] = [reduction.recv_handle(connection) for _ in range(fd_count)]
+    except (EOFError, ConnectionResetError):  # The pool has closed the connection (with the "ready" message unread, in the latter case)
+        return
+    connection.close()
+    process_obj = reduction.pickle.loads(data)
+    os._exit(process_obj._bootstrap())
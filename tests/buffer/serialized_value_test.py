@@ -0,0 +1,52 @@
+import pickle
+from threading import Lock
+from typing import Any, Tuple
+from unittest import TestCase
+
+from puma.buffer import SerializedValue
+from puma.buffer.internal.items.serialized_value_item import SerializedValueItem
+from puma.buffer.internal.items.value_item import ValueItem
+
+
+class _PickleCountingValue:
+    # A value which counts how many times it is pickled
+    pickle_count = 0
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        _PickleCountingValue.pickle_count += 1
+        return _PickleCountingValue, (self.text,)
+
+
+class SerializedValueTest(TestCase):
+
+    def setUp(self) -> None:
+        _PickleCountingValue.pickle_count = 0
+
+    def test_value_is_pickled_once_when_first_needed(self) -> None:
+        serialized_value = SerializedValue(_PickleCountingValue("Hello"))
+        self.assertFalse(serialized_value.is_serialized())
+        self.assertEqual(0, _PickleCountingValue.pickle_count)
+        payload = serialized_value.payload()
+        self.assertTrue(serialized_value.is_serialized())
+        self.assertIs(payload, serialized_value.payload())
+        self.assertEqual(1, _PickleCountingValue.pickle_count)
+        self.assertEqual("Hello", pickle.loads(payload).text)
+
+    def test_item_is_received_as_a_value_item(self) -> None:
+        serialized_value = SerializedValue(_PickleCountingValue("Hello"))
+        items = [SerializedValueItem(serialized_value) for _ in range(3)]
+        self.assertEqual(1, _PickleCountingValue.pickle_count)  # Pickled when the first item was created
+        for item in items:
+            received = pickle.loads(pickle.dumps(item))
+            self.assertIsInstance(received, ValueItem)
+            self.assertEqual("Hello", received.value.text)
+        self.assertEqual(1, _PickleCountingValue.pickle_count)
+
+    def test_error_pickling_value_is_raised_when_item_is_created(self) -> None:
+        serialized_value = SerializedValue(Lock())
+        with self.assertRaises(TypeError):
+            SerializedValueItem(serialized_value)
+        self.assertFalse(serialized_value.is_serialized())
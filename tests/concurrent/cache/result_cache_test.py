@@ -0,0 +1,119 @@
+import os
+import pickle
+import tempfile
+from concurrent.futures import Future
+from typing import Any, List
+from unittest import TestCase
+
+from puma.concurrent.cache.result_cache import ResultCache, ResultCacheStatistics
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+def subtract(a: int, b: int) -> int:
+    return a - b
+
+
+def _pickled_size(value: Any) -> int:
+    return len(pickle.dumps(value, protocol=4))
+
+
+class ResultCacheTest(TestCase):
+
+    def test_key_depends_on_function_and_arguments(self) -> None:
+        key = ResultCache.make_key(add, (1, 2))
+        self.assertIsNotNone(key)
+        self.assertEqual(key, ResultCache.make_key(add, (1, 2)))
+        self.assertNotEqual(key, ResultCache.make_key(add, (2, 1)))
+        self.assertNotEqual(key, ResultCache.make_key(subtract, (1, 2)))
+        self.assertNotEqual(key, ResultCache.make_key(add, (1,), {"b": 2}))
+        self.assertEqual(ResultCache.make_key(add, (), {"a": 1, "b": 2}), ResultCache.make_key(add, (), {"b": 2, "a": 1}))
+
+    def test_calls_that_cannot_be_identified_are_not_cached(self) -> None:
+        def local_function(value: int) -> int:
+            return value
+
+        self.assertIsNone(ResultCache.make_key(lambda value: value, (1,)))
+        self.assertIsNone(ResultCache.make_key(local_function, (1,)))
+        self.assertIsNone(ResultCache.make_key(add, (lambda: 1, 2)))  # The argument cannot be pickled
+
+    def test_get_and_put(self) -> None:
+        cache = ResultCache(1000)
+        self.assertEqual((False, None), cache.get("key"))
+        cache.put("key", [1, 2, 3])
+        found, result = cache.get("key")
+        self.assertTrue(found)
+        self.assertEqual([1, 2, 3], result)
+        result.append(4)  # Each hit is a copy
+        self.assertEqual((True, [1, 2, 3]), cache.get("key"))
+        self.assertEqual(ResultCacheStatistics(hits=2, disk_hits=0, misses=1, evictions=0, entry_count=1, size_bytes=_pickled_size([1, 2, 3])),
+                         cache.get_statistics())
+
+    def test_least_recently_used_results_are_evicted_to_stay_within_the_size_limit(self) -> None:
+        entry_size = _pickled_size("x" * 100)
+        cache = ResultCache(entry_size * 3)
+        for key in ["a", "b", "c"]:
+            cache.put(key, "x" * 100)
+        cache.get("a")  # Now "b" is the least recently used
+        cache.put("d", "x" * 100)
+        self.assertEqual(["a", "c", "d"], [key for key in ["a", "b", "c", "d"] if cache.get(key)[0]])
+        statistics = cache.get_statistics()
+        self.assertEqual(1, statistics.evictions)
+        self.assertEqual(3, statistics.entry_count)
+        self.assertEqual(entry_size * 3, statistics.size_bytes)
+
+    def test_result_larger_than_the_limit_is_not_held_in_memory(self) -> None:
+        cache = ResultCache(10)
+        cache.put("key", "x" * 100)
+        self.assertEqual((False, None), cache.get("key"))
+        self.assertEqual(0, cache.get_statistics().entry_count)
+
+    def test_disk_tier_keeps_evicted_results_and_survives_a_new_cache(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(_pickled_size("x" * 100), disk_directory=directory)
+            cache.put("a", "x" * 100)
+            cache.put("b", "y" * 100)  # Evicts "a" from memory
+            self.assertEqual((True, "x" * 100), cache.get("a"))
+            self.assertEqual(1, cache.get_statistics().disk_hits)
+            self.assertEqual(2, len(os.listdir(directory)))
+
+            new_cache = ResultCache(1000, disk_directory=directory)
+            self.assertEqual((True, "y" * 100), new_cache.get("b"))
+            self.assertEqual((True, "y" * 100), new_cache.get("b"))
+            self.assertEqual(ResultCacheStatistics(hits=2, disk_hits=1, misses=0, evictions=0, entry_count=1, size_bytes=_pickled_size("y" * 100)),
+                             new_cache.get_statistics())
+
+    def test_submit_returns_cached_result_without_submitting(self) -> None:
+        cache = ResultCache(1000)
+        key = ResultCache.make_key(add, (1, 2))
+        submitted: List[Future] = []
+
+        def submit() -> Future:
+            future: Future = Future()
+            submitted.append(future)
+            return future
+
+        first = cache.submit(key, submit)
+        self.assertEqual(1, len(submitted))
+        first.set_result(3)
+        second = cache.submit(key, submit)
+        self.assertEqual(1, len(submitted))
+        self.assertTrue(second.done())
+        self.assertEqual(3, second.result())
+
+    def test_errors_are_not_cached(self) -> None:
+        cache = ResultCache(1000)
+        future: Future = Future()
+        cache.submit("key", lambda: future)
+        future.set_exception(ValueError("Test Error"))
+        self.assertEqual((False, None), cache.get("key"))
+
+    def test_clear(self) -> None:
+        cache = ResultCache(1000)
+        cache.put("key", 1)
+        cache.get("key")
+        cache.clear()
+        self.assertEqual(ResultCacheStatistics(hits=0, disk_hits=0, misses=0, evictions=0, entry_count=0, size_bytes=0), cache.get_statistics())
+        self.assertEqual((False, None), cache.get("key"))
@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from puma.concurrent.executor._adaptive_chunksize import _AdaptiveChunkSize, _run_timed_chunk
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+class AdaptiveChunkSizeTest(TestCase):
+
+    def test_calls_are_probed_one_at_a_time_until_measured(self) -> None:
+        self.assertEqual(1, _AdaptiveChunkSize().next_chunksize())
+
+    def test_chunks_are_sized_to_the_target_duration(self) -> None:
+        chunk_size = _AdaptiveChunkSize(target_duration=0.05)
+        chunk_size.record(1, 0.005)
+        self.assertEqual(10, chunk_size.next_chunksize())
+
+    def test_chunk_size_follows_changes_in_call_duration(self) -> None:
+        chunk_size = _AdaptiveChunkSize(target_duration=0.05)
+        chunk_size.record(1, 0.005)
+        chunk_size.record(10, 0.5)  # The calls have become ten times slower
+        self.assertEqual(3, chunk_size.next_chunksize())
+        for _ in range(20):
+            chunk_size.record(1, 0.05)
+        self.assertEqual(1, chunk_size.next_chunksize())
+
+    def test_chunk_size_is_limited(self) -> None:
+        chunk_size = _AdaptiveChunkSize(target_duration=0.05, max_chunksize=100)
+        chunk_size.record(1000, 0.0)
+        self.assertEqual(100, chunk_size.next_chunksize())
+        chunk_size = _AdaptiveChunkSize(target_duration=0.05, max_chunksize=100)
+        chunk_size.record(1, 10.0)
+        self.assertEqual(1, chunk_size.next_chunksize())
+
+    def test_empty_chunk_is_ignored(self) -> None:
+        chunk_size = _AdaptiveChunkSize()
+        chunk_size.record(0, 1.0)
+        self.assertEqual(1, chunk_size.next_chunksize())
+
+    def test_run_timed_chunk(self) -> None:
+        results, duration = _run_timed_chunk(add, [(1, 2), (3, 4)])
+        self.assertEqual([3, 7], results)
+        self.assertGreaterEqual(duration, 0.0)
@@ -0,0 +1,53 @@
+import os
+import tempfile
+from typing import Any
+from unittest import TestCase
+
+from puma.concurrent.executor._shared_memory import _SharedSegment, _call_with_shared_memory, _is_large_enough, _read_segment, _receive_segment, _write_segment
+
+
+def reverse(data: bytes) -> bytes:
+    return data[::-1]
+
+
+class SharedMemoryTest(TestCase):
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def test_bytes_and_bytearray_round_trip(self) -> None:
+        for value in [b"abc" * 100, bytearray(b"xyz" * 100)]:
+            segment = _write_segment(value, self._directory.name)
+            assert segment is not None
+            received = _receive_segment(segment)
+            self.assertEqual(type(value), type(received))
+            self.assertEqual(value, received)
+            self.assertFalse(os.path.exists(segment.path))
+
+    def test_memoryview_round_trips_with_its_format_and_shape(self) -> None:
+        value: Any = memoryview(bytearray(48))  # Typed as Any because the stubs for memoryview lack cast
+        value = value.cast("d", (2, 3))
+        segment = _write_segment(value, self._directory.name)
+        assert segment is not None
+        received = _read_segment(segment)
+        self.assertEqual("d", received.format)
+        self.assertEqual((2, 3), received.shape)
+        self.assertEqual(value.tolist(), received.tolist())
+        received.release()
+        os.remove(segment.path)
+
+    def test_only_supported_values_at_least_the_threshold_size_are_shared(self) -> None:
+        self.assertTrue(_is_large_enough(b"a" * 100, 100))
+        self.assertFalse(_is_large_enough(b"a" * 99, 100))
+        self.assertFalse(_is_large_enough("a" * 100, 1))
+        self.assertFalse(_is_large_enough([1, 2, 3], 1))
+        self.assertFalse(_is_large_enough(memoryview(b"a" * 100)[::2], 1))  # Not contiguous
+        self.assertIsNone(_write_segment("a" * 100, self._directory.name))
+
+    def test_call_reads_arguments_and_shares_large_result(self) -> None:
+        argument = _write_segment(b"abc" * 100, self._directory.name)
+        result = _call_with_shared_memory(reverse, (argument,), {}, 100, self._directory.name)
+        self.assertIsInstance(result, _SharedSegment)
+        self.assertEqual(b"cba" * 100, _receive_segment(result))
+        self.assertEqual(b"a", _call_with_shared_memory(reverse, (b"a",), {}, 100, self._directory.name))  # Small values are passed as they are
@@ -1,16 +1,20 @@
+import os
+import tempfile
 from concurrent.futures import wait
 from time import monotonic
-from typing import Callable, Iterable, List
+from typing import Any, Callable, Iterable, Iterator, List
 from unittest import TestCase
 
+from puma.concurrent.cache.result_cache import ResultCache
 from puma.concurrent.executor.typed_executor import TypedExecutor, TypedProcessPoolExecutor, TypedThreadPoolExecutor
+from puma.concurrent.futures.typed_future import as_completed
 from puma.helpers.testing.parameterized import NamedTestParameters, parameterized
-from tests.concurrent.executor.typed_executor_slowtest_methods import DELAY_SLOW, fast_method, method0, method1, method10, method2, method3, method4, method5, method6, \
-    method7, method8, method9
+from tests.concurrent.executor.typed_executor_slowtest_methods import DELAY_SLOW, double, fail_on_three, fail_with_data, fast_method, length_after_delay, method0, method1, \
+    method10, method2, method3, method4, method5, method6, method7, method8, method9, reverse_bytes, sleep_then_return, unique_result
 
 
 class TypedExecutorSlowTestParams(NamedTestParameters):
-    def __init__(self, executor: Callable[[], TypedExecutor]) -> None:
+    def __init__(self, executor: Callable[..., TypedExecutor]) -> None:
         super().__init__(executor.__name__)
         self._executor = executor
 
@@ -18,6 +22,9 @@ class TypedExecutorSlowTestParams(NamedTestParameters):
     def executor(self) -> TypedExecutor:
         return self._executor()
 
+    def create_executor(self, **kwargs: Any) -> TypedExecutor:
+        return self._executor(**kwargs)
+
 
 executors = [
     TypedExecutorSlowTestParams(TypedThreadPoolExecutor),
@@ -25,6 +32,11 @@ executors = [
 ]
 
 
+CACHE_SIZE = 10000
+MAX_IN_FLIGHT = 3
+SHARED_MEMORY_THRESHOLD = 1000
+
+
 class TypedExecutorSlowTest(TestCase):
 
     @parameterized(executors)
@@ -156,3 +168,130 @@ class TypedExecutorSlowTest(TestCase):
 
             with self.assertRaisesRegex(RuntimeError, "cannot schedule new futures after shutdown"):
                 e.map_tuple(method1, [1, 2, 3])
+
+    @parameterized(executors)
+    def test_submit_and_map_return_cached_results(self, params: TypedExecutorSlowTestParams) -> None:
+        cache = ResultCache(CACHE_SIZE)
+        with params.create_executor(result_cache=cache) as e:
+            first = e.submit(unique_result, 1).result()
+            self.assertEqual(first, e.submit(unique_result, 1).result())
+            self.assertNotEqual(first, e.submit(unique_result, 2).result())
+            mapped = list(e.map(unique_result, [1, 2, 3]))
+            self.assertEqual(first, mapped[0])
+            self.assertEqual(mapped, list(e.map_tuple(unique_result, [1, 2, 3])))
+        statistics = cache.get_statistics()
+        self.assertEqual(3, statistics.misses)
+        self.assertEqual(6, statistics.hits)
+
+    @parameterized(executors)
+    def test_map_tuple_accepts_param_sets_from_a_generator(self, params: TypedExecutorSlowTestParams) -> None:
+        with params.executor as e:
+            self.assertEqual([f"fast_method - {i} - {i + 1} - None" for i in range(10)], list(e.map_tuple(fast_method, ((i, i + 1) for i in range(10)))))
+
+    @parameterized(executors)
+    def test_imap_yields_values_in_order_and_takes_items_lazily(self, params: TypedExecutorSlowTestParams) -> None:
+        taken: List[int] = []
+        with params.executor as e:
+            results = e.imap(double, self._recording_generator(1000, taken), max_in_flight=MAX_IN_FLIGHT)
+            self.assertEqual(0, next(results))
+            self.assertLessEqual(len(taken), MAX_IN_FLIGHT + 1)  # The window, plus the item whose arrival made the first value be yielded
+            self.assertEqual([i * 2 for i in range(1, 1000)], list(results))
+
+    @parameterized(executors)
+    def test_imap_unordered_yields_values_as_they_complete(self, params: TypedExecutorSlowTestParams) -> None:
+        taken: List[int] = []
+        with params.executor as e:
+            results = e.imap_unordered(double, self._recording_generator(1000, taken), max_in_flight=MAX_IN_FLIGHT)
+            next(results)
+            self.assertLessEqual(len(taken), MAX_IN_FLIGHT + 1)
+            self.assertEqual(1000, len(list(results)) + 1)
+        with params.create_executor(max_workers=2) as e:
+            self.assertEqual([0.0, 0.5], list(e.imap_unordered(sleep_then_return, [0.5, 0.0])))
+
+    @parameterized(executors)
+    def test_imap_rejects_max_in_flight_less_than_one(self, params: TypedExecutorSlowTestParams) -> None:
+        with params.executor as e:
+            with self.assertRaisesRegex(ValueError, "at least 1"):
+                e.imap(double, [1], max_in_flight=0)
+            with self.assertRaisesRegex(ValueError, "at least 1"):
+                e.imap_unordered(double, [1], max_in_flight=0)
+
+    @parameterized(executors)
+    def test_as_completed(self, params: TypedExecutorSlowTestParams) -> None:
+        with params.create_executor(max_workers=2) as e:
+            futures = [e.submit(sleep_then_return, 0.5), e.submit(sleep_then_return, 0.0)]
+            completed = [future.result() for future in as_completed(futures, timeout=10.0)]
+        self.assertEqual([0.0, 0.5], completed)
+
+    @parameterized(executors)
+    def test_map_with_auto_chunksize(self, params: TypedExecutorSlowTestParams) -> None:
+        with params.executor as e:
+            self.assertEqual([i * 2 for i in range(5000)], list(e.map(double, range(5000), chunksize="auto")))
+            self.assertEqual([f"fast_method - {i} - {i + 1} - None" for i in range(20)],
+                             list(e.map_tuple(fast_method, [(i, i + 1) for i in range(20)], chunksize="auto")))
+
+    @parameterized(executors)
+    def test_map_with_auto_chunksize_raises_errors(self, params: TypedExecutorSlowTestParams) -> None:
+        with params.executor as e:
+            results = e.map(fail_on_three, range(10), chunksize="auto")
+            with self.assertRaisesRegex(ValueError, "Three"):
+                list(results)
+
+    @parameterized(executors)
+    def test_map_rejects_unknown_chunksize(self, params: TypedExecutorSlowTestParams) -> None:
+        with params.executor as e:
+            with self.assertRaisesRegex(ValueError, "chunk size must be a number or 'auto'"):
+                e.map(double, range(10), chunksize="big")
+
+    @staticmethod
+    def _recording_generator(count: int, taken: List[int]) -> Iterator[int]:
+        for i in range(count):
+            taken.append(i)
+            yield i
+
+
+class TypedProcessPoolExecutorSharedMemorySlowTest(TestCase):
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self._directory.cleanup)
+
+    def test_large_argument_passed_to_many_calls_is_shared_once_and_removed_when_they_resolve(self) -> None:
+        data = b"x" * (SHARED_MEMORY_THRESHOLD * 10)
+        with self._create_executor() as e:
+            futures = [e.submit(length_after_delay, data, 0.2) for _ in range(5)]
+            self.assertEqual(1, len(os.listdir(self._directory.name)))
+            self.assertEqual([len(data)] * 5, [future.result() for future in futures])
+            self.assertEqual([], os.listdir(self._directory.name))
+
+    def test_small_arguments_are_pickled(self) -> None:
+        with self._create_executor() as e:
+            future = e.submit(length_after_delay, b"x" * (SHARED_MEMORY_THRESHOLD - 1), 0.2)
+            self.assertEqual([], os.listdir(self._directory.name))
+            self.assertEqual(SHARED_MEMORY_THRESHOLD - 1, future.result())
+
+    def test_large_result_is_returned_through_shared_memory(self) -> None:
+        data = bytes(range(256)) * 10
+        with self._create_executor() as e:
+            self.assertEqual(data[::-1], e.submit(reverse_bytes, data).result())
+            self.assertEqual([data[::-1]] * 3, list(e.imap(reverse_bytes, [data] * 3)))
+        self.assertEqual([], os.listdir(self._directory.name))
+
+    def test_shared_memory_is_removed_when_call_fails(self) -> None:
+        with self._create_executor() as e:
+            future = e.submit(fail_with_data, b"x" * SHARED_MEMORY_THRESHOLD)
+            with self.assertRaisesRegex(ValueError, f"Received {SHARED_MEMORY_THRESHOLD} bytes"):
+                future.result()
+        self.assertEqual([], os.listdir(self._directory.name))
+
+    def test_shared_memory_is_removed_when_call_is_cancelled(self) -> None:
+        with self._create_executor(max_workers=1) as e:
+            running = [e.submit(length_after_delay, b"", 0.5) for _ in range(3)]  # Occupy the worker, and fill the executor's call queue
+            queued = e.submit(length_after_delay, b"x" * SHARED_MEMORY_THRESHOLD, 0.0)
+            self.assertTrue(queued.cancel())
+            self.assertTrue(queued.cancelled())
+            wait(running)
+        self.assertEqual([], os.listdir(self._directory.name))
+
+    def _create_executor(self, max_workers: int = 2) -> TypedExecutor:
+        return TypedProcessPoolExecutor(max_workers, shared_memory_threshold=SHARED_MEMORY_THRESHOLD, shared_memory_directory=self._directory.name)
@@ -1,3 +1,4 @@
+import uuid
 from time import sleep
 from typing import Optional
 
@@ -63,3 +64,35 @@ def method10(a: int, b: int, c: int, d: int, e: int, f: int, g: int, h: int, i:
 def fast_method(a: Optional[int] = None, b: Optional[int] = None, c: Optional[int] = None) -> str:
     sleep(DELAY_FAST)
     return f"fast_method - {a} - {b} - {c}"
+
+
+def unique_result(a: int) -> str:
+    return f"unique_result - {a} - {uuid.uuid4()}"  # Different each time it is called, so shows whether a result came from a cache
+
+
+def double(a: int) -> int:
+    return a * 2
+
+
+def sleep_then_return(a: float) -> float:
+    sleep(a)
+    return a
+
+
+def fail_on_three(a: int) -> int:
+    if a == 3:
+        raise ValueError("Three")
+    return a
+
+
+def length_after_delay(data: bytes, delay: float) -> int:
+    sleep(delay)
+    return len(data)
+
+
+def reverse_bytes(data: bytes) -> bytes:
+    return data[::-1]
+
+
+def fail_with_data(data: bytes) -> None:
+    raise ValueError(f"Received {len(data)} bytes")
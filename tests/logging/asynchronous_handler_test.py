@@ -0,0 +1,198 @@
+import io
+import logging
+import logging.handlers
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List
+from unittest import TestCase
+
+from puma.logging import Logging
+from puma.logging.child_process_logging.asynchronous_handler import AsynchronousHandler, LogWriterOptions
+
+TIMEOUT = 5.0
+LONG_INTERVAL = 60.0
+
+
+class _CountingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.write_count = 0
+        self.flush_count = 0
+
+    def write(self, s: str) -> int:
+        self.write_count += 1
+        return super().write(s)
+
+    def flush(self) -> None:
+        self.flush_count += 1
+        super().flush()
+
+
+class _BlockingHandler(logging.Handler):
+    # Blocks in emit() until released, recording the messages it is given
+    def __init__(self) -> None:
+        super().__init__()
+        self.entered = threading.Event()
+        self.unblock = threading.Event()
+        self.messages: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.entered.set()
+        self.unblock.wait(TIMEOUT)
+        self.messages.append(record.getMessage())
+
+
+class AsynchronousHandlerTest(TestCase):
+
+    def setUp(self) -> None:
+        self._logger = logging.getLogger(f"{__name__}.{self._testMethodName}")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+
+    def tearDown(self) -> None:
+        for handler in self._logger.handlers.copy():
+            self._logger.removeHandler(handler)
+            handler.close()
+
+    def test_records_are_written_in_order_with_few_writes(self) -> None:
+        stream = _CountingStream()
+        target = logging.StreamHandler(stream)
+        target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        handler = self._add_handler(AsynchronousHandler(target, LogWriterOptions(flush_interval=LONG_INTERVAL)))
+        for i in range(1000):
+            self._logger.info("Message %d", i)
+        handler.stop()
+        self.assertEqual([f"INFO Message {i}" for i in range(1000)], stream.getvalue().splitlines())
+        self.assertLess(stream.write_count, 1000)
+        self.assertEqual(1, stream.flush_count)
+
+    def test_target_level_and_filters_apply(self) -> None:
+        stream = io.StringIO()
+        target = logging.StreamHandler(stream)
+        target.setLevel(logging.INFO)
+        target.addFilter(lambda record: "Excluded" not in record.getMessage())
+        handler = self._add_handler(AsynchronousHandler(target, LogWriterOptions()))
+        self._logger.debug("Debug")
+        self._logger.info("Included")
+        self._logger.info("Excluded")
+        handler.stop()
+        self.assertEqual(["Included"], stream.getvalue().splitlines())
+
+    def test_stream_is_flushed_after_the_interval(self) -> None:
+        stream = _CountingStream()
+        self._add_handler(AsynchronousHandler(logging.StreamHandler(stream), LogWriterOptions(flush_interval=0.05)))
+        self._logger.info("Message")
+        self._wait_for(lambda: stream.flush_count == 1)
+        self.assertEqual(["Message"], stream.getvalue().splitlines())
+
+    def test_stream_is_flushed_at_once_after_an_error(self) -> None:
+        stream = _CountingStream()
+        self._add_handler(AsynchronousHandler(logging.StreamHandler(stream), LogWriterOptions(flush_interval=LONG_INTERVAL)))
+        self._logger.info("Message")
+        self._logger.error("Error")
+        self._wait_for(lambda: stream.flush_count == 1)
+        self.assertEqual(["Message", "Error"], stream.getvalue().splitlines())
+
+    def test_records_are_dropped_when_the_buffer_is_full(self) -> None:
+        target = _BlockingHandler()
+        handler = self._add_handler(AsynchronousHandler(target, LogWriterOptions(buffer_size=2)))
+        self._logger.info("Message 0")
+        self.assertTrue(target.entered.wait(TIMEOUT))  # The writer thread is now blocked writing the first record
+        for i in range(1, 6):
+            self._logger.info("Message %d", i)
+        target.unblock.set()
+        handler.stop()
+        self.assertEqual(["Message 0", "Message 1", "Message 2"], target.messages[:3])
+        self.assertRegex(target.messages[3], r"^3 log records dropped because the writer for .* could not keep up$")
+        self.assertEqual(4, len(target.messages))
+
+    def test_file_handlers(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "test.log")
+            handler = self._add_handler(AsynchronousHandler(logging.FileHandler(filename, delay=True), LogWriterOptions()))
+            self._logger.info("Message 1")
+            self._logger.info("Message 2")
+            handler.stop()
+            self.assertEqual(["Message 1", "Message 2"], Path(filename).read_text().splitlines())
+            self._logger.removeHandler(handler)
+            handler.close()
+
+    def test_rotating_file_handler_rolls_over(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filename = os.path.join(temp_dir, "test.log")
+            target = logging.handlers.RotatingFileHandler(filename, maxBytes=100, backupCount=100)
+            handler = self._add_handler(AsynchronousHandler(target, LogWriterOptions(flush_interval=LONG_INTERVAL)))
+            for i in range(100):
+                self._logger.info("Message %02d", i)
+            handler.stop()
+            self._logger.removeHandler(handler)
+            handler.close()
+            files = [Path(f"{filename}.{i}") for i in range(100, 0, -1)] + [Path(filename)]
+            lines = [line for file in files if file.exists() for line in file.read_text().splitlines()]
+            self.assertEqual([f"Message {i:02d}" for i in range(100)], lines)
+            self.assertTrue(all(file.stat().st_size <= 100 for file in files if file.exists()))
+
+    def test_queue_handlers_are_not_wrapped(self) -> None:
+        queue_handler = logging.handlers.QueueHandler(None)  # type: ignore  # The queue is not used
+        self.assertIs(queue_handler, AsynchronousHandler.wrap(queue_handler, LogWriterOptions()))
+        stream_handler = logging.StreamHandler(io.StringIO())
+        wrapped = AsynchronousHandler.wrap(stream_handler, LogWriterOptions())
+        assert isinstance(wrapped, AsynchronousHandler)
+        self.assertIs(stream_handler, wrapped.target)
+        wrapped.close()
+
+    def test_illegal_options(self) -> None:
+        with self.assertRaisesRegex(ValueError, "The writer buffer size must be at least 1"):
+            LogWriterOptions(buffer_size=0)
+        with self.assertRaisesRegex(ValueError, "The writer flush interval must not be negative"):
+            LogWriterOptions(flush_interval=-1.0)
+
+    def _add_handler(self, handler: AsynchronousHandler) -> AsynchronousHandler:
+        self._logger.addHandler(handler)
+        return handler
+
+    def _wait_for(self, condition: Callable[[], bool]) -> None:
+        end = time.monotonic() + TIMEOUT
+        while not condition():
+            self.assertLess(time.monotonic(), end, "Timed out")
+            time.sleep(0.01)
+
+
+class LogWriterConfigurationTest(TestCase):
+
+    def setUp(self) -> None:
+        Logging.reset_logging()
+
+    def tearDown(self) -> None:
+        Logging.reset_logging()
+
+    def test_options_are_configured_from_dictionary(self) -> None:
+        self.assertEqual(LogWriterOptions(), Logging.get_log_writer_options())
+        Logging.init_logging_from_dict({'version': 1, 'log_writers': {'buffer_size': 5, 'flush_interval': 1.5}})
+        self.assertEqual(LogWriterOptions(buffer_size=5, flush_interval=1.5), Logging.get_log_writer_options())
+        Logging.reset_logging()
+        self.assertEqual(LogWriterOptions(), Logging.get_log_writer_options())
+
+    def test_illegal_options_are_rejected_before_configuring(self) -> None:
+        with self.assertRaises(ValueError):
+            Logging.init_logging_from_dict({'version': 1, 'log_writers': {'flush_interval': -1.0}})
+        with self.assertRaises(TypeError):
+            Logging.init_logging_from_dict({'version': 1, 'log_writers': {'unknown': 1}})
+
+    def test_handlers_are_replaced(self) -> None:
+        Logging.init_logging_from_dict({
+            'version': 1,
+            'handlers': {'console': {'class': 'logging.StreamHandler', 'stream': 'ext://sys.stdout'}},
+            'loggers': {'first': {'handlers': ['console']}, 'second': {'handlers': ['console']}},
+        })
+        console = logging.getLogger('first').handlers[0]
+        replacements = Logging.replace_handlers(lambda handler: AsynchronousHandler.wrap(handler, LogWriterOptions()))
+        self.assertEqual(1, len(replacements))
+        replacement = replacements[0]
+        assert isinstance(replacement, AsynchronousHandler)
+        self.assertIs(console, replacement.target)
+        self.assertEqual([replacement], logging.getLogger('first').handlers)
+        self.assertEqual([replacement], logging.getLogger('second').handlers)
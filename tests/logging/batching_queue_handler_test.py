@@ -0,0 +1,150 @@
+import logging
+import queue
+import time
+from typing import Any, List
+from unittest import TestCase
+
+from puma.logging.child_process_logging.batching_queue_handler import BatchingQueueHandler
+
+LONG_DELAY = 60.0
+TIMEOUT = 5.0
+
+
+class BatchingQueueHandlerTest(TestCase):
+
+    def setUp(self) -> None:
+        self._queue: queue.Queue = queue.Queue()
+        self._logger = logging.getLogger(f"{__name__}.{self._testMethodName}")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+
+    def tearDown(self) -> None:
+        for handler in self._logger.handlers.copy():
+            self._logger.removeHandler(handler)
+            handler.close()
+
+    def test_records_are_sent_in_batches_when_full(self) -> None:
+        self._add_handler(BatchingQueueHandler(self._queue, max_batch_size=3, max_batch_delay=LONG_DELAY))
+        for i in range(7):
+            self._logger.debug("Message %d", i)
+        self.assertEqual([["Message 0", "Message 1", "Message 2"], ["Message 3", "Message 4", "Message 5"]], self._get_batches())
+
+    def test_records_are_sent_after_the_delay(self) -> None:
+        self._add_handler(BatchingQueueHandler(self._queue, max_batch_delay=0.05))
+        start = time.monotonic()
+        self._logger.debug("Message 1")
+        self._logger.info("Message 2")
+        self.assertEqual(["Message 1", "Message 2"], self._get_message_texts(self._queue.get(timeout=TIMEOUT)))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self._logger.warning("Message 3")
+        self.assertEqual(["Message 3"], self._get_message_texts(self._queue.get(timeout=TIMEOUT)))
+
+    def test_records_are_sent_at_once_from_the_flush_level(self) -> None:
+        self._add_handler(BatchingQueueHandler(self._queue, max_batch_delay=LONG_DELAY))
+        self._logger.warning("Message 1")
+        self.assertEqual([], self._get_batches())
+        self._logger.error("Message 2")
+        self.assertEqual([["Message 1", "Message 2"]], self._get_batches())
+
+    def test_records_are_sent_when_flushed_and_closed(self) -> None:
+        handler = self._add_handler(BatchingQueueHandler(self._queue, max_batch_delay=LONG_DELAY))
+        self._logger.debug("Message 1")
+        handler.flush()
+        self._logger.debug("Message 2")
+        self._logger.removeHandler(handler)
+        handler.close()
+        self.assertEqual([["Message 1"], ["Message 2"]], self._get_batches())
+
+    def test_records_are_prepared_for_pickling(self) -> None:
+        self._add_handler(BatchingQueueHandler(self._queue, max_batch_size=1))
+        try:
+            raise ValueError("Test error")
+        except ValueError:
+            self._logger.exception("Failed with %s", "arguments")
+        record = self._queue.get(timeout=TIMEOUT)[0]
+        self.assertIsNone(record.args)
+        self.assertIsNone(record.exc_info)
+        self.assertTrue(record.getMessage().startswith("Failed with arguments"))
+        self.assertIn("ValueError: Test error", record.getMessage())
+
+    def test_records_are_held_while_the_queue_is_full(self) -> None:
+        self._queue = queue.Queue(maxsize=1)
+        self._queue.put("Blocker")
+        handler = self._add_handler(BatchingQueueHandler(self._queue, max_batch_size=2, max_batch_delay=0.05))
+        for i in range(5):
+            self._logger.info("Message %d", i)
+        self._logger.error("Message 5")  # Tries to send at once, but cannot
+        self.assertEqual("Blocker", self._queue.get_nowait())
+        self.assertEqual(["Message 0", "Message 1"], self._get_message_texts(self._queue.get(timeout=TIMEOUT)))
+        self.assertEqual(["Message 2", "Message 3"], self._get_message_texts(self._queue.get(timeout=TIMEOUT)))
+        self.assertEqual(["Message 4", "Message 5"], self._get_message_texts(self._queue.get(timeout=TIMEOUT)))
+        self.assertEqual(0, handler.get_dropped_count())
+
+    def test_debug_records_are_dropped_first_when_the_backlog_is_too_long(self) -> None:
+        self._queue = queue.Queue(maxsize=1)
+        self._queue.put("Blocker")
+        handler = self._add_handler(BatchingQueueHandler(self._queue, max_batch_size=10, max_batch_delay=LONG_DELAY, max_backlog=10))
+        for i in range(5):
+            self._logger.info("Info %d", i)
+        for i in range(6):
+            self._logger.debug("Debug %d", i)  # The backlog is too long after the last of these, and is cut to 9 records by dropping the 2 oldest debug records
+        for i in range(5, 7):
+            self._logger.info("Info %d", i)  # And after the last of these, by dropping the next 2 oldest debug records
+        self.assertEqual(4, handler.get_dropped_count())
+
+        self.assertEqual("Blocker", self._queue.get_nowait())
+        handler.flush()
+        self.assertEqual([["4 log records dropped because the logging queue was full (4 dropped by this process in total)",
+                           "Info 0", "Info 1", "Info 2", "Info 3", "Info 4", "Debug 4", "Debug 5", "Info 5", "Info 6"]], self._get_batches())
+
+    def test_oldest_records_are_dropped_when_there_are_no_debug_records(self) -> None:
+        self._queue = queue.Queue(maxsize=1)
+        self._queue.put("Blocker")
+        handler = self._add_handler(BatchingQueueHandler(self._queue, max_batch_size=10, max_batch_delay=LONG_DELAY, max_backlog=10))
+        self._logger.debug("Debug 0")
+        for i in range(10):
+            self._logger.warning("Warning %d", i)
+        self.assertEqual(2, handler.get_dropped_count())
+
+        self.assertEqual("Blocker", self._queue.get_nowait())
+        handler.flush()
+        batches = self._get_batches()
+        self.assertEqual([[f"Warning {i}" for i in range(1, 10)]], [batch[1:] for batch in batches])
+
+    def test_dropped_records_summary_is_sent_without_further_logging(self) -> None:
+        self._queue = queue.Queue(maxsize=1)
+        self._queue.put("Blocker")
+        handler = self._add_handler(BatchingQueueHandler(self._queue, max_batch_size=1, max_batch_delay=0.01, max_backlog=1, dropped_summary_interval=0.05))
+        self._logger.info("Message 0")
+        self._logger.info("Message 1")
+        self.assertEqual(1, handler.get_dropped_count())
+        self.assertEqual("Blocker", self._queue.get_nowait())
+        summary = self._queue.get(timeout=TIMEOUT)
+        self.assertEqual(["1 log records dropped because the logging queue was full (1 dropped by this process in total)", "Message 1"], self._get_message_texts(summary))
+        self.assertEqual(logging.WARNING, summary[0].levelno)
+
+    def test_illegal_params(self) -> None:
+        with self.assertRaisesRegex(ValueError, "The maximum batch size must be at least 1"):
+            BatchingQueueHandler(self._queue, max_batch_size=0)
+        with self.assertRaisesRegex(ValueError, "The maximum batch delay must be greater than zero"):
+            BatchingQueueHandler(self._queue, max_batch_delay=0.0)
+        with self.assertRaisesRegex(ValueError, "The maximum backlog must be at least the maximum batch size"):
+            BatchingQueueHandler(self._queue, max_batch_size=10, max_backlog=9)
+        with self.assertRaisesRegex(ValueError, "The dropped records summary interval must not be negative"):
+            BatchingQueueHandler(self._queue, dropped_summary_interval=-1.0)
+
+    def _add_handler(self, handler: BatchingQueueHandler) -> BatchingQueueHandler:
+        self._logger.addHandler(handler)
+        return handler
+
+    def _get_batches(self) -> List[List[str]]:
+        ret = []
+        while True:
+            try:
+                ret.append(self._get_message_texts(self._queue.get_nowait()))
+            except queue.Empty:
+                return ret
+
+    @staticmethod
+    def _get_message_texts(batch: Any) -> List[str]:
+        return [record.getMessage() for record in batch]
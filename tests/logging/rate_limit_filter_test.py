@@ -0,0 +1,173 @@
+import logging
+import time
+from typing import List
+from unittest import TestCase
+
+from puma.logging import Logging
+from puma.logging.rate_limit_filter import RateLimitFilter
+
+NO_REFILL = 1e-6  # A rate so low that no tokens are added during a test
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+    def get_messages(self) -> List[str]:
+        return [record.getMessage() for record in self.records]
+
+
+class RateLimitFilterTest(TestCase):
+
+    def setUp(self) -> None:
+        self._logger = logging.getLogger(f"{__name__}.{self._testMethodName}")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._handler = _ListHandler()
+        self._logger.addHandler(self._handler)
+
+    def tearDown(self) -> None:
+        for handler in self._logger.handlers.copy():
+            self._logger.removeHandler(handler)
+
+    def test_message_is_limited_after_burst(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=3, rate=NO_REFILL))
+        for i in range(10):
+            self._logger.warning("Buffer %s is full", "a")
+        self.assertEqual(["Buffer a is full"] * 3, self._handler.get_messages())
+
+    def test_messages_are_limited_separately_by_logger_and_template(self) -> None:
+        rate_limit_filter = RateLimitFilter(burst=1, rate=NO_REFILL)
+        self._handler.addFilter(rate_limit_filter)
+        other_logger = logging.getLogger(f"{__name__}.{self._testMethodName}.other")
+        for i in range(3):
+            self._logger.warning("Message A %d", i)
+            self._logger.warning("Message B %d", i)
+            other_logger.warning("Message A %d", i)
+        self.assertEqual(["Message A 0", "Message B 0", "Message A 0"], self._handler.get_messages())
+        self.assertEqual([self._logger.name, self._logger.name, other_logger.name], [record.name for record in self._handler.records])
+
+    def test_tokens_are_added_at_the_rate(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=1, rate=10.0))
+        self._logger.warning("Message")
+        self._logger.warning("Message")
+        self.assertEqual(1, len(self._handler.records))
+        time.sleep(0.15)
+        self._logger.warning("Message")
+        self._logger.warning("Message")
+        self.assertEqual(2, len(self._handler.records))
+
+    def test_records_over_the_limit_are_sampled(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=1, rate=NO_REFILL, sample_every=3))
+        for i in range(10):
+            self._logger.warning("Message %d", i)
+        self.assertEqual(["Message 0", "Message 3", "Message 6", "Message 9"], self._handler.get_messages())
+
+    def test_summary_is_logged_when_message_is_next_logged(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=1, rate=NO_REFILL, summary_interval=0.05))
+        self._logger.info("Message")
+        self._logger.warning("Message")
+        self._logger.info("Message")
+        time.sleep(0.1)
+        self._logger.info("Message")
+        self.assertEqual(2, len(self._handler.records))
+        summary = self._handler.records[1]
+        self.assertRegex(summary.getMessage(), r"^Suppressed 3 similar messages in the last \d+\.\d seconds: Message$")
+        self.assertEqual(logging.WARNING, summary.levelno)
+        self.assertEqual(self._logger.name, summary.name)
+
+    def test_summary_is_logged_when_another_message_is_logged(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=1, rate=NO_REFILL, summary_interval=0.05))
+        self._logger.warning("Message")
+        self._logger.warning("Message")
+        time.sleep(0.1)
+        self._logger.warning("Other message")
+        self.assertEqual(3, len(self._handler.records))
+        self.assertTrue(self._handler.records[1].getMessage().startswith("Suppressed 1 similar messages in the last"))
+        self.assertEqual("Other message", self._handler.records[2].getMessage())
+
+    def test_summaries_are_not_logged_more_often_than_the_interval(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=1, rate=NO_REFILL, summary_interval=60.0))
+        for i in range(100):
+            self._logger.warning("Message")
+        self.assertEqual(["Message"], self._handler.get_messages())
+
+    def test_record_is_counted_once_by_a_filter_shared_between_handlers(self) -> None:
+        rate_limit_filter = RateLimitFilter(burst=2, rate=NO_REFILL)
+        other_handler = _ListHandler()
+        self._logger.addHandler(other_handler)
+        self._handler.addFilter(rate_limit_filter)
+        other_handler.addFilter(rate_limit_filter)
+        for i in range(3):
+            self._logger.warning("Message %d", i)
+        self.assertEqual(["Message 0", "Message 1"], self._handler.get_messages())
+        self.assertEqual(["Message 0", "Message 1"], other_handler.get_messages())
+
+    def test_least_recently_logged_message_is_forgotten(self) -> None:
+        self._handler.addFilter(RateLimitFilter(burst=1, rate=NO_REFILL, max_keys=2))
+        self._logger.warning("Message A")
+        self._logger.warning("Message A")
+        self._logger.warning("Message B")
+        self._logger.warning("Message C")  # Forgets A, logging its summary at once
+        self._logger.warning("Message A")
+        messages = self._handler.get_messages()
+        self.assertEqual(["Message A", "Message B"], messages[:2])
+        self.assertTrue(messages[2].startswith("Suppressed 1 similar messages in the last"))
+        self.assertTrue(messages[2].endswith(": Message A"))
+        self.assertEqual(["Message C", "Message A"], messages[3:])
+
+    def test_illegal_params(self) -> None:
+        with self.assertRaisesRegex(ValueError, "The burst must be at least 1"):
+            RateLimitFilter(burst=0)
+        with self.assertRaisesRegex(ValueError, "The rate must be greater than zero"):
+            RateLimitFilter(rate=0.0)
+        with self.assertRaisesRegex(ValueError, "The sampling interval must not be negative"):
+            RateLimitFilter(sample_every=-1)
+        with self.assertRaisesRegex(ValueError, "The summary interval must not be negative"):
+            RateLimitFilter(summary_interval=-1.0)
+        with self.assertRaisesRegex(ValueError, "The maximum number of keys must be at least 1"):
+            RateLimitFilter(max_keys=0)
+
+
+class RateLimitFilterConfigurationTest(TestCase):
+
+    def setUp(self) -> None:
+        Logging.reset_logging()
+
+    def tearDown(self) -> None:
+        Logging.reset_logging()
+
+    def test_configured_from_dictionary(self) -> None:
+        Logging.init_logging_from_dict({
+            'version': 1,
+            'filters': {
+                'rate_limit': {
+                    '()': 'puma.logging.rate_limit_filter.RateLimitFilter',
+                    'burst': 2,
+                    'rate': NO_REFILL,
+                },
+            },
+            'handlers': {
+                'list': {
+                    'class': f"{__name__}._ListHandler",
+                    'filters': ['rate_limit'],
+                },
+            },
+            'loggers': {
+                'rate_limited': {
+                    'level': 'DEBUG',
+                    'handlers': ['list'],
+                    'propagate': False,
+                },
+            },
+        })
+        logger = logging.getLogger('rate_limited')
+        for i in range(5):
+            logger.warning("Message")
+        handler = logger.handlers[0]
+        assert isinstance(handler, _ListHandler)
+        self.assertEqual(["Message", "Message"], handler.get_messages())
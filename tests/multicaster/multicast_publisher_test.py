@@ -0,0 +1,166 @@
+import queue
+from typing import List, TypeVar, no_type_check
+from unittest import TestCase
+
+from puma.buffer import MultiThreadBuffer, Observable
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.multicaster.multicast_publisher import MulticastPublisher
+from puma.primitives import AutoResetEvent
+from puma.timeouts import TIMEOUT_NO_WAIT
+from puma.unexpected_situation_action import UnexpectedSituationAction
+from tests.buffer.test_support.buffer_api_test_support import TestSubscriberBase, receive_all
+
+T = TypeVar("T")
+
+OUTPUT_BUFFER_1_SIZE = 3
+OUTPUT_BUFFER_2_SIZE = OUTPUT_BUFFER_1_SIZE + 2
+FULL_ERROR_MESSAGE = "Full(\"Test publisher: Unable to push to buffer 'Test output buffer 1', it is full\")"
+
+
+def _topic(value: str) -> str:
+    return value.split(":")[0]
+
+
+class MulticastPublisherTest(TestCase):
+    def setUp(self) -> None:
+        self._output_buffer_1 = MultiThreadBuffer[str](OUTPUT_BUFFER_1_SIZE, "Test output buffer 1")
+        self._output_buffer_2 = MultiThreadBuffer[str](OUTPUT_BUFFER_2_SIZE, "Test output buffer 2")
+        self._output_buffer_1.__enter__()
+        self._output_buffer_2.__enter__()
+
+    def tearDown(self) -> None:
+        self._output_buffer_1.__exit__(None, None, None)
+        self._output_buffer_2.__exit__(None, None, None)
+
+    @assert_no_warnings_or_errors_logged
+    def test_typical_case(self) -> None:
+        value = "Hello"
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_1)
+            publisher.subscribe(self._output_buffer_2)
+            publisher.publish_value(value)
+            publisher.publish_value("World")
+            publisher.publish_complete(None)
+
+        subscriber_1 = self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=["Hello", "World"], expect_completed=True, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["Hello", "World"], expect_completed=True, errors=[])
+        self.assertIs(value, subscriber_1.published_values[0])
+
+    @assert_no_warnings_or_errors_logged
+    def test_ok_if_no_subscribers(self) -> None:
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.publish_value("Hello")
+            publisher.publish_complete(None)
+
+    @assert_no_warnings_or_errors_logged
+    def test_outputs_are_unpublished_on_exit_and_unsubscribe(self) -> None:
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_1)
+            publisher.subscribe(self._output_buffer_2)
+            publisher.unsubscribe(self._output_buffer_1)
+            with self._output_buffer_1.publish():  # Can be published again
+                pass
+            publisher.publish_value("Hello")
+        with self._output_buffer_2.publish():
+            pass
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=[], expect_completed=False, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["Hello"], expect_completed=False, errors=[])
+
+    @assert_no_warnings_or_errors_logged
+    def test_items_are_routed_by_key_and_predicate(self) -> None:
+        with MulticastPublisher[str]("Test publisher", key_function=_topic) as publisher:
+            publisher.subscribe(self._output_buffer_1, routing_keys=["a", "b"], predicate=lambda value: value.endswith("1"))
+            publisher.subscribe(self._output_buffer_2, routing_keys=["b"])
+            for value in ["a:1", "a:2", "b:1", "b:2", "c:1"]:
+                publisher.publish_value(value)
+            publisher.publish_complete(None)
+
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=["a:1", "b:1"], expect_completed=True, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["b:1", "b:2"], expect_completed=True, errors=[])
+
+    @assert_no_warnings_or_errors_logged
+    def test_buffer_full_when_pushing_value_option_is_not_raising(self) -> None:
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_1, on_full_action=UnexpectedSituationAction.IGNORE)
+            publisher.subscribe(self._output_buffer_2, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+            pushed_to_fill = self._fill_output_buffer_1(publisher)
+            publisher.publish_value("Extra")
+
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=pushed_to_fill, expect_completed=False, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=pushed_to_fill + ["Extra"], expect_completed=False, errors=[])
+
+    def test_buffer_full_when_pushing_value_option_is_raising(self) -> None:
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_2, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+            publisher.subscribe(self._output_buffer_1, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+            pushed_to_fill = self._fill_output_buffer_1(publisher)
+            with self.assertRaises(queue.Full):
+                publisher.publish_value("Extra")
+
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=pushed_to_fill + ["Extra"], expect_completed=False, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=pushed_to_fill, expect_completed=False, errors=[])
+
+    def test_buffer_full_when_pushing_complete_option_is_raising(self) -> None:
+        # The error is distributed to the remaining outputs before being raised
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_1, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+            publisher.subscribe(self._output_buffer_2, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+            pushed_to_fill = self._fill_output_buffer_1(publisher)
+            with self.assertRaises(queue.Full):
+                publisher.publish_complete(None, timeout=TIMEOUT_NO_WAIT)
+
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=pushed_to_fill, expect_completed=False, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=pushed_to_fill, expect_completed=True, errors=[FULL_ERROR_MESSAGE])
+
+    @assert_no_warnings_or_errors_logged
+    def test_cannot_publish_after_complete(self) -> None:
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_1)
+            publisher.publish_complete(None)
+            with self.assertRaisesRegex(RuntimeError, "Trying to publish a value after publishing Complete"):
+                publisher.publish_value("Hello")
+            with self.assertRaisesRegex(RuntimeError, "Trying to publish Complete more than once"):
+                publisher.publish_complete(None)
+            with self.assertRaisesRegex(RuntimeError, "Trying to subscribe after publishing Complete"):
+                publisher.subscribe(self._output_buffer_2)
+
+    @assert_no_warnings_or_errors_logged
+    def test_can_only_subscribe_and_unsubscribe_a_buffer_once(self) -> None:
+        with MulticastPublisher[str]("Test publisher") as publisher:
+            publisher.subscribe(self._output_buffer_1)
+            with self.assertRaisesRegex(RuntimeError, "Publishable is already subscribed"):
+                publisher.subscribe(self._output_buffer_1)
+            publisher.unsubscribe(self._output_buffer_1)
+            with self.assertRaisesRegex(RuntimeError, "Publishable is not subscribed"):
+                publisher.unsubscribe(self._output_buffer_1)
+
+    # noinspection PyTypeChecker
+    @no_type_check
+    def test_illegal_params(self) -> None:
+        with self.assertRaises(ValueError):
+            MulticastPublisher("")
+        with MulticastPublisher("Test publisher") as publisher:
+            with self.assertRaises(ValueError):
+                publisher.subscribe(None)
+            with self.assertRaises(ValueError):
+                publisher.subscribe(self._output_buffer_1, None)
+            with self.assertRaisesRegex(ValueError, "Routing keys can only be used if the publisher was given a key function"):
+                publisher.subscribe(self._output_buffer_1, routing_keys=["a"])
+            publisher.subscribe(self._output_buffer_1)  # The failed attempts did not subscribe the buffer
+
+    @staticmethod
+    def _fill_output_buffer_1(publisher: MulticastPublisher[str]) -> List[str]:
+        pushed = [f"Fill {i}" for i in range(OUTPUT_BUFFER_1_SIZE)]
+        for value in pushed:
+            publisher.publish_value(value)
+        return pushed
+
+    def _subscribe_and_receive_all_and_validate(self, observable: Observable[str], values: List[str], expect_completed: bool, errors: List[str]) -> TestSubscriberBase[str]:
+        subscriber = TestSubscriberBase[str]()
+        event = AutoResetEvent()
+        with observable.subscribe(event) as subscription:
+            receive_all(subscription, event, subscriber)
+        subscriber.assert_published_values(values, self)
+        subscriber.assert_completed(expect_completed, self)
+        subscriber.assert_error_values(errors, self)
+        return subscriber
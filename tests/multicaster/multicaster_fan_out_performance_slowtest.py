@@ -0,0 +1,100 @@
+import queue
+import time
+from contextlib import ExitStack
+from typing import Any, List, Tuple
+from unittest import TestCase
+
+from puma.buffer import Buffer, MultiProcessBuffer, MultiThreadBuffer, Subscriber, Subscription
+from puma.multicaster.multicaster import Multicaster
+from puma.primitives import AutoResetEvent
+from tests.buffer.test_support.buffer_api_test_support import TestSubscriberBase
+
+FRAME_COUNT = 40
+FRAME_ROWS = 5000
+OUTPUT_COUNTS = [1, 2, 4, 8]
+TIMEOUT = 30.0
+
+
+class _Frame:
+    # A value which is relatively expensive to pickle, and which counts how many times it is pickled
+    pickle_count = 0
+
+    def __init__(self, rows: List[Tuple[int, float, str]]) -> None:
+        self.rows = rows
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        _Frame.pickle_count += 1
+        return _Frame, (self.rows,)
+
+
+class MulticasterFanOutPerformanceSlowTest(TestCase):
+    """Benchmarks multicasting frames to several buffers that carry them across a process boundary, comparing the multicaster (which pickles each frame once) with
+    publishing each frame to each buffer in turn (which pickles each frame once per buffer).
+    """
+
+    def test_fan_out_performance(self) -> None:
+        frames = [_Frame([(i, float(i), str(i)) for i in range(FRAME_ROWS)]) for _ in range(FRAME_COUNT)]
+        print()
+        for output_count in OUTPUT_COUNTS:
+            _Frame.pickle_count = 0
+            multicast_duration = self._time_fan_out(frames, output_count, self._multicast)
+            self.assertEqual(FRAME_COUNT, _Frame.pickle_count)
+
+            _Frame.pickle_count = 0
+            publish_to_each_duration = self._time_fan_out(frames, output_count, self._publish_to_each)
+            self.assertEqual(FRAME_COUNT * output_count, _Frame.pickle_count)
+
+            print(f"1 to {output_count}: multicaster {multicast_duration:.3f}s; publishing to each output {publish_to_each_duration:.3f}s")
+
+    def _time_fan_out(self, frames: List[_Frame], output_count: int, fan_out: Any) -> float:
+        with ExitStack() as stack:
+            outputs: List[Buffer[_Frame]] = [stack.enter_context(MultiProcessBuffer[_Frame](FRAME_COUNT + 1, f"Output {i}")) for i in range(output_count)]
+            start = time.monotonic()
+            fan_out(frames, outputs)
+            for output in outputs:
+                subscriber = self._receive_until_complete(output)
+                self.assertEqual(FRAME_COUNT, len(subscriber.published_values))
+                self.assertEqual([], subscriber.error_values)
+            return time.monotonic() - start
+
+    def _multicast(self, frames: List[_Frame], outputs: List[Buffer[_Frame]]) -> None:
+        with MultiThreadBuffer[_Frame](FRAME_COUNT + 1, "Input") as input_buffer:
+            with Multicaster(input_buffer) as multicaster:
+                for output in outputs:
+                    multicaster.subscribe(output)
+                multicaster.start_blocking()
+                with input_buffer.publish() as publisher:
+                    for frame in frames:
+                        publisher.publish_value(frame, timeout=TIMEOUT)
+                    publisher.publish_complete(None)
+                multicaster.join(TIMEOUT)
+                self.assertFalse(multicaster.is_alive())
+
+    @staticmethod
+    def _publish_to_each(frames: List[_Frame], outputs: List[Buffer[_Frame]]) -> None:
+        with ExitStack() as stack:
+            publishers = [stack.enter_context(output.publish()) for output in outputs]
+            for frame in frames:
+                for publisher in publishers:
+                    publisher.publish_value(frame, timeout=TIMEOUT)
+            for publisher in publishers:
+                publisher.publish_complete(None)
+
+    @staticmethod
+    def _receive_until_complete(output: Buffer[_Frame]) -> TestSubscriberBase[_Frame]:
+        subscriber = TestSubscriberBase[_Frame]()
+        event = AutoResetEvent()
+        with output.subscribe(event) as subscription:
+            end_time = time.monotonic() + TIMEOUT
+            while not subscriber.completed and time.monotonic() < end_time:
+                event.wait(0.1)
+                _call_events_until_empty(subscription, subscriber)
+        return subscriber
+
+
+def _call_events_until_empty(subscription: Subscription[_Frame], subscriber: Subscriber[_Frame]) -> None:
+    while True:
+        try:
+            subscription.call_events(subscriber)
+        except queue.Empty:
+            return
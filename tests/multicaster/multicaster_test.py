@@ -1,15 +1,15 @@
 import logging
 import time
 from threading import Thread
-from typing import List, Optional, TypeVar, no_type_check
+from typing import Any, List, Optional, Tuple, TypeVar, no_type_check
 from unittest import TestCase
 
-from puma.buffer import MultiThreadBuffer, Observable, Publisher
+from puma.buffer import Buffer, MultiProcessBuffer, MultiThreadBuffer, Observable, Publisher
 from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
 from puma.multicaster.multicaster import Multicaster
 from puma.primitives import AutoResetEvent
 from puma.unexpected_situation_action import UnexpectedSituationAction
-from tests.buffer.test_support.buffer_api_test_support import TestSubscriber, receive_all
+from tests.buffer.test_support.buffer_api_test_support import TestSubscriberBase, receive_all
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,22 @@ TIME_TOLERANCE = 0.3
 FULL_ERROR_MESSAGE = "Full(\"Multicaster from 'Test input buffer': Unable to push to buffer 'Test output buffer 1', it is full\")"
 
 
+class _PickleCountingValue:
+    # A value which counts how many times it is pickled
+    pickle_count = 0
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        _PickleCountingValue.pickle_count += 1
+        return _PickleCountingValue, (self.text,)
+
+
+def _topic(value: str) -> str:
+    return value.split(":")[0]
+
+
 class MulticasterTest(TestCase):
     def __init__(self, name: str) -> None:
         super().__init__(name)
@@ -115,6 +131,88 @@ class MulticasterTest(TestCase):
         self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=["Hello"], expect_completed=True, errors=["RuntimeError('Test error')"])
         self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["Hello"], expect_completed=True, errors=["RuntimeError('Test error')"])
 
+    @assert_no_warnings_or_errors_logged
+    def test_item_is_pickled_once_for_all_outputs_across_process_boundaries(self) -> None:
+        _PickleCountingValue.pickle_count = 0
+        values = [_PickleCountingValue("Hello"), _PickleCountingValue("World")]
+        with MultiThreadBuffer[_PickleCountingValue](INPUT_BUFFER_SIZE, "Test input buffer") as input_buffer, \
+                MultiThreadBuffer[_PickleCountingValue](INPUT_BUFFER_SIZE, "Test thread output buffer") as thread_output_buffer, \
+                MultiProcessBuffer[_PickleCountingValue](INPUT_BUFFER_SIZE, "Test process output buffer 1") as process_output_buffer_1, \
+                MultiProcessBuffer[_PickleCountingValue](INPUT_BUFFER_SIZE, "Test process output buffer 2") as process_output_buffer_2, \
+                MultiProcessBuffer[_PickleCountingValue](INPUT_BUFFER_SIZE, "Test process output buffer 3") as process_output_buffer_3:
+            process_output_buffers: List[Buffer[_PickleCountingValue]] = [process_output_buffer_1, process_output_buffer_2, process_output_buffer_3]
+            with Multicaster(input_buffer) as multicaster:
+                multicaster.subscribe(thread_output_buffer)
+                for process_output_buffer in process_output_buffers:
+                    multicaster.subscribe(process_output_buffer)
+                multicaster.start_blocking()
+                with input_buffer.publish() as publisher:
+                    for value in values:
+                        publisher.publish_value(value)
+                    publisher.publish_complete(None)
+                multicaster.join(DELAY)
+                self.assertFalse(multicaster.is_alive())
+
+            self.assertEqual(len(values), _PickleCountingValue.pickle_count)
+            thread_subscriber: TestSubscriberBase[_PickleCountingValue] = self._subscribe_and_receive_all(thread_output_buffer)
+            self.assertEqual(len(values), len(thread_subscriber.published_values))
+            for received, value in zip(thread_subscriber.published_values, values):
+                self.assertIs(value, received)  # Not copied
+            for process_output_buffer in process_output_buffers:
+                process_subscriber: TestSubscriberBase[_PickleCountingValue] = self._subscribe_and_receive_all(process_output_buffer)
+                self.assertEqual(["Hello", "World"], [received.text for received in process_subscriber.published_values])
+                self.assertTrue(process_subscriber.completed)
+
+    @assert_no_warnings_or_errors_logged
+    def test_items_are_routed_by_key(self) -> None:
+        with MultiThreadBuffer[str](OUTPUT_BUFFER_2_SIZE, "Test output buffer 3") as output_buffer_3:
+            with Multicaster(self._input_buffer, key_function=_topic) as multicaster:
+                multicaster.subscribe(self._output_buffer_1, routing_keys=["a"])
+                multicaster.subscribe(self._output_buffer_2, routing_keys={"b", "c"})
+                multicaster.subscribe(output_buffer_3)
+                multicaster.start_blocking()
+                with self._input_buffer.publish() as publisher:
+                    for value in ["a:1", "b:2", "c:3", "d:4"]:
+                        publisher.publish_value(value)
+                    publisher.publish_complete(None)
+                    time.sleep(0.1)
+
+            self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=["a:1"], expect_completed=True, errors=[])
+            self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["b:2", "c:3"], expect_completed=True, errors=[])
+            self._subscribe_and_receive_all_and_validate(output_buffer_3, values=["a:1", "b:2", "c:3", "d:4"], expect_completed=True, errors=[])
+        self.assertFalse(multicaster.is_alive())
+
+    @assert_no_warnings_or_errors_logged
+    def test_items_are_filtered_by_predicate_and_key(self) -> None:
+        with Multicaster(self._input_buffer, key_function=_topic) as multicaster:
+            multicaster.subscribe(self._output_buffer_1, predicate=lambda value: value.endswith("1"))
+            multicaster.subscribe(self._output_buffer_2, routing_keys=["b"], predicate=lambda value: value.endswith("2"))
+            multicaster.start_blocking()
+            with self._input_buffer.publish() as publisher:
+                for value in ["a:1", "b:1", "b:2", "c:2"]:
+                    publisher.publish_value(value)
+                publisher.publish_complete(None)
+                time.sleep(0.1)
+
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=["a:1", "b:1"], expect_completed=True, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["b:2"], expect_completed=True, errors=[])
+        self.assertFalse(multicaster.is_alive())
+
+    @assert_no_warnings_or_errors_logged
+    def test_unsubscribed_buffer_is_removed_from_routing(self) -> None:
+        with Multicaster(self._input_buffer, key_function=_topic) as multicaster:
+            multicaster.subscribe(self._output_buffer_1, routing_keys=["a"])
+            multicaster.subscribe(self._output_buffer_2, routing_keys=["a"])
+            multicaster.unsubscribe(self._output_buffer_1)
+            multicaster.start_blocking()
+            with self._input_buffer.publish() as publisher:
+                publisher.publish_value("a:1")
+                publisher.publish_complete(None)
+                time.sleep(0.1)
+
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_1, values=[], expect_completed=False, errors=[])
+        self._subscribe_and_receive_all_and_validate(self._output_buffer_2, values=["a:1"], expect_completed=True, errors=[])
+
     @assert_no_warnings_or_errors_logged
     def test_cannot_subscribe_while_running(self) -> None:
         with Multicaster(self._input_buffer) as multicaster:
@@ -284,6 +382,12 @@ class MulticasterTest(TestCase):
                 multicaster.subscribe(None)
             with self.assertRaises(ValueError):
                 multicaster.subscribe(self._output_buffer_1, None)
+            with self.assertRaisesRegex(ValueError, "Routing keys can only be used if the multicaster was given a key function"):
+                multicaster.subscribe(self._output_buffer_1, routing_keys=["a"])
+        with Multicaster(self._input_buffer, key_function=_topic) as multicaster:
+            with self.assertRaisesRegex(ValueError, "If routing keys are given, there must be at least one"):
+                multicaster.subscribe(self._output_buffer_1, routing_keys=[])
+            multicaster.subscribe(self._output_buffer_1, routing_keys=["a"])  # The failed attempts did not subscribe the buffer
             with self.assertRaises(ValueError):
                 multicaster.unsubscribe(None)
             # Base class methods are covered by base class tests
@@ -300,11 +404,16 @@ class MulticasterTest(TestCase):
 
     def _subscribe_and_receive_all_and_validate(self, observable: Observable[str], values: List[str], expect_completed: bool, errors: List[str]) -> None:
         # Receives and checks the received values received on one of the multicaster's outputs
-        subscriber = TestSubscriber()
-        event = AutoResetEvent()
-        with observable.subscribe(event) as subscription:
-            receive_all(subscription, event, subscriber)
+        subscriber: TestSubscriberBase[str] = self._subscribe_and_receive_all(observable)
 
         subscriber.assert_published_values(values, self)
         subscriber.assert_completed(expect_completed, self)
         subscriber.assert_error_values(errors, self)
+
+    @staticmethod
+    def _subscribe_and_receive_all(observable: Observable[T]) -> TestSubscriberBase[T]:
+        subscriber = TestSubscriberBase[T]()
+        event = AutoResetEvent()
+        with observable.subscribe(event) as subscription:
+            receive_all(subscription, event, subscriber)
+        return subscriber
@@ -0,0 +1,143 @@
+import time
+from typing import Any, List, Optional, Tuple
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from puma.buffer import MultiProcessBuffer, MultiThreadBuffer, Observable, Publishable
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.pipeline import Pipeline, StagePlacement
+from puma.primitives import AutoResetEvent
+from puma.runnable import Runnable
+from tests.buffer.test_support.buffer_api_test_support import TestSubscriberBase, publish_values_and_complete
+from tests.runnable.test_support.publishing_runnable import PublishingRunnable
+from tests.runnable.test_support.testval import TestVal
+
+TIMEOUT = 30.0
+COUNT = 20
+PLACEMENTS = [[StagePlacement.THREAD], [StagePlacement.PROCESS]]
+
+
+def double(value: int) -> int:
+    return value * 2
+
+
+def increment(value: int) -> int:
+    return value + 1
+
+
+def odd_only(value: int) -> Optional[int]:
+    return value if value % 2 else None
+
+
+def not_multiple_of_four(value: int) -> Optional[int]:
+    return None if value % 4 == 0 else value
+
+
+def fail_at_five(value: int) -> int:
+    if value == 5:
+        raise RuntimeError("Test Error")
+    return value
+
+
+def get_counter(value: TestVal) -> int:
+    return value.counter
+
+
+def create_publishing_runnable(inputs: List[Observable[Any]], outputs: List[Publishable[Any]]) -> Runnable:
+    return PublishingRunnable(COUNT, outputs[0], delay=0.01)
+
+
+class PipelineSlowTest(TestCase):
+
+    @parameterized.expand(PLACEMENTS)
+    @assert_no_warnings_or_errors_logged
+    def test_values_flow_through_fused_and_unfused_stages(self, placement: StagePlacement) -> None:
+        pipeline = Pipeline("Test")
+        pipeline.add_input("in")
+        pipeline.add_function_stage("increment", increment, "in", lightweight=True)
+        pipeline.add_function_stage("double", double, "increment", placement=placement)
+        pipeline.add_function_stage("filter", not_multiple_of_four, "double")
+        pipeline.add_function_stage("increment again", increment, "filter", lightweight=True)
+        pipeline.add_output("out", "increment again")
+        self.assertEqual([["increment", "double"], ["filter", "increment again"]], pipeline.get_stage_groups())
+        with pipeline:
+            expected_buffer_type = MultiProcessBuffer if placement == StagePlacement.PROCESS else MultiThreadBuffer
+            self.assertIsInstance(pipeline.get_input("in"), expected_buffer_type)
+            self.assertIsInstance(pipeline.get_buffer("double", "filter"), expected_buffer_type)
+            self.assertIsInstance(pipeline.get_output("out"), MultiThreadBuffer)
+            pipeline.start_blocking(TIMEOUT)
+            publish_values_and_complete(pipeline.get_input("in"), list(range(COUNT)))
+            values, errors = self._receive_all(pipeline.get_output("out"))
+            pipeline.join(TIMEOUT)
+            pipeline.check_for_exceptions()
+        self.assertEqual([(i + 1) * 2 + 1 for i in range(COUNT) if (i + 1) % 2], values)
+        self.assertEqual([], errors)
+
+    @parameterized.expand(PLACEMENTS)
+    @assert_no_warnings_or_errors_logged
+    def test_runnable_source_and_fan_out(self, placement: StagePlacement) -> None:
+        pipeline = Pipeline("Test")
+        pipeline.add_stage("source", create_publishing_runnable, placement=placement)
+        pipeline.add_function_stage("counter", get_counter, "source", lightweight=True)
+        pipeline.add_function_stage("odd", odd_only, "counter")
+        pipeline.add_function_stage("double", double, "counter")
+        pipeline.add_output("odd out", "odd")
+        pipeline.add_output("double out", "double")
+        self.assertEqual([["source"], ["counter"], ["odd"], ["double"]], pipeline.get_stage_groups())
+        with pipeline:
+            pipeline.start_blocking(TIMEOUT)
+            odd_values, _ = self._receive_all(pipeline.get_output("odd out"))
+            double_values, _ = self._receive_all(pipeline.get_output("double out"))
+            pipeline.join(TIMEOUT)
+            pipeline.check_for_exceptions()
+        self.assertEqual([i for i in range(COUNT) if i % 2], odd_values)
+        self.assertEqual([i * 2 for i in range(COUNT)], double_values)
+
+    @parameterized.expand(PLACEMENTS)
+    @assert_no_warnings_or_errors_logged
+    def test_stop_drains_the_pipeline(self, placement: StagePlacement) -> None:
+        pipeline = Pipeline("Test")
+        pipeline.add_stage("source", create_publishing_runnable)
+        pipeline.add_function_stage("counter", get_counter, "source", placement=placement)
+        pipeline.add_output("out", "counter")
+        with pipeline:
+            pipeline.start_blocking(TIMEOUT)
+            time.sleep(0.05)
+            pipeline.stop()
+            values, errors = self._receive_all(pipeline.get_output("out"))
+            pipeline.join(TIMEOUT)
+            self.assertFalse(pipeline.is_alive())
+        self.assertEqual(list(range(len(values))), values)  # everything published before the source was stopped has arrived, in order
+        self.assertEqual([], errors)
+
+    @parameterized.expand(PLACEMENTS)
+    def test_errors_flow_downstream(self, placement: StagePlacement) -> None:
+        pipeline = Pipeline("Test")
+        pipeline.add_input("in")
+        pipeline.add_function_stage("fail", fail_at_five, "in", placement=placement)
+        pipeline.add_function_stage("double", double, "fail")
+        pipeline.add_output("out", "double")
+        with pipeline:
+            pipeline.start_blocking(TIMEOUT)
+            publish_values_and_complete(pipeline.get_input("in"), list(range(COUNT)))
+            values, errors = self._receive_all(pipeline.get_output("out"))
+            pipeline.join(TIMEOUT)
+            pipeline.check_for_exceptions()  # the error has been passed on, so is not raised by the stages
+        self.assertEqual([0, 2, 4, 6, 8], values)
+        self.assertEqual(["RuntimeError('Test Error')"], [repr(error) for error in errors])
+
+    def _receive_all(self, observable: Observable[Any]) -> Tuple[List[Any], List[BaseException]]:
+        event = AutoResetEvent()
+        subscriber = TestSubscriberBase[Any]()
+        end_time = time.monotonic() + TIMEOUT
+        with observable.subscribe(event) as subscription:
+            while not subscriber.completed:
+                self.assertLess(time.monotonic(), end_time, "Timed out waiting for the pipeline")
+                event.wait(0.1)
+                while not subscriber.completed:
+                    try:
+                        subscription.call_events(subscriber)
+                    except Exception:
+                        break
+        return subscriber.published_values, subscriber.error_values
@@ -0,0 +1,133 @@
+from typing import Any, List
+from unittest import TestCase
+
+from puma.buffer import MultiThreadBuffer, Observable, Publishable
+from puma.context import MustBeContextManagedError
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.pipeline import Pipeline, StagePlacement
+from puma.runnable import Runnable
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+
+
+def double(value: int) -> int:
+    return value * 2
+
+
+def increment(value: int) -> int:
+    return value + 1
+
+
+def create_runnable(inputs: List[Observable[Any]], outputs: List[Publishable[Any]]) -> Runnable:
+    return TestInlineRunnable("Custom")
+
+
+class PipelineTest(TestCase):
+
+    @assert_no_warnings_or_errors_logged
+    def test_is_initialised(self) -> None:
+        pipeline = Pipeline()
+        with self.assertRaisesRegex(MustBeContextManagedError, "Must be context managed"):
+            pipeline.start()
+
+    @assert_no_warnings_or_errors_logged
+    def test_names_must_be_unique(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("a")
+        with self.assertRaisesRegex(ValueError, "The name 'a' is already used"):
+            pipeline.add_function_stage("a", double, "a")
+
+    @assert_no_warnings_or_errors_logged
+    def test_inputs_must_already_exist(self) -> None:
+        pipeline = Pipeline()
+        with self.assertRaisesRegex(ValueError, "There is no stage, input or output called 'b'"):
+            pipeline.add_function_stage("a", double, "b")
+
+    @assert_no_warnings_or_errors_logged
+    def test_pipeline_input_feeds_one_stage(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("in")
+        pipeline.add_function_stage("a", double, "in")
+        with self.assertRaisesRegex(ValueError, "Pipeline input 'in' already feeds 'a'"):
+            pipeline.add_function_stage("b", double, "in")
+
+    @assert_no_warnings_or_errors_logged
+    def test_outputs_cannot_feed_stages(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("in")
+        pipeline.add_output("out", "in")
+        with self.assertRaisesRegex(ValueError, "'out' is a pipeline output"):
+            pipeline.add_function_stage("a", double, "out")
+
+    @assert_no_warnings_or_errors_logged
+    def test_lightweight_stages_are_fused(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("in")
+        pipeline.add_function_stage("parse", increment, "in", lightweight=True)
+        pipeline.add_function_stage("work", double, "parse", placement=StagePlacement.PROCESS)
+        pipeline.add_function_stage("tidy", increment, "work", lightweight=True)
+        pipeline.add_function_stage("more work", double, "tidy")
+        pipeline.add_output("out", "more work")
+        self.assertEqual([["parse", "work", "tidy"], ["more work"]], pipeline.get_stage_groups())
+
+    @assert_no_warnings_or_errors_logged
+    def test_heavy_stages_are_not_fused(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("in")
+        pipeline.add_function_stage("a", double, "in")
+        pipeline.add_function_stage("b", double, "a")
+        self.assertEqual([["a"], ["b"]], pipeline.get_stage_groups())
+
+    @assert_no_warnings_or_errors_logged
+    def test_fusion_can_be_disabled(self) -> None:
+        pipeline = Pipeline(fuse_stages=False)
+        pipeline.add_input("in")
+        pipeline.add_function_stage("a", double, "in", lightweight=True)
+        pipeline.add_function_stage("b", double, "a", lightweight=True)
+        self.assertEqual([["a"], ["b"]], pipeline.get_stage_groups())
+
+    @assert_no_warnings_or_errors_logged
+    def test_fan_out_and_runnable_stages_are_not_fused(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_stage("source", create_runnable)
+        pipeline.add_function_stage("a", double, "source", lightweight=True)
+        pipeline.add_function_stage("b", double, "a", lightweight=True)
+        pipeline.add_function_stage("c", double, "a", lightweight=True)
+        self.assertEqual([["source"], ["a"], ["b"], ["c"]], pipeline.get_stage_groups())
+
+    @assert_no_warnings_or_errors_logged
+    def test_unused_input_is_an_error(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("in")
+        with self.assertRaisesRegex(ValueError, "Pipeline input 'in' does not feed any stage"):
+            pipeline.get_stage_groups()
+
+    @assert_no_warnings_or_errors_logged
+    def test_set_placement(self) -> None:
+        pipeline = Pipeline()
+        pipeline.add_input("in")
+        pipeline.add_function_stage("a", double, "in")
+        pipeline.set_placement("a", StagePlacement.PROCESS)
+        with self.assertRaisesRegex(ValueError, "'in' is not a stage"):
+            pipeline.set_placement("in", StagePlacement.PROCESS)
+
+    @assert_no_warnings_or_errors_logged
+    def test_thread_stages_are_connected_by_thread_buffers(self) -> None:
+        pipeline = Pipeline("Test")
+        pipeline.add_input("in")
+        pipeline.add_function_stage("a", increment, "in", lightweight=True)
+        pipeline.add_function_stage("b", double, "a")
+        pipeline.add_function_stage("c", double, "b")
+        pipeline.add_output("out", "c")
+        with pipeline:
+            self.assertIsInstance(pipeline.get_input("in"), MultiThreadBuffer)
+            self.assertIsInstance(pipeline.get_output("out"), MultiThreadBuffer)
+            self.assertIsNone(pipeline.get_buffer("a", "b"))  # fused
+            buffer = pipeline.get_buffer("b", "c")
+            self.assertIsInstance(buffer, MultiThreadBuffer)
+            assert buffer is not None
+            self.assertEqual("Test: b -> c", buffer.buffer_name())
+            self.assertIs(pipeline.get_runner("a"), pipeline.get_runner("b"))
+            self.assertEqual(["Test: a+b", "Test: c"], [runner.get_name() for runner in pipeline.get_runners()])
+            self.assertFalse(pipeline.is_alive())
+            with self.assertRaisesRegex(RuntimeError, "cannot be changed while it is context managed"):
+                pipeline.add_function_stage("d", double, "c")
@@ -0,0 +1,45 @@
+import multiprocessing
+from unittest import TestCase, skipUnless
+
+from puma.process_context import StartMethod, get_process_context, get_start_method, set_start_method
+from puma.runnable.runner import ProcessRunner
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+
+
+class ProcessContextTest(TestCase):
+
+    def tearDown(self) -> None:
+        set_start_method(None)
+
+    def test_default_is_multiprocessing_default(self) -> None:
+        self.assertIs(multiprocessing.get_context(), get_process_context())
+        self.assertEqual(multiprocessing.get_context().get_start_method(), get_start_method().value)
+
+    @skipUnless(StartMethod.SPAWN.is_available(), "Start method not available")
+    def test_set_start_method(self) -> None:
+        set_start_method(StartMethod.SPAWN)
+        self.assertEqual(StartMethod.SPAWN, get_start_method())
+        self.assertEqual("spawn", get_process_context().get_start_method())
+        self.assertNotEqual("spawn", multiprocessing.get_context().get_start_method())  # the multiprocessing module's default is left alone
+        set_start_method(None)
+        self.assertEqual(multiprocessing.get_context().get_start_method(), get_start_method().value)
+
+    @skipUnless(StartMethod.SPAWN.is_available(), "Start method not available")
+    def test_specific_context(self) -> None:
+        self.assertEqual("spawn", get_process_context(StartMethod.SPAWN).get_start_method())
+
+    @skipUnless(StartMethod.SPAWN.is_available(), "Start method not available")
+    def test_forkserver_preload_only_allowed_with_forkserver(self) -> None:
+        with self.assertRaisesRegex(ValueError, "forkserver_preload"):
+            set_start_method(StartMethod.SPAWN, forkserver_preload=["yaml"])
+
+    @skipUnless(StartMethod.FORK.is_available() and StartMethod.SPAWN.is_available(), "Start methods not available")
+    def test_runner_start_method(self) -> None:
+        set_start_method(StartMethod.FORK)
+        self.assertEqual(StartMethod.FORK, ProcessRunner(TestInlineRunnable("test")).get_start_method())
+        with self.assertRaisesRegex(ValueError, "global start method is fork"):
+            ProcessRunner(TestInlineRunnable("test"), start_method=StartMethod.SPAWN)
+
+        set_start_method(StartMethod.SPAWN)
+        self.assertEqual(StartMethod.SPAWN, ProcessRunner(TestInlineRunnable("test")).get_start_method())
+        self.assertEqual(StartMethod.FORK, ProcessRunner(TestInlineRunnable("test"), start_method=StartMethod.FORK).get_start_method())
@@ -0,0 +1,128 @@
+import threading
+import time
+from typing import Any, List, Tuple
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from puma.buffer import Observable
+from puma.environment import Environment, ProcessEnvironment, ThreadEnvironment
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.primitives import AutoResetEvent
+from puma.runnable.pool import ParallelMapRunnable
+from tests.buffer.test_support.buffer_api_test_support import TestSubscriberBase, publish_values_and_complete
+
+BUFFER_SIZE = 100
+COUNT = 20
+WORKER_COUNT = 3
+TIMEOUT = 30.0
+
+# The environment in which the runnable runs, and that of its workers
+ENVIRONMENTS = [
+    [ThreadEnvironment(), ThreadEnvironment()],
+    [ThreadEnvironment(), ProcessEnvironment()],
+    [ProcessEnvironment(), ThreadEnvironment()],
+]
+
+_running_lock = threading.Lock()
+_running_count = 0
+_max_running_count = 0
+
+
+def square_after_delay(value: int) -> int:
+    time.sleep(0.01 * (value % 4))  # Later values often complete before earlier ones
+    return value * value
+
+
+def fail_at_five(value: int) -> int:
+    if value == 5:
+        raise RuntimeError("Test Error")
+    return value
+
+
+def count_concurrent_calls(value: int) -> int:
+    # Only meaningful if the workers are threads in the test's process
+    global _running_count, _max_running_count
+    with _running_lock:
+        _running_count += 1
+        _max_running_count = max(_max_running_count, _running_count)
+    time.sleep(0.01)
+    with _running_lock:
+        _running_count -= 1
+    return value
+
+
+class ParallelMapRunnableSlowTest(TestCase):
+
+    @parameterized.expand(ENVIRONMENTS)
+    @assert_no_warnings_or_errors_logged
+    def test_results_are_published_in_the_order_of_the_values(self, runner_environment: Environment, worker_environment: Environment) -> None:
+        values, errors = self._run(runner_environment, worker_environment, square_after_delay, list(range(COUNT)))
+        self.assertEqual([i * i for i in range(COUNT)], values)
+        self.assertEqual([], errors)
+
+    @assert_no_warnings_or_errors_logged
+    def test_in_flight_values_are_bounded(self) -> None:
+        global _max_running_count
+        _max_running_count = 0
+        values, errors = self._run(ThreadEnvironment(), ThreadEnvironment(), count_concurrent_calls, list(range(COUNT)), max_in_flight=2)
+        self.assertEqual(list(range(COUNT)), values)
+        self.assertEqual(2, _max_running_count)  # There are more workers than this, so only the bound prevents more calls running at once
+
+    @parameterized.expand(ENVIRONMENTS)
+    def test_error_raised_by_the_function_is_passed_on(self, runner_environment: Environment, worker_environment: Environment) -> None:
+        values, errors = self._run(runner_environment, worker_environment, fail_at_five, list(range(COUNT)))
+        self.assertEqual(list(range(5)), values)
+        self.assertEqual(1, len(errors))
+        self.assertEqual("Test Error", str(errors[0]))
+
+    @assert_no_warnings_or_errors_logged
+    def test_error_received_from_the_input_is_passed_on(self) -> None:
+        environment = ThreadEnvironment()
+        with environment.create_buffer(int, BUFFER_SIZE, "In") as in_buffer, environment.create_buffer(int, BUFFER_SIZE, "Out") as out_buffer:
+            runnable = ParallelMapRunnable("Test", in_buffer, square_after_delay, out_buffer, WORKER_COUNT, worker_environment=ThreadEnvironment())
+            with environment.create_runner(runnable) as runner:
+                runner.start_blocking()
+                with in_buffer.publish() as publisher:
+                    publisher.publish_value(2)
+                    publisher.publish_complete(RuntimeError("Upstream Error"))
+                values, errors = self._receive_all(out_buffer)
+                runner.join(TIMEOUT)
+        self.assertEqual(1, len(errors))
+        self.assertEqual("Upstream Error", str(errors[0]))
+
+    def test_constructor_checks_arguments(self) -> None:
+        environment = ThreadEnvironment()
+        with environment.create_buffer(int, BUFFER_SIZE, "In") as in_buffer, environment.create_buffer(int, BUFFER_SIZE, "Out") as out_buffer:
+            with self.assertRaisesRegex(ValueError, "at least one worker"):
+                ParallelMapRunnable("Test", in_buffer, square_after_delay, out_buffer, 0)
+            with self.assertRaisesRegex(ValueError, "in flight must be at least 1"):
+                ParallelMapRunnable("Test", in_buffer, square_after_delay, out_buffer, WORKER_COUNT, max_in_flight=0)
+
+    def _run(self, runner_environment: Environment, worker_environment: Environment, function: Any, inputs: List[int], **kwargs: Any) \
+            -> Tuple[List[Any], List[BaseException]]:
+        with runner_environment.create_buffer(int, BUFFER_SIZE, "In") as in_buffer, runner_environment.create_buffer(int, BUFFER_SIZE, "Out") as out_buffer:
+            runnable = ParallelMapRunnable("Test", in_buffer, function, out_buffer, WORKER_COUNT, worker_environment=worker_environment, **kwargs)
+            with runner_environment.create_runner(runnable) as runner:
+                runner.start_blocking()
+                publish_values_and_complete(in_buffer, inputs)
+                result = self._receive_all(out_buffer)
+                runner.join(TIMEOUT)
+                self.assertFalse(runner.is_alive())
+                runner.check_for_exceptions()
+        return result
+
+    def _receive_all(self, observable: Observable[Any]) -> Tuple[List[Any], List[BaseException]]:
+        event = AutoResetEvent()
+        subscriber = TestSubscriberBase[Any]()
+        end_time = time.monotonic() + TIMEOUT
+        with observable.subscribe(event) as subscription:
+            while not subscriber.completed:
+                self.assertLess(time.monotonic(), end_time, "Timed out waiting for the results")
+                event.wait(0.1)
+                while not subscriber.completed:
+                    try:
+                        subscription.call_events(subscriber)
+                    except Exception:
+                        break
+        return subscriber.published_values, subscriber.error_values
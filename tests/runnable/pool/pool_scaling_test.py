@@ -0,0 +1,27 @@
+from unittest import TestCase
+
+from puma.runnable.pool import PoolScaling
+
+
+class PoolScalingTest(TestCase):
+
+    def test_valid(self) -> None:
+        scaling = PoolScaling(0, 4)
+        self.assertEqual(0, scaling.min_size)
+        self.assertEqual(4, scaling.max_size)
+
+    def test_invalid_sizes(self) -> None:
+        with self.assertRaisesRegex(ValueError, "minimum size"):
+            PoolScaling(-1, 4)
+        with self.assertRaisesRegex(ValueError, "maximum size"):
+            PoolScaling(0, 0)
+        with self.assertRaisesRegex(ValueError, "maximum size"):
+            PoolScaling(3, 2)
+
+    def test_invalid_thresholds(self) -> None:
+        with self.assertRaisesRegex(ValueError, "backlog"):
+            PoolScaling(1, 2, scale_up_backlog=0)
+        with self.assertRaisesRegex(ValueError, "greater than zero"):
+            PoolScaling(1, 2, scale_up_wait=0.0)
+        with self.assertRaisesRegex(ValueError, "greater than zero"):
+            PoolScaling(1, 2, idle_timeout=-1.0)
@@ -0,0 +1,409 @@
+import logging
+import os
+import queue
+import statistics
+import threading
+import time
+import uuid
+from typing import Any, List, Type
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from puma.buffer import MultiProcessBuffer, MultiThreadBuffer, Subscription
+from puma.concurrent.cache.result_cache import ResultCache
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.primitives import AutoResetEvent
+from puma.runnable.pool import Pool, PoolDispatch, PoolScaling, PoolScalingEvent, PoolScalingEventType, ProcessPool, ThreadPool, get_worker_context
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 3
+BUFFER_SIZE = 100
+JOB_COUNT = 50
+LATENCY_SAMPLES = 50
+MAX_MEDIAN_DISPATCH_LATENCY = 0.01  # Before dispatch was event-driven, an idle worker polled its job queue every 0.1 seconds
+TIMEOUT = 10.0
+
+POOLS = [[ThreadPool, MultiThreadBuffer], [ProcessPool, MultiProcessBuffer]]
+
+
+def square(value: int) -> int:
+    return value * value
+
+
+def sleep_then_return(value: float) -> float:
+    time.sleep(value)
+    return value
+
+
+def get_worker_identity(value: int) -> str:
+    return f"{os.getpid()}:{threading.get_ident()}"
+
+
+def fail_on_three(value: int) -> int:
+    if value == 3:
+        raise ValueError("Three")
+    return value
+
+
+def make_worker_context(prefix: str) -> str:
+    return f"{prefix}:{uuid.uuid4()}"  # Unique to each call, so shows which call of the initializer created the context that a job sees
+
+
+def get_context(value: int) -> str:
+    return str(get_worker_context())
+
+
+def fail_to_initialize() -> None:
+    raise ValueError("Initializer failed")
+
+
+def unique_result(value: int) -> str:
+    return f"{value}:{uuid.uuid4()}"  # Different each time it is called, so shows whether a result came from a cache
+
+
+class PoolSlowTest(TestCase):
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_runs_all_jobs(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        event = AutoResetEvent()
+        with buffer_class(BUFFER_SIZE, "Results") as results_buffer, results_buffer.subscribe(event) as results:
+            with pool_class(POOL_SIZE, "Test pool", results_buffer) as pool:
+                for i in range(JOB_COUNT):  # Many more jobs than workers, so most are queued
+                    pool.submit(square, (i,), TIMEOUT)
+                received = self._receive(results, event, JOB_COUNT)
+            self._receive(results, event, 1)  # The completion
+        self.assertEqual([i * i for i in range(JOB_COUNT)], sorted(received))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_idle_workers_are_woken_by_a_submitted_job(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        # Measures the time from submitting a job to an idle pool to receiving its result
+        event = AutoResetEvent()
+        latencies: List[float] = []
+        with buffer_class(BUFFER_SIZE, "Results") as results_buffer, results_buffer.subscribe(event) as results:
+            with pool_class(POOL_SIZE, "Test pool", results_buffer) as pool:
+                for i in range(LATENCY_SAMPLES):
+                    self._wait_until_all_idle(pool)
+                    t1 = time.perf_counter()
+                    pool.submit(square, (i,), TIMEOUT)
+                    self.assertEqual([i * i], self._receive(results, event, 1))
+                    latencies.append(time.perf_counter() - t1)
+            self._receive(results, event, 1)  # The completion
+        median_latency = statistics.median(latencies)
+        logger.info("%s dispatch latency: median %.2f ms, max %.2f ms", pool_class.__name__, median_latency * 1000, max(latencies) * 1000)
+        self.assertLess(median_latency, MAX_MEDIAN_DISPATCH_LATENCY)
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_submit_blocks_while_all_workers_busy_and_queue_full(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        event = AutoResetEvent()
+        with buffer_class(BUFFER_SIZE, "Results") as results_buffer, results_buffer.subscribe(event) as results:
+            with pool_class(1, "Test pool", results_buffer) as pool:
+                self._wait_until_all_idle(pool)
+                pool.submit(sleep_then_return, (0.5,), TIMEOUT)  # Sent to the idle worker
+                pool.submit(sleep_then_return, (0.0,), TIMEOUT)  # Queued
+                t1 = time.perf_counter()
+                with self.assertRaises(queue.Full):
+                    pool.submit(sleep_then_return, (0.0,), 0.1)
+                self.assertGreaterEqual(time.perf_counter() - t1, 0.1)
+                pool.submit(sleep_then_return, (0.0,), TIMEOUT)  # Waits until the worker takes the queued job
+                self.assertEqual([0.5, 0.0, 0.0], self._receive(results, event, 3))
+            self._receive(results, event, 1)  # The completion
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_idle_pool_stops_quickly(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        event = AutoResetEvent()
+        with buffer_class(BUFFER_SIZE, "Results") as results_buffer, results_buffer.subscribe(event) as results:
+            with pool_class(POOL_SIZE, "Test pool", results_buffer) as pool:
+                self._wait_until_all_idle(pool)
+                t1 = time.perf_counter()
+                for runnable in pool._pool_runnables.values():
+                    runnable.stop()
+                for runner in pool._pool_runners.values():
+                    runner.join(TIMEOUT)
+                self.assertLess(time.perf_counter() - t1, 0.5)
+            self._receive(results, event, 1)  # The completion
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_submit_returns_future_of_the_job(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            futures = [pool.submit(square, (i,), TIMEOUT) for i in range(JOB_COUNT)]
+            self.assertEqual([i * i for i in range(JOB_COUNT)], [future.result(TIMEOUT) for future in futures])
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_error_in_job_is_set_on_its_future_and_worker_continues(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(1, "Test pool") as pool:
+            future = pool.submit(fail_on_three, (3,), TIMEOUT)
+            with self.assertRaisesRegex(ValueError, "Three"):
+                future.result(TIMEOUT)
+            self.assertEqual(4, pool.submit(fail_on_three, (4,), TIMEOUT).result(TIMEOUT))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_map_and_imap_return_results_in_order(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        delays = [0.05, 0.0, 0.03, 0.0, 0.01, 0.0]  # Later items complete before earlier ones
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            self.assertEqual([i * i for i in range(JOB_COUNT)], pool.map(square, range(JOB_COUNT)))
+            self.assertEqual(delays, list(pool.imap(sleep_then_return, delays)))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_imap_raises_error_when_it_reaches_the_failed_item(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        received: List[int] = []
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            with self.assertRaisesRegex(ValueError, "Three"):
+                for value in pool.imap(fail_on_three, range(6)):
+                    received.append(value)
+        self.assertEqual([0, 1, 2], received)
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_imap_unordered_yields_results_as_they_complete(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        delays = [0.5, 0.0, 0.0]
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            received = list(pool.imap_unordered(sleep_then_return, delays))
+        self.assertEqual(0.5, received[-1])
+        self.assertEqual(sorted(delays), sorted(received))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_submit_many_returns_futures_in_order_of_arguments(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            futures = pool.submit_many(square, [(i,) for i in range(JOB_COUNT)], chunksize=7)  # The last chunk is a short one
+            self.assertEqual([i * i for i in range(JOB_COUNT)], [future.result(TIMEOUT) for future in futures])
+            self.assertEqual([i * i for i in range(JOB_COUNT)], pool.map(square, range(JOB_COUNT), chunksize=7))
+            self.assertEqual([i * i for i in range(JOB_COUNT)], sorted(pool.imap_unordered(square, range(JOB_COUNT), chunksize=7)))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_error_in_chunk_only_affects_its_own_job(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            futures = pool.submit_many(fail_on_three, [(i,) for i in range(6)], chunksize=6)
+            with self.assertRaisesRegex(ValueError, "Three"):
+                futures[3].result(TIMEOUT)
+            self.assertEqual([0, 1, 2, 4, 5], [future.result(TIMEOUT) for i, future in enumerate(futures) if i != 3])
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_chunking_increases_throughput_of_fine_grained_jobs(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        job_count = 2000
+        durations = []
+        with pool_class(POOL_SIZE, "Test pool") as pool:
+            for chunksize in [1, 100]:
+                t1 = time.perf_counter()
+                self.assertEqual([i * i for i in range(job_count)], pool.map(square, range(job_count), chunksize))
+                durations.append(time.perf_counter() - t1)
+        logger.info("%s: %d jobs take %.3f s unchunked, %.3f s in chunks of 100", pool_class.__name__, job_count, durations[0], durations[1])
+        self.assertLess(durations[1], durations[0])
+
+    @assert_no_warnings_or_errors_logged
+    def test_process_pool_rejects_unpickleable_jobs_and_arguments(self) -> None:
+        with ProcessPool(1, "Test pool") as pool:
+            with self.assertRaisesRegex(RuntimeError, "pickleable job"):
+                pool.submit(lambda value: value, (1,))
+            with self.assertRaisesRegex(RuntimeError, "pickleable arguments"):
+                pool.submit(square, (threading.Lock(),))
+            self.assertEqual(4, pool.submit(square, (2,)).result(TIMEOUT))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_per_worker_queues_run_all_jobs(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(POOL_SIZE, "Test pool", dispatch=PoolDispatch.PER_WORKER_QUEUES, queue_size=2) as pool:
+            futures = [pool.submit(square, (i,), TIMEOUT) for i in range(JOB_COUNT)]
+            self.assertEqual([i * i for i in range(JOB_COUNT)], [future.result(TIMEOUT) for future in futures])
+            self.assertEqual([i * i for i in range(JOB_COUNT)], pool.map(square, range(JOB_COUNT), chunksize=4))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_jobs_with_same_affinity_key_run_on_same_worker(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(POOL_SIZE, "Test pool", dispatch=PoolDispatch.PER_WORKER_QUEUES) as pool:
+            for key in ["patient-1", "patient-2"]:
+                futures = [pool.submit(get_worker_identity, (i,), TIMEOUT, affinity_key=key) for i in range(20)]
+                self.assertEqual(1, len({future.result(TIMEOUT) for future in futures}))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_idle_worker_steals_jobs_queued_for_busy_worker(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(2, "Test pool", dispatch=PoolDispatch.PER_WORKER_QUEUES, queue_size=4) as pool:
+            self._wait_until_all_idle(pool)
+            t1 = time.perf_counter()
+            slow = pool.submit(sleep_then_return, (1.0,), TIMEOUT)
+            pool.submit(sleep_then_return, (0.1,), TIMEOUT)
+            quick = [pool.submit(sleep_then_return, (0.0,), TIMEOUT) for _ in range(6)]  # Shared between the two workers' queues
+            for future in quick:
+                future.result(TIMEOUT)
+            self.assertLess(time.perf_counter() - t1, 0.8)  # Without stealing, the jobs queued behind the slow one would finish after it
+            self.assertEqual(1.0, slow.result(TIMEOUT))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_per_worker_queues_submit_blocks_while_queues_full(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(1, "Test pool", dispatch=PoolDispatch.PER_WORKER_QUEUES) as pool:
+            self._wait_until_all_idle(pool)
+            futures = [pool.submit(sleep_then_return, (0.5,), TIMEOUT), pool.submit(sleep_then_return, (0.0,), TIMEOUT)]  # Sent, then queued
+            with self.assertRaises(queue.Full):
+                pool.submit(sleep_then_return, (0.0,), 0.1)
+            futures.append(pool.submit(sleep_then_return, (0.0,), TIMEOUT))  # Waits until the worker takes the queued job
+            self.assertEqual([0.5, 0.0, 0.0], [future.result(TIMEOUT) for future in futures])
+
+    @assert_no_warnings_or_errors_logged
+    def test_affinity_key_not_supported_with_shared_queue(self) -> None:
+        with ThreadPool(1, "Test pool") as pool:
+            with self.assertRaises(ValueError):
+                pool.submit(square, (1,), affinity_key="patient-1")
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_elastic_pool_grows_for_burst_then_retires_idle_workers(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        events: List[PoolScalingEvent] = []
+        scaling = PoolScaling(1, 4, idle_timeout=0.5)
+        with pool_class(1, "Test pool", scaling=scaling) as pool:
+            pool.add_scaling_callback(events.append)
+            futures = [pool.submit(sleep_then_return, (0.2,), TIMEOUT) for _ in range(8)]
+            self.assertEqual([0.2] * 8, [future.result(TIMEOUT) for future in futures])
+            self.assertEqual(4, pool.get_worker_count())
+            self.assertEqual([PoolScalingEventType.WORKER_ADDED] * 3, [event.event_type for event in events])
+
+            self._wait_until_worker_count(pool, 1)
+            self.assertEqual([PoolScalingEventType.WORKER_RETIRED] * 3, [event.event_type for event in events[3:]])
+            self.assertEqual([3, 2, 1], [event.worker_count for event in events[3:]])
+            self.assertEqual(4, pool.submit(square, (2,), TIMEOUT).result(TIMEOUT))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_elastic_pool_can_scale_to_zero_and_back(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(1, "Test pool", scaling=PoolScaling(0, 2, idle_timeout=0.2)) as pool:
+            self._wait_until_worker_count(pool, 0)
+            self.assertEqual(9, pool.submit(square, (3,), TIMEOUT).result(TIMEOUT))
+            self.assertEqual(1, pool.get_worker_count())
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_elastic_pool_adds_worker_when_all_have_retired_but_not_yet_been_removed(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(1, "Test pool", scaling=PoolScaling(0, 1, idle_timeout=0.1)) as pool:
+            end_time = time.monotonic() + TIMEOUT
+            while pool._dispatcher.get_worker_count() > 0:  # Not checking the pool, so the retired worker has not been removed
+                self.assertLess(time.monotonic(), end_time, "Worker did not retire")
+                time.sleep(0.01)
+            self.assertEqual(1, pool.get_worker_count())
+            self.assertEqual(9, pool.submit(square, (3,), TIMEOUT).result(TIMEOUT))
+
+    @assert_no_warnings_or_errors_logged
+    def test_elastic_pool_rejects_affinity_key(self) -> None:
+        with ThreadPool(1, "Test pool", scaling=PoolScaling(1, 2)) as pool:
+            with self.assertRaises(ValueError):
+                pool.submit(square, (1,), affinity_key="patient-1")
+
+    @assert_no_warnings_or_errors_logged
+    def test_elastic_pool_requires_shared_queue(self) -> None:
+        with self.assertRaisesRegex(ValueError, "SHARED_QUEUE"):
+            ThreadPool(1, "Test pool", dispatch=PoolDispatch.PER_WORKER_QUEUES, scaling=PoolScaling(1, 2))
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_initializer_runs_once_in_each_worker_and_jobs_see_its_context(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(POOL_SIZE, "Test pool", initializer=make_worker_context, initargs=("model",)) as pool:
+            contexts = pool.map(get_context, range(JOB_COUNT))
+        self.assertTrue(all(context.startswith("model:") for context in contexts))
+        self.assertLessEqual(len(set(contexts)), POOL_SIZE)
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_worker_context_is_none_without_initializer(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with pool_class(1, "Test pool") as pool:
+            self.assertEqual("None", pool.submit(get_context, (1,), TIMEOUT).result(TIMEOUT))
+
+    @parameterized.expand(POOLS)
+    def test_error_in_initializer_is_raised_by_the_pool(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        with self.assertRaisesRegex(ValueError, "Initializer failed"):
+            with pool_class(1, "Test pool", initializer=fail_to_initialize) as pool:
+                end_time = time.monotonic() + TIMEOUT
+                while time.monotonic() < end_time:
+                    pool.check_for_exceptions()
+                    time.sleep(0.01)
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_workers_are_recycled_after_max_jobs(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        events: List[PoolScalingEvent] = []
+        with pool_class(1, "Test pool", initializer=make_worker_context, initargs=("worker",), max_jobs_per_worker=2) as pool:
+            pool.add_scaling_callback(events.append)
+            contexts = [pool.submit(get_context, (i,), TIMEOUT).result(TIMEOUT) for i in range(6)]
+            self.assertEqual(1, pool.get_worker_count())
+        self.assertEqual(3, len(set(contexts)))
+        self.assertEqual(contexts[0], contexts[1])
+        self.assertEqual(contexts[2], contexts[3])
+        self.assertEqual([PoolScalingEventType.WORKER_RECYCLED] * 2, [event.event_type for event in events])  # The third worker is not replaced before the pool ends
+        self.assertEqual("it has run 2 jobs", events[0].reason)
+
+    @assert_no_warnings_or_errors_logged
+    def test_process_workers_are_recycled_when_rss_limit_reached(self) -> None:
+        with ProcessPool(1, "Test pool", max_worker_rss=1) as pool:  # Every worker exceeds this as soon as it has run a job
+            pids = [pool.submit(get_worker_identity, (i,), TIMEOUT).result(TIMEOUT) for i in range(3)]
+        self.assertEqual(3, len(set(pids)))
+
+    @assert_no_warnings_or_errors_logged
+    def test_recycled_worker_keeps_its_affinity_jobs(self) -> None:
+        with ThreadPool(2, "Test pool", dispatch=PoolDispatch.PER_WORKER_QUEUES, initializer=make_worker_context, initargs=("worker",),
+                        max_jobs_per_worker=1) as pool:
+            # More jobs than can be queued for the worker, so it is replaced while jobs are queued for it, and its replacement must run them
+            futures = [pool.submit(get_context, (i,), TIMEOUT, affinity_key="patient-1") for i in range(6)]
+            contexts = [future.result(TIMEOUT) for future in futures]
+            contexts.append(pool.submit(get_context, (6,), TIMEOUT, affinity_key="patient-1").result(TIMEOUT))
+        self.assertGreater(len(set(contexts)), 1)
+        self.assertNotEqual(contexts[-2], contexts[-1])
+
+    @parameterized.expand(POOLS)
+    @assert_no_warnings_or_errors_logged
+    def test_cached_results_are_returned_without_running_jobs(self, pool_class: Type[Any], buffer_class: Type[Any]) -> None:
+        cache = ResultCache(100000)
+        with pool_class(POOL_SIZE, "Test pool", result_cache=cache) as pool:
+            first = pool.submit(unique_result, (1,), TIMEOUT).result(TIMEOUT)
+            cached = pool.submit(unique_result, (1,), TIMEOUT)
+            self.assertTrue(cached.done())
+            self.assertEqual(first, cached.result())
+            mapped = pool.map(unique_result, range(JOB_COUNT), chunksize=4)  # Chunks mixing cached and uncached calls
+            self.assertEqual(first, mapped[1])
+            self.assertEqual(mapped, pool.map(unique_result, range(JOB_COUNT), chunksize=4))
+        statistics = cache.get_statistics()
+        self.assertEqual(JOB_COUNT, statistics.misses)
+        self.assertEqual(JOB_COUNT + 2, statistics.hits)
+
+    def test_result_cache_cannot_be_used_with_result_buffer(self) -> None:
+        with MultiThreadBuffer[str](BUFFER_SIZE, "Results") as results_buffer:
+            with self.assertRaisesRegex(ValueError, "result cache cannot be used with a result buffer"):
+                ThreadPool(POOL_SIZE, "Test pool", results_buffer, result_cache=ResultCache(100000))
+
+    def test_get_worker_context_outside_pool_raises_error(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "Pool worker"):
+            get_worker_context()
+
+    def _wait_until_worker_count(self, pool: Pool, count: int) -> None:
+        end_time = time.monotonic() + TIMEOUT
+        while pool.get_worker_count() != count:
+            self.assertLess(time.monotonic(), end_time, "Workers did not retire")
+            time.sleep(0.01)
+            pool.check_for_exceptions()  # Removes workers that have retired
+
+    def _wait_until_all_idle(self, pool: Pool) -> None:
+        end_time = time.monotonic() + TIMEOUT
+        while pool._dispatcher.get_idle_count() < len(pool._pool_runnables):
+            self.assertLess(time.monotonic(), end_time, "Workers did not become idle")
+            time.sleep(0.001)
+
+    @staticmethod
+    def _receive(subscription: Subscription[Any], event: AutoResetEvent, count: int) -> List[Any]:
+        received: List[Any] = []
+        end_time = time.monotonic() + TIMEOUT
+        while len(received) < count and time.monotonic() < end_time:
+            try:
+                subscription.call_events(received.append, lambda error: received.append(None))
+            except queue.Empty:
+                event.wait(end_time - time.monotonic())
+        return [value for value in received if value is not None]
@@ -0,0 +1,147 @@
+import queue
+import time
+from contextlib import ExitStack
+from typing import Any, List, Optional
+from unittest import TestCase
+
+from puma.attribute import copied
+from puma.buffer import MultiThreadBuffer, Observable, Publishable, Publisher, Subscriber
+from puma.helpers.testing.logging.capture_logs import CaptureLogs
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.helpers.testing.mixin import NotATestCase
+from puma.logging import LogLevel
+from puma.runnable import MultiBufferServicingRunnable
+from puma.runnable.runner import CooperativeExecutor, CooperativeRunner, RunnerGroup, RunnerMonitor
+from puma.timeouts import TIMEOUT_NO_WAIT
+from puma.unexpected_situation_action import UnexpectedSituationAction
+from tests.runnable.runner.test_adding_runnable import TestAddingRunnable
+
+BUFFER_SIZE = 10
+RUNNABLE_COUNT = 20
+VALUE_COUNT = 50
+TICK_INTERVAL = 0.02
+TIMEOUT = 10.0
+
+
+class _TickCountingRunnable(MultiBufferServicingRunnable, Subscriber[int], NotATestCase):
+    _results_publisher: Publisher[int] = copied("_results_publisher")
+    tick_count: int = copied("tick_count")
+
+    def __init__(self, name: str, input_buffer: Observable[int], results_buffer: Publishable[int]) -> None:
+        super().__init__(name, [results_buffer], tick_interval=TICK_INTERVAL)
+        self._results_publisher = self._get_publisher_unwrapped(results_buffer)
+        self._add_subscription(input_buffer, self)
+        self.tick_count = 0
+
+    def on_value(self, value: int) -> None:
+        pass
+
+    def on_complete(self, error: Optional[BaseException]) -> None:
+        pass
+
+    def _on_tick(self, timestamp: float) -> None:
+        self.tick_count += 1
+        self._results_publisher.publish_value(self.tick_count, TIMEOUT_NO_WAIT, on_full_action=UnexpectedSituationAction.IGNORE)
+
+
+class CooperativeExecutorSlowTest(TestCase):
+
+    @assert_no_warnings_or_errors_logged
+    def test_chain_of_runnables_on_two_threads(self) -> None:
+        with CooperativeExecutor(2) as executor:
+            with ExitStack() as stack:
+                buffers = [stack.enter_context(MultiThreadBuffer[int](BUFFER_SIZE, f"Buffer {i}")) for i in range(RUNNABLE_COUNT + 1)]
+                runnables = [TestAddingRunnable(f"Runnable {i}", buffers[i], buffers[i + 1]) for i in range(RUNNABLE_COUNT)]
+                runners = [CooperativeRunner(runnable, executor) for runnable in runnables]
+                with buffers[-1].subscribe(None) as results_subscription, buffers[0].publish() as publisher, RunnerGroup(runners) as group:
+                    group.start_blocking()
+                    self.assertEqual([RUNNABLE_COUNT // 2, RUNNABLE_COUNT // 2], executor.get_load())
+                    results: List[int] = []
+                    for i in range(VALUE_COUNT):
+                        publisher.publish_value(i, TIMEOUT)
+                        results.extend(self._receive(results_subscription, 1, group))
+                    publisher.publish_complete(None)
+                    group.join(TIMEOUT)
+                    results_subscription.call_events(lambda v: None, lambda e: None)  # The completion
+                    group.check_for_exceptions()
+                    self.assertEqual([i + RUNNABLE_COUNT for i in range(VALUE_COUNT)], results)
+                    self.assertFalse(group.is_alive())
+                    self.assertEqual([0, 0], executor.get_load())
+
+    @assert_no_warnings_or_errors_logged
+    def test_stop(self) -> None:
+        with CooperativeExecutor(2) as executor, ExitStack() as stack:
+            buffers = [stack.enter_context(MultiThreadBuffer[int](BUFFER_SIZE, f"Buffer {i}")) for i in range(5)]
+            runners = [CooperativeRunner(TestAddingRunnable(f"Runnable {i}", buffers[i], buffers[i + 1]), executor) for i in range(4)]
+            with buffers[-1].subscribe(None) as results_subscription, RunnerGroup(runners) as group:
+                group.start_blocking()
+                self.assertTrue(group.is_alive())
+                t1 = time.perf_counter()
+                runners[0].stop()  # The others end when they receive on_complete from their upstream runnable
+                group.join(TIMEOUT)
+                self.assertLess(time.perf_counter() - t1, 1.0)
+                self.assertFalse(group.is_alive())
+                group.check_for_exceptions()
+                results_subscription.call_events(lambda v: None, lambda e: None)  # The completion
+
+    def test_error_is_reported_and_other_runnables_continue(self) -> None:
+        with CooperativeExecutor(1) as executor, \
+                MultiThreadBuffer[int](BUFFER_SIZE, "In 1") as in_buffer_1, MultiThreadBuffer[int](BUFFER_SIZE, "Out 1") as out_buffer_1, \
+                MultiThreadBuffer[int](BUFFER_SIZE, "In 2") as in_buffer_2, MultiThreadBuffer[int](BUFFER_SIZE, "Out 2") as out_buffer_2:
+            failing_runner = CooperativeRunner(TestAddingRunnable("Failing", in_buffer_1, out_buffer_1, fail_on=3), executor)
+            working_runner = CooperativeRunner(TestAddingRunnable("Working", in_buffer_2, out_buffer_2), executor)
+            with CaptureLogs() as log_context:
+                with out_buffer_1.subscribe(None), out_buffer_2.subscribe(None) as working_results, \
+                        in_buffer_1.publish() as failing_publisher, in_buffer_2.publish() as working_publisher:
+                    with failing_runner, working_runner, RunnerMonitor([failing_runner, working_runner]) as monitor:
+                        failing_runner.start_blocking()
+                        working_runner.start_blocking()
+                        failing_publisher.publish_value(3, TIMEOUT)
+                        self.assertIs(failing_runner, monitor.wait_any(TIMEOUT))
+                        with self.assertRaisesRegex(RuntimeError, "Test Error"):
+                            failing_runner.check_for_exceptions()
+
+                        working_publisher.publish_value(3, TIMEOUT)
+                        self.assertEqual([4], self._receive(working_results, 1, working_runner))
+                        self.assertTrue(working_runner.is_alive())
+                records = log_context.pop_captured_records().with_levels_in({LogLevel.error})
+                self.assertTrue(records.containing_message("Failing: Stopped because of error"))
+
+    @assert_no_warnings_or_errors_logged
+    def test_ticks_and_run_in_child_scope(self) -> None:
+        with CooperativeExecutor(1) as executor, \
+                MultiThreadBuffer[int](BUFFER_SIZE, "In 1") as in_buffer_1, MultiThreadBuffer[int](BUFFER_SIZE, "In 2") as in_buffer_2, \
+                MultiThreadBuffer[int](BUFFER_SIZE, "Ticks 1") as ticks_buffer_1, MultiThreadBuffer[int](BUFFER_SIZE, "Ticks 2") as ticks_buffer_2:
+            runnable_1 = _TickCountingRunnable("Ticking 1", in_buffer_1, ticks_buffer_1)
+            runnable_2 = _TickCountingRunnable("Ticking 2", in_buffer_2, ticks_buffer_2)
+            with ticks_buffer_1.subscribe(None) as ticks_1, ticks_buffer_2.subscribe(None) as ticks_2, \
+                    RunnerGroup([CooperativeRunner(runnable_1, executor), CooperativeRunner(runnable_2, executor)]) as group:
+                group.start_blocking()
+                runnable_1.resume_ticks()  # A run_in_child_scope method, executed on the executor's thread
+                self.assertEqual([1, 2, 3, 4, 5], self._receive(ticks_1, 5, group))
+                with self.assertRaises(queue.Empty):
+                    ticks_2.call_events(lambda v: None)  # Not ticking yet
+                runnable_2.resume_ticks()
+                t1 = time.perf_counter()
+                self.assertEqual([1, 2, 3, 4, 5], self._receive(ticks_2, 5, group))
+                self.assertGreater(time.perf_counter() - t1, TICK_INTERVAL * 4)
+                group.stop()
+                group.join(TIMEOUT)
+                for ticks in (ticks_1, ticks_2):
+                    while True:
+                        try:
+                            ticks.call_events(lambda v: None)
+                        except queue.Empty:
+                            break
+
+    @staticmethod
+    def _receive(subscription: Any, count: int, runner: Any) -> List[int]:
+        results: List[int] = []
+        end_time = time.monotonic() + TIMEOUT
+        while len(results) < count and time.monotonic() < end_time:
+            runner.check_for_exceptions()
+            try:
+                subscription.call_events(results.append)
+            except queue.Empty:
+                time.sleep(0.001)
+        return results
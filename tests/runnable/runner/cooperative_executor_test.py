@@ -0,0 +1,51 @@
+from contextlib import ExitStack
+from unittest import TestCase
+
+from puma.buffer import MultiThreadBuffer
+from puma.context import MustBeContextManagedError
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.runnable.runner import CooperativeExecutor, CooperativeRunner
+from tests.runnable.runner.test_adding_runnable import TestAddingRunnable
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+
+
+class CooperativeExecutorTest(TestCase):
+
+    @assert_no_warnings_or_errors_logged
+    def test_must_have_threads(self) -> None:
+        with self.assertRaisesRegex(ValueError, "at least one thread"):
+            CooperativeExecutor(0)
+
+    @assert_no_warnings_or_errors_logged
+    def test_thread_count(self) -> None:
+        executor = CooperativeExecutor(3, "Test executor")
+        self.assertEqual(3, executor.get_thread_count())
+        self.assertEqual([0, 0, 0], executor.get_load())
+        self.assertEqual("Test executor", executor.get_name())
+
+    @assert_no_warnings_or_errors_logged
+    def test_runnable_must_be_multi_buffer_servicing(self) -> None:
+        executor = CooperativeExecutor(1)
+        with self.assertRaisesRegex(TypeError, "can only execute a MultiBufferServicingRunnable"):
+            CooperativeRunner(TestInlineRunnable("Test"), executor)
+
+    @assert_no_warnings_or_errors_logged
+    def test_runnable_cannot_be_begun_cooperatively_unless_multi_buffer_servicing(self) -> None:
+        with self.assertRaisesRegex(TypeError, "Only runnables derived from MultiBufferServicingRunnable"):
+            TestInlineRunnable("Test")._begin_cooperative_execution(ExitStack(), lambda: None)
+
+    @assert_no_warnings_or_errors_logged
+    def test_executor_must_be_context_managed_to_host(self) -> None:
+        executor = CooperativeExecutor(1)
+        with MultiThreadBuffer[int](10, "In") as in_buffer, MultiThreadBuffer[int](10, "Out") as out_buffer:
+            runner = CooperativeRunner(TestAddingRunnable("Test", in_buffer, out_buffer), executor)
+            with runner:
+                with self.assertRaises(MustBeContextManagedError):
+                    runner.start()
+
+    @assert_no_warnings_or_errors_logged
+    def test_runner_name(self) -> None:
+        executor = CooperativeExecutor(1)
+        with MultiThreadBuffer[int](10, "In") as in_buffer, MultiThreadBuffer[int](10, "Out") as out_buffer:
+            self.assertEqual("CooperativeRunner of Test", CooperativeRunner(TestAddingRunnable("Test", in_buffer, out_buffer), executor).get_name())
+            self.assertEqual("Named", CooperativeRunner(TestAddingRunnable("Test", in_buffer, out_buffer), executor, "Named").get_name())
@@ -0,0 +1,51 @@
+import os
+from typing import List
+from unittest import TestCase, skipUnless
+
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.helpers.testing.mixin import NotATestCase
+from puma.runnable import CommandDrivenRunnable
+from puma.runnable.decorator.run_in_child_scope import run_in_child_scope
+from puma.runnable.runner import ProcessRunner, SchedulingPolicy
+from puma.runnable.runner.process_placement import available_cpus, is_placement_supported
+
+
+class PlacementReportingRunnable(CommandDrivenRunnable, NotATestCase):
+
+    def __init__(self) -> None:
+        super().__init__("Placement reporting runnable", [])
+
+    @run_in_child_scope
+    def get_cpu_affinity(self) -> List[int]:
+        return sorted(os.sched_getaffinity(0))
+
+    @run_in_child_scope
+    def get_nice(self) -> int:
+        return os.getpriority(os.PRIO_PROCESS, 0)
+
+    @run_in_child_scope
+    def get_scheduling_policy(self) -> int:
+        return os.sched_getscheduler(0)
+
+
+@skipUnless(is_placement_supported(), "Process placement not supported on this platform")
+class ProcessPlacementSlowTest(TestCase):
+
+    @assert_no_warnings_or_errors_logged
+    def test_placement_applied_in_child(self) -> None:
+        cpu = min(available_cpus())
+        nice = min(os.getpriority(os.PRIO_PROCESS, 0) + 2, 19)
+        runnable = PlacementReportingRunnable()
+        with ProcessRunner(runnable, cpu_affinity=[cpu], nice=nice, scheduling_policy=SchedulingPolicy.BATCH) as runner:
+            runner.start_blocking()
+            self.assertEqual([cpu], runnable.get_cpu_affinity())
+            self.assertEqual(nice, runnable.get_nice())
+            self.assertEqual(os.SCHED_BATCH, runnable.get_scheduling_policy())
+
+    def test_placement_errors_reported_by_runner(self) -> None:
+        unavailable_cpu = max(available_cpus()) + 1024
+        with self.assertRaises(OSError):
+            with ProcessRunner(PlacementReportingRunnable(), cpu_affinity=[unavailable_cpu]) as runner:
+                runner.start()
+                runner.join(30.0)
+                runner.check_for_exceptions()
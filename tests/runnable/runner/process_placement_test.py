@@ -0,0 +1,60 @@
+from unittest import TestCase, skipUnless
+
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.runnable.runner import ProcessPlacement, ProcessRunner, SchedulingPolicy, spread_across_cpus
+from puma.runnable.runner.process_placement import is_placement_supported, parse_cpu_list
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+
+
+class ProcessPlacementTest(TestCase):
+
+    @assert_no_warnings_or_errors_logged
+    def test_parse_cpu_list(self) -> None:
+        self.assertEqual(frozenset({0}), parse_cpu_list("0\n"))
+        self.assertEqual(frozenset({0, 1, 2, 3, 8, 10, 11}), parse_cpu_list("0-3,8,10-11"))
+        self.assertEqual(frozenset(), parse_cpu_list(""))
+
+    @assert_no_warnings_or_errors_logged
+    def test_default_placement(self) -> None:
+        placement = ProcessPlacement()
+        self.assertTrue(placement.is_default())
+        self.assertIsNone(placement.effective_cpu_affinity())
+        placement.apply_to_current_process()  # does nothing
+
+    @skipUnless(is_placement_supported(), "Process placement not supported on this platform")
+    @assert_no_warnings_or_errors_logged
+    def test_validation(self) -> None:
+        with self.assertRaisesRegex(ValueError, "at least one CPU"):
+            ProcessPlacement(cpu_affinity=frozenset())
+        with self.assertRaisesRegex(ValueError, "non-negative"):
+            ProcessPlacement(cpu_affinity=frozenset({-1}))
+        with self.assertRaisesRegex(ValueError, "Nice value"):
+            ProcessPlacement(nice=20)
+        with self.assertRaisesRegex(ValueError, "at least 1"):
+            ProcessPlacement(scheduling_policy=SchedulingPolicy.FIFO)
+        with self.assertRaisesRegex(ValueError, "must be zero"):
+            ProcessPlacement(scheduling_policy=SchedulingPolicy.BATCH, scheduling_priority=5)
+        with self.assertRaisesRegex(ValueError, "only be given together with a scheduling policy"):
+            ProcessPlacement(scheduling_priority=5)
+        ProcessPlacement(cpu_affinity=frozenset({0}), nice=5, scheduling_policy=SchedulingPolicy.ROUND_ROBIN, scheduling_priority=10)
+
+    @skipUnless(is_placement_supported(), "Process placement not supported on this platform")
+    @assert_no_warnings_or_errors_logged
+    def test_constructor_options(self) -> None:
+        runner = ProcessRunner(TestInlineRunnable("Test"), cpu_affinity=[0], nice=3)
+        self.assertEqual(ProcessPlacement(cpu_affinity=frozenset({0}), nice=3), runner.get_placement())
+        self.assertTrue(ProcessRunner(TestInlineRunnable("Test")).get_placement().is_default())
+
+    @skipUnless(is_placement_supported(), "Process placement not supported on this platform")
+    @assert_no_warnings_or_errors_logged
+    def test_spread_across_cpus(self) -> None:
+        runners = [ProcessRunner(TestInlineRunnable(f"Test {i}"), nice=i) for i in range(5)]
+        spread_across_cpus(runners, cpus=[4, 5, 6])
+        self.assertEqual([{4}, {5}, {6}, {4}, {5}], [runner.get_placement().cpu_affinity for runner in runners])
+        self.assertEqual(list(range(5)), [runner.get_placement().nice for runner in runners])
+
+        spread_across_cpus(runners, cpus=[0, 1, 2, 3, 4], cpus_per_runner=2)
+        self.assertEqual([{0, 1}, {2, 3}, {0, 1}, {2, 3}, {0, 1}], [runner.get_placement().cpu_affinity for runner in runners])
+
+        with self.assertRaisesRegex(ValueError, "only 1 are available"):
+            spread_across_cpus(runners, cpus=[0], cpus_per_runner=2)
@@ -0,0 +1,58 @@
+import os
+from typing import List, Optional
+from unittest import TestCase
+
+from parameterized import parameterized
+
+from puma.attribute import child_only, child_scope_value
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.helpers.testing.mixin import NotATestCase
+from puma.process_context import StartMethod, set_start_method
+from puma.runnable import CommandDrivenRunnable
+from puma.runnable.decorator.run_in_child_scope import run_in_child_scope
+from puma.runnable.runner import ProcessRunner
+
+
+class StartMethodReportingRunnable(CommandDrivenRunnable, NotATestCase):
+    _value: str = child_only("_value")
+
+    def __init__(self, value: str) -> None:
+        super().__init__("Start method reporting runnable", [])
+        self._value = child_scope_value(value)
+
+    @run_in_child_scope
+    def get_pid(self) -> int:
+        return os.getpid()
+
+    @run_in_child_scope
+    def get_value(self) -> str:
+        return self._value
+
+
+# The global start method determines the context of the runner's buffers, so must not be fork if runners are to use other start methods
+GLOBAL_START_METHODS = [[method] for method in (StartMethod.FORKSERVER, StartMethod.SPAWN) if method.is_available()]
+
+
+class ProcessStartMethodSlowTest(TestCase):
+
+    def tearDown(self) -> None:
+        set_start_method(None)
+
+    @parameterized.expand(GLOBAL_START_METHODS)
+    @assert_no_warnings_or_errors_logged
+    def test_runners_with_each_start_method(self, global_start_method: StartMethod) -> None:
+        set_start_method(global_start_method)
+        start_methods: List[Optional[StartMethod]] = [None]
+        start_methods.extend(method for method in StartMethod if method.is_available())
+        for start_method in start_methods:
+            with self.subTest(start_method=start_method):
+                runnable = StartMethodReportingRunnable("a value")
+                with ProcessRunner(runnable, start_method=start_method) as runner:
+                    runner.start_blocking()
+                    self.assertEqual(start_method or global_start_method, runner.get_start_method())
+                    self.assertNotEqual(os.getpid(), runnable.get_pid())
+                    self.assertEqual("a value", runnable.get_value())
+                    runner.stop()
+                    runner.join(30.0)
+                    self.assertFalse(runner.is_alive())
+                    runner.check_for_exceptions()
@@ -0,0 +1,41 @@
+import time
+from unittest import TestCase
+
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.helpers.testing.parameterized import parameterized
+from puma.runnable.runner import RunnerGroup
+from tests.runnable.runner.process_start_method_slowtest import StartMethodReportingRunnable
+from tests.runnable.runner.test_logging_runnable import TestLoggingRunnable
+from tests.runnable.test_support.parameterisation import RunnerTestParams, envs
+
+RUNNER_COUNT = 4
+DELAY = 1.0
+
+
+class RunnerGroupSlowTest(TestCase):
+
+    @parameterized(envs)
+    @assert_no_warnings_or_errors_logged
+    def test_start_stop(self, param: RunnerTestParams) -> None:
+        env = param._env
+        runnables = [StartMethodReportingRunnable(f"value {i}") for i in range(RUNNER_COUNT)]
+        with RunnerGroup([env.create_runner(runnable, f"Runner {i}") for i, runnable in enumerate(runnables)]) as group:
+            group.start_blocking(env.activity_timeout())
+            self.assertEqual([f"value {i}" for i in range(RUNNER_COUNT)], [runnable.get_value() for runnable in runnables])
+            group.stop()
+            group.join(env.activity_timeout())
+            self.assertFalse(group.is_alive())
+            group.check_for_exceptions()
+
+    @parameterized(envs)
+    def test_runners_joined_together(self, param: RunnerTestParams) -> None:
+        env = param._env
+        runners = [env.create_runner(TestLoggingRunnable(f"Test {i}", delay=DELAY), f"Runner {i}") for i in range(RUNNER_COUNT)]
+        with RunnerGroup(runners) as group:
+            group.start_blocking()
+            t1 = time.monotonic()
+            group.join(env.activity_timeout() + DELAY)
+            t2 = time.monotonic()
+            self.assertFalse(group.is_alive())
+            group.check_for_exceptions()
+        self.assertLess(t2 - t1, DELAY * 2)  # would be at least DELAY * RUNNER_COUNT if the runners had run in turn
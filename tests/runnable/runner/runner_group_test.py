@@ -0,0 +1,113 @@
+from typing import List
+from unittest import TestCase
+
+from puma.context import MustBeContextManagedError
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.runnable.runner import RunnerGroup
+from puma.runnable.runner.runner import RunnerStillAliveError
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+from tests.runnable.runner.test_inline_runner import TestInlineRunner
+
+
+class RunnerGroupTest(TestCase):
+
+    def setUp(self) -> None:
+        self._runnables: List[TestInlineRunnable] = [TestInlineRunnable(f"Test {i}") for i in range(3)]
+        self._runners: List[TestInlineRunner] = [TestInlineRunner(runnable) for runnable in self._runnables]
+
+    @assert_no_warnings_or_errors_logged
+    def test_must_have_runners(self) -> None:
+        with self.assertRaisesRegex(ValueError, "at least one runner"):
+            RunnerGroup([])
+
+    @assert_no_warnings_or_errors_logged
+    def test_is_initialised(self) -> None:
+        group = RunnerGroup(self._runners)
+        with self.assertRaisesRegex(MustBeContextManagedError, "Must be context managed"):
+            group.start()
+
+    @assert_no_warnings_or_errors_logged
+    def test_start_stop_join(self) -> None:
+        with RunnerGroup(self._runners) as group:
+            self.assertEqual(self._runners, group.get_runners())
+            self.assertFalse(group.is_alive())
+
+            group.start_blocking()
+
+            self.assertTrue(all(runnable.executed for runnable in self._runnables))
+            self.assertTrue(group.is_alive())
+
+            group.stop()
+            group.join()
+
+            self.assertTrue(all(runnable.stopped for runnable in self._runnables))
+            self.assertTrue(all(runner.joined for runner in self._runners))
+            self.assertFalse(group.is_alive())
+            group.check_for_exceptions()
+
+    @assert_no_warnings_or_errors_logged
+    def test_stopped_and_joined_by_context_management(self) -> None:
+        with RunnerGroup(self._runners) as group:
+            group.start()
+        self.assertTrue(all(runnable.stopped for runnable in self._runnables))
+        self.assertTrue(all(runner.joined for runner in self._runners))
+        self.assertTrue(all(runner.get_status_buffer().exited for runner in self._runners))
+
+    def test_error_raised_by_context_management(self) -> None:
+        self._runners[1] = TestInlineRunner(TestInlineRunnable("Erroring", raise_error=True))
+        with self.assertRaisesRegex(RuntimeError, "Test Error"):
+            with RunnerGroup(self._runners) as group:
+                group.start()
+        # The other runners are still shut down
+        self.assertTrue(self._runnables[0].stopped)
+        self.assertTrue(self._runnables[2].stopped)
+        self.assertTrue(all(runner.get_status_buffer().exited for runner in self._runners))
+
+    def test_check_for_exceptions(self) -> None:
+        self._runners[2] = TestInlineRunner(TestInlineRunnable("Erroring", raise_error=True))
+        with RunnerGroup(self._runners) as group:
+            group.start()
+            with self.assertRaisesRegex(RuntimeError, "Test Error"):
+                group.check_for_exceptions()
+
+    @assert_no_warnings_or_errors_logged
+    def test_join_names_runners_still_alive(self) -> None:
+        self._runners[1] = TestInlineRunner(TestInlineRunnable("Immortal", simulate_stop_not_working=True))
+        with self.assertRaisesRegex(RunnerStillAliveError, "Failed to stop"):
+            with RunnerGroup(self._runners, "My group") as group:
+                group.start()
+                group.stop()
+                with self.assertRaisesRegex(RunnerStillAliveError, "My group: Failed to stop the runners: TestInlineRunner of Immortal$"):
+                    group.join(0.1)
+        self.assertTrue(all(runner.get_status_buffer().exited for runner in self._runners))
+
+    @assert_no_warnings_or_errors_logged
+    def test_add_and_remove_while_context_managed(self) -> None:
+        added_runnable = TestInlineRunnable("Added")
+        added_runner = TestInlineRunner(added_runnable)
+        with RunnerGroup(self._runners[:2]) as group:
+            group.start_blocking()
+            group.add(added_runner)
+            added_runner.start_blocking()
+            self.assertEqual(self._runners[:2] + [added_runner], group.get_runners())
+
+            group.remove(self._runners[0])
+            self.assertTrue(self._runnables[0].stopped)
+            self.assertTrue(self._runners[0].get_status_buffer().exited)
+            self.assertFalse(self._runnables[1].stopped)
+            self.assertEqual([self._runners[1], added_runner], group.get_runners())
+        self.assertTrue(added_runnable.stopped)
+        self.assertTrue(added_runner.get_status_buffer().exited)
+
+    @assert_no_warnings_or_errors_logged
+    def test_cannot_add_runner_twice(self) -> None:
+        group = RunnerGroup(self._runners)
+        with self.assertRaisesRegex(ValueError, "already in the group"):
+            group.add(self._runners[0])
+
+    def test_remove_raises_error_of_removed_runner(self) -> None:
+        self._runners[0] = TestInlineRunner(TestInlineRunnable("Erroring", raise_error=True))
+        with RunnerGroup(self._runners) as group:
+            group.start()
+            with self.assertRaisesRegex(RuntimeError, "Test Error"):
+                group.remove(self._runners[0])
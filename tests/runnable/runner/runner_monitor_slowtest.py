@@ -0,0 +1,44 @@
+import time
+from typing import List
+from unittest import TestCase
+
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.helpers.testing.parameterized import parameterized
+from puma.runnable.runner import Runner, RunnerGroup, RunnerMonitor
+from tests.runnable.runner.test_blocking_runnable import TestBlockingRunnable
+from tests.runnable.runner.test_execution_mode import TestExecutionMode
+from tests.runnable.runner.test_logging_runnable import TestLoggingRunnable
+from tests.runnable.test_support.parameterisation import RunnerTestParams, envs
+
+RUNNER_COUNT = 4
+DELAY = 0.5
+
+
+class RunnerMonitorSlowTest(TestCase):
+
+    @parameterized(envs)
+    @assert_no_warnings_or_errors_logged
+    def test_wait_any_wakes_when_a_runner_ends(self, param: RunnerTestParams) -> None:
+        env = param._env
+        runners = [env.create_runner(TestBlockingRunnable(f"Test {i}", stop_event=env.create_event()), f"Runner {i}") for i in range(RUNNER_COUNT)]
+        with RunnerGroup(runners) as group, RunnerMonitor(runners) as monitor:
+            group.start_blocking(env.activity_timeout())
+            self.assertIsNone(monitor.wait_any(0.1))
+            runners[2].stop()
+            self.assertIs(runners[2], monitor.wait_any(env.activity_timeout()))
+            runners[2].check_for_exceptions()
+
+    @parameterized(envs)
+    def test_wait_any_wakes_when_a_runner_fails(self, param: RunnerTestParams) -> None:
+        env = param._env
+        runners: List[Runner] = [env.create_runner(TestLoggingRunnable(f"Test {i}", delay=DELAY * 10), f"Runner {i}") for i in range(RUNNER_COUNT - 1)]
+        failing = env.create_runner(TestBlockingRunnable("Failing", stop_event=env.create_event(), execution_mode=TestExecutionMode.EndQuicklyWithError), "Failing")
+        runners.append(failing)
+        with RunnerGroup(runners) as group, RunnerMonitor(runners) as monitor:
+            group.start()
+            t1 = time.monotonic()
+            self.assertIs(failing, monitor.wait_any(env.activity_timeout()))
+            t2 = time.monotonic()
+            self.assertLess(t2 - t1, DELAY * 10)
+            with self.assertRaisesRegex(RuntimeError, "Test Error"):
+                monitor.check_for_exceptions()
@@ -0,0 +1,80 @@
+from typing import List
+from unittest import TestCase
+
+from puma.context import MustBeContextManagedError
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.runnable.runner import Runner, RunnerGroup, RunnerMonitor
+from puma.timeouts import TIMEOUT_NO_WAIT
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+from tests.runnable.runner.test_inline_runner import TestInlineRunner
+
+
+class RunnerMonitorTest(TestCase):
+
+    def setUp(self) -> None:
+        self._runnables: List[TestInlineRunnable] = [TestInlineRunnable(f"Test {i}") for i in range(3)]
+        self._runners: List[TestInlineRunner] = [TestInlineRunner(runnable) for runnable in self._runnables]
+
+    @assert_no_warnings_or_errors_logged
+    def test_is_initialised(self) -> None:
+        monitor = RunnerMonitor(self._runners)
+        with self.assertRaisesRegex(MustBeContextManagedError, "Must be context managed"):
+            monitor.wait_any()
+
+    @assert_no_warnings_or_errors_logged
+    def test_cannot_add_twice(self) -> None:
+        monitor = RunnerMonitor(self._runners)
+        with self.assertRaisesRegex(ValueError, "already being watched"):
+            monitor.add(self._runners[0])
+
+    @assert_no_warnings_or_errors_logged
+    def test_wait_any_returns_each_ended_runner_once(self) -> None:
+        with RunnerGroup(self._runners) as group, RunnerMonitor(self._runners) as monitor:
+            self.assertIsNone(monitor.wait_any(TIMEOUT_NO_WAIT))
+            self._runners[1].start()  # an inline runner ends immediately
+            self.assertIs(self._runners[1], monitor.wait_any(TIMEOUT_NO_WAIT))
+            self.assertIsNone(monitor.wait_any(TIMEOUT_NO_WAIT))
+            self._runners[2].start()
+            self._runners[0].start()
+            self.assertEqual([self._runners[2], self._runners[0]], [monitor.wait_any(TIMEOUT_NO_WAIT), monitor.wait_any(TIMEOUT_NO_WAIT)])
+            self.assertIsNone(monitor.wait_any(0.01))
+            self.assertEqual([self._runners[1], self._runners[2], self._runners[0]], monitor.get_ended())
+            group.check_for_exceptions()
+
+    @assert_no_warnings_or_errors_logged
+    def test_runner_that_ended_before_being_watched(self) -> None:
+        with RunnerGroup(self._runners) as group:
+            group.start()
+            with RunnerMonitor(self._runners) as monitor:
+                self.assertEqual(set(self._runners), {monitor.wait_any(TIMEOUT_NO_WAIT) for _ in self._runners})
+
+    @assert_no_warnings_or_errors_logged
+    def test_add_and_remove(self) -> None:
+        with RunnerGroup(self._runners), RunnerMonitor() as monitor:
+            monitor.add(self._runners[0])
+            monitor.add(self._runners[1])
+            monitor.remove(self._runners[0])
+            self.assertEqual([self._runners[1]], monitor.get_runners())
+            self._runners[0].start()
+            self.assertIsNone(monitor.wait_any(TIMEOUT_NO_WAIT))
+            self._runners[1].start()
+            self.assertIs(self._runners[1], monitor.wait_any(TIMEOUT_NO_WAIT))
+
+    @assert_no_warnings_or_errors_logged
+    def test_callbacks(self) -> None:
+        called: List[Runner] = []
+        with RunnerGroup(self._runners) as group, RunnerMonitor(self._runners) as monitor:
+            monitor.add_callback(called.append)
+            group.start()
+            monitor.check_for_exceptions()
+            self.assertEqual(self._runners, called)
+            monitor.remove_callback(called.append)
+
+    def test_check_for_exceptions(self) -> None:
+        self._runners[1] = TestInlineRunner(TestInlineRunnable("Erroring", raise_error=True))
+        with RunnerGroup(self._runners) as group, RunnerMonitor(self._runners) as monitor:
+            group.start()
+            self.assertEqual(3, len([monitor.wait_any(TIMEOUT_NO_WAIT) for _ in self._runners]))  # finding that a runner has ended does not raise its error
+            with self.assertRaisesRegex(RuntimeError, "Test Error"):
+                monitor.check_for_exceptions()
+            monitor.check_for_exceptions()  # each error is only raised once
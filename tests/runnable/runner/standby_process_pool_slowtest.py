@@ -0,0 +1,89 @@
+import multiprocessing
+import os
+import time
+from pathlib import Path
+from typing import Any
+from unittest import TestCase, mock, skipUnless
+
+from puma.helpers.testing.logging.capture_logs import CaptureLogs
+from puma.helpers.testing.logging.decorator import assert_no_warnings_or_errors_logged
+from puma.logging import LogLevel, Logging
+from puma.process_context import StartMethod, set_start_method
+from puma.runnable.runner import ProcessRunner, StandbyProcessPool
+from puma.runnable.runner.standby_process_pool import _StandbyWorker
+from tests.runnable.runner.process_start_method_slowtest import StartMethodReportingRunnable
+from tests.runnable.runner.test_logging_runnable import TestLoggingRunnable
+
+
+@skipUnless(StartMethod.FORKSERVER.is_available(), "Start method not available")
+class StandbyProcessPoolSlowTest(TestCase):
+
+    def setUp(self) -> None:
+        set_start_method(StartMethod.FORKSERVER)
+
+    def tearDown(self) -> None:
+        set_start_method(None)
+
+    @assert_no_warnings_or_errors_logged
+    def test_runners_use_standby_processes(self) -> None:
+        with StandbyProcessPool(2) as pool:
+            for i in range(3):
+                self.assertTrue(pool.wait_until_ready(30.0))
+                self.assertEqual(2, pool.idle_count())
+                standby_pids = {process.pid for process in multiprocessing.active_children()}
+                runnable = StartMethodReportingRunnable(f"value {i}")
+                with ProcessRunner(runnable, standby_pool=pool) as runner:
+                    runner.start_blocking()
+                    self.assertIn(runnable.get_pid(), standby_pids)
+                    self.assertEqual(runner.pid, runnable.get_pid())
+                    self.assertEqual(f"value {i}", runnable.get_value())
+                    runner.stop()
+                    runner.join(30.0)
+                    self.assertFalse(runner.is_alive())
+                    self.assertEqual(0, runner.exitcode)
+                    runner.check_for_exceptions()
+
+    def test_pool_keeps_replenishing_after_failing_to_start_a_process(self) -> None:
+        attempts = []
+
+        def fail_first_attempt(*args: Any) -> _StandbyWorker:
+            attempts.append(args)
+            if len(attempts) == 1:
+                raise OSError("Too many processes")
+            return _StandbyWorker(*args)
+
+        with mock.patch("puma.runnable.runner.standby_process_pool._StandbyWorker", side_effect=fail_first_attempt):
+            with CaptureLogs(LogLevel.error) as logging_context:
+                with StandbyProcessPool(1) as pool:
+                    with self.assertRaisesRegex(RuntimeError, "Failed to start a standby process"):
+                        pool.wait_until_ready(30.0)
+                    end_time = time.monotonic() + 30.0
+                    while True:
+                        try:
+                            self.assertTrue(pool.wait_until_ready(30.0))
+                            break
+                        except RuntimeError:  # The error is reported until an attempt succeeds
+                            self.assertLess(time.monotonic(), end_time, "The pool did not try again")
+                            time.sleep(0.01)
+                    self.assertEqual(2, len(attempts))
+                    self.assertEqual(1, pool.idle_count())
+                records = logging_context.pop_captured_records()
+                self.assertEqual(1, len(records.containing_message("Failed to start standby process")))
+
+    def test_logging_from_standby_process(self) -> None:
+        Logging.reset_logging()
+        Logging.init_logging(str(Path(os.path.dirname(os.path.realpath(__file__))).joinpath('process_logging_test.yaml')))
+        try:
+            with CaptureLogs(LogLevel.debug) as logging_context:
+                with StandbyProcessPool(1) as pool:
+                    self.assertTrue(pool.wait_until_ready(30.0))
+                    with ProcessRunner(TestLoggingRunnable("Test"), standby_pool=pool) as runner:
+                        runner.start_blocking()
+                        runner.join(30.0)
+                        self.assertFalse(runner.is_alive())
+                        runner.check_for_exceptions()
+                records = logging_context.pop_captured_records()
+                self.assertEqual(1, len(records.containing_message("Debug message").with_levels_in({LogLevel.debug})))
+                self.assertEqual(1, len(records.containing_message("Error message").with_levels_in({LogLevel.error})))
+        finally:
+            Logging.reset_logging()
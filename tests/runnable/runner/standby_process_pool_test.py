@@ -0,0 +1,25 @@
+from unittest import TestCase, skipUnless
+
+from puma.process_context import StartMethod, set_start_method
+from puma.runnable.runner import ProcessRunner, StandbyProcessPool
+from tests.runnable.runner.test_inline_runnable import TestInlineRunnable
+
+
+class StandbyProcessPoolTest(TestCase):
+
+    def tearDown(self) -> None:
+        set_start_method(None)
+
+    @skipUnless(StartMethod.FORK.is_available(), "Start method not available")
+    def test_not_allowed_with_fork(self) -> None:
+        set_start_method(StartMethod.FORK)
+        with self.assertRaisesRegex(ValueError, "fork start method"):
+            StandbyProcessPool()
+
+    @skipUnless(StartMethod.SPAWN.is_available(), "Start method not available")
+    def test_invalid_parameters(self) -> None:
+        set_start_method(StartMethod.SPAWN)
+        with self.assertRaisesRegex(ValueError, "at least 1"):
+            StandbyProcessPool(0)
+        with self.assertRaisesRegex(ValueError, "standby pool"):
+            ProcessRunner(TestInlineRunnable("test"), standby_pool=StandbyProcessPool(), start_method=StartMethod.SPAWN)
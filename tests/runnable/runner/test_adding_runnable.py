@@ -0,0 +1,33 @@
+from typing import Optional
+
+from puma.buffer import Observable, Publishable, Publisher, Subscriber
+from puma.helpers.testing.mixin import NotATestCase
+from puma.runnable import MultiBufferServicingRunnable
+from puma.timeouts import TIMEOUT_NO_WAIT
+from puma.unexpected_situation_action import UnexpectedSituationAction
+
+TIMEOUT = 10.0
+
+
+class _AddingSubscriber(Subscriber[int]):
+    def __init__(self, publisher: Publisher[int], fail_on: Optional[int]) -> None:
+        self._publisher = publisher
+        self._fail_on = fail_on
+
+    def on_value(self, value: int) -> None:
+        if value == self._fail_on:
+            raise RuntimeError("Test Error")
+        self._publisher.publish_value(value + 1, TIMEOUT, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+
+    def on_complete(self, error: Optional[BaseException]) -> None:
+        if error:
+            raise error  # Not passed on, so that the runnable raises it
+        self._publisher.publish_complete(error, TIMEOUT_NO_WAIT, on_full_action=UnexpectedSituationAction.RAISE_EXCEPTION)
+
+
+class TestAddingRunnable(MultiBufferServicingRunnable, NotATestCase):
+    """Adds one to each value received, and publishes the result. An error raises an exception, which is reported by the runner, rather than being passed on."""
+
+    def __init__(self, name: str, in_buffer: Observable[int], out_buffer: Publishable[int], *, fail_on: Optional[int] = None) -> None:
+        super().__init__(name, [out_buffer])
+        self._add_subscription(in_buffer, _AddingSubscriber(self._get_publisher_unwrapped(out_buffer), fail_on))
@@ -124,6 +124,26 @@ class ThreadAndProcessRunnerLoggingSlowTest(TestCase):
                 self.assertFalse(records.containing_message("Filtered out"))
                 self._assert_captured_once(records, "Relevant")
 
+    def test_records_are_batched_when_queuing(self) -> None:
+        # Records from a child process are sent to the listener process in batches, rather than one at a time. To test this, we give the queue a small size
+        # and stop the listening process, before doing more relevant logging than the queue could hold as single records. When we restart the logging process,
+        # we should get all of the records, in order.
+        queue_size = 5
+        log_count = queue_size * 10
+        runnable = TestBatchedLoggingRunnable("Test", log_count=log_count)
+        with CaptureLogs(LogLevel.debug) as logging_context:
+            with TestProcessRunner(runnable, None, log_queue_size=queue_size) as runner:
+                runner.pause_log_listener_process()
+
+                runner.start_blocking()
+                runner.join(20.0)
+                self.assertFalse(runner.is_alive())
+                runner.check_for_exceptions()
+
+                runner.resume_log_listener_process()
+                records = logging_context.pop_captured_records()
+                self.assertEqual([f"Batched {i}" for i in range(log_count)], records.containing_message("Batched").get_lines(timestamp=False, level=False))
+
     def test_logging_to_file_from_processes_delay_is_false(self) -> None:
         # With the "delay" option false, the log file is created as soon as logging is configured
         # Launches a child process only
@@ -321,3 +341,17 @@ class TestLoggingToPumaRunnable(Runnable, NotATestCase):
 
         tests_logger = logging.getLogger('tests')  # process_logging_test.yaml configures this for DEBUG level
         tests_logger.debug("Relevant")
+
+
+class TestBatchedLoggingRunnable(Runnable, NotATestCase):
+    """Logs many relevant records in quick succession, which should be sent to the listener process in batches."""
+    _log_count: int = copied("_log_count")
+
+    def __init__(self, name: str, *, log_count: int) -> None:
+        super().__init__(name, [])
+        self._log_count = log_count
+
+    def _execute(self) -> None:
+        tests_logger = logging.getLogger('tests')  # process_logging_test.yaml configures this for DEBUG level
+        for i in range(self._log_count):
+            tests_logger.debug("Batched %d", i)